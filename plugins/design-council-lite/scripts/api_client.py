@@ -16,6 +16,9 @@ from dataclasses import dataclass
 
 GEMINI_API_URL = "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent"
 
+# Hard ceiling on maxOutputTokens accepted by the model
+MODEL_MAX_OUTPUT_TOKENS = 8192
+
 DEFAULT_CONFIG = {
     "temperature": 0.7,
     "max_output_tokens": 8192,
@@ -74,8 +77,6 @@ class GeminiClient:
         Returns:
             APIResponse with success status and data or error
         """
-        url = f"{self.base_url}?key={self.api_key}"
-
         payload = {
             "contents": [{
                 "parts": [{
@@ -90,6 +91,10 @@ class GeminiClient:
             }
         }
 
+        return self._post(f"{self.base_url}?key={self.api_key}", payload)
+
+    def _post(self, url: str, payload: dict) -> APIResponse:
+        """POST a JSON payload and wrap the result in an APIResponse."""
         headers = {
             "Content-Type": "application/json"
         }
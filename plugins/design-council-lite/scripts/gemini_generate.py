@@ -7,6 +7,7 @@ Main entry point that orchestrates the modular components:
 - api_client: Gemini API interaction
 - prompt_builder: Prompt construction
 - response_parser: Response extraction
+- token_budget: Context trimming and output budget planning
 
 Reads design specification from stdin as JSON, calls Gemini API,
 and outputs generated code to stdout.
@@ -28,15 +29,24 @@ from typing import Optional
 from validators import (
     validate_api_key,
     validate_design_spec,
-    get_api_key
+    get_api_key,
+    get_cache_dir
 )
-from api_client import GeminiClient, APIConfig
+from api_client import GeminiClient, APIConfig, MODEL_MAX_OUTPUT_TOKENS
 from prompt_builder import build_initial_prompt
 from response_parser import (
     extract_code,
     parse_structured_output,
     estimate_lines_of_code
 )
+from token_budget import (
+    TokenBudget,
+    OutputHistory,
+    DEFAULT_MAX_CONTEXT_TOKENS,
+    estimate_tokens,
+    plan_output_tokens,
+    trim_context
+)
 
 
 def output_error(message: str, exit_code: int = 1) -> None:
@@ -88,6 +98,12 @@ def main():
     framework = design_spec.get("framework", "react")
     context = design_spec.get("context")
     feedback = design_spec.get("feedback")
+    template = design_spec.get("template") or design_spec.get("name") or "custom"
+
+    context, context_tokens_removed = trim_context(
+        context,
+        design_spec.get("max_context_tokens", DEFAULT_MAX_CONTEXT_TOKENS)
+    )
 
     prompt = build_initial_prompt(
         design_spec=spec_text,
@@ -96,8 +112,28 @@ def main():
         feedback=feedback
     )
 
-    # Step 5: Call Gemini API
+    # Step 4b: Plan token budget from prompt estimate and output history
     client = GeminiClient(api_key)
+    history = OutputHistory(get_cache_dir())
+    samples = history.samples(framework, template)
+
+    max_output_tokens, budget_source = plan_output_tokens(
+        samples,
+        default=client.config.max_output_tokens,
+        ceiling=MODEL_MAX_OUTPUT_TOKENS
+    )
+    client.config.max_output_tokens = max_output_tokens
+
+    budget = TokenBudget(
+        prompt_tokens=estimate_tokens(prompt),
+        max_output_tokens=max_output_tokens,
+        output_budget_source=budget_source,
+        history_samples=len(samples),
+        context_trimmed=context_tokens_removed > 0,
+        context_tokens_removed=context_tokens_removed
+    )
+
+    # Step 5: Call Gemini API
     response = client.generate(prompt)
 
     if not response.success:
@@ -109,7 +145,11 @@ def main():
     if parsed.error:
         output_error(parsed.error)
 
-    # Step 7: Build result
+    # Step 7: Record output size for future budgets
+    output_tokens = (parsed.usage or {}).get("candidatesTokenCount") or estimate_tokens(parsed.code)
+    history.record(framework, template, output_tokens)
+
+    # Step 8: Build result
     structured = parse_structured_output(response.data)
     lines_of_code = estimate_lines_of_code(response.data)
 
@@ -120,7 +160,8 @@ def main():
         "usage": parsed.usage,
         "lines_of_code": lines_of_code,
         "components_count": len(structured.get("components", [])),
-        "has_styles": structured.get("styles") is not None
+        "has_styles": structured.get("styles") is not None,
+        "token_budget": budget.to_dict()
     }
 
     output_result(result)
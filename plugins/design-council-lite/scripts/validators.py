@@ -5,6 +5,8 @@ Validates:
 - GEMINI_API_KEY environment variable
 - Design specification structure
 - Framework selection
+
+Also resolves the local cache directory shared by the scripts.
 """
 
 import os
@@ -13,6 +15,8 @@ from typing import List, Optional
 
 SUPPORTED_FRAMEWORKS = ["react", "vue", "svelte", "html", "nextjs"]
 
+DEFAULT_CACHE_DIR = os.path.join("~", ".cache", "design-council")
+
 
 def validate_api_key() -> tuple[bool, Optional[str]]:
     """
@@ -71,6 +75,17 @@ def validate_design_spec(spec: dict) -> List[str]:
     if context and not isinstance(context, str):
         errors.append("'context' must be a string")
 
+    # Token budget options
+    template = spec.get("template")
+    if template is not None and not isinstance(template, str):
+        errors.append("'template' must be a string")
+
+    max_context_tokens = spec.get("max_context_tokens")
+    if max_context_tokens is not None and (
+        not isinstance(max_context_tokens, int) or max_context_tokens <= 0
+    ):
+        errors.append("'max_context_tokens' must be a positive integer")
+
     return errors
 
 
@@ -113,3 +128,19 @@ def get_api_key() -> str:
         raise ValueError(error)
 
     return os.environ["GEMINI_API_KEY"]
+
+
+def get_cache_dir() -> str:
+    """
+    Get the local cache directory, creating it if needed.
+
+    Uses DESIGN_COUNCIL_CACHE_DIR when set, else ~/.cache/design-council.
+
+    Returns:
+        Absolute path to the cache directory
+    """
+    cache_dir = os.path.expanduser(
+        os.environ.get("DESIGN_COUNCIL_CACHE_DIR") or DEFAULT_CACHE_DIR
+    )
+    os.makedirs(cache_dir, exist_ok=True)
+    return os.path.abspath(cache_dir)
@@ -9,6 +9,7 @@ Modules:
 - api_client: Pure Gemini API interaction
 - prompt_builder: Design spec → prompt conversion
 - response_parser: Extract code from API responses
+- token_budget: Context trimming and adaptive output budgets
 - gemini_generate: Main entry point
 """
 
@@ -16,6 +17,7 @@ from .validators import validate_api_key, validate_design_spec, validate_framewo
 from .api_client import GeminiClient
 from .prompt_builder import build_initial_prompt, build_iteration_prompt
 from .response_parser import extract_code, extract_reasoning, parse_structured_output
+from .token_budget import OutputHistory, TokenBudget, estimate_tokens, plan_output_tokens, trim_context
 
 __all__ = [
     "validate_api_key",
@@ -27,6 +29,11 @@ __all__ = [
     "extract_code",
     "extract_reasoning",
     "parse_structured_output",
+    "OutputHistory",
+    "TokenBudget",
+    "estimate_tokens",
+    "plan_output_tokens",
+    "trim_context",
 ]
 
 __version__ = "1.0.0"
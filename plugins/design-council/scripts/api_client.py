@@ -5,16 +5,24 @@ Handles:
 - API calls with proper error handling
 - Rate limiting and retry logic
 - Timeout management
+- Streaming generation (server-sent events) for live previews
+- Continuation of truncated or structurally incomplete responses
 """
 
 import json
 import urllib.request
 import urllib.error
-from typing import Optional
+from typing import Callable, Optional
 from dataclasses import dataclass
 
+from completeness import Completeness, check_completeness
+
 
 GEMINI_API_URL = "https://generativelanguage.googleapis.com/v1beta/models/gemini-3-pro-preview:generateContent"
+GEMINI_STREAM_URL = GEMINI_API_URL.replace(":generateContent", ":streamGenerateContent")
+
+# Hard ceiling on maxOutputTokens accepted by the model
+MODEL_MAX_OUTPUT_TOKENS = 65536
 
 DEFAULT_CONFIG = {
     "temperature": 0.7,
@@ -64,19 +72,9 @@ class GeminiClient:
         self.config = config or APIConfig()
         self.base_url = GEMINI_API_URL
 
-    def generate(self, prompt: str) -> APIResponse:
-        """
-        Generate content from a prompt.
-
-        Args:
-            prompt: The prompt to send to Gemini
-
-        Returns:
-            APIResponse with success status and data or error
-        """
-        url = f"{self.base_url}?key={self.api_key}"
-
-        payload = {
+    def _generate_payload(self, prompt: str) -> dict:
+        """Request body for generateContent / streamGenerateContent."""
+        return {
             "contents": [{
                 "parts": [{
                     "text": prompt
@@ -90,6 +88,85 @@ class GeminiClient:
             }
         }
 
+    def generate(self, prompt: str) -> APIResponse:
+        """
+        Generate content from a prompt.
+
+        Args:
+            prompt: The prompt to send to Gemini
+
+        Returns:
+            APIResponse with success status and data or error
+        """
+        return self._post(f"{self.base_url}?key={self.api_key}", self._generate_payload(prompt))
+
+    def generate_stream(self, prompt: str, on_text: Callable[[str], None]) -> APIResponse:
+        """
+        Generate content, reporting text as it streams in.
+
+        Args:
+            prompt: The prompt to send to Gemini
+            on_text: Called with each new text chunk, in order
+
+        Returns:
+            APIResponse shaped like generate() (combined text, finish
+            reason and usage), or the error; partial text received before
+            a failure is returned with finish reason "PARTIAL"
+        """
+        url = f"{GEMINI_STREAM_URL}?alt=sse&key={self.api_key}"
+        data = json.dumps(self._generate_payload(prompt)).encode("utf-8")
+        request = urllib.request.Request(
+            url, data=data, headers={"Content-Type": "application/json"}, method="POST"
+        )
+
+        full_text, finish_reason, usage = "", "UNKNOWN", None
+        try:
+            with urllib.request.urlopen(request, timeout=self.config.timeout) as response:
+                for raw_line in response:
+                    line = raw_line.decode("utf-8").strip()
+                    if not line.startswith("data:"):
+                        continue
+                    chunk = json.loads(line[5:])
+
+                    text, chunk_finish = self._extract_content(chunk)
+                    if chunk_finish != "UNKNOWN":
+                        finish_reason = chunk_finish
+                    usage = chunk.get("usageMetadata") or usage
+                    if text:
+                        full_text += text
+                        on_text(text)
+
+        except urllib.error.HTTPError as e:
+            error_body = e.read().decode("utf-8") if e.fp else str(e)
+            return APIResponse(
+                success=False,
+                error_message=f"HTTP Error {e.code}: {error_body}",
+                status_code=e.code
+            )
+
+        except (urllib.error.URLError, TimeoutError, OSError, ValueError) as e:
+            if full_text:
+                return APIResponse(
+                    success=True,
+                    data=self._build_partial_stream_response(full_text, usage)
+                )
+            reason = e.reason if isinstance(e, urllib.error.URLError) else e
+            return APIResponse(success=False, error_message=f"Stream error: {str(reason)}")
+
+        data = self._build_combined_response(full_text, finish_reason)
+        if usage:
+            data["usageMetadata"] = usage
+        return APIResponse(success=True, data=data)
+
+    def _build_partial_stream_response(self, full_text: str, usage: Optional[dict]) -> dict:
+        """Combined response for a stream that broke off after some text."""
+        data = self._build_combined_response(full_text, "PARTIAL")
+        if usage:
+            data["usageMetadata"] = usage
+        return data
+
+    def _post(self, url: str, payload: dict) -> APIResponse:
+        """POST a JSON payload and wrap the result in an APIResponse."""
         headers = {
             "Content-Type": "application/json"
         }
@@ -162,31 +239,48 @@ class GeminiClient:
 
         return last_response
 
-    def generate_with_continuation(self, prompt: str, max_continuations: int = 3) -> APIResponse:
+    def generate_with_continuation(
+        self,
+        prompt: str,
+        max_continuations: int = 3,
+        on_text: Optional[Callable[[str], None]] = None,
+        check_structure: bool = True
+    ) -> APIResponse:
         """
         Generate content with automatic continuation if truncated.
 
         If the response is truncated (MAX_TOKENS), automatically continues
         generation by sending the partial response back with a continuation prompt.
+        A response that finishes normally but stops inside a code block (open
+        fence, brackets, elements or strings) gets a targeted continuation too.
 
         Args:
             prompt: The initial prompt to send
             max_continuations: Maximum continuation attempts (default: 3)
+            on_text: Optional callback; when given every step is streamed
+                and each text chunk is reported as it arrives
+            check_structure: Also continue structurally incomplete STOP responses
 
         Returns:
             APIResponse with combined content from all continuations
+            (data["continuations"] lists why each continuation was made)
         """
         full_text = ""
         current_prompt = prompt
         continuation_count = 0
+        continuations = []
+        usage = {"promptTokenCount": 0, "candidatesTokenCount": 0, "cachedContentTokenCount": 0}
 
         while continuation_count <= max_continuations:
-            response = self.generate(current_prompt)
+            if on_text is not None:
+                response = self.generate_stream(current_prompt, on_text)
+            else:
+                response = self.generate(current_prompt)
 
             if not response.success:
                 # If we have partial content, return it with a warning
                 if full_text:
-                    response.data = self._build_combined_response(full_text, "PARTIAL")
+                    response.data = self._build_combined_response(full_text, "PARTIAL", usage)
                     response.success = True
                 return response
 
@@ -196,22 +290,41 @@ class GeminiClient:
             if text:
                 full_text += text
 
+            # Accumulate token usage across continuations
+            step_usage = response.data.get("usageMetadata") or {}
+            for key in usage:
+                usage[key] += step_usage.get(key, 0)
+
+            # A STOP can still be a cut-off response (open fence, brackets, elements)
+            completeness = None
+            if finish_reason == "STOP" and check_structure:
+                completeness = check_completeness(full_text)
+                if completeness.complete:
+                    completeness = None
+
             # Check if we need to continue
-            if finish_reason != "MAX_TOKENS":
+            if finish_reason != "MAX_TOKENS" and completeness is None:
                 # Generation complete
                 if full_text:
-                    response.data = self._build_combined_response(full_text, finish_reason)
+                    response.data = self._build_combined_response(full_text, finish_reason, usage)
+                    if continuations:
+                        response.data["continuations"] = continuations
                 return response
 
             # Need to continue - build continuation prompt
             continuation_count += 1
+            continuations.append({
+                "reason": "INCOMPLETE" if completeness else finish_reason,
+                "detail": completeness.describe() if completeness else None,
+            })
             if continuation_count > max_continuations:
                 # Hit max continuations, return what we have
-                response.data = self._build_combined_response(full_text, "MAX_CONTINUATIONS")
+                response.data = self._build_combined_response(full_text, "MAX_CONTINUATIONS", usage)
+                response.data["continuations"] = continuations
                 return response
 
             # Build continuation prompt
-            current_prompt = self._build_continuation_prompt(prompt, full_text)
+            current_prompt = self._build_continuation_prompt(prompt, full_text, completeness)
 
         return response
 
@@ -229,9 +342,14 @@ class GeminiClient:
         except (KeyError, IndexError, TypeError):
             return "", "ERROR"
 
-    def _build_combined_response(self, full_text: str, finish_reason: str) -> dict:
-        """Build a response structure with combined text."""
-        return {
+    def _build_combined_response(
+        self,
+        full_text: str,
+        finish_reason: str,
+        usage: Optional[dict] = None
+    ) -> dict:
+        """Build a response structure with combined text and summed usage."""
+        combined = {
             "candidates": [{
                 "content": {
                     "parts": [{"text": full_text}]
@@ -239,8 +357,19 @@ class GeminiClient:
                 "finishReason": finish_reason
             }]
         }
-
-    def _build_continuation_prompt(self, original_prompt: str, partial_response: str) -> str:
+        if usage:
+            combined["usageMetadata"] = {
+                **usage,
+                "totalTokenCount": usage["promptTokenCount"] + usage["candidatesTokenCount"]
+            }
+        return combined
+
+    def _build_continuation_prompt(
+        self,
+        original_prompt: str,
+        partial_response: str,
+        completeness: Optional[Completeness] = None
+    ) -> str:
         """Build a prompt to continue truncated generation."""
         # Find a good breakpoint (end of a line or code block)
         last_newline = partial_response.rfind('\n')
@@ -249,7 +378,7 @@ class GeminiClient:
         else:
             context = partial_response[-500:]
 
-        return f"""Continue generating from where you left off. Here's the context:
+        prompt = f"""Continue generating from where you left off. Here's the context:
 
 ORIGINAL REQUEST:
 {original_prompt[:1000]}...
@@ -260,3 +389,10 @@ YOUR PARTIAL RESPONSE ENDED WITH:
 ```
 
 IMPORTANT: Continue EXACTLY from where you stopped. Do not repeat any code. Do not add explanations. Just continue the code/content seamlessly."""
+        if completeness is not None and completeness.open is not None:
+            closing = completeness.open.closing_sequence()
+            prompt += f"""
+
+WHERE YOU STOPPED: {completeness.describe()}
+Finish the unfinished code{f" (still open, innermost first: {closing})" if closing else ""}{", then close the ``` code block" if completeness.unclosed_fence else ""}."""
+        return prompt
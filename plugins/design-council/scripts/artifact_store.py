@@ -0,0 +1,350 @@
+"""
+Content-addressed store for design sprint rounds.
+
+Handles:
+- SHA-256 blobs under <staging>/.store/objects/ab/cdef..., written once
+- Per-round manifests (relative path -> hash, size) under .store/manifests/
+- Snapshotting a round: its files become links to the blobs, so a file
+  that did not change since an earlier round costs no extra space
+- Round-to-round diffs as a manifest comparison
+- Checking a round out anywhere (rollback, restore, copy to output)
+
+Snapshots place files with a copy-on-write reflink where the filesystem
+has one (Linux Btrfs, XFS), else a hardlink, else a copy. Hardlinked blobs
+are made read-only: a snapshotted round is history. Checkouts never
+hardlink, since a checked-out round is about to be written to.
+"""
+
+import errno
+import hashlib
+import json
+import os
+import re
+import shutil
+import stat
+import time
+from dataclasses import dataclass, field, asdict
+from typing import Dict, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: no FICLONE
+    fcntl = None
+
+
+STORE_DIR_NAME = ".store"
+FICLONE = 0x40049409  # linux/fs.h: _IOW(0x94, 9, int)
+LINK_MODES = ("auto", "reflink", "hardlink", "copy")
+ROUND_NAME = re.compile(r"^round-(\d+)$")
+CHUNK_SIZE = 1 << 20
+
+
+class StoreError(Exception):
+    """Missing round, manifest or blob."""
+
+
+@dataclass
+class SnapshotReport:
+    """What a snapshot or checkout did."""
+    round: str
+    files: int = 0
+    bytes: int = 0
+    new_blobs: int = 0
+    new_bytes: int = 0
+    reused_bytes: int = 0
+    linked: Dict[str, int] = field(default_factory=dict)  # method -> count
+
+    def to_dict(self) -> dict:
+        """Convert to a JSON-serializable dictionary."""
+        return asdict(self)
+
+
+def file_sha256(path: str) -> str:
+    """SHA-256 hex digest of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def round_number(name: str) -> Optional[int]:
+    """N of "round-N", else None."""
+    match = ROUND_NAME.match(os.path.basename(os.path.normpath(name)))
+    return int(match.group(1)) if match else None
+
+
+def reflink(source: str, target: str) -> bool:
+    """Copy-on-write clone of source at target; False where unsupported."""
+    if fcntl is None:
+        return False
+    try:
+        with open(source, "rb") as src, open(target, "wb") as dst:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        return True
+    except OSError:
+        try:
+            os.unlink(target)
+        except OSError:
+            pass
+        return False
+
+
+class ArtifactStore:
+    """Blobs and round manifests for one staging directory."""
+
+    def __init__(self, staging_dir: str, link: str = "auto"):
+        if link not in LINK_MODES:
+            raise ValueError(f"link must be one of {', '.join(LINK_MODES)}")
+        self.staging_dir = staging_dir
+        self.root = os.path.join(staging_dir, STORE_DIR_NAME)
+        self.objects_dir = os.path.join(self.root, "objects")
+        self.manifests_dir = os.path.join(self.root, "manifests")
+        self.link = link
+
+    def blob_path(self, sha: str) -> str:
+        return os.path.join(self.objects_dir, sha[:2], sha[2:])
+
+    def manifest_path(self, round_name: str) -> str:
+        return os.path.join(self.manifests_dir, f"{round_name}.json")
+
+    def round_dir(self, round_name: str) -> str:
+        return os.path.join(self.staging_dir, round_name)
+
+    # --- Blobs -----------------------------------------------------------
+
+    def add_blob(self, path: str, sha: str) -> bool:
+        """
+        Store path's content as blob sha unless it is already there.
+
+        Returns:
+            True when a new blob was written
+        """
+        blob = self.blob_path(sha)
+        if os.path.exists(blob):
+            return False
+        os.makedirs(os.path.dirname(blob), exist_ok=True)
+        temp_path = f"{blob}.{os.getpid()}.tmp"
+        shutil.copyfile(path, temp_path)
+        os.chmod(temp_path, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+        os.replace(temp_path, blob)
+        return True
+
+    def place(self, sha: str, target: str, hardlink: bool = True) -> str:
+        """
+        Put blob sha at target (replacing whatever is there).
+
+        Args:
+            sha: Blob to place
+            target: Destination file
+            hardlink: Allow sharing the blob's inode (snapshots only: an
+                edit in place would change every round using the blob)
+
+        Returns:
+            Method used: "reflink", "hardlink" or "copy"
+        """
+        blob = self.blob_path(sha)
+        if not os.path.exists(blob):
+            raise StoreError(f"Missing blob {sha[:12]} for {target}")
+        os.makedirs(os.path.dirname(target) or ".", exist_ok=True)
+        temp_path = f"{target}.{os.getpid()}.tmp"
+
+        method = "copy"
+        if self.link in ("auto", "reflink") and reflink(blob, temp_path):
+            method = "reflink"
+        elif hardlink and self.link in ("auto", "hardlink"):
+            try:
+                os.link(blob, temp_path)
+                method = "hardlink"
+            except OSError as e:
+                if e.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK, errno.ENOTSUP, errno.EACCES):
+                    raise
+        if method == "copy":
+            shutil.copyfile(blob, temp_path)
+        os.replace(temp_path, target)
+        return method
+
+    # --- Manifests -------------------------------------------------------
+
+    def load_manifest(self, round_name: str) -> dict:
+        """Manifest of a snapshotted round."""
+        try:
+            with open(self.manifest_path(round_name), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            raise StoreError(f"No snapshot of {round_name}; run snapshot first")
+        except (OSError, json.JSONDecodeError) as e:
+            raise StoreError(f"Unreadable manifest for {round_name}: {e}")
+
+    def save_manifest(self, round_name: str, files: Dict[str, dict], source: Optional[str] = None) -> None:
+        os.makedirs(self.manifests_dir, exist_ok=True)
+        manifest = {
+            "round": round_name,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "files": dict(sorted(files.items())),
+        }
+        if source:
+            manifest["checked_out_from"] = source
+        path = self.manifest_path(round_name)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(temp_path, path)
+
+    def rounds(self) -> List[str]:
+        """Snapshotted rounds, in round order."""
+        if not os.path.isdir(self.manifests_dir):
+            return []
+        names = [name[:-5] for name in os.listdir(self.manifests_dir) if name.endswith(".json")]
+        return sorted(names, key=lambda name: (round_number(name) is None, round_number(name) or 0, name))
+
+    # --- Operations ------------------------------------------------------
+
+    def snapshot(self, round_name: str) -> SnapshotReport:
+        """
+        Store every file of a round and link the round's files to the blobs.
+
+        Args:
+            round_name: Directory name under the staging directory (round-N)
+
+        Returns:
+            SnapshotReport
+        """
+        directory = self.round_dir(round_name)
+        if not os.path.isdir(directory):
+            raise StoreError(f"No round directory: {directory}")
+
+        try:
+            previous = self.load_manifest(round_name)["files"]
+        except StoreError:
+            previous = {}
+
+        report = SnapshotReport(round=round_name)
+        files: Dict[str, dict] = {}
+        for dirpath, dirnames, filenames in os.walk(directory):
+            dirnames.sort()
+            for filename in sorted(filenames):
+                path = os.path.join(dirpath, filename)
+                if os.path.islink(path) or not os.path.isfile(path) or filename.endswith(".tmp"):
+                    continue
+                sha = file_sha256(path)
+                size = os.path.getsize(path)
+                rel_path = os.path.relpath(path, directory).replace(os.sep, "/")
+                old_sha = previous.get(rel_path, {}).get("sha256")
+                if old_sha and old_sha != sha and os.path.exists(self.blob_path(old_sha)) \
+                        and os.path.samefile(path, self.blob_path(old_sha)):
+                    raise StoreError(
+                        f"{rel_path} was edited in place through a hardlink; blob {old_sha[:12]} "
+                        f"(and every round sharing it) no longer matches its hash"
+                    )
+                files[rel_path] = {"sha256": sha, "bytes": size}
+                report.files += 1
+                report.bytes += size
+                if self.add_blob(path, sha):
+                    report.new_blobs += 1
+                    report.new_bytes += size
+                else:
+                    report.reused_bytes += size
+                if not os.path.samefile(path, self.blob_path(sha)):
+                    method = self.place(sha, path)
+                    report.linked[method] = report.linked.get(method, 0) + 1
+
+        self.save_manifest(round_name, files)
+        return report
+
+    def diff(self, old_round: str, new_round: str) -> dict:
+        """
+        Compare two snapshotted rounds by manifest.
+
+        Returns:
+            Dictionary with added, removed, changed (path, old/new hash and
+            size) and the unchanged count
+        """
+        old = self.load_manifest(old_round)["files"]
+        new = self.load_manifest(new_round)["files"]
+        changed = [
+            {
+                "path": path,
+                "from": old[path]["sha256"][:12],
+                "to": new[path]["sha256"][:12],
+                "bytes": new[path]["bytes"] - old[path]["bytes"],
+            }
+            for path in sorted(old.keys() & new.keys())
+            if old[path]["sha256"] != new[path]["sha256"]
+        ]
+        return {
+            "from": old_round,
+            "to": new_round,
+            "added": sorted(new.keys() - old.keys()),
+            "removed": sorted(old.keys() - new.keys()),
+            "changed": changed,
+            "unchanged": len(old.keys() & new.keys()) - len(changed),
+        }
+
+    def checkout(self, round_name: str, target_dir: str, clean: bool = False) -> SnapshotReport:
+        """
+        Materialize a snapshotted round in target_dir.
+
+        Files that already match are left alone; with clean, files the
+        manifest does not list are removed. Files are reflinked or copied,
+        never hardlinked (a matching file that is a hardlink to its blob is
+        replaced too), so the checkout can be edited without touching the
+        store or any other round.
+
+        Args:
+            round_name: Snapshotted round to check out
+            target_dir: Destination directory (created if missing)
+            clean: Remove files not in the manifest
+
+        Returns:
+            SnapshotReport (linked counts only cover files that were placed)
+        """
+        manifest = self.load_manifest(round_name)["files"]
+        target_name = os.path.basename(os.path.normpath(target_dir))
+        in_staging = os.path.dirname(os.path.realpath(target_dir)) == os.path.realpath(self.staging_dir)
+        report = SnapshotReport(round=round_name)
+        for rel_path, entry in manifest.items():
+            target = os.path.join(target_dir, *rel_path.split("/"))
+            report.files += 1
+            report.bytes += entry["bytes"]
+            blob = self.blob_path(entry["sha256"])
+            if os.path.isfile(target) and file_sha256(target) == entry["sha256"] \
+                    and not (os.path.exists(blob) and os.path.samefile(target, blob)):
+                continue
+            method = self.place(entry["sha256"], target, hardlink=False)
+            report.linked[method] = report.linked.get(method, 0) + 1
+
+        if clean and os.path.isdir(target_dir):
+            for dirpath, _, filenames in os.walk(target_dir, topdown=False):
+                for filename in filenames:
+                    path = os.path.join(dirpath, filename)
+                    if os.path.relpath(path, target_dir).replace(os.sep, "/") not in manifest:
+                        os.unlink(path)
+                if dirpath != target_dir and not os.listdir(dirpath):
+                    os.rmdir(dirpath)
+
+        # A checkout into another round (rollback) is a snapshot of that round too
+        if in_staging and round_number(target_name) is not None and target_name != round_name:
+            self.save_manifest(target_name, manifest, source=round_name)
+        return report
+
+    def gc(self) -> dict:
+        """Remove blobs no manifest references."""
+        referenced = {
+            entry["sha256"]
+            for name in self.rounds()
+            for entry in self.load_manifest(name)["files"].values()
+        }
+        removed = freed = 0
+        if os.path.isdir(self.objects_dir):
+            for prefix in os.listdir(self.objects_dir):
+                prefix_dir = os.path.join(self.objects_dir, prefix)
+                for rest in os.listdir(prefix_dir):
+                    if prefix + rest not in referenced:
+                        path = os.path.join(prefix_dir, rest)
+                        freed += os.path.getsize(path)
+                        os.unlink(path)
+                        removed += 1
+                if not os.listdir(prefix_dir):
+                    os.rmdir(prefix_dir)
+        return {"blobs_removed": removed, "bytes_freed": freed, "blobs_kept": len(referenced)}
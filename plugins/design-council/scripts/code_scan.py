@@ -0,0 +1,553 @@
+"""
+Lightweight scanners for generated frontend code.
+
+Handles:
+- Markup via html.parser (HTML files, Vue/Svelte single-file components)
+- CSS via a small tokenizer (rules, at-rules, declarations, comments)
+- JS/JSX via a small tokenizer (JSX elements, string literals, comments)
+- Splitting a Gemini response into files by its fenced code blocks
+
+Everything lands in one SourceIndex, with file names and line numbers,
+so checks can run over a whole round without caring about the framework.
+"""
+
+import re
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+from typing import Dict, List, Optional
+
+
+VOID_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta",
+    "param", "source", "track", "wbr",
+}
+
+MARKUP_EXTENSIONS = (".html", ".htm", ".vue", ".svelte")
+CSS_EXTENSIONS = (".css", ".scss", ".less")
+SCRIPT_EXTENSIONS = (".js", ".jsx", ".ts", ".tsx", ".mjs")
+
+# Fence language -> file extension, for responses split into files
+FENCE_EXTENSIONS = {
+    "html": ".html", "htm": ".html", "css": ".css", "scss": ".scss", "less": ".less",
+    "js": ".js", "javascript": ".js", "jsx": ".jsx", "ts": ".ts", "typescript": ".ts",
+    "tsx": ".tsx", "vue": ".vue", "svelte": ".svelte",
+}
+FRAMEWORK_FILES = {
+    "html": "index.html", "react": "Component.jsx", "nextjs": "page.jsx",
+    "vue": "Component.vue", "svelte": "Component.svelte",
+}
+FENCE = re.compile(r"```([\w+-]*)[^\n]*\n(.*?)(?:```|\Z)", re.DOTALL)
+FILE_COMMENT = re.compile(r"\s*(?://|/\*|<!--|#)")
+FILE_HINT = re.compile(r"([\w./-]+\.(?:html?|css|scss|less|jsx?|tsx?|mjs|vue|svelte))\b")
+
+# JSX starts after these tokens (not after an identifier: a < b)
+JSX_PRECEDERS = set("(,=?:&|{}[;>!") | {"", "return"}
+IDENTIFIER = re.compile(r"[A-Za-z_$][\w$]*")
+JSX_TAG_NAME = re.compile(r"[A-Za-z][\w.:-]*")
+ATTR_NAME = re.compile(r"[^\s=/>{}\"']+")
+STYLED_CSS = re.compile(r"[\w-]+\s*:\s*[^;{}]+;")
+STYLE_OBJECT_ENTRY = re.compile(r"([A-Za-z]+)\s*:\s*(['\"])(.*?)\2")
+
+
+@dataclass
+class Element:
+    """A markup element (HTML tag or JSX element)."""
+    tag: str
+    attrs: Dict[str, Optional[str]]
+    file: str
+    line: int
+    text: str = ""  # text content including descendants (and img alt)
+    in_label: bool = False
+    depth: int = 0
+    end_line: int = 0
+
+
+@dataclass
+class Declaration:
+    """A CSS declaration, from a stylesheet, style attribute or style object."""
+    property: str
+    value: str
+    file: str
+    line: int
+    selector: str = ""
+
+
+@dataclass
+class AtRule:
+    """A CSS at-rule such as @media or @keyframes."""
+    name: str
+    prelude: str
+    file: str
+    line: int
+
+
+@dataclass
+class Snippet:
+    """A comment, string literal or text node."""
+    text: str
+    file: str
+    line: int
+
+
+@dataclass
+class SourceIndex:
+    """Everything the scanners found in a set of files."""
+    elements: List[Element] = field(default_factory=list)
+    declarations: List[Declaration] = field(default_factory=list)
+    at_rules: List[AtRule] = field(default_factory=list)
+    selectors: List[Snippet] = field(default_factory=list)
+    comments: List[Snippet] = field(default_factory=list)
+    strings: List[Snippet] = field(default_factory=list)
+    texts: List[Snippet] = field(default_factory=list)
+    files: List[str] = field(default_factory=list)
+    skipped: List[str] = field(default_factory=list)
+
+    def tags(self, *names: str) -> List[Element]:
+        """Elements with one of the given tag names."""
+        return [e for e in self.elements if e.tag in names]
+
+
+def attr_key(name: str) -> str:
+    """Normalize framework attribute spellings (onClick, @click, :aria-label, htmlFor)."""
+    key = name.lower()
+    for prefix in ("v-bind:", ":"):
+        if key.startswith(prefix):
+            key = key[len(prefix):]
+    if key.startswith("@"):
+        key = "on" + key[1:]
+    elif key.startswith(("v-on:", "on:")):
+        key = "on" + key.split(":", 1)[1]
+    return {"classname": "class", "htmlfor": "for"}.get(key, key)
+
+
+def line_starts(text: str) -> List[int]:
+    """Offsets at which each line begins."""
+    return [0] + [m.end() for m in re.finditer("\n", text)]
+
+
+def line_at(starts: List[int], offset: int) -> int:
+    """1-based line number of an offset."""
+    return bisect_right(starts, offset)
+
+
+def camel_to_kebab(name: str) -> str:
+    """fontFamily -> font-family (React style objects)."""
+    return re.sub(r"[A-Z]", lambda m: "-" + m.group().lower(), name)
+
+
+def skip_string(source: str, pos: int, end: int) -> int:
+    """Offset just past the string literal starting at pos."""
+    quote = source[pos]
+    pos += 1
+    while pos < end:
+        char = source[pos]
+        if char == "\\":
+            pos += 2
+            continue
+        if char == quote:
+            return pos + 1
+        if char == "\n" and quote != "`":
+            return pos  # unterminated; stop at the line end
+        pos += 1
+    return end
+
+
+def match_brace(source: str, pos: int, end: int) -> int:
+    """Offset just past the brace block starting at pos (string and comment aware)."""
+    depth = 0
+    while pos < end:
+        char = source[pos]
+        if char in "\"'`":
+            pos = skip_string(source, pos, end)
+            continue
+        if source.startswith("//", pos):
+            stop = source.find("\n", pos)
+            pos = end if stop < 0 else stop
+            continue
+        if source.startswith("/*", pos):
+            stop = source.find("*/", pos + 2)
+            pos = end if stop < 0 else stop + 2
+            continue
+        if char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return pos + 1
+        pos += 1
+    return end
+
+
+def scan_css(css: str, file: str, index: SourceIndex, first_line: int = 1, selector: str = "") -> None:
+    """
+    Tokenize CSS into rules, at-rules, declarations and comments.
+
+    Declarations outside any block are kept too, so styled-components
+    bodies and style attributes can be scanned with the same function.
+
+    Args:
+        css: Stylesheet text
+        file: File name for reporting
+        index: Index to add to
+        first_line: Line number of the first character in its file
+        selector: Selector for top-level declarations (style attributes)
+    """
+    starts = line_starts(css)
+    stack: List[str] = []
+    buffer_start = 0
+    pos, end = 0, len(css)
+
+    def line(offset: int) -> int:
+        return first_line + line_at(starts, offset) - 1
+
+    def flush(stop: int) -> None:
+        text = css[buffer_start:stop]
+        stripped = text.strip()
+        if not stripped:
+            return
+        offset = buffer_start + len(text) - len(text.lstrip())
+        if stripped.startswith("@"):
+            name, _, prelude = stripped[1:].partition(" ")
+            index.at_rules.append(AtRule(name.lower(), prelude.strip(), file, line(offset)))
+        elif ":" in stripped:
+            prop, _, value = stripped.partition(":")
+            index.declarations.append(Declaration(
+                prop.strip().lower() if not prop.strip().startswith("--") else prop.strip(),
+                value.strip(), file, line(offset), stack[-1] if stack else selector
+            ))
+
+    while pos < end:
+        char = css[pos]
+        if css.startswith("/*", pos):
+            stop = css.find("*/", pos + 2)
+            stop = end if stop < 0 else stop + 2
+            index.comments.append(Snippet(css[pos + 2:stop - 2].strip(), file, line(pos)))
+            # Blank the comment out of the buffer (newlines kept for line numbers)
+            css = css[:pos] + re.sub(r"[^\n]", " ", css[pos:stop]) + css[stop:]
+            pos = stop
+            continue
+        if char in "\"'":
+            pos = skip_string(css, pos, end)
+            continue
+        if char == "{":
+            prelude = css[buffer_start:pos].strip()
+            offset = buffer_start + len(css[buffer_start:pos]) - len(css[buffer_start:pos].lstrip())
+            if prelude.startswith("@"):
+                name, _, rest = prelude[1:].partition(" ")
+                index.at_rules.append(AtRule(name.lower(), rest.strip(), file, line(offset)))
+            elif prelude:
+                index.selectors.append(Snippet(prelude, file, line(offset)))
+            stack.append(prelude)
+            buffer_start = pos + 1
+        elif char == ";":
+            flush(pos)
+            buffer_start = pos + 1
+        elif char == "}":
+            flush(pos)
+            if stack:
+                stack.pop()
+            buffer_start = pos + 1
+        pos += 1
+    flush(end)
+
+
+class MarkupScanner(HTMLParser):
+    """html.parser front end: elements, text, inline styles, <style> and <script>."""
+
+    def __init__(self, file: str, index: SourceIndex):
+        super().__init__(convert_charrefs=True)
+        self.file = file
+        self.index = index
+        self.open: List[Element] = []
+        self.raw_tag: Optional[str] = None
+        self.raw_line = 0
+        self.raw_parts: List[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        line = self.getpos()[0]
+        element = Element(
+            tag, {attr_key(k): v for k, v in attrs}, self.file, line,
+            in_label=any(e.tag == "label" for e in self.open), depth=len(self.open), end_line=line
+        )
+        self.index.elements.append(element)
+
+        if element.attrs.get("style"):
+            scan_css(element.attrs["style"], self.file, self.index, line, selector=f"<{tag} style>")
+        if tag == "img" and element.attrs.get("alt"):
+            self.add_text(element.attrs["alt"], line, record=False)
+
+        if tag in ("style", "script"):
+            self.raw_tag, self.raw_line, self.raw_parts = tag, line, []
+        if tag not in VOID_TAGS:
+            self.open.append(element)
+
+    def handle_endtag(self, tag):
+        if tag == self.raw_tag:
+            raw = "".join(self.raw_parts)
+            if tag == "style":
+                scan_css(raw, self.file, self.index, self.raw_line)
+            else:
+                JsxScanner(raw, self.file, self.index, self.raw_line).scan()
+            self.raw_tag = None
+        if any(e.tag == tag for e in self.open):
+            line = self.getpos()[0]
+            while True:
+                element = self.open.pop()
+                element.end_line = line
+                if element.tag == tag:
+                    break
+
+    def handle_data(self, data):
+        if self.raw_tag:
+            self.raw_parts.append(data)
+            return
+        if data.strip():
+            self.add_text(data, self.getpos()[0])
+
+    def handle_comment(self, data):
+        self.index.comments.append(Snippet(data.strip(), self.file, self.getpos()[0]))
+
+    def add_text(self, text: str, line: int, record: bool = True) -> None:
+        for element in self.open:
+            element.text += text
+        if record:
+            self.index.texts.append(Snippet(text.strip(), self.file, line))
+
+
+class JsxScanner:
+    """
+    Small JS/JSX tokenizer.
+
+    Collects comments and string literals, and JSX elements with their
+    attributes and text. CSS-looking template literals (styled-components,
+    <style jsx>) and style={{...}} objects are scanned as CSS.
+    """
+
+    def __init__(self, source: str, file: str, index: SourceIndex, first_line: int = 1):
+        self.src = source
+        self.file = file
+        self.index = index
+        self.first_line = first_line
+        self.starts = line_starts(source)
+        self.open: List[Element] = []
+
+    def line(self, pos: int) -> int:
+        return self.first_line + line_at(self.starts, pos) - 1
+
+    def scan(self) -> None:
+        self.scan_js(0, len(self.src))
+
+    def scan_js(self, pos: int, end: int) -> None:
+        src = self.src
+        prev = ""
+        while pos < end:
+            char = src[pos]
+            if src.startswith("//", pos):
+                stop = src.find("\n", pos, end)
+                stop = end if stop < 0 else stop
+                self.index.comments.append(Snippet(src[pos + 2:stop].strip(), self.file, self.line(pos)))
+                pos = stop
+                continue
+            if src.startswith("/*", pos):
+                stop = src.find("*/", pos + 2, end)
+                stop = end if stop < 0 else stop + 2
+                self.index.comments.append(Snippet(src[pos + 2:stop - 2].strip(" *\n"), self.file, self.line(pos)))
+                pos = stop
+                continue
+            if char in "\"'`":
+                stop = skip_string(src, pos, end)
+                self.add_string(src[pos + 1:stop - 1], pos, char == "`")
+                prev, pos = "a", stop
+                continue
+            if char == "<" and prev in JSX_PRECEDERS and (
+                JSX_TAG_NAME.match(src, pos + 1) or src.startswith("<>", pos)
+            ):
+                pos = self.scan_element(pos, end)
+                prev = ")"
+                continue
+            identifier = IDENTIFIER.match(src, pos)
+            if identifier:
+                prev = "return" if identifier.group() == "return" else "a"
+                pos = identifier.end()
+                continue
+            if not char.isspace():
+                prev = char
+            pos += 1
+
+    def add_string(self, text: str, pos: int, template: bool) -> None:
+        self.index.strings.append(Snippet(text, self.file, self.line(pos)))
+        if template and STYLED_CSS.search(text):
+            scan_css(text, self.file, self.index, self.line(pos + 1), selector="styled")
+
+    def skip_space(self, pos: int, end: int) -> int:
+        while pos < end and self.src[pos].isspace():
+            pos += 1
+        return pos
+
+    def scan_element(self, pos: int, end: int) -> int:
+        """Scan one JSX element (with its children); returns the offset after it."""
+        src = self.src
+        name_match = JSX_TAG_NAME.match(src, pos + 1)
+        tag = name_match.group() if name_match else ""
+        p = name_match.end() if name_match else pos + 1
+        attrs: Dict[str, Optional[str]] = {}
+        self_closing = False
+
+        while p < end:
+            p = self.skip_space(p, end)
+            if src.startswith("/>", p):
+                self_closing, p = True, p + 2
+                break
+            if p >= end or src[p] == ">":
+                p += 1
+                break
+            if src[p] == "{":  # spread props
+                stop = match_brace(src, p, end)
+                self.scan_js(p + 1, stop - 1)
+                attrs["{...}"] = src[p + 1:stop - 1]
+                p = stop
+                continue
+            name = ATTR_NAME.match(src, p)
+            if not name:
+                p += 1
+                continue
+            key, value, p = attr_key(name.group()), None, self.skip_space(name.end(), end)
+            if p < end and src[p] == "=":
+                p = self.skip_space(p + 1, end)
+                if p < end and src[p] in "\"'":
+                    stop = skip_string(src, p, end)
+                    value, p = src[p + 1:stop - 1], stop
+                elif p < end and src[p] == "{":
+                    stop = match_brace(src, p, end)
+                    value = src[p:stop]
+                    if key == "style":
+                        self.add_style_object(value, p)
+                    self.scan_js(p + 1, stop - 1)
+                    p = stop
+            attrs[key] = value
+
+        element = Element(
+            tag if tag[:1].isupper() else tag.lower(), attrs, self.file, self.line(pos),
+            in_label=any(e.tag == "label" for e in self.open), depth=len(self.open), end_line=self.line(p)
+        )
+        self.index.elements.append(element)
+        if element.tag == "img" and attrs.get("alt"):
+            for parent in self.open:
+                parent.text += attrs["alt"]
+        if self_closing or element.tag in VOID_TAGS:
+            return p
+
+        self.open.append(element)
+        while p < end:
+            if src.startswith("</", p):
+                stop = src.find(">", p)
+                p = end if stop < 0 else stop + 1
+                break
+            if src[p] == "<" and (JSX_TAG_NAME.match(src, p + 1) or src.startswith("<>", p)):
+                p = self.scan_element(p, end)
+                continue
+            if src[p] == "{":
+                stop = match_brace(src, p, end)
+                inner = src[p + 1:stop - 1].strip()
+                if inner and not inner.startswith("/*"):
+                    for parent in self.open:
+                        parent.text += "{}"  # dynamic content counts as text
+                self.scan_js(p + 1, stop - 1)
+                p = stop
+                continue
+            stops = [i for i in (src.find("<", p + 1, end), src.find("{", p, end)) if i >= 0]
+            stop = min(stops) if stops else end
+            text = src[p:stop]
+            if text.strip():
+                for parent in self.open:
+                    parent.text += text
+                self.index.texts.append(Snippet(text.strip(), self.file, self.line(p)))
+            p = stop
+        self.open.pop()
+        element.end_line = self.line(max(p - 1, 0))
+        return p
+
+    def add_style_object(self, value: str, pos: int) -> None:
+        """style={{ fontFamily: 'Inter', color: '#fff' }} -> declarations."""
+        for match in STYLE_OBJECT_ENTRY.finditer(value):
+            self.index.declarations.append(Declaration(
+                camel_to_kebab(match.group(1)), match.group(3), self.file,
+                self.line(pos + match.start()), "style={{...}}"
+            ))
+
+
+def scan_file(name: str, text: str, index: SourceIndex) -> None:
+    """Scan one file into the index by its extension (others are skipped)."""
+    lower = name.lower()
+    if lower.endswith(MARKUP_EXTENSIONS):
+        scanner = MarkupScanner(name, index)
+        scanner.feed(text)
+        scanner.close()
+    elif lower.endswith(CSS_EXTENSIONS):
+        scan_css(text, name, index)
+    elif lower.endswith(SCRIPT_EXTENSIONS):
+        JsxScanner(text, name, index).scan()
+    else:
+        index.skipped.append(name)
+        return
+    index.files.append(name)
+
+
+def scan_files(files: Dict[str, str]) -> SourceIndex:
+    """
+    Scan a set of files into one index.
+
+    Args:
+        files: File name -> content
+
+    Returns:
+        SourceIndex over all supported files
+    """
+    index = SourceIndex()
+    for name, text in files.items():
+        scan_file(name, text, index)
+    return index
+
+
+def split_response(text: str, framework: str = "react") -> Dict[str, str]:
+    """
+    Split a generated response into files by its fenced code blocks.
+
+    A file name on the fence line, in a comment on the block's first line,
+    or just above the block is used when present; otherwise names come from the fence language (or the
+    framework for unlabeled blocks). A response without fences is one file.
+
+    Args:
+        text: Generated response text
+        framework: Target framework (html, react, vue, svelte, nextjs)
+
+    Returns:
+        File name -> content, in response order
+    """
+    default = FRAMEWORK_FILES.get(framework, FRAMEWORK_FILES["react"])
+    files: Dict[str, str] = {}
+    for number, match in enumerate(FENCE.finditer(text), 1):
+        language = match.group(1).lower()
+        body = match.group(2)
+        first_line = body.split("\n", 1)[0]
+        header = text[max(0, match.start() - 120):match.start()].rsplit("\n", 2)[-2:]
+        hint = (
+            FILE_HINT.search(text[match.start():text.find("\n", match.start())])
+            or (FILE_COMMENT.match(first_line) and FILE_HINT.search(first_line))
+            or FILE_HINT.search(" ".join(header))
+        )
+        if hint:
+            name = hint.group(1).split("/")[-1]
+        elif language in FENCE_EXTENSIONS:
+            name = f"block-{number}{FENCE_EXTENSIONS[language]}"
+        elif not language:
+            name = f"block-{number}{default[default.rfind('.'):]}"
+        else:
+            continue  # bash, json, ... are not part of the page
+        if name in files:
+            name = f"block-{number}-{name}"
+        files[name] = body
+    if not files and text.strip():
+        files[default] = text
+    return files
@@ -0,0 +1,183 @@
+"""
+Derived color scales and interaction states for palettes.
+
+Handles:
+- 50-900 tint/shade ramps for every palette role, evenly spaced in OKLCH
+  lightness at the role's hue, with chroma easing off toward the ends
+- hover, active and disabled variants of every role
+- Gamut mapping into sRGB by chroma reduction (lightness and hue kept)
+- All roles of all palettes in one batch: one NumPy pass when NumPy is
+  installed, the scalar color_space conversions otherwise
+
+Both paths run the same chroma bisection, so they give the same colors
+(up to the last bit of rounding).
+"""
+
+import time
+from typing import Dict, List, Tuple
+
+from color_space import (
+    GAMUT_EPSILON,
+    GAMUT_ITERATIONS,
+    hex_to_oklch,
+    in_srgb_gamut,
+    oklab_to_linear_rgb,
+    oklch_to_hex,
+    oklch_to_oklab,
+)
+from palette_engine import PALETTE_ROLES
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+
+SCALE_STEPS = (50, 100, 200, 300, 400, 500, 600, 700, 800, 900)
+STATE_NAMES = ("hover", "active", "disabled")
+
+# OKLCH lightness of the lightest and darkest steps; steps in between are evenly spaced
+SCALE_LIGHTNESS = (0.97, 0.27)
+# Chroma falls off linearly with lightness distance from the role color, to this floor
+CHROMA_FALLOFF = 1.4
+CHROMA_FLOOR = 0.3
+
+# Lightness shift of hover/active: darker on light themes, lighter on dark ones
+HOVER_SHIFT = 0.06
+ACTIVE_SHIFT = 0.12
+# Disabled: this far toward the background lightness, at this share of the chroma
+DISABLED_TOWARD_BG = 0.6
+DISABLED_CHROMA = 0.25
+DARK_THEME_LIGHTNESS = 0.5
+
+
+def scale_lightness() -> List[float]:
+    """Target OKLCH lightness of each scale step, lightest first."""
+    light, dark = SCALE_LIGHTNESS
+    last = len(SCALE_STEPS) - 1
+    return [light + (dark - light) * i / last for i in range(len(SCALE_STEPS))]
+
+
+def plan_colors(palettes: List[Dict]) -> Tuple[List[Tuple[float, float, float]], int]:
+    """
+    OKLCH targets for every scale step and state of every role.
+
+    Returns:
+        (targets, per-role count); for palette p and role r the targets
+        start at (p * len(PALETTE_ROLES) + r) * count, scale steps first
+    """
+    steps = scale_lightness()
+    targets = []
+    for palette in palettes:
+        colors = palette["colors"]
+        background_l = hex_to_oklch(colors["bg_primary"])[0]
+        direction = 1 if background_l < DARK_THEME_LIGHTNESS else -1
+        for role in PALETTE_ROLES:
+            L, C, h = hex_to_oklch(colors[role])
+            for step_l in steps:
+                taper = max(CHROMA_FLOOR, 1 - abs(step_l - L) * CHROMA_FALLOFF)
+                targets.append((step_l, C * taper, h))
+            targets.append((L + direction * HOVER_SHIFT, C, h))
+            targets.append((L + direction * ACTIVE_SHIFT, C, h))
+            targets.append((L + (background_l - L) * DISABLED_TOWARD_BG, C * DISABLED_CHROMA, h))
+    return targets, len(steps) + len(STATE_NAMES)
+
+
+def oklch_to_hex_batch(targets: List[Tuple[float, float, float]]) -> Tuple[List[str], int]:
+    """
+    Gamut-map and format many OKLCH colors at once.
+
+    Returns:
+        (hex colors, how many needed their chroma reduced)
+    """
+    if not targets:
+        return [], 0
+    if np is None:
+        hexes = [oklch_to_hex(lch) for lch in targets]
+        mapped = sum(1 for lch in targets if _out_of_gamut(lch))
+        return hexes, mapped
+
+    lch = np.asarray(targets, dtype=float)
+    L = np.clip(lch[:, 0], 0.0, 1.0)
+    C = lch[:, 1]
+    h = np.radians(lch[:, 2])
+    cos_h, sin_h = np.cos(h), np.sin(h)
+
+    rgb = _oklab_to_linear_rgb(L, C * cos_h, C * sin_h)
+    outside = ~_in_gamut(rgb)
+    if outside.any():
+        low = np.zeros(int(outside.sum()))
+        high = C[outside].copy()
+        L_out, cos_out, sin_out = L[outside], cos_h[outside], sin_h[outside]
+        for _ in range(GAMUT_ITERATIONS):
+            mid = (low + high) / 2
+            fits = _in_gamut(_oklab_to_linear_rgb(L_out, mid * cos_out, mid * sin_out))
+            low = np.where(fits, mid, low)
+            high = np.where(fits, high, mid)
+        rgb[outside] = _oklab_to_linear_rgb(L_out, low * cos_out, low * sin_out)
+
+    rgb = np.clip(rgb, 0.0, 1.0)
+    srgb = np.where(rgb <= 0.0031308, rgb * 12.92, 1.055 * np.power(rgb, 1 / 2.4) - 0.055)
+    codes = np.rint(np.clip(srgb, 0.0, 1.0) * 255).astype(int)
+    hexes = [f"#{r:02X}{g:02X}{b:02X}" for r, g, b in codes.tolist()]
+    return hexes, int(outside.sum())
+
+
+def _oklab_to_linear_rgb(L, a, b):
+    """Vectorized color_space.oklab_to_linear_rgb; returns an (n, 3) array."""
+    l = (L + 0.3963377774 * a + 0.2158037573 * b) ** 3
+    m = (L - 0.1055613458 * a - 0.0638541728 * b) ** 3
+    s = (L - 0.0894841775 * a - 1.2914855480 * b) ** 3
+    return np.stack([
+        4.0767416621 * l - 3.3077115913 * m + 0.2309699292 * s,
+        -1.2684380046 * l + 2.6097574011 * m - 0.3413193965 * s,
+        -0.0041960863 * l - 0.7034186147 * m + 1.7076147010 * s,
+    ], axis=1)
+
+
+def _in_gamut(rgb):
+    return ((rgb >= -GAMUT_EPSILON) & (rgb <= 1 + GAMUT_EPSILON)).all(axis=1)
+
+
+def _out_of_gamut(lch: Tuple[float, float, float]) -> bool:
+    L, C, h = lch
+    return not in_srgb_gamut(oklab_to_linear_rgb(oklch_to_oklab((min(max(L, 0.0), 1.0), C, h))))
+
+
+def add_scales(palettes: List[Dict]) -> Dict:
+    """
+    Add "scales" and "states" to every palette, in place.
+
+    scales[role] maps "50".."900" to hex (50 lightest); states[role] has
+    hover, active and disabled.
+
+    Args:
+        palettes: Palettes with all 12 roles in "colors"
+
+    Returns:
+        Report with the engine used, color count, gamut-mapped count and time
+
+    Raises:
+        ValueError: On a color that is not hex
+    """
+    started = time.perf_counter()
+    targets, count = plan_colors(palettes)
+    hexes, mapped = oklch_to_hex_batch(targets)
+
+    position = 0
+    for palette in palettes:
+        scales, states = {}, {}
+        for role in PALETTE_ROLES:
+            block = hexes[position:position + count]
+            position += count
+            scales[role] = {str(step): value for step, value in zip(SCALE_STEPS, block)}
+            states[role] = dict(zip(STATE_NAMES, block[len(SCALE_STEPS):]))
+        palette["scales"] = scales
+        palette["states"] = states
+
+    return {
+        "engine": "numpy" if np is not None else "python",
+        "colors": len(hexes),
+        "gamut_mapped": mapped,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
@@ -0,0 +1,175 @@
+"""
+Color space conversions.
+
+Handles:
+- Hex parsing and formatting
+- sRGB <-> linear sRGB transfer functions
+- Linear sRGB <-> OKLab <-> OKLCH (Björn Ottosson's OKLab)
+- Gamut mapping into sRGB by chroma reduction
+- WCAG relative luminance
+"""
+
+import math
+import re
+from typing import Tuple
+
+
+HEX_PATTERN = re.compile(r"^#?([0-9a-fA-F]{3}|[0-9a-fA-F]{6})$")
+
+# Gamut mapping precision (chroma bisection steps)
+GAMUT_EPSILON = 1e-4
+GAMUT_ITERATIONS = 24
+
+
+def is_hex_color(value: str) -> bool:
+    """Check whether a string is a #RGB or #RRGGBB hex color."""
+    return isinstance(value, str) and bool(HEX_PATTERN.match(value.strip()))
+
+
+def hex_to_rgb(value: str) -> Tuple[float, float, float]:
+    """
+    Parse a hex color into sRGB channels.
+
+    Args:
+        value: "#RGB" or "#RRGGBB" (leading # optional)
+
+    Returns:
+        Tuple of (r, g, b) in 0..1
+
+    Raises:
+        ValueError: If the value is not a hex color
+    """
+    match = HEX_PATTERN.match(value.strip()) if isinstance(value, str) else None
+    if not match:
+        raise ValueError(f"Invalid hex color: {value!r}")
+
+    digits = match.group(1)
+    if len(digits) == 3:
+        digits = "".join(c * 2 for c in digits)
+
+    return tuple(int(digits[i:i + 2], 16) / 255 for i in (0, 2, 4))
+
+
+def rgb_to_hex(rgb: Tuple[float, float, float]) -> str:
+    """Format sRGB channels (0..1, clamped) as an uppercase #RRGGBB string."""
+    return "#" + "".join(
+        f"{round(min(max(c, 0.0), 1.0) * 255):02X}" for c in rgb
+    )
+
+
+def normalize_hex(value: str) -> str:
+    """Normalize "#abc" / "aabbcc" style input to uppercase #RRGGBB."""
+    return rgb_to_hex(hex_to_rgb(value))
+
+
+def srgb_to_linear(c: float) -> float:
+    """sRGB transfer function inverse (gamma decode)."""
+    if c <= 0.04045:
+        return c / 12.92
+    return ((c + 0.055) / 1.055) ** 2.4
+
+
+def linear_to_srgb(c: float) -> float:
+    """sRGB transfer function (gamma encode)."""
+    if c <= 0.0031308:
+        return c * 12.92
+    return 1.055 * (c ** (1 / 2.4)) - 0.055
+
+
+def linear_rgb_to_oklab(rgb: Tuple[float, float, float]) -> Tuple[float, float, float]:
+    """Convert linear sRGB to OKLab (L, a, b)."""
+    r, g, b = rgb
+    l = 0.4122214708 * r + 0.5363325363 * g + 0.0514459929 * b
+    m = 0.2119034982 * r + 0.6806995451 * g + 0.1073969566 * b
+    s = 0.0883024619 * r + 0.2817188376 * g + 0.6299787005 * b
+
+    l_, m_, s_ = (math.copysign(abs(v) ** (1 / 3), v) for v in (l, m, s))
+
+    return (
+        0.2104542553 * l_ + 0.7936177850 * m_ - 0.0040720468 * s_,
+        1.9779984951 * l_ - 2.4285922050 * m_ + 0.4505937099 * s_,
+        0.0259040371 * l_ + 0.7827717662 * m_ - 0.8086757660 * s_,
+    )
+
+
+def oklab_to_linear_rgb(lab: Tuple[float, float, float]) -> Tuple[float, float, float]:
+    """Convert OKLab (L, a, b) to linear sRGB (may be out of gamut)."""
+    L, a, b = lab
+    l = (L + 0.3963377774 * a + 0.2158037573 * b) ** 3
+    m = (L - 0.1055613458 * a - 0.0638541728 * b) ** 3
+    s = (L - 0.0894841775 * a - 1.2914855480 * b) ** 3
+
+    return (
+        4.0767416621 * l - 3.3077115913 * m + 0.2309699292 * s,
+        -1.2684380046 * l + 2.6097574011 * m - 0.3413193965 * s,
+        -0.0041960863 * l - 0.7034186147 * m + 1.7076147010 * s,
+    )
+
+
+def oklab_to_oklch(lab: Tuple[float, float, float]) -> Tuple[float, float, float]:
+    """Convert OKLab to OKLCH (L, C, h in degrees)."""
+    L, a, b = lab
+    return L, math.hypot(a, b), math.degrees(math.atan2(b, a)) % 360
+
+
+def oklch_to_oklab(lch: Tuple[float, float, float]) -> Tuple[float, float, float]:
+    """Convert OKLCH (L, C, h in degrees) to OKLab."""
+    L, C, h = lch
+    rad = math.radians(h)
+    return L, C * math.cos(rad), C * math.sin(rad)
+
+
+def hex_to_oklab(value: str) -> Tuple[float, float, float]:
+    """Convert a hex color to OKLab."""
+    return linear_rgb_to_oklab(tuple(srgb_to_linear(c) for c in hex_to_rgb(value)))
+
+
+def hex_to_oklch(value: str) -> Tuple[float, float, float]:
+    """Convert a hex color to OKLCH."""
+    return oklab_to_oklch(hex_to_oklab(value))
+
+
+def in_srgb_gamut(linear_rgb: Tuple[float, float, float]) -> bool:
+    """Check whether linear sRGB channels are inside the unit cube."""
+    return all(-GAMUT_EPSILON <= c <= 1 + GAMUT_EPSILON for c in linear_rgb)
+
+
+def oklch_to_linear_rgb_in_gamut(lch: Tuple[float, float, float]) -> Tuple[float, float, float]:
+    """
+    Map an OKLCH color into sRGB gamut by reducing chroma.
+
+    Lightness and hue are preserved; chroma is bisected down to the
+    largest in-gamut value.
+
+    Args:
+        lch: OKLCH color (L, C, h)
+
+    Returns:
+        Linear sRGB channels clamped to 0..1
+    """
+    L, C, h = lch
+    L = min(max(L, 0.0), 1.0)
+
+    rgb = oklab_to_linear_rgb(oklch_to_oklab((L, C, h)))
+    if not in_srgb_gamut(rgb):
+        low, high = 0.0, C
+        for _ in range(GAMUT_ITERATIONS):
+            mid = (low + high) / 2
+            if in_srgb_gamut(oklab_to_linear_rgb(oklch_to_oklab((L, mid, h)))):
+                low = mid
+            else:
+                high = mid
+        rgb = oklab_to_linear_rgb(oklch_to_oklab((L, low, h)))
+
+    return tuple(min(max(c, 0.0), 1.0) for c in rgb)
+
+
+def oklch_to_hex(lch: Tuple[float, float, float]) -> str:
+    """Convert OKLCH to a gamut-mapped #RRGGBB hex color."""
+    return rgb_to_hex(tuple(linear_to_srgb(c) for c in oklch_to_linear_rgb_in_gamut(lch)))
+
+
+def relative_luminance(value: str) -> float:
+    """WCAG 2.x relative luminance of a hex color."""
+    r, g, b = (srgb_to_linear(c) for c in hex_to_rgb(value))
+    return 0.2126 * r + 0.7152 * g + 0.0722 * b
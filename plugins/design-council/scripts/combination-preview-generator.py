@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Generate an HTML preview of every palette × typography combination.
+
+Rows are palettes and columns are typography options (4 × 4 = 16 cards
+in a sprint), so the mixing step can be judged on one page instead of
+imagined from the two separate previews.
+
+Styles are shared rather than repeated per card:
+- One rule per palette (.palette-N) sets the mockup color variables
+- One rule per typography option (.type-N) sets the font variables
+- One consolidated css2 stylesheet loads every family
+Each card is a clone of a single <template> carrying the two classes,
+and its mockup is only mounted once it scrolls into view.
+
+Usage:
+    echo '{"palettes": [...], "typography": [...], "project": "music player"}' | python combination-preview-generator.py --output ./.design-sprint-staging/combination-options.html
+
+Output: HTML content to stdout (or --output file)
+"""
+
+import argparse
+import html
+import json
+import sys
+from typing import Dict, Iterator, List, Optional
+
+from font_catalog import collect_fonts, css2_link_tags
+from mockup_registry import CSS_VAR_ROLES, css_var_name, get_registry
+from preview_templates import (
+    PageAssets, gallery_chunks, indent_css, render_page, script_json, write_chunks,
+    write_page_assets
+)
+
+
+# Suffix the shared mockup is rendered with; .palette-N rules define these variables
+COMBINATION_SUFFIX = "g"
+FONT_ROLES = ["display", "body", "mono"]
+FONT_FALLBACKS = {"display": "serif", "body": "sans-serif", "mono": "monospace"}
+SWATCH_ROLES = ["bg_primary", "bg_secondary", "text_primary", "accent_primary", "accent_secondary"]
+SAMPLE_SUBHEADING = "Beautiful typography makes all the difference"
+
+
+def output_error(message: str, exit_code: int = 1) -> None:
+    """Output error message as JSON and exit."""
+    print(json.dumps({"error": True, "message": message}))
+    sys.exit(exit_code)
+
+
+def read_input() -> dict:
+    """Read and parse JSON input from stdin."""
+    try:
+        input_data = sys.stdin.read()
+        if not input_data.strip():
+            output_error("No input provided.")
+        return json.loads(input_data)
+    except json.JSONDecodeError as e:
+        output_error(f"Invalid JSON input: {str(e)}")
+
+
+def css_string(value: str) -> str:
+    """Quote a font family for a CSS declaration."""
+    cleaned = "".join(c for c in str(value) if c not in "'\"\\;{}<>")
+    return f"'{cleaned}'"
+
+
+def page_css(columns: int) -> str:
+    """Layout and card styles; columns is the number of typography options."""
+    swatches = "\n".join(
+        f".combo-swatches .swatch:nth-child({i}) {{ background: var({css_var_name(role, COMBINATION_SUFFIX)}); }}"
+        for i, role in enumerate(SWATCH_ROLES, 1)
+    )
+    return indent_css(f"""
+.options-grid {{
+    grid-template-columns: repeat({columns}, minmax(240px, 1fr));
+    max-width: none;
+    overflow-x: auto;
+}}
+
+.combo-preview {{
+    padding: 1rem;
+    background: var({css_var_name("bg_primary", COMBINATION_SUFFIX)});
+    color: var({css_var_name("text_primary", COMBINATION_SUFFIX)});
+    font-family: var(--body-font), sans-serif;
+}}
+
+.combo-title {{
+    font-family: var(--display-font), serif;
+    font-size: 1.25rem;
+    font-weight: 700;
+    margin-bottom: 0.25rem;
+}}
+
+.combo-subtitle {{
+    font-family: var(--display-font), serif;
+    font-size: 0.85rem;
+    font-weight: 500;
+    color: var({css_var_name("text_secondary", COMBINATION_SUFFIX)});
+    margin-bottom: 0.75rem;
+}}
+
+.combo-preview .mockup-container {{
+    min-height: 180px;
+}}
+
+.combo-preview code {{
+    font-family: var(--mono-font), monospace;
+}}
+
+.combo-info {{
+    padding: 0.75rem 1rem;
+    border-top: 1px solid #333;
+}}
+
+.combo-info h3 {{
+    font-size: 0.9rem;
+    font-weight: 600;
+    margin-bottom: 0.25rem;
+}}
+
+.combo-info p {{
+    font-size: 0.75rem;
+    color: #888;
+    margin-bottom: 0.5rem;
+}}
+
+.combo-swatches {{
+    display: flex;
+    gap: 6px;
+}}
+
+.combo-swatches .swatch {{
+    width: 20px;
+    height: 20px;
+    border-radius: 5px;
+    border: 1px solid rgba(255, 255, 255, 0.1);
+}}
+
+{swatches}
+""")
+
+
+def iter_variable_rules(palettes: List[Dict], typography: List[Dict]) -> Iterator[str]:
+    """Yield one variable rule per palette and per typography option."""
+    for palette_num, palette in enumerate(palettes, 1):
+        yield f"        .palette-{palette_num} {{\n"
+        for role in CSS_VAR_ROLES:
+            yield f"            {css_var_name(role, COMBINATION_SUFFIX)}: {palette['colors'][role]};\n"
+        yield "        }\n\n"
+
+    for type_num, option in enumerate(typography, 1):
+        yield f"        .type-{type_num} {{\n"
+        for role in FONT_ROLES:
+            font = option.get(role)
+            family = font.get("family") if isinstance(font, dict) else None
+            value = css_string(family) if family else FONT_FALLBACKS[role]
+            yield f"            --{role}-font: {value};\n"
+        yield "        }\n\n"
+
+
+def combination_card(project: str) -> str:
+    """The single card shell every combination is cloned from."""
+    swatches = '<div class="swatch"></div>' * len(SWATCH_ROLES)
+    return f"""
+<div class="option-card">
+    <div class="card-header">
+        <span class="option-number"></span>
+        <div class="check-mark">&#10003;</div>
+    </div>
+    <div class="combo-preview">
+        <div class="combo-title">{html.escape(project.title())}</div>
+        <div class="combo-subtitle">{SAMPLE_SUBHEADING}</div>
+        <div class="mockup-container"></div>
+    </div>
+    <div class="combo-info">
+        <h3></h3>
+        <p></p>
+        <div class="combo-swatches">{swatches}</div>
+    </div>
+</div>
+"""
+
+
+COMBINATION_PAGE_SCRIPT = """
+        const mockupHtml = __MOCKUP__;
+
+        function fillCard(card, item) {
+            card.classList.add(`palette-${item.palette}`, `type-${item.typography}`);
+            card.querySelector('.option-number').textContent = `P${item.palette} × T${item.typography}`;
+            card.querySelector('.combo-info h3').textContent = item.label;
+            card.querySelector('.combo-info p').textContent = item.fonts;
+        }
+
+        function mountCard(card) {
+            card.querySelector('.mockup-container').innerHTML = mockupHtml;
+        }
+"""
+
+
+def iter_combinations(palettes: List[Dict], typography: List[Dict]) -> Iterator[Dict]:
+    """Yield combination data, row by row (palette-major)."""
+    for palette_num, palette in enumerate(palettes, 1):
+        for type_num, option in enumerate(typography, 1):
+            yield {
+                "name": f"Palette {palette_num} + Typography {type_num}",
+                "palette": palette_num,
+                "typography": type_num,
+                "label": f"{palette['name']} × {option['name']}",
+                "fonts": " · ".join(
+                    option[role]["family"] for role in FONT_ROLES
+                    if isinstance(option.get(role), dict) and option[role].get("family")
+                ),
+            }
+
+
+def iter_combination_preview_html(
+    palettes: List[Dict],
+    typography: List[Dict],
+    project: str,
+    assets: Optional[PageAssets] = None
+) -> Iterator[str]:
+    """Render the combination matrix page as a stream of HTML chunks."""
+    components = get_registry().components_for(project)
+    page_script = COMBINATION_PAGE_SCRIPT.replace(
+        "__MOCKUP__", script_json(get_registry().render_mockup(components, COMBINATION_SUFFIX))
+    )
+
+    return render_page(
+        title="Choose Your Combination",
+        heading="Choose Your Palette + Typography",
+        intro="Every palette (rows) with every font pairing (columns)",
+        project=project,
+        head=css2_link_tags(collect_fonts(typography)),
+        styles=iter_variable_rules(palettes, typography),
+        page_css=page_css(len(typography)),
+        cards=(),
+        option_names=None,
+        storage_key="combinationSelection",
+        gallery=gallery_chunks(combination_card(project), iter_combinations(palettes, typography)),
+        scripts=[page_script],
+        choice_hint="I choose Palette [number] + Typography [number]",
+        choice="I choose {name}",
+        assets=assets,
+    )
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line flags."""
+    parser = argparse.ArgumentParser(description="Generate the palette × typography combination preview.")
+    parser.add_argument(
+        "--mockups",
+        action="append",
+        default=[],
+        metavar="DIR",
+        help="Extra mockup directory (project-types.json, components/*.html); repeatable"
+    )
+    parser.add_argument(
+        "--output",
+        help="Write the page to this file instead of stdout"
+    )
+    parser.add_argument(
+        "--assets-dir",
+        metavar="DIR",
+        help="Link a shared, content-hashed stylesheet/script written to DIR/assets/ "
+             "(DIR is where the HTML is saved) instead of inlining them"
+    )
+    parser.add_argument(
+        "--precompress",
+        action="store_true",
+        help="With --assets-dir, also write .gz (and .br with brotli installed) siblings"
+    )
+    return parser.parse_args()
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+
+    try:
+        get_registry(args.mockups)
+    except (OSError, ValueError) as e:
+        output_error(f"Could not load mockups: {str(e)}")
+
+    input_data = read_input()
+
+    palettes = input_data.get("palettes")
+    typography = input_data.get("typography")
+    project = input_data.get("project", "web application")
+
+    if not palettes:
+        output_error("Missing required field: palettes")
+    if not typography:
+        output_error("Missing required field: typography")
+
+    for i, palette in enumerate(palettes, 1):
+        if not isinstance(palette, dict) or "name" not in palette:
+            output_error(f"Palette {i} is missing field: name")
+        missing = [role for role in CSS_VAR_ROLES if role not in palette.get("colors", {})]
+        if missing:
+            output_error(f"Palette {i} is missing colors: {', '.join(missing)}")
+
+    for i, option in enumerate(typography, 1):
+        if not isinstance(option, dict) or "name" not in option:
+            output_error(f"Typography option {i} is missing field: name")
+
+    if args.precompress and not args.assets_dir:
+        output_error("--precompress requires --assets-dir")
+
+    assets = None
+    if args.assets_dir:
+        try:
+            assets = write_page_assets(args.assets_dir, page_css(len(typography)), args.precompress)
+        except OSError as e:
+            output_error(f"Could not write assets: {str(e)}")
+
+    try:
+        write_chunks(iter_combination_preview_html(palettes, typography, project, assets), args.output)
+    except OSError as e:
+        output_error(f"Could not write preview: {str(e)}")
+
+
+if __name__ == "__main__":
+    main()
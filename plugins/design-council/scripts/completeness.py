@@ -0,0 +1,295 @@
+"""
+Structural completeness of generated responses.
+
+Handles:
+- Code fences left open at the end of a response
+- Unclosed HTML elements, and responses that stop inside a tag
+- Unclosed JS/CSS brackets, strings, template literals and comments
+
+One linear pass over the response. A response that stops inside a code
+block was cut off, whatever its finishReason, and is worth a targeted
+continuation; a closed block that is merely unbalanced is reported but
+left to review (continuing cannot fix it).
+"""
+
+import re
+from dataclasses import dataclass, field, asdict
+from typing import List, Optional, Tuple
+
+
+FENCE_LINE = re.compile(r"^[ \t]*```([\w+-]*)[^\n]*$", re.MULTILINE)
+SIGNIFICANT = re.compile(r"[\"'`/()\[\]{}]")
+CSS_SIGNIFICANT = re.compile(r"[\"'/()\[\]{}]")
+TEMPLATE_SIGNIFICANT = re.compile(r"[\\`$]")
+TAG_START = re.compile(r"<!--|<(/?)([A-Za-z][\w:.-]*)")
+# First line of an unfenced response that reads as JS/CSS rather than prose
+CODE_START = re.compile(
+    r"^\s*(?:import\s|export\s|const\s|let\s|var\s|function[\s*(]|class\s|async\s|"
+    r"\"use |'use |//|/\*|@(?:media|import|keyframes|font-face)\b|:root\b|[.#]?[\w-]+[^\n{]*\{\s*$)"
+)
+
+MARKUP_LANGUAGES = {"html", "htm", "xml", "svg", "vue", "svelte"}
+CSS_LANGUAGES = {"css", "scss", "sass", "less"}
+SCRIPT_LANGUAGES = {
+    "js", "jsx", "javascript", "ts", "tsx", "typescript", "mjs", "json",
+}
+
+VOID_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta",
+    "param", "source", "track", "wbr", "!doctype",
+}
+# End tags HTML lets authors omit; never counted as unclosed
+OPTIONAL_END_TAGS = {
+    "p", "li", "dt", "dd", "option", "optgroup", "tr", "td", "th", "thead", "tbody",
+    "tfoot", "colgroup", "rt", "rp",
+}
+RAW_TEXT_END = {
+    "script": re.compile(r"</script\s*>", re.IGNORECASE),
+    "style": re.compile(r"</style\s*>", re.IGNORECASE),
+}
+CLOSERS = {"(": ")", "[": "]", "{": "}", "${": "}", "`": "`"}
+OPENERS = {")": "(", "]": "[", "}": "{"}
+
+
+@dataclass
+class BlockState:
+    """What is still open at the end of one code block."""
+    language: str
+    line: int  # line of the block's first code line
+    brackets: str = ""
+    tags: List[str] = field(default_factory=list)
+    unterminated: Optional[str] = None  # "string", "template", "comment", "tag", "script", "style"
+
+    @property
+    def balanced(self) -> bool:
+        return not self.brackets and not self.tags and not self.unterminated
+
+    def closing_sequence(self) -> str:
+        """What would close the open constructs, innermost first."""
+        closers = "".join(CLOSERS[b] for b in reversed(self.brackets_list()))
+        tags = "".join(f"</{tag}>" for tag in reversed(self.tags))
+        return (closers + " " + tags).strip()
+
+    def brackets_list(self) -> List[str]:
+        return re.findall(r"\$\{|[(\[{`]", self.brackets)
+
+
+@dataclass
+class Completeness:
+    """Completeness of a whole response."""
+    complete: bool
+    unclosed_fence: bool = False
+    blocks_checked: int = 0
+    open: Optional[BlockState] = None  # the cut-off block, when incomplete
+    unbalanced_blocks: List[BlockState] = field(default_factory=list)
+
+    def describe(self) -> str:
+        """One sentence on where the response stopped (for the continuation prompt)."""
+        if self.complete or self.open is None:
+            return "The response is complete."
+        state = self.open
+        parts = [f"The response stopped inside a {state.language or 'code'} block (started at line {state.line})"]
+        if state.unterminated:
+            parts.append(f"in the middle of a {state.unterminated}")
+        if state.brackets:
+            parts.append(f"with unclosed {' '.join(state.brackets_list())}")
+        if state.tags:
+            parts.append("with open elements " + " ".join(f"<{t}>" for t in state.tags))
+        return ", ".join(parts) + "."
+
+    def to_dict(self) -> dict:
+        """Convert to a JSON-serializable dictionary."""
+        result = {
+            "complete": self.complete,
+            "unclosed_fence": self.unclosed_fence,
+            "blocks_checked": self.blocks_checked,
+        }
+        if self.open is not None:
+            result["open"] = {**asdict(self.open), "closing": self.open.closing_sequence()}
+        if self.unbalanced_blocks:
+            result["unbalanced_blocks"] = [asdict(b) for b in self.unbalanced_blocks]
+        return result
+
+
+def scan_brackets(text: str, start: int, end: int, css: bool = False) -> Tuple[List[str], Optional[str]]:
+    """
+    Track JS/CSS brackets, strings, template literals and comments.
+
+    A quote that runs into a line break is taken as plain text (JSX
+    copy like Don't), not as an unterminated string.
+
+    Args:
+        text: Response text
+        start: Offset of the first character to scan
+        end: Offset to stop at
+        css: CSS rules (no // comments or template literals)
+
+    Returns:
+        Tuple of (open brackets, innermost first last; unterminated construct or None)
+    """
+    stack: List[str] = []
+    pos = start
+    while pos < end:
+        # Jump straight to the next character that can matter
+        in_template = bool(stack) and stack[-1] == "`"
+        match = (TEMPLATE_SIGNIFICANT if in_template else CSS_SIGNIFICANT if css else SIGNIFICANT).search(text, pos, end)
+        if not match:
+            break
+        pos = match.start()
+        char = text[pos]
+        if in_template:
+            if char == "\\":
+                pos += 2
+            elif char == "`":
+                stack.pop()
+                pos += 1
+            elif text.startswith("${", pos):
+                stack.append("${")
+                pos += 2
+            else:
+                pos += 1
+            continue
+
+        if char in "\"'":
+            probe = pos + 1
+            while probe < end and text[probe] != char and text[probe] != "\n":
+                probe += 2 if text[probe] == "\\" else 1
+            if probe >= end:
+                return stack, "string"
+            pos = probe + 1 if text[probe] == char else pos + 1
+            continue
+        if not css and text.startswith("//", pos):
+            stop = text.find("\n", pos, end)
+            pos = end if stop < 0 else stop
+            continue
+        if text.startswith("/*", pos):
+            stop = text.find("*/", pos + 2, end)
+            if stop < 0:
+                return stack, "comment"
+            pos = stop + 2
+            continue
+
+        if char == "`" and not css:
+            stack.append("`")
+        elif char in "([{":
+            stack.append(char)
+        elif char in ")]}" and stack:
+            if stack[-1] == OPENERS[char] or (char == "}" and stack[-1] == "${"):
+                stack.pop()
+        pos += 1
+
+    return stack, ("template" if stack and stack[-1] == "`" else None)
+
+
+def scan_markup(text: str, start: int, end: int) -> Tuple[List[str], List[str], Optional[str]]:
+    """
+    Track open elements, plus brackets inside <script> and <style>.
+
+    Returns:
+        Tuple of (open elements, open brackets, unterminated construct or None)
+    """
+    tags: List[str] = []
+    pos = start
+    while pos < end:
+        match = TAG_START.search(text, pos, end)
+        if not match:
+            break
+        if match.group(0) == "<!--":
+            stop = text.find("-->", match.end(), end)
+            if stop < 0:
+                return tags, [], "comment"
+            pos = stop + 3
+            continue
+
+        probe, quote = match.end(), None
+        while probe < end:
+            char = text[probe]
+            if quote:
+                if char == quote:
+                    quote = None
+            elif char in "\"'":
+                quote = char
+            elif char == ">":
+                break
+            probe += 1
+        if probe >= end:
+            return tags, [], "tag"
+
+        name = match.group(2).lower()
+        if match.group(1):
+            for i in range(len(tags) - 1, -1, -1):
+                if tags[i] == name:
+                    del tags[i:]
+                    break
+        elif name not in VOID_TAGS and name not in OPTIONAL_END_TAGS and text[probe - 1] != "/":
+            tags.append(name)
+            if name in RAW_TEXT_END:
+                close = RAW_TEXT_END[name].search(text, probe + 1, end)
+                stop = close.start() if close else end
+                brackets, unterminated = scan_brackets(text, probe + 1, stop, css=name == "style")
+                if not close:
+                    return tags, brackets, unterminated or name
+                pos = stop
+                continue
+        pos = probe + 1
+    return tags, [], None
+
+
+def check_block(text: str, start: int, end: int, language: str, line: int) -> BlockState:
+    """Scan one code block according to its language."""
+    if not language:
+        # Unlabeled: markup if it opens with a tag, script otherwise
+        language = "html" if text[start:end].lstrip().startswith("<") else "js"
+    state = BlockState(language, line)
+    if language in MARKUP_LANGUAGES:
+        state.tags, brackets, state.unterminated = scan_markup(text, start, end)
+    elif language in CSS_LANGUAGES or language in SCRIPT_LANGUAGES:
+        brackets, state.unterminated = scan_brackets(text, start, end, css=language in CSS_LANGUAGES)
+    else:
+        brackets = []  # shell, text, ...: nothing to balance
+    state.brackets = "".join(brackets)
+    return state
+
+
+def check_completeness(text: str) -> Completeness:
+    """
+    Check whether a generated response stops mid-structure.
+
+    Args:
+        text: Full response text
+
+    Returns:
+        Completeness: incomplete when a fence is left open or the final
+        (or only) code block ends with open brackets, elements, strings
+        or comments. Unfenced text is only checked when it starts like
+        markup or code; prose is complete.
+    """
+    fences = list(FENCE_LINE.finditer(text))
+    if not fences:
+        stripped = text.lstrip()
+        # Unfenced prose ("Here's the plan: ...") has nothing to balance;
+        # its apostrophes would read as open strings
+        if not stripped.startswith("<") and not CODE_START.match(stripped.split("\n", 1)[0]):
+            return Completeness(complete=True)
+        state = check_block(text, 0, len(text), "", 1)
+        return Completeness(complete=state.balanced, blocks_checked=1, open=None if state.balanced else state)
+
+    result = Completeness(complete=True)
+    line, counted = 1, 0
+    for i in range(0, len(fences), 2):
+        opening = fences[i]
+        closing = fences[i + 1] if i + 1 < len(fences) else None
+        start = opening.end() + 1
+        end = closing.start() if closing else len(text)
+        line += text.count("\n", counted, start)
+        counted = start
+        state = check_block(text, min(start, len(text)), end, opening.group(1).lower(), line)
+        result.blocks_checked += 1
+
+        if closing is None:
+            result.complete = False
+            result.unclosed_fence = True
+            result.open = state
+        elif not state.balanced:
+            result.unbalanced_blocks.append(state)
+    return result
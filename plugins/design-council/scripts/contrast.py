@@ -0,0 +1,196 @@
+"""
+WCAG contrast checking and local palette repair.
+
+Handles:
+- Contrast ratios for every text/background and accent/background role pair
+- Checking all palettes in a single pass over a shared luminance table
+- Repairing failures by nudging OKLCH lightness to the nearest passing value
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+from color_space import hex_to_oklch, oklch_to_hex, relative_luminance
+
+
+AA_NORMAL_TEXT = 4.5
+AA_LARGE_TEXT = 3.0
+AA_NON_TEXT = 3.0
+
+BACKGROUND_ROLES = ["bg_primary", "bg_secondary", "bg_tertiary"]
+
+# (adjustable role, fixed background role, minimum ratio)
+# Backgrounds are never adjusted, so one repair pass is enough.
+CONTRAST_PAIRS = (
+    [("text_primary", bg, AA_NORMAL_TEXT) for bg in BACKGROUND_ROLES]
+    + [("text_secondary", bg, AA_NORMAL_TEXT) for bg in BACKGROUND_ROLES]
+    + [("text_tertiary", bg, AA_LARGE_TEXT) for bg in BACKGROUND_ROLES]
+    # bg_primary doubles as the label color on accent buttons
+    + [("accent_primary", "bg_primary", AA_NORMAL_TEXT)]
+    + [("accent_primary", bg, AA_NON_TEXT) for bg in BACKGROUND_ROLES[1:]]
+    + [("accent_secondary", bg, AA_NON_TEXT) for bg in BACKGROUND_ROLES[:2]]
+    + [("border_focus", bg, AA_NON_TEXT) for bg in BACKGROUND_ROLES[:2]]
+    + [("success", "bg_primary", AA_NORMAL_TEXT), ("error", "bg_primary", AA_NORMAL_TEXT)]
+)
+
+# Lightness search for repairs (OKLCH L units)
+REPAIR_STEP = 0.005
+REPAIR_MAX_STEPS = 200
+
+
+def ratio_from_luminance(lum_a: float, lum_b: float) -> float:
+    """WCAG contrast ratio from two relative luminances."""
+    lighter, darker = max(lum_a, lum_b), min(lum_a, lum_b)
+    return (lighter + 0.05) / (darker + 0.05)
+
+
+def contrast_ratio(color_a: str, color_b: str) -> float:
+    """
+    WCAG contrast ratio between two hex colors.
+
+    Args:
+        color_a: Hex color
+        color_b: Hex color
+
+    Returns:
+        Ratio from 1.0 to 21.0
+    """
+    return ratio_from_luminance(relative_luminance(color_a), relative_luminance(color_b))
+
+
+def check_palettes(palettes: List[Dict]) -> List[Dict]:
+    """
+    Compute the contrast matrix for every role pair across all palettes.
+
+    Luminance is computed once per (palette, role) and shared by every
+    pair that uses it.
+
+    Args:
+        palettes: Palette dicts with a "colors" mapping
+
+    Returns:
+        One report per palette: {"ratios": {...}, "failures": [...], "min_ratio": float}
+    """
+    roles = {role for pair in CONTRAST_PAIRS for role in pair[:2]}
+    luminance = [
+        {role: relative_luminance(p["colors"][role]) for role in roles}
+        for p in palettes
+    ]
+
+    reports = []
+    for lum in luminance:
+        ratios, failures = {}, []
+        for role, background, minimum in CONTRAST_PAIRS:
+            ratio = ratio_from_luminance(lum[role], lum[background])
+            ratios[f"{role}/{background}"] = round(ratio, 2)
+            if ratio < minimum:
+                failures.append({
+                    "role": role,
+                    "against": background,
+                    "ratio": round(ratio, 2),
+                    "required": minimum
+                })
+
+        reports.append({
+            "ratios": ratios,
+            "failures": failures,
+            "min_ratio": min(ratios.values()) if ratios else None
+        })
+
+    return reports
+
+
+def nudge_lightness(color: str, constraints: List[Tuple[float, float]]) -> Optional[str]:
+    """
+    Find the nearest OKLCH lightness that satisfies all contrast constraints.
+
+    Hue and chroma are kept (chroma is reduced only if needed for gamut).
+
+    Args:
+        color: Hex color to adjust
+        constraints: List of (other_luminance, minimum_ratio)
+
+    Returns:
+        Repaired hex color, or None if no lightness satisfies every constraint
+    """
+    L, C, h = hex_to_oklch(color)
+
+    def passes(candidate: str) -> bool:
+        lum = relative_luminance(candidate)
+        return all(ratio_from_luminance(lum, other) >= minimum for other, minimum in constraints)
+
+    for step in range(1, REPAIR_MAX_STEPS + 1):
+        for direction in (-1, 1):
+            lightness = L + direction * step * REPAIR_STEP
+            if 0.0 <= lightness <= 1.0:
+                candidate = oklch_to_hex((lightness, C, h))
+                if passes(candidate):
+                    return candidate
+
+    return None
+
+
+def repair_palette(palette: Dict, failures: List[Dict]) -> Tuple[Dict, List[Dict]]:
+    """
+    Repair failing roles of one palette.
+
+    Args:
+        palette: Palette dict with a "colors" mapping
+        failures: Failures for this palette from check_palettes()
+
+    Returns:
+        Tuple of (repaired palette copy, list of repairs made)
+    """
+    colors = dict(palette["colors"])
+    repairs = []
+
+    for role in dict.fromkeys(f["role"] for f in failures):
+        constraints = [
+            (relative_luminance(colors[background]), minimum)
+            for adjusted, background, minimum in CONTRAST_PAIRS
+            if adjusted == role
+        ]
+        repaired = nudge_lightness(colors[role], constraints)
+        if repaired:
+            repairs.append({"role": role, "from": colors[role], "to": repaired})
+            colors[role] = repaired
+
+    return {**palette, "colors": colors}, repairs
+
+
+def audit_palettes(palettes: List[Dict], repair: bool = True) -> Tuple[List[Dict], Dict]:
+    """
+    Check WCAG AA contrast for all palettes and optionally repair them.
+
+    Args:
+        palettes: Palette dicts with a "colors" mapping
+        repair: Nudge failing roles instead of only reporting them
+
+    Returns:
+        Tuple of (palettes, report) where palettes are repaired copies
+        when repair is True
+    """
+    reports = check_palettes(palettes)
+
+    results, summaries = [], []
+    for palette, report in zip(palettes, reports):
+        repairs = []
+        if repair and report["failures"]:
+            palette, repairs = repair_palette(palette, report["failures"])
+        results.append(palette)
+        summaries.append({
+            "name": palette.get("name"),
+            "failures_found": len(report["failures"]),
+            "repairs": repairs
+        })
+
+    # Re-check so the report reflects the colors actually returned
+    final_reports = check_palettes(results) if repair else reports
+    for summary, report in zip(summaries, final_reports):
+        summary.update(report)
+
+    return results, {
+        "standard": "WCAG 2.1 AA",
+        "passed": all(not r["failures"] for r in final_reports),
+        "repaired": repair,
+        "palettes": summaries
+    }
@@ -0,0 +1,528 @@
+"""
+CSS deduplication and minification for generated code.
+
+Handles:
+- Finding stylesheets in a response (```css blocks, <style> in html/vue/svelte)
+- Dropping declarations that can never win: exact repeats and superseded
+  custom-property definitions for the same selector
+- Dropping repeated rules, @font-face/@keyframes and @import statements
+- Merging adjacent rules and adjacent identical @media/@supports blocks
+- Readable (2-space indent) and minified output
+
+Only rewrites that keep the cascade are applied: declarations are removed
+only when a later one for the same selector under the same conditions
+makes them dead, and rules are only merged with their neighbours. A
+stylesheet that does not parse cleanly (unbalanced braces, CSS nesting,
+preprocessor syntax) is left exactly as generated.
+"""
+
+import re
+from dataclasses import dataclass, field, asdict
+from typing import Dict, List, Optional, Set, Tuple, Union
+
+from code_scan import FENCE
+
+
+# At-rules whose block holds rules (everything else holds declarations)
+GROUP_AT_RULES = {"media", "supports", "container", "layer", "scope", "document", "starting-style"}
+KEYFRAMES_AT_RULES = {"keyframes", "-webkit-keyframes", "-moz-keyframes"}
+CSS_FENCES = {"css"}
+MARKUP_FENCES = {"html", "htm", "vue", "svelte", ""}
+STYLE_BLOCK = re.compile(r"(<style\b[^>]*>)(.*?)(</style\s*>)", re.IGNORECASE | re.DOTALL)
+PREPROCESSOR_LANG = re.compile(r"\blang\s*=\s*[\"']?(?:scss|sass|less|stylus|postcss)", re.IGNORECASE)
+IMPORTANT = re.compile(r"\s*!\s*important\s*$", re.IGNORECASE)
+# Selector lists are all-or-nothing: one unknown vendor pseudo drops the whole list
+VENDOR_PSEUDO = re.compile(r"::?-[a-z]")
+WHITESPACE = re.compile(r"\s+")
+
+
+class CssSyntaxError(ValueError):
+    """Stylesheet the optimizer will not touch."""
+
+
+@dataclass
+class Rule:
+    """A selector (or @font-face, @page, keyframe step) and its declarations."""
+    selector: str
+    declarations: List[Tuple[str, str]]  # (property, value incl. !important)
+
+
+@dataclass
+class Block:
+    """An at-rule holding rules: @media, @supports, @layer, @keyframes..."""
+    prelude: str
+    children: List["Node"]
+
+    @property
+    def is_keyframes(self) -> bool:
+        return at_name(self.prelude) in KEYFRAMES_AT_RULES
+
+
+@dataclass
+class Statement:
+    """@import/@charset/@layer statements and top-level comments."""
+    text: str
+
+    @property
+    def is_comment(self) -> bool:
+        return self.text.startswith("/*")
+
+
+Node = Union[Rule, Block, Statement]
+
+
+@dataclass
+class CssStats:
+    """What one optimization pass changed."""
+    stylesheets: int = 0
+    skipped: int = 0
+    declarations_removed: int = 0
+    rules_removed: int = 0
+    rules_merged: int = 0
+    bytes_before: int = 0
+    bytes_after: int = 0
+
+    def to_dict(self) -> dict:
+        """Convert to a JSON-serializable dictionary."""
+        return asdict(self)
+
+
+@dataclass
+class CssOptimization:
+    """A response with its stylesheets optimized."""
+    code: str  # minified or readable, as requested
+    readable: str
+    stats: CssStats = field(default_factory=CssStats)
+
+
+def at_name(prelude: str) -> str:
+    """Lowercase at-rule name of a prelude ("@media (...)" -> "media")."""
+    match = re.match(r"@([\w-]+)", prelude)
+    return match.group(1).lower() if match else ""
+
+
+def collapse(text: str) -> str:
+    """Collapse whitespace runs (outside strings) to single spaces."""
+    parts = re.split(r"(\"(?:\\.|[^\"\\])*\"|'(?:\\.|[^'\\])*')", text)
+    return "".join(p if i % 2 else WHITESPACE.sub(" ", p) for i, p in enumerate(parts)).strip()
+
+
+# --- Parsing -------------------------------------------------------------
+
+def skip_string(css: str, pos: int, end: int) -> int:
+    """Offset just past the string starting at pos."""
+    quote = css[pos]
+    pos += 1
+    while pos < end:
+        if css[pos] == "\\":
+            pos += 2
+        elif css[pos] == quote:
+            return pos + 1
+        elif css[pos] == "\n":
+            raise CssSyntaxError("unterminated string")
+        else:
+            pos += 1
+    raise CssSyntaxError("unterminated string")
+
+
+def skip_comment(css: str, pos: int, end: int) -> int:
+    """Offset just past the comment starting at pos."""
+    stop = css.find("*/", pos + 2, end)
+    if stop < 0:
+        raise CssSyntaxError("unterminated comment")
+    return stop + 2
+
+
+def find_outside(css: str, pos: int, end: int, chars: str) -> int:
+    """First of chars outside strings, comments and ()/[] (or -1)."""
+    depth = 0
+    while pos < end:
+        char = css[pos]
+        if char in "\"'":
+            pos = skip_string(css, pos, end)
+            continue
+        if css.startswith("/*", pos):
+            pos = skip_comment(css, pos, end)
+            continue
+        if char in "([":
+            depth += 1
+        elif char in ")]":
+            depth -= 1
+        elif depth == 0 and char in chars:
+            return pos
+        pos += 1
+    return -1
+
+
+def strip_comments(text: str) -> str:
+    """Text with comments outside strings removed."""
+    out, pos = [], 0
+    while pos < len(text):
+        if text[pos] in "\"'":
+            stop = skip_string(text, pos, len(text))
+            out.append(text[pos:stop])
+            pos = stop
+        elif text.startswith("/*", pos):
+            pos = skip_comment(text, pos, len(text))
+            out.append(" ")
+        else:
+            out.append(text[pos])
+            pos += 1
+    return "".join(out)
+
+
+def parse_declarations(css: str, pos: int, end: int) -> List[Tuple[str, str]]:
+    """Declarations of one block; nested rules are refused."""
+    declarations = []
+    while pos < end:
+        stop = find_outside(css, pos, end, ";{}")
+        if stop >= 0 and css[stop] != ";":
+            raise CssSyntaxError("nested rule")
+        stop = end if stop < 0 else stop
+        text = strip_comments(css[pos:stop]).strip()
+        pos = stop + 1
+        if not text:
+            continue
+        prop, colon, value = text.partition(":")
+        prop = prop.strip()
+        if not colon or not prop or not re.match(r"^-?[\w-]+$|^\*[\w-]+$", prop):
+            raise CssSyntaxError(f"not a declaration: {text[:40]}")
+        if not prop.startswith("--"):
+            prop = prop.lower()
+            value = collapse(value)
+        else:
+            value = value.strip()
+        declarations.append((prop, value))
+    return declarations
+
+
+def parse_nodes(css: str, pos: int, end: int) -> List[Node]:
+    """Rules, blocks and statements between pos and end."""
+    nodes: List[Node] = []
+    while True:
+        while pos < end and (css[pos].isspace() or css.startswith("<!--", pos) or css.startswith("-->", pos)):
+            pos += 4 if css.startswith("<!--", pos) else 3 if css.startswith("-->", pos) else 1
+        if pos >= end:
+            return nodes
+        if css.startswith("/*", pos):
+            stop = skip_comment(css, pos, end)
+            nodes.append(Statement(css[pos:stop]))
+            pos = stop
+            continue
+
+        stop = find_outside(css, pos, end, "{;}")
+        if stop < 0 or css[stop] == "}":
+            raise CssSyntaxError("rule without a block")
+        prelude = collapse(strip_comments(css[pos:stop]))
+        if css[stop] == ";":
+            if not prelude.startswith("@"):
+                raise CssSyntaxError(f"stray declaration: {prelude[:40]}")
+            nodes.append(Statement(prelude + ";"))
+            pos = stop + 1
+            continue
+        if not prelude:
+            raise CssSyntaxError("empty selector")
+
+        close = find_close(css, stop, end)
+        name = at_name(prelude) if prelude.startswith("@") else ""
+        if name in GROUP_AT_RULES or name in KEYFRAMES_AT_RULES:
+            nodes.append(Block(prelude, parse_nodes(css, stop + 1, close)))
+        else:
+            nodes.append(Rule(prelude, parse_declarations(css, stop + 1, close)))
+        pos = close + 1
+
+
+def find_close(css: str, pos: int, end: int) -> int:
+    """Offset of the } matching the { at pos."""
+    depth = 0
+    while pos < end:
+        stop = find_outside(css, pos, end, "{}")
+        if stop < 0:
+            break
+        depth += 1 if css[stop] == "{" else -1
+        if depth == 0:
+            return stop
+        pos = stop + 1
+    raise CssSyntaxError("unbalanced braces")
+
+
+def parse_css(css: str) -> List[Node]:
+    """
+    Parse a stylesheet.
+
+    Raises:
+        CssSyntaxError: for anything the optimizer should not rewrite
+    """
+    return parse_nodes(css, 0, len(css))
+
+
+# --- Optimizing ----------------------------------------------------------
+
+def supersedes(later: Tuple[str, str], earlier: Tuple[str, str]) -> bool:
+    """Whether a later declaration for the same selector makes an earlier one dead."""
+    if later[0] != earlier[0]:
+        return False
+    if later[0].startswith("--"):
+        # Custom properties take any value, so the last one always wins
+        return bool(IMPORTANT.search(later[1])) or not IMPORTANT.search(earlier[1])
+    # Other properties may be deliberate fallbacks; only exact repeats are dead
+    return later[1] == earlier[1]
+
+
+def drop_dead_declarations(nodes: List[Node], stats: CssStats) -> None:
+    """Remove declarations a later one for the same selector and conditions overrides."""
+    rules: List[Tuple[tuple, Rule]] = []
+
+    def walk(children: List[Node], context: tuple) -> None:
+        for node in children:
+            if isinstance(node, Block):
+                if not node.is_keyframes:
+                    walk(node.children, context + (node.prelude,))
+            elif isinstance(node, Rule) and not node.selector.startswith("@"):
+                rules.append((context, node))
+
+    walk(nodes, ())
+    seen: Dict[Tuple[tuple, str], Dict[str, List[Tuple[str, str]]]] = {}
+    for context, rule in reversed(rules):
+        later = seen.setdefault((context, rule.selector), {})
+        kept = []
+        for declaration in reversed(rule.declarations):
+            if any(supersedes(d, declaration) for d in later.get(declaration[0], ())):
+                stats.declarations_removed += 1
+                continue
+            later.setdefault(declaration[0], []).append(declaration)
+            kept.append(declaration)
+        rule.declarations = kept[::-1]
+
+
+def node_key(node: Node) -> str:
+    """Canonical text of a node, for spotting repeats."""
+    return format_nodes([node], minify=True)
+
+
+def can_join_selectors(a: str, b: str) -> bool:
+    return not a.startswith("@") and not b.startswith("@") and not VENDOR_PSEUDO.search(a + b)
+
+
+def merge_nodes(nodes: List[Node], stats: CssStats, in_keyframes: bool = False) -> List[Node]:
+    """Drop empty and repeated nodes, merge neighbours; recurses into blocks."""
+    for node in nodes:
+        if isinstance(node, Block):
+            node.children = merge_nodes(node.children, stats, node.is_keyframes)
+
+    # Repeated statements keep the first (@import/@charset are only valid at
+    # the top); repeated @font-face, @keyframes and blocks keep the last.
+    # Repeated plain rules were already emptied by drop_dead_declarations.
+    deduped: List[Node] = []
+    seen: Set[str] = set()
+    for node in nodes:
+        if isinstance(node, Statement) and not node.is_comment:
+            if node.text in seen:
+                stats.rules_removed += 1
+                continue
+            seen.add(node.text)
+        deduped.append(node)
+    if not in_keyframes:
+        last: Dict[str, int] = {}
+        for i, node in enumerate(deduped):
+            if isinstance(node, Block) or isinstance(node, Rule) and node.selector.startswith("@"):
+                last[node_key(node)] = i
+        before = len(deduped)
+        deduped = [
+            node for i, node in enumerate(deduped)
+            if not (isinstance(node, Block) or isinstance(node, Rule) and node.selector.startswith("@"))
+            or last[node_key(node)] == i
+        ]
+        stats.rules_removed += before - len(deduped)
+
+    merged: List[Node] = []
+    for node in deduped:
+        if (isinstance(node, Rule) and not node.declarations) or (isinstance(node, Block) and not node.children):
+            stats.rules_removed += 1
+            continue
+        previous = merged[-1] if merged else None
+        if isinstance(node, Rule) and isinstance(previous, Rule) and not in_keyframes:
+            if node.selector == previous.selector and not node.selector.startswith("@"):
+                previous.declarations = previous.declarations + node.declarations
+                stats.rules_merged += 1
+                continue
+            if node.declarations == previous.declarations and can_join_selectors(previous.selector, node.selector):
+                previous.selector = f"{previous.selector}, {node.selector}"
+                stats.rules_merged += 1
+                continue
+        if isinstance(node, Block) and isinstance(previous, Block) and not node.is_keyframes \
+                and node.prelude == previous.prelude:
+            previous.children = merge_nodes(previous.children + node.children, stats)
+            stats.rules_merged += 1
+            continue
+        merged.append(node)
+    return merged
+
+
+def optimize_nodes(nodes: List[Node], stats: CssStats) -> List[Node]:
+    """Deduplicate a parsed stylesheet."""
+    drop_dead_declarations(nodes, stats)
+    nodes = merge_nodes(nodes, stats)
+    # Merging neighbours can line up new repeats within a rule
+    drop_dead_declarations(nodes, stats)
+    return merge_nodes(nodes, stats)
+
+
+# --- Formatting ----------------------------------------------------------
+
+def outside_strings(text: str, pattern: str, replacement: str) -> str:
+    """re.sub applied only outside string literals."""
+    parts = re.split(r"(\"(?:\\.|[^\"\\])*\"|'(?:\\.|[^'\\])*')", text)
+    return "".join(p if i % 2 else re.sub(pattern, replacement, p) for i, p in enumerate(parts))
+
+
+def minify_selector(selector: str) -> str:
+    """Drop spaces around combinators and commas (not inside parentheses)."""
+    out, depth = [], 0
+    for part in re.split(r"(\"(?:\\.|[^\"\\])*\"|'(?:\\.|[^'\\])*'|[()])", selector):
+        if part == "(":
+            depth += 1
+        elif part == ")":
+            depth -= 1
+        elif depth == 0 and part and part[0] not in "\"'":
+            part = re.sub(r"\s*([>+~,])\s*", r"\1", part)
+        out.append(part)
+    return "".join(out)
+
+
+def minify_prelude(prelude: str) -> str:
+    return outside_strings(prelude, r"\s*([:,])\s*", r"\1")
+
+
+def minify_value(prop: str, value: str) -> str:
+    if prop.startswith("--"):
+        return value
+    value = outside_strings(value, r"\s*,\s*", ",")
+    return IMPORTANT.sub("!important", value)
+
+
+def format_nodes(nodes: List[Node], minify: bool = False, indent: str = "") -> str:
+    """
+    Serialize nodes.
+
+    Args:
+        nodes: Parsed (and optimized) stylesheet
+        minify: One line, no comments (except /*! ... */), no optional spaces
+        indent: Leading indentation for readable output
+
+    Returns:
+        CSS text
+    """
+    if minify:
+        out = []
+        for node in nodes:
+            if isinstance(node, Statement):
+                if not node.is_comment or node.text.startswith("/*!"):
+                    out.append(minify_prelude(node.text) if not node.is_comment else node.text)
+            elif isinstance(node, Block):
+                out.append(f"{minify_prelude(node.prelude)}{{{format_nodes(node.children, True)}}}")
+            else:
+                body = ";".join(f"{p}:{minify_value(p, v)}" for p, v in node.declarations)
+                out.append(f"{minify_selector(node.selector)}{{{body}}}")
+        return "".join(out)
+
+    out = []
+    for node in nodes:
+        if isinstance(node, Statement):
+            out.append(f"{indent}{node.text}")
+        elif isinstance(node, Block):
+            inner = format_nodes(node.children, False, indent + "  ")
+            out.append(f"{indent}{node.prelude} {{\n{inner}\n{indent}}}")
+        else:
+            body = "".join(f"{indent}  {p}: {v};\n" for p, v in node.declarations)
+            out.append(f"{indent}{node.selector} {{\n{body}{indent}}}")
+    return ("\n\n" if not indent else "\n").join(out)
+
+
+def optimize_css(css: str, stats: Optional[CssStats] = None) -> Tuple[str, str]:
+    """
+    Deduplicate one stylesheet.
+
+    Args:
+        css: Stylesheet text
+        stats: Counters to update
+
+    Returns:
+        Tuple of (readable, minified) CSS; both are the input unchanged
+        when it does not parse
+    """
+    stats = stats if stats is not None else CssStats()
+    stats.stylesheets += 1
+    stats.bytes_before += len(css.encode("utf-8"))
+    try:
+        nodes = optimize_nodes(parse_css(css), stats)
+    except CssSyntaxError:
+        stats.skipped += 1
+        stats.bytes_after += len(css.encode("utf-8"))
+        return css, css
+    minified = format_nodes(nodes, minify=True)
+    stats.bytes_after += len(minified.encode("utf-8"))
+    return format_nodes(nodes), minified
+
+
+# --- Responses -----------------------------------------------------------
+
+def indent_block(css: str, indent: str) -> str:
+    return "\n".join(indent + line if line else line for line in css.split("\n"))
+
+
+def optimize_markup(markup: str, stats: CssStats) -> Tuple[str, str]:
+    """<style> elements of an html/vue/svelte file, as (readable, minified) markup."""
+    readable, minified, pos = [], [], 0
+    for match in STYLE_BLOCK.finditer(markup):
+        if PREPROCESSOR_LANG.search(match.group(1)) or not match.group(2).strip():
+            continue
+        line_start = markup.rfind("\n", 0, match.start()) + 1
+        indent = re.match(r"[ \t]*", markup[line_start:]).group(0)
+        pretty, small = optimize_css(match.group(2), stats)
+        if pretty is match.group(2):
+            continue  # unparsed: leave as generated
+        head = markup[pos:match.start()] + match.group(1)
+        readable.append(f"{head}\n{indent_block(pretty, indent + '  ')}\n{indent}{match.group(3)}")
+        minified.append(f"{head}{small}{match.group(3)}")
+        pos = match.end()
+    return "".join(readable) + markup[pos:], "".join(minified) + markup[pos:]
+
+
+def optimize_response(text: str, minify: bool = False) -> CssOptimization:
+    """
+    Deduplicate (and optionally minify) every stylesheet in a generated response.
+
+    Args:
+        text: Generated response (fenced code blocks, or a bare html page)
+        minify: Put minified CSS in .code (.readable keeps the readable form)
+
+    Returns:
+        CssOptimization with the rewritten response and counters
+    """
+    stats = CssStats()
+    spans: List[Tuple[int, int, str, str]] = []
+    fences = list(FENCE.finditer(text))
+    if not fences and STYLE_BLOCK.search(text):
+        spans.append((0, len(text), *optimize_markup(text, stats)))
+    for match in fences:
+        language = match.group(1).lower()
+        body = match.group(2)
+        if not match.group(0).endswith("```"):
+            continue  # cut-off block
+        if language in CSS_FENCES:
+            pretty, small = optimize_css(body, stats)
+            if pretty is body:
+                continue
+            pretty, small = pretty + "\n", small + "\n"
+        elif language in MARKUP_FENCES and STYLE_BLOCK.search(body):
+            pretty, small = optimize_markup(body, stats)
+        else:
+            continue
+        spans.append((match.start(2), match.start(2) + len(body), pretty, small))
+
+    readable, code = text, text
+    for start, end, pretty, small in reversed(spans):
+        readable = readable[:start] + pretty + readable[end:]
+        code = code[:start] + (small if minify else pretty) + code[end:]
+    return CssOptimization(code=code, readable=readable, stats=stats)
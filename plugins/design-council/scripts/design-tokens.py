@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Compile the selected palette and typography into design token files.
+
+Writes to --out-dir:
+- tokens.css          # :root custom properties (+ font @import)
+- tailwind.config.js  # theme.extend colors/fontFamily pointing at the properties
+- tokens.json         # design tokens format; gemini-generate.py --tokens reads it
+
+With --tokens, gemini-generate.py names the properties in the prompt
+instead of the palette values and adds tokens.css to the generated code
+itself, so Gemini no longer writes the variable block every round.
+
+Usage:
+    echo '{"palette": {...selected option...}, "typography": {...selected option...}}' | python design-tokens.py --out-dir ./.design-sprint-staging/tokens
+
+Output: JSON with the written files and the prompt reference to stdout
+"""
+
+import argparse
+import json
+import sys
+
+from design_tokens import compile_tokens, prompt_reference, write_outputs
+from token_budget import estimate_tokens
+
+
+def output_error(message: str, exit_code: int = 1) -> None:
+    """Output error message as JSON and exit."""
+    print(json.dumps({"error": True, "message": message}))
+    sys.exit(exit_code)
+
+
+def read_input() -> dict:
+    """Read and parse JSON input from stdin."""
+    try:
+        input_data = sys.stdin.read()
+        if not input_data.strip():
+            output_error("No input provided. Expected JSON with palette and typography.")
+        return json.loads(input_data)
+    except json.JSONDecodeError as e:
+        output_error(f"Invalid JSON input: {str(e)}")
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line flags."""
+    parser = argparse.ArgumentParser(description="Compile palette and typography into design tokens.")
+    parser.add_argument(
+        "--out-dir",
+        required=True,
+        metavar="DIR",
+        help="Directory for tokens.css, tailwind.config.js and tokens.json"
+    )
+    return parser.parse_args()
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+    input_data = read_input()
+
+    if not isinstance(input_data.get("palette"), dict):
+        output_error("Input needs the selected palette object under 'palette'")
+    if not isinstance(input_data.get("typography"), dict):
+        output_error("Input needs the selected typography object under 'typography'")
+
+    try:
+        tokens = compile_tokens(input_data["palette"], input_data["typography"])
+        files = write_outputs(tokens, args.out_dir)
+    except ValueError as e:
+        output_error(str(e))
+    except OSError as e:
+        output_error(f"Could not write tokens: {str(e)}")
+
+    reference = prompt_reference(tokens)
+    print(json.dumps({
+        "error": False,
+        "files": files,
+        "theme": tokens.theme,
+        "colors": len(tokens.colors),
+        "fonts": {role: font["family"] for role, font in tokens.fonts.items()},
+        "prompt_reference": reference,
+        "prompt_reference_tokens": estimate_tokens(reference),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
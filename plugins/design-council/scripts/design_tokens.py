@@ -0,0 +1,371 @@
+"""
+Design token compiler for the selected palette and typography.
+
+Handles:
+- Compiling the 12 palette roles, their 50-900 scales and hover/active/
+  disabled states, and the display/body/mono fonts into one token set
+- Emitting a CSS custom property stylesheet, a Tailwind config that points
+  at those properties, and a JSON token file (design tokens format)
+- A short prompt section that names the tokens instead of spelling out
+  the palette, so Gemini neither reads nor re-emits the values
+- Injecting the stylesheet into generated code and dropping any
+  redefinitions of the tokens Gemini wrote anyway
+
+The stylesheet is the single source of values: the Tailwind config and
+the generated code only refer to the custom properties.
+"""
+
+import json
+import os
+import re
+from dataclasses import dataclass, field, asdict
+from typing import Dict, Optional, Tuple
+
+from color_scales import SCALE_STEPS, STATE_NAMES, add_scales
+from color_space import hex_to_oklch, is_hex_color, normalize_hex
+from palette_engine import PALETTE_ROLES
+
+
+STYLESHEET_FILENAME = "tokens.css"
+TAILWIND_FILENAME = "tailwind.config.js"
+TOKENS_FILENAME = "tokens.json"
+STYLE_ELEMENT_ID = "design-tokens"
+
+FONT_ROLES = ("display", "body", "mono")
+# Font catalog category -> CSS generic family
+GENERIC_FAMILIES = {
+    "serif": "serif",
+    "sans-serif": "sans-serif",
+    "monospace": "monospace",
+    "handwriting": "cursive",
+}
+ROLE_FALLBACKS = {"display": "serif", "body": "sans-serif", "mono": "monospace"}
+# OKLCH lightness below which bg_primary makes a dark theme
+DARK_THEME_LIGHTNESS = 0.5
+
+
+@dataclass
+class TokenSet:
+    """Compiled design tokens."""
+    colors: Dict[str, str]  # palette role -> #rrggbb
+    fonts: Dict[str, dict] = field(default_factory=dict)  # role -> family, generic, weights
+    fonts_url: Optional[str] = None
+    name: Optional[str] = None
+    scales: Dict[str, Dict[str, str]] = field(default_factory=dict)  # role -> "50".."900" -> hex
+    states: Dict[str, Dict[str, str]] = field(default_factory=dict)  # role -> hover/active/disabled -> hex
+
+    def to_dict(self) -> dict:
+        """Convert to a JSON-serializable dictionary."""
+        return asdict(self)
+
+    @property
+    def theme(self) -> str:
+        lightness = hex_to_oklch(self.colors["bg_primary"])[0]
+        return "dark" if lightness < DARK_THEME_LIGHTNESS else "light"
+
+
+def color_variable(role: str) -> str:
+    """CSS custom property of a palette role (bg_primary -> --color-bg-primary)."""
+    return f"--color-{role.replace('_', '-')}"
+
+
+def derived_colors(tokens: TokenSet) -> Dict[str, str]:
+    """Scale and state colors by token name (accent-primary-500, accent-primary-hover)."""
+    derived = {}
+    for group in (tokens.scales, tokens.states):
+        for role, values in group.items():
+            for key, value in values.items():
+                derived[f"{role.replace('_', '-')}-{key}"] = value
+    return derived
+
+
+def font_variable(role: str) -> str:
+    """CSS custom property of a font role (display -> --font-display)."""
+    return f"--font-{role}"
+
+
+def compile_tokens(palette: dict, typography: dict) -> TokenSet:
+    """
+    Compile a selected palette and typography pairing.
+
+    Args:
+        palette: Palette option ({"name", "colors": {role: hex}}) or its
+            colors; scales and states are derived when it has none
+        typography: Typography option with display, body and optional mono
+
+    Returns:
+        TokenSet
+
+    Raises:
+        ValueError: On a missing role, bad color or missing font family
+    """
+    colors = palette.get("colors", palette) if isinstance(palette, dict) else {}
+    missing = [role for role in PALETTE_ROLES if role not in colors]
+    if missing:
+        raise ValueError(f"Palette is missing roles: {', '.join(missing)}")
+    bad = [role for role in PALETTE_ROLES if not is_hex_color(str(colors[role]))]
+    if bad:
+        raise ValueError(f"Palette roles are not hex colors: {', '.join(bad)}")
+
+    fonts = {}
+    for role in FONT_ROLES:
+        font = typography.get(role) if isinstance(typography, dict) else None
+        if not font:
+            if role == "mono":
+                continue
+            raise ValueError(f"Typography is missing a {role} font")
+        if not isinstance(font, dict) or not font.get("family"):
+            raise ValueError(f"Typography {role} font has no family")
+        fonts[role] = {
+            "family": font["family"],
+            "generic": GENERIC_FAMILIES.get(font.get("style"), ROLE_FALLBACKS[role]),
+            "weights": sorted(font.get("weights") or []),
+        }
+
+    derived = {"colors": {role: normalize_hex(colors[role]) for role in PALETTE_ROLES}}
+    if isinstance(palette, dict) and palette.get("scales") and palette.get("states"):
+        derived["scales"], derived["states"] = palette["scales"], palette["states"]
+    else:
+        add_scales([derived])
+
+    return TokenSet(
+        colors=derived["colors"],
+        fonts=fonts,
+        fonts_url=typography.get("google_fonts_url"),
+        name=palette.get("name") if isinstance(palette, dict) else None,
+        scales={role: dict(derived["scales"][role]) for role in PALETTE_ROLES},
+        states={role: dict(derived["states"][role]) for role in PALETTE_ROLES}
+    )
+
+
+def font_stack(font: dict) -> str:
+    return f"\"{font['family']}\", {font['generic']}"
+
+
+def to_css(tokens: TokenSet) -> str:
+    """The token stylesheet: font import and one :root block."""
+    lines = [f"/* Design tokens{f' - {tokens.name}' if tokens.name else ''}. Generated by design-tokens.py; do not edit. */"]
+    if tokens.fonts_url:
+        lines.append(f"@import url(\"{tokens.fonts_url}\");")
+    lines.append(":root {")
+    lines.append(f"  color-scheme: {tokens.theme};")
+    lines.extend(f"  {color_variable(role)}: {value};" for role, value in tokens.colors.items())
+    lines.extend(f"  --color-{name}: {value};" for name, value in derived_colors(tokens).items())
+    lines.extend(f"  {font_variable(role)}: {font_stack(font)};" for role, font in tokens.fonts.items())
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+def to_tailwind(tokens: TokenSet) -> str:
+    """A Tailwind config whose colors and font families use the token properties."""
+    config = {
+        "theme": {
+            "extend": {
+                "colors": {
+                    role.replace("_", "-"): {
+                        "DEFAULT": f"var({color_variable(role)})",
+                        **{
+                            key: f"var({color_variable(role)}-{key})"
+                            for key in [*tokens.scales.get(role, {}), *tokens.states.get(role, {})]
+                        },
+                    }
+                    for role in tokens.colors
+                },
+                "fontFamily": {
+                    role: [f"var({font_variable(role)})"] for role in tokens.fonts
+                },
+            }
+        }
+    }
+    body = json.dumps(config, indent=2)
+    return (
+        "// Generated by design-tokens.py; load tokens.css for the values.\n"
+        "/** @type {import('tailwindcss').Config} */\n"
+        f"module.exports = {body};\n"
+    )
+
+
+def to_json(tokens: TokenSet) -> dict:
+    """The token file, in the design tokens community group format."""
+    data = {
+        "$description": f"Design tokens{f' - {tokens.name}' if tokens.name else ''}",
+        "color": {
+            name: {"$type": "color", "$value": value}
+            for name, value in {
+                **{role.replace("_", "-"): value for role, value in tokens.colors.items()},
+                **derived_colors(tokens),
+            }.items()
+        },
+        "font": {
+            role: {
+                "$type": "fontFamily",
+                "$value": [font["family"], font["generic"]],
+                "$extensions": {"weights": font["weights"]},
+            }
+            for role, font in tokens.fonts.items()
+        },
+    }
+    if tokens.fonts_url:
+        data["$extensions"] = {"fonts_url": tokens.fonts_url}
+    return data
+
+
+def from_json(data: dict) -> TokenSet:
+    """
+    Read a token file written by to_json.
+
+    Raises:
+        ValueError: When it lacks the palette roles or font families
+    """
+    try:
+        color = data["color"]
+        colors = {role: color[role.replace("_", "-")]["$value"] for role in PALETTE_ROLES}
+        scales, states = {}, {}
+        for role in PALETTE_ROLES:
+            for group, keys in ((scales, [str(step) for step in SCALE_STEPS]), (states, STATE_NAMES)):
+                values = {
+                    key: color[f"{role.replace('_', '-')}-{key}"]["$value"]
+                    for key in keys if f"{role.replace('_', '-')}-{key}" in color
+                }
+                if values:
+                    group[role] = values
+        fonts = {
+            role: {
+                "family": entry["$value"][0],
+                "generic": entry["$value"][-1],
+                "weights": (entry.get("$extensions") or {}).get("weights", []),
+            }
+            for role, entry in data.get("font", {}).items()
+        }
+    except (KeyError, IndexError, TypeError) as e:
+        raise ValueError(f"Not a design token file (missing {e})")
+    description = data.get("$description", "")
+    return TokenSet(
+        colors=colors,
+        fonts=fonts,
+        fonts_url=(data.get("$extensions") or {}).get("fonts_url"),
+        name=description.split(" - ", 1)[1] if " - " in description else None,
+        scales=scales,
+        states=states
+    )
+
+
+def load_tokens(path: str) -> TokenSet:
+    """
+    Load a tokens.json file.
+
+    Raises:
+        ValueError: When it is unreadable or not a token file
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            return from_json(json.load(f))
+    except OSError as e:
+        raise ValueError(f"Cannot read design tokens {path}: {e}")
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid design tokens {path}: {e}")
+
+
+def prompt_reference(tokens: TokenSet) -> str:
+    """
+    Prompt text naming the tokens without their values.
+
+    The same text serves every framework, so a fan-out prefix stays shared.
+    """
+    colors = ", ".join(color_variable(role) for role in tokens.colors)
+    fonts = ", ".join(f"{font_variable(role)} ({font['family']})" for role, font in tokens.fonts.items())
+    return (
+        f"A stylesheet defining these CSS custom properties and loading the fonts is added "
+        f"after generation ({STYLESHEET_FILENAME}; inlined in <head> for html). Use var(...) "
+        f"for every color and font-family; in a component framework, import './{STYLESHEET_FILENAME}' "
+        f"once in the entry component. Do not define these properties or load the fonts yourself.\n"
+        f"Theme: {tokens.theme}\n"
+        f"Colors: {colors}\n"
+        + (
+            f"Each color also has {color_variable('<role>')}-50 (lightest) to -900 and "
+            f"-hover, -active, -disabled; use these for tints and states instead of new colors.\n"
+            if tokens.scales else ""
+        )
+        + f"Fonts: {fonts}"
+    )
+
+
+def strip_redefinitions(code: str, tokens: TokenSet) -> Tuple[str, int]:
+    """
+    Remove declarations of the token properties from generated code.
+
+    Returns:
+        (code, number of declarations removed)
+    """
+    names = (
+        [color_variable(role) for role in tokens.colors]
+        + [f"--color-{name}" for name in derived_colors(tokens)]
+        + [font_variable(role) for role in tokens.fonts]
+    )
+    declaration = re.compile(r"[ \t]*(?:" + "|".join(re.escape(n) for n in names) + r")\s*:[^;{}]*;?[ \t]*\n?")
+    code, removed = declaration.subn("", code)
+    if removed:
+        # :root blocks that only held token definitions
+        code = re.sub(r"[ \t]*:root\s*\{\s*\}[ \t]*\n?", "", code)
+    return code, removed
+
+
+def inject_tokens(code: str, tokens: TokenSet, framework: str = "react") -> Tuple[str, dict]:
+    """
+    Add the token stylesheet to generated code.
+
+    html gets a <style id="design-tokens"> element in <head>, ahead of the
+    page's own stylesheets;
+    other frameworks get a ```css tokens.css block ahead of the response.
+
+    Args:
+        code: Extracted code (fenced response)
+        tokens: Compiled tokens
+        framework: Target framework
+
+    Returns:
+        (code, report with how the stylesheet was added and how many
+        redefinitions were dropped)
+    """
+    code, removed = strip_redefinitions(code, tokens)
+    stylesheet = to_css(tokens)
+    report = {"redefinitions_removed": removed}
+
+    if framework == "html":
+        element = f"<style id=\"{STYLE_ELEMENT_ID}\">\n{stylesheet}</style>\n"
+        # Ahead of the page's own styles, after <meta charset> and friends
+        head = re.search(r"<head(?:\s[^>]*)?>(.*?)</head>", code, re.IGNORECASE | re.DOTALL)
+        if head:
+            first_style = re.search(r"<style|<link[^>]*stylesheet", head.group(1), re.IGNORECASE)
+            at = head.start(1) + first_style.start() if first_style else head.end(1)
+            code = code[:at] + element + code[at:]
+            report["injected"] = "head"
+            return code, report
+
+    block = f"```css {STYLESHEET_FILENAME}\n{stylesheet}```\n\n"
+    report["injected"] = STYLESHEET_FILENAME
+    return block + code, report
+
+
+def write_outputs(tokens: TokenSet, out_dir: str) -> Dict[str, str]:
+    """
+    Write tokens.css, tailwind.config.js and tokens.json.
+
+    Returns:
+        Kind -> written path
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    outputs = {
+        "css": (STYLESHEET_FILENAME, to_css(tokens)),
+        "tailwind": (TAILWIND_FILENAME, to_tailwind(tokens)),
+        "json": (TOKENS_FILENAME, json.dumps(to_json(tokens), indent=2) + "\n"),
+    }
+    written = {}
+    for kind, (filename, content) in outputs.items():
+        path = os.path.join(out_dir, filename)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(temp_path, path)
+        written[kind] = path
+    return written
@@ -0,0 +1,229 @@
+"""
+Multi-framework fan-out from one design spec.
+
+Handles:
+- Parsing and validating a --frameworks list
+- One shared prompt prefix (spec, design tokens, context, requirements)
+  with the framework named only at the end, so every request shares the
+  same cacheable prefix and the same token block
+- Generating the first framework alone, so its request puts the prefix
+  in Gemini's implicit cache, then the rest concurrently against it
+- Adding a compiled token stylesheet to every framework's output
+- Writing each framework's files to its own directory
+
+Each framework keeps its own output budget and history; the history file
+is only written from the calling thread.
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, asdict
+from typing import Callable, Dict, List, Optional
+
+from api_client import APIResponse, GeminiClient, MODEL_MAX_OUTPUT_TOKENS
+from code_scan import split_response
+from completeness import check_completeness
+from css_optimize import optimize_response
+from design_tokens import TokenSet, inject_tokens
+from prompt_builder import build_fanout_prompt
+from response_parser import extract_code
+from token_budget import OutputHistory, TokenBudget, estimate_tokens, plan_output_tokens
+from validators import validate_framework
+
+
+RESPONSE_FILENAME = "response.md"
+
+# How one request is made: (client, prompt) -> APIResponse
+GenerateCall = Callable[[GeminiClient, str], APIResponse]
+
+
+@dataclass
+class FrameworkResult:
+    """Outcome of one framework in a fan-out."""
+    framework: str
+    success: bool
+    out_dir: Optional[str] = None
+    files: List[str] = field(default_factory=list)
+    finish_reason: Optional[str] = None
+    usage: Optional[dict] = None
+    cached_tokens: int = 0
+    output_tokens: int = 0
+    token_budget: Optional[dict] = None
+    completeness: Optional[dict] = None
+    design_tokens: Optional[dict] = None
+    css: Optional[dict] = None
+    elapsed_ms: float = 0.0
+    error: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        """Convert to a JSON-serializable dictionary."""
+        return {k: v for k, v in asdict(self).items() if v is not None}
+
+
+def parse_frameworks(value: str) -> List[str]:
+    """
+    Split and validate "react,vue,svelte".
+
+    Raises:
+        ValueError: On an unsupported or empty list
+    """
+    frameworks = []
+    for name in value.split(","):
+        name = name.strip().lower()
+        if not name or name in frameworks:
+            continue
+        is_valid, error = validate_framework(name)
+        if not is_valid:
+            raise ValueError(error)
+        frameworks.append(name)
+    if not frameworks:
+        raise ValueError("--frameworks needs at least one framework")
+    return frameworks
+
+
+def write_files(out_dir: str, code: str, framework: str) -> List[str]:
+    """Split a response into files under out_dir; returns relative names."""
+    os.makedirs(out_dir, exist_ok=True)
+    files = split_response(code, framework)
+    for name, content in files.items():
+        path = os.path.join(out_dir, *name.split("/"))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+    with open(os.path.join(out_dir, RESPONSE_FILENAME), "w", encoding="utf-8") as f:
+        f.write(code)
+    return sorted(files)
+
+
+def generate_one(
+    framework: str,
+    prefix: str,
+    api_key: str,
+    samples: List[int],
+    out_root: str,
+    call: GenerateCall,
+    optimize_css: bool = False,
+    minify_css: bool = False,
+    tokens: Optional[TokenSet] = None
+) -> FrameworkResult:
+    """
+    Generate one framework of a fan-out and write its directory.
+
+    Args:
+        framework: Target framework
+        prefix: Shared prompt prefix
+        api_key: Gemini API key
+        samples: Output history for this framework/template
+        out_root: Parent directory; files go to out_root/<framework>/
+        call: How to make the request (plain or with continuation)
+        optimize_css: Deduplicate CSS before writing
+        minify_css: Write minified CSS (implies optimize_css)
+        tokens: Compiled tokens whose stylesheet is added to the output
+
+    Returns:
+        FrameworkResult
+    """
+    started = time.perf_counter()
+    result = FrameworkResult(framework=framework, success=False)
+    prompt = build_fanout_prompt(prefix, framework)
+
+    client = GeminiClient(api_key)
+    max_output_tokens, budget_source = plan_output_tokens(
+        samples,
+        default=client.config.max_output_tokens,
+        ceiling=MODEL_MAX_OUTPUT_TOKENS
+    )
+    client.config.max_output_tokens = max_output_tokens
+    result.token_budget = TokenBudget(
+        prompt_tokens=estimate_tokens(prompt),
+        max_output_tokens=max_output_tokens,
+        output_budget_source=budget_source,
+        history_samples=len(samples)
+    ).to_dict()
+
+    response = call(client, prompt)
+    if not response.success:
+        result.error = response.error_message
+        result.elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+        return result
+
+    parsed = extract_code(response.data)
+    if parsed.error:
+        result.error = parsed.error
+        result.elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+        return result
+
+    code = parsed.code
+    if tokens is not None:
+        code, result.design_tokens = inject_tokens(code, tokens, framework)
+    if optimize_css or minify_css:
+        css = optimize_response(code, minify=minify_css)
+        code = css.code
+        result.css = css.stats.to_dict()
+
+    result.out_dir = os.path.join(out_root, framework)
+    result.files = write_files(result.out_dir, code, framework)
+    result.success = True
+    result.finish_reason = parsed.finish_reason
+    result.usage = parsed.usage
+    result.cached_tokens = (parsed.usage or {}).get("cachedContentTokenCount") or 0
+    result.output_tokens = (parsed.usage or {}).get("candidatesTokenCount") or estimate_tokens(parsed.code)
+    result.completeness = check_completeness(parsed.code).to_dict()
+    result.elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+    return result
+
+
+def fan_out(
+    frameworks: List[str],
+    prefix: str,
+    api_key: str,
+    history: OutputHistory,
+    template: str,
+    out_root: str,
+    call: GenerateCall,
+    optimize_css: bool = False,
+    minify_css: bool = False,
+    tokens: Optional[TokenSet] = None
+) -> List[FrameworkResult]:
+    """
+    Generate every framework from one shared prefix.
+
+    The first framework runs alone: Gemini only caches a prefix once a
+    request with it has been processed, so requests sent together would
+    all miss. The rest then run concurrently and read the prefix from
+    the cache (two wall-clock slots instead of N).
+
+    Args:
+        frameworks: Targets, e.g. ["react", "vue", "svelte"]
+        prefix: Shared prompt prefix (build_fanout_prefix)
+        api_key: Gemini API key
+        history: Output size history (recorded after all runs finish)
+        template: Template/job name for the history
+        out_root: Parent of the per-framework directories
+        call: How to make each request
+        optimize_css: Deduplicate CSS before writing
+        minify_css: Write minified CSS
+        tokens: Compiled tokens whose stylesheet is added to every output
+
+    Returns:
+        One FrameworkResult per framework, in the order given
+    """
+    samples: Dict[str, List[int]] = {f: history.samples(f, template) for f in frameworks}
+
+    def run(framework: str) -> FrameworkResult:
+        try:
+            return generate_one(framework, prefix, api_key, samples[framework], out_root, call,
+                                optimize_css, minify_css, tokens)
+        except (OSError, ValueError) as e:
+            return FrameworkResult(framework=framework, success=False, error=str(e))
+
+    results = [run(frameworks[0])]
+    if len(frameworks) > 1:
+        with ThreadPoolExecutor(max_workers=len(frameworks) - 1) as pool:
+            results.extend(pool.map(run, frameworks[1:]))
+
+    for result in results:
+        if result.success:
+            history.record(result.framework, template, result.output_tokens)
+    return results
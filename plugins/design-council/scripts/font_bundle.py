@@ -0,0 +1,339 @@
+"""
+Self-hosted, subset font bundles for offline previews.
+
+Handles:
+- Resolving families to font files in a local font directory
+  (Google Fonts download zips or the google/fonts repo layout both work)
+- Subsetting to the glyphs used on the page and converting to WOFF2
+- Caching subsets by content hash so repeat previews are instant
+- Falling back to Google Fonts for families fontTools cannot subset
+- Emitting @font-face rules with inline data URIs or sibling files
+
+Optional dependencies:
+    pip install fonttools brotli   # subsetting and WOFF2 output
+
+Without fontTools the matched files are embedded as-is (no subsetting).
+"""
+
+import base64
+import hashlib
+import io
+import logging
+import os
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from font_catalog import normalize_family
+
+try:
+    from fontTools import subset as ft_subset
+    from fontTools.ttLib import TTFont
+    # Keep "table dropped" notices out of the script's stderr report
+    logging.getLogger("fontTools").setLevel(logging.ERROR)
+except ImportError:  # fontTools is optional
+    ft_subset = None
+    TTFont = None
+
+try:
+    import brotli  # noqa: F401  (enables WOFF2 output in fontTools)
+    HAS_BROTLI = True
+except ImportError:
+    HAS_BROTLI = False
+
+
+FONT_DIR_NAME = "fonts"
+SUBSET_CACHE_DIR_NAME = "subsets"
+FONT_EXTENSIONS = {".woff2": "woff2", ".woff": "woff", ".ttf": "truetype", ".otf": "opentype"}
+FONT_MIME_TYPES = {"woff2": "font/woff2", "woff": "font/woff", "truetype": "font/ttf", "opentype": "font/otf"}
+
+# Static style suffix -> weight (checked longest first)
+STYLE_WEIGHTS = {
+    "thin": 100, "hairline": 100,
+    "extralight": 200, "ultralight": 200,
+    "light": 300,
+    "regular": 400, "normal": 400, "book": 400,
+    "medium": 500,
+    "semibold": 600, "demibold": 600,
+    "bold": 700,
+    "extrabold": 800, "ultrabold": 800,
+    "black": 900, "heavy": 900,
+}
+
+STEM_SPLIT = re.compile(r"[-_\[]")
+
+
+@dataclass
+class FontFile:
+    """A font file matched to a family."""
+    family: str
+    path: str
+    weight_range: Tuple[int, int]  # (w, w) for static files
+    variable: bool = False
+
+
+@dataclass
+class BundledFont:
+    """A font prepared for embedding."""
+    file: FontFile
+    data: bytes
+    format: str
+    subset: bool
+
+    @property
+    def filename(self) -> str:
+        digest = hashlib.sha256(self.data).hexdigest()[:12]
+        ext = {"woff2": "woff2", "woff": "woff", "truetype": "ttf", "opentype": "otf"}[self.format]
+        return f"{normalize_family(self.file.family)}-{self.file.weight_range[0]}-{digest}.{ext}"
+
+
+def _parse_font_filename(filename: str) -> Optional[Tuple[str, Optional[int], bool]]:
+    """
+    Split a font filename into (normalized family, weight, variable).
+
+    Examples: "Inter[opsz,wght].ttf", "PlayfairDisplay-VariableFont_wght.ttf",
+    "Lato-Bold.ttf", "SourceSans3-SemiBold.woff2". Italic files return None.
+    """
+    stem, ext = os.path.splitext(filename)
+    if ext.lower() not in FONT_EXTENSIONS or "italic" in stem.lower():
+        return None
+
+    base = STEM_SPLIT.split(stem, 1)[0]
+    suffix = stem[len(base):]
+    variable = "[" in stem or "variablefont" in stem.lower()
+    if variable:
+        return normalize_family(base), None, True
+
+    style = normalize_family(suffix)
+    weight = 400
+    for name in sorted(STYLE_WEIGHTS, key=len, reverse=True):
+        if style.startswith(name):
+            weight = STYLE_WEIGHTS[name]
+            break
+    return normalize_family(base), weight, False
+
+
+def index_font_dir(font_dir: str) -> Dict[str, List[Tuple[str, Optional[int], bool]]]:
+    """
+    Index a font directory (recursively) by normalized family name.
+
+    The default font directory also holds the subset cache, so a top-level
+    SUBSET_CACHE_DIR_NAME directory is skipped.
+
+    Returns:
+        {normalized family: [(path, weight or None, variable), ...]}
+    """
+    index: Dict[str, List[Tuple[str, Optional[int], bool]]] = {}
+    for root, dirs, files in os.walk(font_dir):
+        if root == font_dir:
+            dirs[:] = [name for name in dirs if name != SUBSET_CACHE_DIR_NAME]
+        for filename in files:
+            parsed = _parse_font_filename(filename)
+            if parsed:
+                family, weight, variable = parsed
+                index.setdefault(family, []).append((os.path.join(root, filename), weight, variable))
+    return index
+
+
+def resolve_font_files(
+    index: Dict[str, List[Tuple[str, Optional[int], bool]]],
+    family: str,
+    weights: List[int],
+    variable_range: Tuple[int, int] = (100, 900)
+) -> List[FontFile]:
+    """
+    Pick the files needed to render a family at the given weights.
+
+    A variable file covers every weight; otherwise the closest static
+    file per weight is used.
+
+    Args:
+        index: Result of index_font_dir()
+        family: Family name
+        weights: Weights used on the page
+        variable_range: Weight axis range to declare for variable files
+
+    Returns:
+        Matched files (empty if the family is not available locally)
+    """
+    entries = index.get(normalize_family(family), [])
+    if not entries:
+        return []
+
+    variable = [e for e in entries if e[2]]
+    if variable:
+        # Prefer woff2, then the smallest file
+        path = min((e[0] for e in variable), key=lambda p: (not p.endswith(".woff2"), os.path.getsize(p)))
+        return [FontFile(family, path, variable_range, variable=True)]
+
+    by_weight: Dict[int, str] = {}
+    for path, weight, _ in entries:
+        if weight not in by_weight or path.endswith(".woff2"):
+            by_weight[weight] = path
+
+    files = {}
+    for weight in weights or [400]:
+        nearest = min(by_weight, key=lambda w: (abs(w - weight), w))
+        files[nearest] = FontFile(family, by_weight[nearest], (nearest, nearest))
+    return [files[w] for w in sorted(files)]
+
+
+def subset_font(font_file: FontFile, text: Optional[str], cache_dir: Optional[str] = None) -> BundledFont:
+    """
+    Subset a font to the given text and convert it to WOFF2 (or WOFF).
+
+    Subsets are cached under cache_dir keyed by file content and text.
+    Without fontTools the file is returned unchanged.
+
+    Args:
+        font_file: Matched font file
+        text: Glyphs to keep (None keeps everything)
+        cache_dir: Directory for cached subsets
+
+    Returns:
+        BundledFont with the embeddable bytes
+
+    Raises:
+        OSError: If the font file cannot be read
+        ValueError: If fontTools cannot subset it (corrupt file, font
+            collection, WOFF2 source without brotli)
+    """
+    with open(font_file.path, "rb") as f:
+        original = f.read()
+
+    source_format = FONT_EXTENSIONS[os.path.splitext(font_file.path)[1].lower()]
+    if ft_subset is None or not text:
+        return BundledFont(font_file, original, source_format, subset=False)
+
+    flavor = "woff2" if HAS_BROTLI else "woff"
+    key = hashlib.sha256(original + b"\0" + text.encode("utf-8") + flavor.encode()).hexdigest()
+    cached = os.path.join(cache_dir, f"{key}.{flavor}") if cache_dir else None
+
+    if cached and os.path.exists(cached):
+        with open(cached, "rb") as f:
+            return BundledFont(font_file, f.read(), flavor, subset=True)
+
+    options = ft_subset.Options()
+    options.flavor = flavor
+    options.layout_features = ["*"]
+    options.name_IDs = ["*"]
+
+    try:
+        font = TTFont(io.BytesIO(original))
+        subsetter = ft_subset.Subsetter(options)
+        subsetter.populate(text=text)
+        subsetter.subset(font)
+
+        buffer = io.BytesIO()
+        font.flavor = flavor
+        font.save(buffer)
+    except Exception as e:
+        raise ValueError(f"Could not subset {os.path.basename(font_file.path)}: {str(e)}")
+    data = buffer.getvalue()
+
+    if cached:
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(cached, "wb") as f:
+            f.write(data)
+
+    return BundledFont(font_file, data, flavor, subset=True)
+
+
+def font_face_css(font: BundledFont, url: Optional[str] = None) -> str:
+    """
+    Build an @font-face rule.
+
+    Args:
+        font: Bundled font
+        url: Relative URL of a sibling file; inline data URI when None
+    """
+    if url is None:
+        encoded = base64.b64encode(font.data).decode("ascii")
+        url = f"data:{FONT_MIME_TYPES[font.format]};base64,{encoded}"
+
+    low, high = font.file.weight_range
+    weight = f"{low} {high}" if low != high else str(low)
+    return (
+        "@font-face {\n"
+        f"    font-family: '{font.file.family}';\n"
+        "    font-style: normal;\n"
+        f"    font-weight: {weight};\n"
+        "    font-display: swap;\n"
+        f"    src: url({url}) format('{font.format}');\n"
+        "}"
+    )
+
+
+def bundle_fonts(
+    fonts: List[Tuple[str, List[int]]],
+    font_dir: str,
+    text: Optional[str] = None,
+    output_dir: Optional[str] = None,
+    cache_dir: Optional[str] = None,
+    variable_ranges: Optional[Dict[str, Tuple[int, int]]] = None
+) -> Tuple[str, List[Tuple[str, List[int]]], Dict]:
+    """
+    Bundle fonts from a local directory as @font-face rules.
+
+    Args:
+        fonts: (family, weights) pairs used on the page
+        font_dir: Local font directory to resolve families from
+        text: Glyphs to keep when subsetting
+        output_dir: Write font files to output_dir/fonts/ instead of inlining
+        cache_dir: Directory for cached subsets
+        variable_ranges: Optional {family: (min, max)} weight axis ranges
+
+    Returns:
+        Tuple of (CSS, fonts not found locally or not subsettable, report);
+        the second list is meant to be loaded from Google Fonts instead
+    """
+    merged: Dict[str, set] = {}
+    for family, weights in fonts:
+        merged.setdefault(family, set()).update(weights)
+
+    index = index_font_dir(font_dir) if os.path.isdir(font_dir) else {}
+    rules, missing, bundled, failed = [], [], [], []
+
+    for family, weights in merged.items():
+        files = resolve_font_files(
+            index, family, sorted(weights), (variable_ranges or {}).get(family, (100, 900))
+        )
+        if not files:
+            missing.append((family, sorted(weights)))
+            continue
+
+        try:
+            prepared = [subset_font(font_file, text, cache_dir) for font_file in files]
+        except ValueError as e:
+            # Load the whole family remotely rather than mixing local and remote weights
+            missing.append((family, sorted(weights)))
+            failed.append({"family": family, "error": str(e)})
+            continue
+
+        for font_file, font in zip(files, prepared):
+            url = None
+            if output_dir:
+                target_dir = os.path.join(output_dir, FONT_DIR_NAME)
+                os.makedirs(target_dir, exist_ok=True)
+                with open(os.path.join(target_dir, font.filename), "wb") as f:
+                    f.write(font.data)
+                url = f"{FONT_DIR_NAME}/{font.filename}"
+
+            rules.append(font_face_css(font, url))
+            bundled.append({
+                "family": family,
+                "file": os.path.basename(font_file.path),
+                "weights": list(font_file.weight_range),
+                "format": font.format,
+                "subset": font.subset,
+                "bytes": len(font.data),
+            })
+
+    return "\n".join(rules), missing, {
+        "font_dir": font_dir,
+        "mode": "files" if output_dir else "inline",
+        "subsetting": ft_subset is not None and bool(text),
+        "bundled": bundled,
+        "missing": [family for family, _ in missing],
+        "failed": failed,
+    }
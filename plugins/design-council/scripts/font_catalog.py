@@ -0,0 +1,362 @@
+"""
+Offline Google Fonts catalog.
+
+Handles:
+- Loading the bundled metadata snapshot (data/google-fonts.json)
+- A normalized-name index for O(1) family lookups
+- Auto-correcting misspelled families and unavailable weights
+- Building css2 URLs and <link> tags from corrected families
+
+The snapshot covers the commonly used families, not the full Google
+Fonts library. Families missing from it are reported, not replaced,
+unless a close spelling match exists.
+"""
+
+import difflib
+import html
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, quote, quote_plus, urlsplit
+
+
+CATALOG_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "data", "google-fonts.json"
+)
+
+GOOGLE_FONTS_CSS2_URL = "https://fonts.googleapis.com/css2"
+
+# Typography option roles, and the weights requested when an option lists none
+OPTION_FONT_ROLES = ("display", "body", "mono")
+DEFAULT_OPTION_WEIGHTS = [400, 500, 600, 700]
+
+# Spelling correction: minimum difflib ratio and maximum length difference.
+# The length cap keeps real families missing from the snapshot (e.g. a
+# "Semi Condensed" cut) from being "corrected" to a sibling family.
+FUZZY_CUTOFF = 0.82
+FUZZY_MAX_LENGTH_DELTA = 2
+
+
+@dataclass
+class FontFamily:
+    """Metadata for one Google Fonts family."""
+    name: str
+    category: str
+    weights: List[int]  # static weights, or [min, max] when variable
+    variable: bool = False
+    axes: List[str] = field(default_factory=list)
+    italic: bool = False
+
+    def supports(self, weight: int) -> bool:
+        """Check whether a weight can be requested."""
+        if self.variable:
+            return self.weights[0] <= weight <= self.weights[-1]
+        return weight in self.weights
+
+    def snap_weight(self, weight: int) -> int:
+        """Return the closest available weight."""
+        if self.variable:
+            return min(max(weight, self.weights[0]), self.weights[-1])
+        return min(self.weights, key=lambda w: (abs(w - weight), w))
+
+
+def normalize_family(name: str) -> str:
+    """Index key for a family name: lowercase alphanumerics only."""
+    return "".join(c for c in str(name).lower() if c.isalnum())
+
+
+def _parse_weights(spec: str) -> Tuple[List[int], bool]:
+    if ".." in spec:
+        low, high = spec.split("..")
+        return [int(low), int(high)], True
+    return [int(w) for w in spec.split(",")], False
+
+
+class FontCatalog:
+    """
+    Indexed Google Fonts metadata.
+
+    Usage:
+        catalog = FontCatalog.load()
+        font = catalog.lookup("playfair display")
+        option, corrections = catalog.correct_option(option)
+    """
+
+    def __init__(self, families: Dict[str, List], snapshot_date: Optional[str] = None):
+        """
+        Build the index.
+
+        Args:
+            families: {name: [category, weights, axes, has_italic]} as in the snapshot
+            snapshot_date: Date of the metadata snapshot
+        """
+        self.snapshot_date = snapshot_date
+        self.families: Dict[str, FontFamily] = {}
+        for name, (category, weights, axes, italic) in families.items():
+            parsed, variable = _parse_weights(weights)
+            self.families[normalize_family(name)] = FontFamily(
+                name=name,
+                category=category,
+                weights=parsed,
+                variable=variable,
+                axes=[a for a in axes.split(",") if a],
+                italic=bool(italic),
+            )
+        self._keys = list(self.families)
+
+    @classmethod
+    def load(cls, path: str = CATALOG_PATH) -> "FontCatalog":
+        """
+        Load the bundled snapshot.
+
+        Raises:
+            OSError: If the file cannot be read
+            ValueError: If the file is not valid catalog JSON
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if not isinstance(data.get("families"), dict):
+            raise ValueError(f"Font catalog has no 'families' mapping: {path}")
+        return cls(data["families"], data.get("snapshot_date"))
+
+    def __len__(self) -> int:
+        return len(self.families)
+
+    def lookup(self, name: str) -> Optional[FontFamily]:
+        """Exact lookup, ignoring case, spaces and punctuation."""
+        return self.families.get(normalize_family(name))
+
+    def resolve(self, name: str) -> Optional[FontFamily]:
+        """
+        Look up a family, falling back to the closest spelling.
+
+        Returns:
+            The matching family, or None if nothing is close enough
+        """
+        font = self.lookup(name)
+        if font is not None:
+            return font
+
+        key = normalize_family(name)
+        for match in difflib.get_close_matches(key, self._keys, n=3, cutoff=FUZZY_CUTOFF):
+            if abs(len(match) - len(key)) <= FUZZY_MAX_LENGTH_DELTA:
+                return self.families[match]
+        return None
+
+    def by_category(self, category: str) -> List[FontFamily]:
+        """All families in a category, alphabetically."""
+        return sorted(
+            (f for f in self.families.values() if f.category == category),
+            key=lambda f: f.name
+        )
+
+    def snap_weights(self, family: str, weights: List[int]) -> List[int]:
+        """
+        Closest available weights of a family (unchanged when it is unknown).
+
+        css2 rejects the whole request if one family asks for a weight it
+        does not have, so every family is snapped before URLs are merged.
+        """
+        entry = self.lookup(family)
+        if entry is None:
+            return sorted({int(w) for w in weights})
+        return sorted({entry.snap_weight(int(w)) for w in weights})
+
+    def correct_font(self, font: Dict, role: str) -> Tuple[Dict, List[Dict]]:
+        """
+        Correct one font entry ({"family", "weights", ...}).
+
+        Args:
+            font: Font dict from a typography option
+            role: "display", "body" or "mono" (for reporting)
+
+        Returns:
+            Tuple of (corrected copy, list of corrections made)
+        """
+        corrections = []
+        family = font.get("family", "")
+        entry = self.resolve(family)
+
+        if entry is None:
+            return dict(font), [{"role": role, "field": "family", "from": family, "to": None,
+                                 "reason": "not in offline catalog"}]
+
+        corrected = dict(font)
+        if entry.name != family:
+            corrections.append({"role": role, "field": "family", "from": family, "to": entry.name,
+                                "reason": "spelling"})
+            corrected["family"] = entry.name
+
+        weights = font.get("weights") or [400]
+        try:
+            requested = [int(w) for w in weights]
+        except (TypeError, ValueError):
+            requested = [400]
+
+        snapped = sorted({entry.snap_weight(w) for w in requested})
+        if snapped != sorted(set(requested)):
+            corrections.append({"role": role, "field": "weights", "from": weights, "to": snapped,
+                                "reason": "unavailable weight"})
+        corrected["weights"] = snapped
+
+        return corrected, corrections
+
+    def correct_option(self, option: Dict) -> Tuple[Dict, List[Dict]]:
+        """
+        Correct all fonts of a typography option and rebuild its URL.
+
+        Returns:
+            Tuple of (corrected copy, list of corrections made)
+        """
+        corrected = dict(option)
+        corrections = []
+
+        for role in ("display", "body", "mono"):
+            if isinstance(option.get(role), dict) and option[role].get("family"):
+                corrected[role], found = self.correct_font(option[role], role)
+                corrections.extend(found)
+
+        if any(c["to"] is not None for c in corrections):
+            corrected["google_fonts_url"] = build_css2_url([
+                (corrected[role]["family"], corrected[role].get("weights", [400]))
+                for role in ("display", "body", "mono")
+                if isinstance(corrected.get(role), dict) and corrected[role].get("family")
+            ])
+
+        return corrected, corrections
+
+
+def build_css2_url(fonts: List[Tuple[str, List[int]]], text: Optional[str] = None) -> str:
+    """
+    Build a Google Fonts css2 URL.
+
+    Args:
+        fonts: List of (family, weights) pairs; duplicates are merged
+        text: Optional glyph subset; only these characters are served
+
+    Returns:
+        URL with one family= parameter per family and display=swap
+    """
+    merged: Dict[str, set] = {}
+    for family, weights in fonts:
+        merged.setdefault(family, set()).update(int(w) for w in weights)
+
+    params = []
+    for family, weights in merged.items():
+        name = quote_plus(family)
+        if weights and weights != {400}:
+            params.append(f"family={name}:wght@{';'.join(str(w) for w in sorted(weights))}")
+        else:
+            params.append(f"family={name}")
+
+    params.append("display=swap")
+    if text:
+        params.append(f"text={quote(''.join(sorted(set(text))), safe='')}")
+
+    return f"{GOOGLE_FONTS_CSS2_URL}?{'&'.join(params)}"
+
+
+def parse_css2_url(url: str) -> List[Tuple[str, List[int]]]:
+    """
+    Extract (family, weights) pairs from a css2 (or css) Google Fonts URL.
+
+    Understands "wght@400;700", "ital,wght@0,400;1,700" and "wght@300..700".
+    Families without an axis spec get weight 400.
+    """
+    fonts = []
+    for key, value in parse_qsl(urlsplit(url).query, keep_blank_values=True):
+        if key != "family" or not value:
+            continue
+
+        for spec in value.split("|"):
+            name, _, axes = spec.partition(":")
+            weights = set()
+            tags, _, tuples = axes.partition("@")
+            if "wght" in tags.split(","):
+                index = tags.split(",").index("wght")
+                for item in tuples.split(";"):
+                    parts = item.split(",")
+                    if index >= len(parts):
+                        continue
+                    low, _, high = parts[index].partition("..")
+                    try:
+                        if high:
+                            weights.update(range(int(low), int(high) + 1, 100))
+                        else:
+                            weights.add(int(low))
+                    except ValueError:
+                        continue
+            elif axes:
+                # css v1 style: "Font:400,700"
+                weights.update(int(w) for w in axes.split(",") if w.strip().isdigit())
+
+            fonts.append((name.strip(), sorted(weights) or [400]))
+
+    return fonts
+
+
+_catalog: Optional[FontCatalog] = None
+
+
+def get_catalog() -> Optional[FontCatalog]:
+    """The bundled catalog, loaded on first use (None if it cannot be read)."""
+    global _catalog
+    if _catalog is None:
+        try:
+            _catalog = FontCatalog.load()
+        except (OSError, ValueError):
+            return None
+    return _catalog
+
+
+def collect_fonts(typography: List[Dict]) -> List[Tuple[str, List[int]]]:
+    """
+    Collect (family, weights) pairs across all typography options.
+
+    Structured display/body/mono entries are authoritative; families that
+    only appear in a model-supplied google_fonts_url are merged in too.
+    Weights are snapped to what each family offers in the catalog, so a
+    merged css2 URL never asks for a missing weight.
+    """
+    fonts = []
+    for option in typography:
+        families = set()
+        for key in OPTION_FONT_ROLES:
+            if isinstance(option.get(key), dict) and option[key].get("family"):
+                family = option[key]["family"]
+                fonts.append((family, option[key].get("weights") or DEFAULT_OPTION_WEIGHTS))
+                families.add(family)
+
+        if option.get("google_fonts_url"):
+            fonts.extend(
+                (family, weights)
+                for family, weights in parse_css2_url(option["google_fonts_url"])
+                if family not in families
+            )
+
+    catalog = get_catalog()
+    if catalog is not None:
+        fonts = [(family, catalog.snap_weights(family, weights)) for family, weights in fonts]
+    return fonts
+
+
+def css2_link_tags(fonts: List[Tuple[str, List[int]]], text: Optional[str] = None) -> str:
+    """
+    One consolidated css2 stylesheet link with preconnect hints.
+
+    Args:
+        fonts: (family, weights) pairs to request
+        text: Optional glyph subset (css2 text= parameter)
+
+    Returns:
+        HTML link tags for the document head, or "" when fonts is empty
+    """
+    if not fonts:
+        return ""
+
+    return "\n    ".join([
+        '<link rel="preconnect" href="https://fonts.googleapis.com">',
+        '<link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>',
+        f'<link rel="stylesheet" href="{html.escape(build_css2_url(fonts, text=text))}">',
+    ])
@@ -7,6 +7,11 @@ Main entry point that orchestrates the modular components:
 - api_client: Gemini API interaction
 - prompt_builder: Prompt construction
 - response_parser: Response extraction
+- completeness: Structural completeness (open fences, brackets, tags)
+- css_optimize: Generated CSS deduplication and minification
+- design_tokens: Compiled token stylesheet referenced by the prompt
+- fanout: Multi-framework generation from one shared, cache-warmed prefix
+- token_budget: Context trimming and output budget planning
 
 Reads design specification from stdin as JSON, calls Gemini API,
 and outputs generated code to stdout.
@@ -18,25 +23,52 @@ Usage:
 
     # Or with the hyphenated name (symlink)
     echo '{"design_spec": "...", "framework": "react"}' | python gemini-generate.py
+
+    # Watch an html page build up while it streams (serve the staging
+    # directory with preview-server.py); abort early with Ctrl-C:
+    echo '{"design_spec": "...", "framework": "html"}' | python gemini_generate.py --live-html ./.design-sprint-staging/live/index.html
+
+    # Name compiled design tokens (design-tokens.py) in the prompt instead of
+    # the palette values; tokens.css is added to the generated code
+    echo '{"design_spec": "...", "framework": "react"}' | python gemini_generate.py --tokens ./.design-sprint-staging/tokens/tokens.json
+
+    # One spec, several stacks at once (one directory per framework)
+    echo '{"design_spec": "...", "palette": {...}, "typography": {...}}' | python gemini_generate.py --frameworks react,vue,svelte --out-dir ./.design-sprint-staging/round-1/code
 """
 
+import argparse
 import json
 import sys
+import time
 from typing import Optional
 
 # Import modular components
 from validators import (
     validate_api_key,
     validate_design_spec,
-    get_api_key
+    get_api_key,
+    get_cache_dir
 )
-from api_client import GeminiClient, APIConfig
-from prompt_builder import build_initial_prompt
+from api_client import GeminiClient, APIConfig, MODEL_MAX_OUTPUT_TOKENS
+from completeness import check_completeness
+from css_optimize import optimize_response
+from design_tokens import TokenSet, inject_tokens, load_tokens, prompt_reference
+from fanout import fan_out, parse_frameworks
+from live_html import LiveHtml
+from prompt_builder import build_initial_prompt, build_fanout_prefix, design_token_block
 from response_parser import (
     extract_code,
     parse_structured_output,
     estimate_lines_of_code
 )
+from token_budget import (
+    TokenBudget,
+    OutputHistory,
+    DEFAULT_MAX_CONTEXT_TOKENS,
+    estimate_tokens,
+    plan_output_tokens,
+    trim_context
+)
 
 
 def output_error(message: str, exit_code: int = 1) -> None:
@@ -66,8 +98,106 @@ def read_input() -> dict:
         output_error(f"Invalid JSON input: {str(e)}")
 
 
+def parse_args() -> argparse.Namespace:
+    """Parse command-line flags."""
+    parser = argparse.ArgumentParser(description="Generate frontend code with Gemini.")
+    parser.add_argument(
+        "--live-html",
+        metavar="HTML",
+        help="For framework html: stream the response and keep this file updated with "
+             "the completed part of the page (unclosed tags auto-closed)"
+    )
+    parser.add_argument(
+        "--optimize-css",
+        action="store_true",
+        help="Deduplicate the generated CSS (```css blocks and <style> elements): "
+             "repeated declarations and rules, superseded custom properties"
+    )
+    parser.add_argument(
+        "--minify-css",
+        action="store_true",
+        help="Like --optimize-css, with minified CSS in code and the readable "
+             "version in code_readable"
+    )
+    parser.add_argument(
+        "--tokens",
+        metavar="TOKENS_JSON",
+        help="tokens.json from design-tokens.py: the prompt names the token properties "
+             "instead of spelling out values, and tokens.css is added to the output"
+    )
+    parser.add_argument(
+        "--frameworks",
+        metavar="LIST",
+        help="Generate several frameworks from one spec, e.g. react,vue,svelte "
+             "(needs --out-dir; overrides the input's framework)"
+    )
+    parser.add_argument(
+        "--out-dir",
+        metavar="DIR",
+        help="With --frameworks: write each framework's files to DIR/<framework>/"
+    )
+    return parser.parse_args()
+
+
+def fanout_call(client: GeminiClient, prompt: str):
+    """One fan-out request, made like the single-framework path (is a single call)."""
+    return client.generate(prompt)
+
+
+def run_fanout(args: argparse.Namespace, design_spec: dict, api_key: str,
+               context: Optional[str], context_tokens_removed: int,
+               tokens: Optional[TokenSet]) -> None:
+    """Generate every --frameworks target from one shared prefix and print a summary."""
+    try:
+        frameworks = parse_frameworks(args.frameworks)
+    except ValueError as e:
+        output_error(str(e))
+    if not args.out_dir:
+        output_error("--frameworks needs --out-dir (one directory per framework)")
+
+    started = time.perf_counter()
+    design_tokens = design_token_block(design_spec) if tokens is None else None
+    prefix = build_fanout_prefix(
+        design_spec=design_spec.get("design_spec") or design_spec.get("description", ""),
+        design_tokens=design_tokens,
+        context=context,
+        feedback=design_spec.get("feedback"),
+        token_reference=prompt_reference(tokens) if tokens is not None else None
+    )
+    template = design_spec.get("template") or design_spec.get("name") or "custom"
+
+    results = fan_out(
+        frameworks,
+        prefix,
+        api_key,
+        OutputHistory(get_cache_dir()),
+        template,
+        args.out_dir,
+        fanout_call,
+        optimize_css=args.optimize_css,
+        minify_css=args.minify_css,
+        tokens=tokens
+    )
+
+    result = {
+        "error": not any(r.success for r in results),
+        "out_dir": args.out_dir,
+        "frameworks": [r.to_dict() for r in results],
+        "shared_prefix_tokens": estimate_tokens(prefix),
+        "design_tokens": args.tokens or ("inline" if design_tokens else None),
+        "context_tokens_removed": context_tokens_removed,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        "sequential_ms": round(sum(r.elapsed_ms for r in results), 1)
+    }
+    if args.live_html:
+        result["live_html"] = {"path": args.live_html, "skipped": "live rendering is not available with --frameworks"}
+    output_result(result)
+
+
 def main():
     """Main entry point."""
+    args = parse_args()
+
     # Step 1: Read input
     design_spec = read_input()
 
@@ -83,22 +213,71 @@ def main():
 
     api_key = get_api_key()
 
+    tokens = None
+    if args.tokens:
+        try:
+            tokens = load_tokens(args.tokens)
+        except ValueError as e:
+            output_error(str(e))
+
     # Step 4: Build prompt
     spec_text = design_spec.get("design_spec") or design_spec.get("description", "")
     framework = design_spec.get("framework", "react")
     context = design_spec.get("context")
     feedback = design_spec.get("feedback")
+    template = design_spec.get("template") or design_spec.get("name") or "custom"
+
+    context, context_tokens_removed = trim_context(
+        context,
+        design_spec.get("max_context_tokens", DEFAULT_MAX_CONTEXT_TOKENS)
+    )
+
+    if args.frameworks:
+        run_fanout(args, design_spec, api_key, context, context_tokens_removed, tokens)
+        return
 
     prompt = build_initial_prompt(
         design_spec=spec_text,
         framework=framework,
         context=context,
-        feedback=feedback
+        feedback=feedback,
+        token_reference=prompt_reference(tokens) if tokens is not None else None
     )
 
-    # Step 5: Call Gemini API
+    live = None
+    live_skipped = None
+    if args.live_html:
+        if framework == "html":
+            live = LiveHtml(args.live_html)
+        else:
+            live_skipped = f"live rendering needs framework html, got {framework}"
+
+    # Step 4b: Plan token budget from prompt estimate and output history
     client = GeminiClient(api_key)
-    response = client.generate(prompt)
+    history = OutputHistory(get_cache_dir())
+    samples = history.samples(framework, template)
+
+    max_output_tokens, budget_source = plan_output_tokens(
+        samples,
+        default=client.config.max_output_tokens,
+        ceiling=MODEL_MAX_OUTPUT_TOKENS
+    )
+    client.config.max_output_tokens = max_output_tokens
+
+    budget = TokenBudget(
+        prompt_tokens=estimate_tokens(prompt),
+        max_output_tokens=max_output_tokens,
+        output_budget_source=budget_source,
+        history_samples=len(samples),
+        context_trimmed=context_tokens_removed > 0,
+        context_tokens_removed=context_tokens_removed
+    )
+
+    # Step 5: Call Gemini API (streamed when rendering live)
+    if live is not None:
+        response = client.generate_stream(prompt, live.feed)
+    else:
+        response = client.generate(prompt)
 
     if not response.success:
         output_error(response.error_message)
@@ -109,20 +288,54 @@ def main():
     if parsed.error:
         output_error(parsed.error)
 
-    # Step 7: Build result
+    if live is not None:
+        live.finish(parsed.code)
+
+    # Step 6b: Add the token stylesheet Gemini was told about
+    code = parsed.code
+    token_report = None
+    if tokens is not None:
+        code, token_report = inject_tokens(code, tokens, framework)
+
+    # Step 6c: Deduplicate (and minify) generated CSS
+    css = None
+    if args.optimize_css or args.minify_css:
+        css = optimize_response(code, minify=args.minify_css)
+        code = css.code
+
+    # Step 7: Record output size for future budgets
+    output_tokens = (parsed.usage or {}).get("candidatesTokenCount") or estimate_tokens(parsed.code)
+    history.record(framework, template, output_tokens)
+
+    # Step 8: Build result
     structured = parse_structured_output(response.data)
     lines_of_code = estimate_lines_of_code(response.data)
 
     result = {
         "error": False,
-        "code": parsed.code,
+        "code": code,
         "finish_reason": parsed.finish_reason,
         "usage": parsed.usage,
         "lines_of_code": lines_of_code,
         "components_count": len(structured.get("components", [])),
-        "has_styles": structured.get("styles") is not None
+        "has_styles": structured.get("styles") is not None,
+        "token_budget": budget.to_dict(),
+        "completeness": check_completeness(parsed.code).to_dict()
     }
 
+    if token_report is not None:
+        result["design_tokens"] = {"file": args.tokens, **token_report}
+
+    if css is not None:
+        result["css"] = css.stats.to_dict()
+        if args.minify_css:
+            result["code_readable"] = css.readable
+
+    if live is not None:
+        result["live_html"] = live.report()
+    elif live_skipped:
+        result["live_html"] = {"path": args.live_html, "skipped": live_skipped}
+
     output_result(result)
 
 
@@ -0,0 +1,356 @@
+"""
+Dominant color extraction from reference images.
+
+Handles:
+- Decoding PNG with the standard library (zlib + scanline unfiltering)
+- Decoding JPEG/PNG/WebP with Pillow when it is installed (faster)
+- Downsampling to a small pixel grid
+- Weighted k-means in OKLab over a quantized color histogram
+
+Optional dependency:
+    pip install Pillow   # JPEG support and faster decoding of large photos
+"""
+
+import random
+import struct
+import zlib
+from typing import Dict, List, Tuple
+
+from color_space import (
+    linear_rgb_to_oklab,
+    oklab_to_linear_rgb,
+    linear_to_srgb,
+    rgb_to_hex,
+    srgb_to_linear,
+)
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is optional
+    Image = None
+
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+PNG_CHANNELS = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}
+
+# Downsampling: sample roughly SAMPLE_GRID x SAMPLE_GRID pixels
+SAMPLE_GRID = 160
+MIN_ALPHA = 128
+
+# Histogram quantization (bits kept per channel) and clustering
+QUANT_BITS = 4
+KMEANS_ITERATIONS = 12
+MIN_CLUSTER_DISTANCE = 0.04  # OKLab distance below which colors are merged
+DEFAULT_COLOR_COUNT = 5
+
+
+Pixel = Tuple[int, int, int]
+
+
+def _swar_add(a: int, b: int, low: int, high: int) -> int:
+    """Add two byte strings packed into ints, lane-wise modulo 256."""
+    return ((a & low) + (b & low)) ^ ((a ^ b) & high)
+
+
+def _unfilter_row(
+    filter_type: int,
+    raw: bytes,
+    prior: bytearray,
+    bpp: int
+) -> bytearray:
+    """Reverse PNG scanline filtering for one row."""
+    n = len(raw)
+
+    if filter_type == 0:
+        return bytearray(raw)
+
+    if filter_type in (1, 2):
+        # None/Sub/Up are lane-wise additions: do them on packed ints
+        low = int.from_bytes(b"\x7f" * n, "little")
+        high = int.from_bytes(b"\x80" * n, "little")
+        full = (1 << (8 * n)) - 1
+        value = int.from_bytes(raw, "little")
+
+        if filter_type == 2:
+            value = _swar_add(value, int.from_bytes(prior, "little"), low, high)
+        else:
+            # Prefix sum with stride bpp by doubling
+            shift = bpp
+            while shift < n:
+                value = _swar_add(value, (value << (8 * shift)) & full, low, high)
+                shift *= 2
+
+        return bytearray(value.to_bytes(n, "little"))
+
+    out = bytearray(raw)
+    if filter_type == 3:
+        for i in range(bpp):
+            out[i] = (out[i] + (prior[i] >> 1)) & 0xFF
+        for i in range(bpp, n):
+            out[i] = (out[i] + ((out[i - bpp] + prior[i]) >> 1)) & 0xFF
+    elif filter_type == 4:
+        for i in range(bpp):
+            out[i] = (out[i] + prior[i]) & 0xFF
+        for i in range(bpp, n):
+            a, b, c = out[i - bpp], prior[i], prior[i - bpp]
+            pa, pb, pc = abs(b - c), abs(a - c), abs(a + b - 2 * c)
+            if pa <= pb and pa <= pc:
+                out[i] = (out[i] + a) & 0xFF
+            elif pb <= pc:
+                out[i] = (out[i] + b) & 0xFF
+            else:
+                out[i] = (out[i] + c) & 0xFF
+    else:
+        raise ValueError(f"Corrupt PNG: unknown filter type {filter_type}")
+
+    return out
+
+
+def _read_png(path: str) -> List[Pixel]:
+    """Decode a PNG with the standard library, returning sampled RGB pixels."""
+    with open(path, "rb") as f:
+        data = f.read()
+
+    if not data.startswith(PNG_SIGNATURE):
+        raise ValueError(f"Not a PNG file: {path}")
+
+    pos, header, palette, transparency, idat = 8, None, None, None, []
+    while pos + 8 <= len(data):
+        length, chunk_type = struct.unpack(">I4s", data[pos:pos + 8])
+        chunk = data[pos + 8:pos + 8 + length]
+        pos += 12 + length
+
+        if chunk_type == b"IHDR":
+            header = struct.unpack(">IIBBBBB", chunk)
+        elif chunk_type == b"PLTE":
+            palette = [tuple(chunk[i:i + 3]) for i in range(0, len(chunk), 3)]
+        elif chunk_type == b"tRNS":
+            transparency = chunk
+        elif chunk_type == b"IDAT":
+            idat.append(chunk)
+        elif chunk_type == b"IEND":
+            break
+
+    if header is None:
+        raise ValueError(f"Corrupt PNG (no IHDR): {path}")
+
+    width, height, bit_depth, color_type, _, _, interlace = header
+    if interlace:
+        raise ValueError("Interlaced PNGs need Pillow (pip install Pillow)")
+    if color_type not in PNG_CHANNELS:
+        raise ValueError(f"Unsupported PNG color type: {color_type}")
+    if color_type == 3 and not palette:
+        raise ValueError("Corrupt PNG: palette image without PLTE")
+
+    channels = PNG_CHANNELS[color_type]
+    bits_per_pixel = channels * bit_depth
+    bpp = max(1, bits_per_pixel // 8)
+    row_bytes = (width * bits_per_pixel + 7) // 8
+    sample_size = bit_depth // 8 if bit_depth >= 8 else 0
+    max_value = (1 << bit_depth) - 1
+
+    raw = zlib.decompress(b"".join(idat))
+    row_step = max(1, height // SAMPLE_GRID)
+    columns = range(0, width, max(1, width // SAMPLE_GRID))
+
+    def sample(row: bytearray, x: int, channel: int) -> int:
+        if sample_size:
+            # 8-bit, or high byte of 16-bit samples
+            return row[(x * channels + channel) * sample_size]
+        bit = x * bit_depth
+        return (row[bit >> 3] >> (8 - bit_depth - (bit & 7))) & max_value
+
+    pixels: List[Pixel] = []
+    prior = bytearray(row_bytes)
+    stride = row_bytes + 1
+    for y in range(height):
+        start = y * stride
+        row = _unfilter_row(raw[start], raw[start + 1:start + stride], prior, bpp)
+        prior = row
+
+        if y % row_step:
+            continue
+
+        for x in columns:
+            if color_type == 3:
+                index = sample(row, x, 0)
+                if transparency and index < len(transparency) and transparency[index] < MIN_ALPHA:
+                    continue
+                pixels.append(palette[index])
+                continue
+
+            values = [sample(row, x, c) for c in range(channels)]
+            if bit_depth < 8:
+                values = [v * 255 // max_value for v in values]
+            if color_type in (4, 6) and values[-1] < MIN_ALPHA:
+                continue
+            if color_type in (0, 4):
+                pixels.append((values[0], values[0], values[0]))
+            else:
+                pixels.append(tuple(values[:3]))
+
+    return pixels
+
+
+def _read_with_pillow(path: str) -> List[Pixel]:
+    """Decode any Pillow-supported image, returning sampled RGB pixels."""
+    with Image.open(path) as image:
+        # JPEG decoders can downscale during DCT decoding
+        image.draft("RGB", (SAMPLE_GRID * 2, SAMPLE_GRID * 2))
+        image = image.convert("RGBA")
+        image.thumbnail((SAMPLE_GRID, SAMPLE_GRID))
+        return [p[:3] for p in image.getdata() if p[3] >= MIN_ALPHA]
+
+
+def load_pixels(path: str) -> List[Pixel]:
+    """
+    Load a downsampled set of opaque RGB pixels from an image file.
+
+    Args:
+        path: Path to a PNG (stdlib) or any Pillow-supported image
+
+    Returns:
+        List of (r, g, b) tuples in 0..255
+
+    Raises:
+        ValueError: If the image cannot be decoded
+        OSError: If the file cannot be read
+    """
+    if Image is not None:
+        try:
+            return _read_with_pillow(path)
+        except Exception as e:
+            raise ValueError(f"Could not decode image {path}: {str(e)}")
+
+    with open(path, "rb") as f:
+        is_png = f.read(8) == PNG_SIGNATURE
+    if not is_png:
+        raise ValueError(
+            "Only PNG images can be read without Pillow. "
+            "Install it for JPEG support: pip install Pillow"
+        )
+
+    try:
+        return _read_png(path)
+    except (zlib.error, struct.error, IndexError) as e:
+        raise ValueError(f"Corrupt PNG {path}: {str(e)}")
+
+
+def _distance_sq(a: Tuple[float, float, float], b: Tuple[float, float, float]) -> float:
+    return (a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2 + (a[2] - b[2]) ** 2
+
+
+def dominant_colors(pixels: List[Pixel], count: int = DEFAULT_COLOR_COUNT) -> List[Dict]:
+    """
+    Cluster pixels into dominant colors with weighted k-means in OKLab.
+
+    Pixels are first quantized into a histogram, so clustering cost
+    depends on the number of distinct colors, not the image size.
+
+    Args:
+        pixels: RGB pixels in 0..255
+        count: Number of colors to return
+
+    Returns:
+        List of {"hex", "share"} sorted by share, largest first
+    """
+    if not pixels:
+        return []
+
+    shift = 8 - QUANT_BITS
+    histogram: Dict[Pixel, int] = {}
+    for r, g, b in pixels:
+        key = (r >> shift, g >> shift, b >> shift)
+        histogram[key] = histogram.get(key, 0) + 1
+
+    half = 1 << (shift - 1)
+    points, weights = [], []
+    for (r, g, b), weight in histogram.items():
+        rgb = ((r << shift) + half, (g << shift) + half, (b << shift) + half)
+        points.append(linear_rgb_to_oklab(tuple(srgb_to_linear(c / 255) for c in rgb)))
+        weights.append(weight)
+
+    # Deterministic weighted farthest-point initialization
+    k = min(count * 2, len(points))
+    centers = [points[max(range(len(points)), key=weights.__getitem__)]]
+    nearest = [_distance_sq(p, centers[0]) for p in points]
+    rng = random.Random(0)
+    while len(centers) < k:
+        scores = [w * d for w, d in zip(weights, nearest)]
+        total = sum(scores)
+        if total == 0:
+            break
+        target, acc, index = rng.random() * total, 0.0, 0
+        for index, score in enumerate(scores):
+            acc += score
+            if acc >= target:
+                break
+        centers.append(points[index])
+        nearest = [min(d, _distance_sq(p, points[index])) for p, d in zip(points, nearest)]
+
+    assignment = [-1] * len(points)
+    for _ in range(KMEANS_ITERATIONS):
+        changed = False
+        for i, (L, a, b) in enumerate(points):
+            best, best_distance = 0, float("inf")
+            for c, (cl, ca, cb) in enumerate(centers):
+                distance = (L - cl) ** 2 + (a - ca) ** 2 + (b - cb) ** 2
+                if distance < best_distance:
+                    best, best_distance = c, distance
+            if best != assignment[i]:
+                assignment[i], changed = best, True
+        if not changed:
+            break
+
+        sums = [[0.0, 0.0, 0.0, 0] for _ in centers]
+        for p, w, c in zip(points, weights, assignment):
+            s = sums[c]
+            s[0] += p[0] * w
+            s[1] += p[1] * w
+            s[2] += p[2] * w
+            s[3] += w
+        centers = [
+            (s[0] / s[3], s[1] / s[3], s[2] / s[3]) if s[3] else centers[i]
+            for i, s in enumerate(sums)
+        ]
+
+    cluster_weights = [0] * len(centers)
+    for w, c in zip(weights, assignment):
+        cluster_weights[c] += w
+
+    # Merge near-identical clusters, keeping the heavier one
+    ranked = sorted(zip(cluster_weights, centers), key=lambda item: -item[0])
+    merged: List[List] = []
+    for weight, center in ranked:
+        if weight == 0:
+            continue
+        for entry in merged:
+            if _distance_sq(entry[1], center) < MIN_CLUSTER_DISTANCE ** 2:
+                entry[0] += weight
+                break
+        else:
+            merged.append([weight, center])
+
+    total = sum(weights)
+    merged.sort(key=lambda item: -item[0])
+    return [
+        {
+            "hex": rgb_to_hex(tuple(linear_to_srgb(c) for c in oklab_to_linear_rgb(center))),
+            "share": round(weight / total, 3)
+        }
+        for weight, center in merged[:count]
+    ]
+
+
+def extract_reference_colors(path: str, count: int = DEFAULT_COLOR_COUNT) -> List[Dict]:
+    """
+    Extract the dominant colors of an image file.
+
+    Args:
+        path: Image path (PNG without Pillow; any format with Pillow)
+        count: Number of colors to return
+
+    Returns:
+        List of {"hex", "share"} sorted by share, largest first
+    """
+    return dominant_colors(load_pixels(path), count)
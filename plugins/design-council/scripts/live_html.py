@@ -0,0 +1,213 @@
+"""
+Progressive live render of generated HTML while it is still streaming.
+
+Handles:
+- Locating the HTML document in the streamed response (```html fence or
+  a bare <!DOCTYPE>/<html>)
+- Cutting the text at the last completed block and auto-closing the
+  elements that are still open
+- Atomic writes, so preview-server.py never serves a half-written file
+
+Pair with preview-server.py: every write is pushed to the open page,
+which swaps in the new body (partial pages) or reloads (final page), so a
+clearly wrong generation can be aborted long before it finishes.
+"""
+
+import os
+import re
+from html.parser import HTMLParser
+from typing import Dict, List, Optional
+
+
+# End tags that complete a block worth showing
+BLOCK_TAGS = {
+    "head", "style", "script", "body", "header", "footer", "main", "nav", "section",
+    "article", "aside", "div", "form", "fieldset", "ul", "ol", "li", "dl", "table",
+    "thead", "tbody", "tr", "figure", "blockquote", "pre", "p",
+    "h1", "h2", "h3", "h4", "h5", "h6", "button", "svg", "template",
+}
+VOID_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta",
+    "param", "source", "track", "wbr",
+}
+HTML_FENCE = re.compile(r"```html[^\n]*\n", re.IGNORECASE)
+DOCUMENT_START = re.compile(r"<!doctype html|<html[\s>]", re.IGNORECASE)
+STATUS_ID = "live-render-status"
+STATUS_BADGE = (
+    f'<div id="{STATUS_ID}" style="position:fixed;right:12px;bottom:12px;z-index:2147483647;'
+    'padding:6px 12px;border-radius:999px;background:#111;color:#fff;'
+    'font:12px/1.4 monospace;opacity:0.85;pointer-events:none">'
+    'Generating&hellip; {blocks} blocks</div>'
+)
+
+
+class BlockTracker(HTMLParser):
+    """
+    Incrementally parses the document and remembers where the last block
+    ended and which elements were open at that point.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        self.text = ""
+        self.line_starts = [0]
+        self.stack: List[str] = []
+        self.cut = 0
+        self.open_at_cut: List[str] = []
+        self.blocks = 0
+
+    def add(self, chunk: str) -> None:
+        """Feed the next piece of the document."""
+        base = len(self.text)
+        self.text += chunk
+        self.line_starts.extend(base + m.end() for m in re.finditer("\n", chunk))
+        self.feed(chunk)
+
+    def handle_starttag(self, tag, attrs):
+        if tag not in VOID_TAGS:
+            self.stack.append(tag)
+
+    def handle_endtag(self, tag):
+        if tag not in self.stack:
+            return  # stray end tag; browsers ignore it too
+        while self.stack.pop() != tag:
+            pass
+        if tag in BLOCK_TAGS:
+            line, col = self.getpos()
+            start = self.line_starts[line - 1] + col
+            self.cut = self.text.index(">", start) + 1
+            self.open_at_cut = list(self.stack)
+            self.blocks += 1
+
+    def snapshot(self, badge: bool = True) -> str:
+        """The completed portion with open elements closed."""
+        document = self.text[:self.cut]
+        if badge and "body" in self.open_at_cut:
+            document += STATUS_BADGE.replace("{blocks}", str(self.blocks))
+        return document + "".join(f"</{tag}>" for tag in reversed(self.open_at_cut))
+
+
+def find_document(text: str) -> Optional[tuple]:
+    """
+    Locate the HTML document in a (possibly partial) response.
+
+    Args:
+        text: Response text received so far
+
+    Returns:
+        (start, end) offsets, end being None while the document is still
+        open, or None if no document has started yet
+    """
+    fence = HTML_FENCE.search(text)
+    if fence:
+        close = text.find("```", fence.end())
+        return fence.end(), (close if close >= 0 else None)
+    bare = DOCUMENT_START.search(text)
+    if bare:
+        return bare.start(), None
+    return None
+
+
+class LiveHtml:
+    """
+    An HTML file rewritten as generated code streams in.
+
+    Usage:
+        live = LiveHtml("./.design-sprint-staging/live/index.html")
+        client.generate_stream(prompt, live.feed)   # partial, auto-closed pages
+        live.finish(parsed.code)                    # complete page
+    """
+
+    def __init__(self, output: str):
+        """
+        Args:
+            output: HTML file to (re)write
+        """
+        self.output = output
+        self.text = ""
+        self.fed = 0
+        self.start: Optional[int] = None
+        self.closed = False
+        self.tracker = BlockTracker()
+        self.written_blocks = 0
+        self.writes = 0
+        self.complete = False
+        self.errors: List[str] = []
+
+    def feed(self, chunk: str) -> None:
+        """Add streamed text; rewrite the page when another block completes."""
+        self.text += chunk
+        if self.closed:
+            return
+
+        if self.start is None:
+            found = find_document(self.text)
+            if found is None:
+                return
+            self.start = self.fed = found[0]
+
+        close = self.text.find("```", self.fed)
+        end = close if close >= 0 else len(self.text)
+        # Hold back a trailing backtick or two: it may be the start of the closing fence
+        if close < 0:
+            end = len(self.text.rstrip("`"))
+        if end > self.fed:
+            self.tracker.add(self.text[self.fed:end])
+            self.fed = end
+        self.closed = close >= 0
+
+        if self.tracker.blocks > self.written_blocks:
+            self.written_blocks = self.tracker.blocks
+            self.write(self.tracker.snapshot())
+
+    def finish(self, text: Optional[str] = None) -> None:
+        """
+        Write the final page.
+
+        Args:
+            text: Full response text (defaults to what was streamed); when it
+                holds no HTML document the last partial page is left as is
+        """
+        text = self.text if text is None else text
+        found = find_document(text)
+        if found is None:
+            return
+        start, end = found
+        self.complete = end is not None or bool(re.search(r"</html\s*>", text[start:], re.IGNORECASE))
+        if self.complete:
+            self.write(text[start:end].strip() + "\n")
+        else:
+            # Truncated response: keep the auto-closed page, minus the badge
+            tracker = BlockTracker()
+            tracker.add(text[start:])
+            tracker.close()
+            self.written_blocks = tracker.blocks
+            self.write(tracker.snapshot(badge=False))
+
+    def write(self, document: str) -> bool:
+        """Atomically replace the output file."""
+        temp_path = f"{self.output}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.output)), exist_ok=True)
+            with open(temp_path, "w", encoding="utf-8") as f:
+                f.write(document)
+            os.replace(temp_path, self.output)
+        except OSError as e:
+            self.errors.append(str(e))
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return False
+        self.writes += 1
+        return True
+
+    def report(self) -> Dict:
+        """Summary for the generator's JSON output."""
+        report = {
+            "path": self.output,
+            "blocks_rendered": self.written_blocks,
+            "writes": self.writes,
+            "complete": self.complete,
+        }
+        if self.errors:
+            report["errors"] = self.errors[-3:]
+        return report
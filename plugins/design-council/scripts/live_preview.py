@@ -0,0 +1,159 @@
+"""
+Live preview pages written while options are still streaming in.
+
+Handles:
+- Pulling complete option objects out of a partial JSON response
+- Re-rendering a preview page (via the preview generator scripts) each
+  time another option is complete
+- Atomic writes, so preview-server.py never serves a half-written page
+
+Pair with preview-server.py: it watches the staging directory and pushes
+each rewrite to open pages, which update in place.
+"""
+
+import json
+import os
+import subprocess
+import sys
+from typing import Callable, Dict, Iterator, List, Optional
+
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+RENDER_TIMEOUT = 30
+
+
+def iter_array_objects(text: str, key: str) -> Iterator[Dict]:
+    """
+    Yield the complete objects of a JSON array in a possibly partial document.
+
+    Finds the first "key": [ ... and yields each object in it whose closing
+    brace has arrived. Objects that do not parse are skipped.
+
+    Args:
+        text: JSON text received so far (may be wrapped in a code fence)
+        key: Name of the array, e.g. "palettes"
+
+    Yields:
+        Parsed objects, in order
+    """
+    marker = text.find(f'"{key}"')
+    if marker < 0:
+        return
+    start = text.find("[", marker)
+    if start < 0:
+        return
+
+    depth, in_string, escaped, object_start = 0, False, False, None
+    for i in range(start + 1, len(text)):
+        char = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == "{":
+            if depth == 0:
+                object_start = i
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0 and object_start is not None:
+                try:
+                    yield json.loads(text[object_start:i + 1])
+                except json.JSONDecodeError:
+                    pass
+                object_start = None
+        elif char == "]" and depth == 0:
+            return
+
+
+class LivePreview:
+    """
+    A preview page that is re-rendered as options arrive.
+
+    Usage:
+        live = LivePreview("preview-generator.py", "palettes", path, project)
+        client.generate_stream(prompt, live.feed)   # renders 1, 2, 3, 4 options
+        live.update(final_palettes)                 # final page
+    """
+
+    def __init__(
+        self,
+        script: str,
+        key: str,
+        output: str,
+        project: str,
+        prepare: Optional[Callable[[List[Dict]], List[Dict]]] = None
+    ):
+        """
+        Args:
+            script: Preview generator script in this directory
+            key: Input field for the options ("palettes" or "typography")
+            output: HTML file to (re)write
+            project: Project name shown on the page
+            prepare: Optional hook applied to the options before rendering
+        """
+        self.script = os.path.join(SCRIPTS_DIR, script)
+        self.key = key
+        self.output = output
+        self.project = project
+        self.prepare = prepare
+        self.text = ""
+        self.rendered = 0
+        self.errors: List[str] = []
+
+    def feed(self, chunk: str) -> None:
+        """Add streamed text; re-render when another option is complete."""
+        self.text += chunk
+        # Only scan once a closing brace could have completed an option
+        if "}" not in chunk:
+            return
+        options = list(iter_array_objects(self.text, self.key))
+        if len(options) > self.rendered:
+            self.update(options)
+
+    def update(self, options: List[Dict]) -> bool:
+        """
+        Render the page for the given options and swap it into place.
+
+        Rendering failures (e.g. an option missing fields mid-stream) are
+        recorded in self.errors, not raised: the live page is best effort.
+
+        Returns:
+            True if the page was written
+        """
+        if self.prepare:
+            options = self.prepare(options)
+
+        temp_path = f"{self.output}.{os.getpid()}.tmp"
+        payload = json.dumps({self.key: options, "project": self.project})
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.output)), exist_ok=True)
+            result = subprocess.run(
+                [sys.executable, self.script, "--output", temp_path],
+                input=payload, capture_output=True, text=True, timeout=RENDER_TIMEOUT
+            )
+            if result.returncode != 0 or not os.path.exists(temp_path):
+                self.errors.append(result.stdout.strip() or result.stderr.strip() or "render failed")
+                return False
+            os.replace(temp_path, self.output)
+        except (OSError, subprocess.SubprocessError) as e:
+            self.errors.append(str(e))
+            return False
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+        self.rendered = len(options)
+        return True
+
+    def report(self) -> Dict:
+        """Summary for the generator's JSON output."""
+        report = {"path": self.output, "options_rendered": self.rendered}
+        if self.errors:
+            report["errors"] = self.errors[-3:]
+        return report
@@ -0,0 +1,145 @@
+"""
+Precompiled mockup fragment registry for preview pages.
+
+Handles:
+- Loading project types (data/mockups/project-types.json) and component
+  fragments (data/mockups/components/<name>.html)
+- Compiling each fragment once into literal parts split on {{option}}
+- Rendering a fragment for an option number by joining its parts
+
+Adding a mockup is a data change: drop an HTML file into the components
+directory (use {{option}} wherever the option number goes) and list it
+under a project type. Extra directories with the same layout can be
+layered on top of the bundled one.
+"""
+
+import json
+import os
+from typing import Dict, List, Optional, Sequence
+
+
+MOCKUPS_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "data", "mockups"
+)
+PROJECT_TYPES_FILENAME = "project-types.json"
+COMPONENTS_DIRNAME = "components"
+OPTION_PLACEHOLDER = "{{option}}"
+DEFAULT_PROJECT_TYPE = "default"
+
+# Palette roles the fragments read as CSS variables (--bg-primary-{{option}}, ...)
+CSS_VAR_ROLES = [
+    "bg_primary", "bg_secondary", "bg_tertiary",
+    "text_primary", "text_secondary", "text_tertiary",
+    "accent_primary", "accent_secondary",
+    "border_default", "border_focus",
+    "success", "error",
+]
+
+MISSING_FRAGMENT = (
+    '<div style="color: var(--text-secondary-{{option}}); font-size: 0.6rem;">[{name}]</div>'
+)
+
+
+def css_var_name(role: str, option) -> str:
+    """CSS variable a fragment reads for a palette role, e.g. --bg-primary-2."""
+    return f"--{role.replace('_', '-')}-{option}"
+
+
+class MockupRegistry:
+    """
+    Compiled mockup fragments and project type mapping.
+
+    Usage:
+        registry = get_registry()
+        components = registry.components_for("pomodoro timer")
+        html = registry.render_mockup(components, option_num=2)
+    """
+
+    def __init__(self):
+        self.project_types: Dict[str, List[str]] = {}
+        self.fragments: Dict[str, List[str]] = {}
+
+    @staticmethod
+    def compile(template: str) -> List[str]:
+        """Split a fragment into literal parts around the option placeholder."""
+        return template.split(OPTION_PLACEHOLDER)
+
+    def load_dir(self, path: str) -> "MockupRegistry":
+        """
+        Layer a mockup directory onto the registry.
+
+        Later directories override project types and fragments with the
+        same name.
+
+        Raises:
+            OSError: If a file cannot be read
+            ValueError: If project-types.json is malformed
+        """
+        types_path = os.path.join(path, PROJECT_TYPES_FILENAME)
+        if os.path.exists(types_path):
+            with open(types_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            project_types = data.get("project_types")
+            if not isinstance(project_types, dict):
+                raise ValueError(f"{types_path} has no 'project_types' mapping")
+            self.project_types.update(project_types)
+
+        components_dir = os.path.join(path, COMPONENTS_DIRNAME)
+        if os.path.isdir(components_dir):
+            for filename in sorted(os.listdir(components_dir)):
+                name, ext = os.path.splitext(filename)
+                if ext != ".html":
+                    continue
+                with open(os.path.join(components_dir, filename), "r", encoding="utf-8") as f:
+                    self.fragments[name] = self.compile(f.read().rstrip())
+
+        return self
+
+    def detect_project_type(self, project: str) -> str:
+        """Detect the project type from a description (first keyword match)."""
+        project_lower = project.lower()
+        for key in self.project_types:
+            if key != DEFAULT_PROJECT_TYPE and key in project_lower:
+                return key
+        return DEFAULT_PROJECT_TYPE
+
+    def components_for(self, project: str) -> List[str]:
+        """Component names for a project description."""
+        project_type = self.detect_project_type(project)
+        return self.project_types.get(project_type) or self.project_types.get(DEFAULT_PROJECT_TYPE, [])
+
+    def render(self, component: str, option_num) -> str:
+        """Render one fragment for an option number."""
+        parts = self.fragments.get(component)
+        if parts is None:
+            parts = self.fragments[component] = self.compile(
+                MISSING_FRAGMENT.replace("{name}", component)
+            )
+        return str(option_num).join(parts)
+
+    def render_mockup(self, components: Sequence[str], option_num) -> str:
+        """Render the mockup content block for one option card."""
+        body = "\n".join(self.render(c, option_num) for c in components)
+        return (
+            '<div class="mockup-content" style="display: flex; flex-direction: column; gap: 0.5rem;">\n'
+            f"{body}\n"
+            "</div>"
+        )
+
+
+_registry: Optional[MockupRegistry] = None
+
+
+def get_registry(extra_dirs: Sequence[str] = ()) -> MockupRegistry:
+    """
+    Get the process-wide registry, compiling the bundled mockups on first use.
+
+    Args:
+        extra_dirs: Additional mockup directories layered on top
+    """
+    global _registry
+    if _registry is None:
+        _registry = MockupRegistry().load_dir(MOCKUPS_DIR)
+    for path in extra_dirs:
+        _registry.load_dir(path)
+    return _registry
@@ -5,19 +5,59 @@ Generate 4 color palette variations using Gemini API.
 Takes mood, aesthetic, project description, and optional reference colors.
 Outputs JSON with 4 palette options for user selection.
 
+If the API key is missing or Gemini fails, falls back to the local OKLCH
+palette engine. Use --local to skip the API entirely (instant previews).
+
+Every palette is checked for WCAG AA contrast; failing roles are nudged
+in OKLCH lightness locally (disable with --no-repair).
+
+--scales adds 50-900 tint/shade scales and hover/active/disabled variants
+of every role, derived locally in OKLCH (see color_scales).
+
 Usage:
     echo '{"mood": "Warm & Cozy", "aesthetic": "minimalist", "project": "pomodoro timer"}' | python palette-generator.py
 
     # With reference colors from user's uploaded image:
     echo '{"mood": "...", "reference_colors": ["#FAF6F1", "#C4704A"]}' | python palette-generator.py
+
+    # Or extract them from the image itself (absolute path; PNG, or any format with Pillow):
+    echo '{"mood": "...", "reference_image": "/abs/path/moodboard.png"}' | python palette-generator.py
+
+    # With derived color scales and interaction states per role:
+    echo '{"mood": "Warm & Cozy"}' | python palette-generator.py --scales
+
+    # Local engine only (no API call, milliseconds):
+    echo '{"mood": "Warm & Cozy"}' | python palette-generator.py --local
+
+    # Reuse close matches from palette history (or mix them in as reference colors):
+    echo '{"mood": "Warm & Cozy"}' | python palette-generator.py --reuse
+    echo '{"mood": "Warm & Cozy"}' | python palette-generator.py --reuse mix
+
+    # Stream Gemini's answer and render the preview as each palette arrives
+    # (serve the staging directory with preview-server.py to watch it live):
+    echo '{"mood": "Warm & Cozy"}' | python palette-generator.py --live-preview ./.design-sprint-staging/palette-options.html
 """
 
+import argparse
 import json
+import sqlite3
 import sys
 from typing import Optional, List
 
 from api_client import GeminiClient, APIConfig
-from validators import validate_api_key, get_api_key
+from validators import validate_api_key, get_api_key, get_cache_dir
+from palette_engine import PALETTE_ROLES, generate_local_palettes
+from color_space import is_hex_color
+from color_scales import add_scales
+from contrast import audit_palettes
+from image_colors import DEFAULT_COLOR_COUNT, extract_reference_colors
+from palette_history import PaletteHistory, color_centroid
+from live_preview import LivePreview
+
+
+MAX_MIXED_COLORS = 6
+# Upper bound on reference_color_count (colors taken from reference_image)
+MAX_REFERENCE_COLOR_COUNT = 12
 
 
 def output_error(message: str, exit_code: int = 1) -> None:
@@ -176,14 +216,6 @@ def validate_palettes(palettes_data: dict) -> Optional[str]:
     if not isinstance(palettes, list) or len(palettes) != 4:
         return f"Expected 4 palettes, got {len(palettes) if isinstance(palettes, list) else 'non-list'}"
 
-    required_colors = [
-        "bg_primary", "bg_secondary", "bg_tertiary",
-        "text_primary", "text_secondary", "text_tertiary",
-        "accent_primary", "accent_secondary",
-        "border_default", "border_focus",
-        "success", "error"
-    ]
-
     for i, palette in enumerate(palettes):
         if "name" not in palette:
             return f"Palette {i+1} missing 'name'"
@@ -191,35 +223,76 @@ def validate_palettes(palettes_data: dict) -> Optional[str]:
             return f"Palette {i+1} missing 'colors'"
 
         colors = palette["colors"]
-        for color_name in required_colors:
+        for color_name in PALETTE_ROLES:
             if color_name not in colors:
                 return f"Palette {i+1} ({palette['name']}) missing color '{color_name}'"
+            if not is_hex_color(colors[color_name]):
+                return f"Palette {i+1} ({palette['name']}) color '{color_name}' is not a hex color"
 
     return None
 
 
-def main():
-    """Main entry point."""
-    # Step 1: Read input
-    input_data = read_input()
-
-    # Step 2: Validate required fields
-    mood = input_data.get("mood")
-    aesthetic = input_data.get("aesthetic", "modern")
-    project = input_data.get("project", "web application")
-    reference_colors = input_data.get("reference_colors")
+def parse_args() -> argparse.Namespace:
+    """Parse command-line flags."""
+    parser = argparse.ArgumentParser(description="Generate 4 color palette options.")
+    parser.add_argument(
+        "--local",
+        action="store_true",
+        help="Use the local OKLCH palette engine only (no API call)"
+    )
+    parser.add_argument(
+        "--no-repair",
+        action="store_true",
+        help="Report WCAG contrast failures without repairing them"
+    )
+    parser.add_argument(
+        "--reuse",
+        nargs="?",
+        const="auto",
+        choices=["auto", "mix"],
+        help="Reuse close palettes from history: 'auto' returns 4 matches when "
+             "available, 'mix' only adds their colors as references"
+    )
+    parser.add_argument(
+        "--no-history",
+        action="store_true",
+        help="Do not record the resulting Gemini palettes in the local history"
+    )
+    parser.add_argument(
+        "--live-preview",
+        metavar="HTML",
+        help="Stream the Gemini response and rewrite this preview page as each palette arrives"
+    )
+    parser.add_argument(
+        "--scales",
+        action="store_true",
+        help="Add 50-900 scales and hover/active/disabled states for every role"
+    )
+    return parser.parse_args()
 
-    if not mood:
-        output_error("Missing required field: mood")
 
-    # Step 3: Validate API key
+def generate_gemini_palettes(
+    mood: str,
+    aesthetic: str,
+    project: str,
+    reference_colors: Optional[List[str]],
+    live: Optional[LivePreview] = None
+) -> tuple[Optional[list], Optional[str]]:
+    """
+    Generate palettes with Gemini.
+
+    Args:
+        live: Stream the response and render each palette as it completes
+
+    Returns:
+        Tuple of (palettes, error_message); palettes is None on failure
+    """
     is_valid, error = validate_api_key()
     if not is_valid:
-        output_error(error)
+        return None, error
 
     api_key = get_api_key()
 
-    # Step 4: Build prompt
     prompt = build_palette_prompt(
         mood=mood,
         aesthetic=aesthetic,
@@ -227,36 +300,181 @@ def main():
         reference_colors=reference_colors
     )
 
-    # Step 5: Call Gemini API
     config = APIConfig(
         temperature=0.8,  # Slightly higher for creative variation
         max_output_tokens=4096,  # Palettes are much smaller than code
         timeout=60
     )
     client = GeminiClient(api_key, config)
-    response = client.generate(prompt)
+    if live is not None:
+        response = client.generate_stream(prompt, live.feed)
+    else:
+        response = client.generate(prompt)
 
     if not response.success:
-        output_error(f"Gemini API error: {response.error_message}")
+        return None, f"Gemini API error: {response.error_message}"
 
-    # Step 6: Extract and validate palettes
     palettes_data = extract_palettes(response.data)
 
     validation_error = validate_palettes(palettes_data)
     if validation_error:
-        output_error(f"Invalid palette response: {validation_error}")
+        return None, f"Invalid palette response: {validation_error}"
+
+    return palettes_data["palettes"], None
+
+
+def find_history_matches(
+    mood: str,
+    aesthetic: str,
+    reference_colors: Optional[List[str]]
+) -> tuple[list, list]:
+    """
+    Find close palettes in history.
+
+    The query color is the centroid of the local engine's palettes for
+    the same inputs, so it is comparable with stored palette centroids.
+
+    Returns:
+        Tuple of (matches, mixed_colors) where mixed_colors are accent and
+        background colors of the matches, usable as reference colors
+    """
+    local = generate_local_palettes(mood, aesthetic, reference_colors)
+    query_color = color_centroid([c for p in local for c in p["colors"].values()])
+
+    try:
+        with PaletteHistory(get_cache_dir()) as history:
+            matches = history.find_similar(mood, aesthetic, query_color)
+    except (OSError, sqlite3.Error):
+        return [], []
+
+    mixed_colors = []
+    for match in matches:
+        for role in ("accent_primary", "bg_primary"):
+            color = match["palette"]["colors"].get(role)
+            if color and color not in mixed_colors and color not in (reference_colors or []):
+                mixed_colors.append(color)
+
+    return matches, mixed_colors[:MAX_MIXED_COLORS]
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+
+    # Step 1: Read input
+    input_data = read_input()
+
+    # Step 2: Validate required fields
+    mood = input_data.get("mood")
+    aesthetic = input_data.get("aesthetic", "modern")
+    project = input_data.get("project", "web application")
+    reference_colors = input_data.get("reference_colors")
+    reference_image = input_data.get("reference_image")
+
+    if not mood:
+        output_error("Missing required field: mood")
+
+    color_count = input_data.get("reference_color_count", DEFAULT_COLOR_COUNT)
+    if (
+        not isinstance(color_count, int) or isinstance(color_count, bool)
+        or not 1 <= color_count <= MAX_REFERENCE_COLOR_COUNT
+    ):
+        output_error(f"reference_color_count must be an integer from 1 to {MAX_REFERENCE_COLOR_COUNT}")
+
+    # Step 2b: Extract dominant colors from a reference image
+    extracted_colors = None
+    if reference_image:
+        try:
+            extracted_colors = extract_reference_colors(reference_image, color_count)
+        except (OSError, ValueError) as e:
+            output_error(f"Could not read reference image: {str(e)}")
+
+        reference_colors = (reference_colors or []) + [c["hex"] for c in extracted_colors]
+
+    # Step 2c: Look up similar palettes in history
+    palettes, source, reuse_report = None, "gemini", None
+    if args.reuse:
+        matches, mixed_colors = find_history_matches(mood, aesthetic, reference_colors)
+        if args.reuse == "auto" and len(matches) >= 4:
+            palettes, source = [m["palette"] for m in matches[:4]], "history"
+        elif mixed_colors:
+            reference_colors = (reference_colors or []) + mixed_colors
+
+        reuse_report = {
+            "mode": args.reuse,
+            "matches": [
+                {key: m[key] for key in ("score", "mood", "aesthetic", "project", "created_at")}
+                | {"name": m["palette"].get("name")}
+                for m in matches
+            ],
+            "mixed_colors": mixed_colors if source != "history" else []
+        }
 
-    # Step 7: Output result
-    output_result({
+    live = None
+    if args.live_preview:
+        live = LivePreview("preview-generator.py", "palettes", args.live_preview, project)
+
+    # Step 3: Generate with Gemini unless local-only or reused
+    fallback_reason = "Local engine requested (--local)"
+    if palettes is None and not args.local:
+        palettes, fallback_reason = generate_gemini_palettes(
+            mood, aesthetic, project, reference_colors, live
+        )
+        if palettes is not None:
+            source = "gemini"
+
+    # Step 4: Fall back to the local OKLCH engine
+    if palettes is None:
+        palettes = generate_local_palettes(mood, aesthetic, reference_colors)
+        source = "local"
+
+    # Step 5: Check contrast and repair locally
+    palettes, contrast_report = audit_palettes(palettes, repair=not args.no_repair)
+
+    # Step 5b: Record Gemini palettes for future reuse (local ones would
+    # match the local-engine query of --reuse and shadow Gemini forever)
+    if not args.no_history and source == "gemini":
+        try:
+            with PaletteHistory(get_cache_dir()) as history:
+                history.record(palettes, mood, aesthetic, project, source)
+        except (OSError, sqlite3.Error):
+            pass  # History is an optimization; never fail generation over it
+
+    # Step 5c: Derive color scales and states (after history: they are recomputable)
+    scales_report = None
+    if args.scales:
+        scales_report = add_scales(palettes)
+
+    # Step 5d: Final live preview (repaired palettes)
+    if live is not None:
+        live.update(palettes)
+
+    # Step 6: Output result
+    result = {
         "error": False,
-        "palettes": palettes_data["palettes"],
+        "palettes": palettes,
+        "source": source,
+        "contrast": contrast_report,
         "input": {
             "mood": mood,
             "aesthetic": aesthetic,
             "project": project,
-            "has_reference": reference_colors is not None
+            "has_reference": reference_colors is not None,
+            "reference_image": reference_image
         }
-    })
+    }
+    if scales_report is not None:
+        result["scales"] = scales_report
+    if extracted_colors is not None:
+        result["extracted_colors"] = extracted_colors
+    if reuse_report is not None:
+        result["reuse"] = reuse_report
+    if source == "local":
+        result["fallback_reason"] = fallback_reason
+    if live is not None:
+        result["live_preview"] = live.report()
+
+    output_result(result)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,287 @@
+"""
+Local palette generation in OKLCH.
+
+Handles:
+- Mood and aesthetic presets (hue, chroma, light/dark theme)
+- Seeding from user reference colors
+- The four option archetypes: classic, bold, subtle, creative
+- Deriving all 12 palette roles from lightness/chroma rules
+
+Runs in milliseconds without an API call, so it serves as an offline
+fallback and as an instant first preview while Gemini refines.
+"""
+
+import math
+from typing import Dict, List, Optional
+from dataclasses import dataclass
+
+from color_space import hex_to_oklch, is_hex_color, normalize_hex, oklch_to_hex
+
+
+PALETTE_ROLES = [
+    "bg_primary", "bg_secondary", "bg_tertiary",
+    "text_primary", "text_secondary", "text_tertiary",
+    "accent_primary", "accent_secondary",
+    "border_default", "border_focus",
+    "success", "error"
+]
+
+# Mood keyword -> style hints (hue in degrees, accent chroma, dark theme)
+MOOD_PRESETS = {
+    "warm": {"hue": 55, "chroma": 0.14},
+    "cozy": {"hue": 45, "chroma": 0.11},
+    "cool": {"hue": 235, "chroma": 0.12},
+    "calm": {"hue": 200, "chroma": 0.08},
+    "serene": {"hue": 195, "chroma": 0.07},
+    "bold": {"hue": 25, "chroma": 0.20},
+    "vibrant": {"hue": 345, "chroma": 0.21},
+    "energetic": {"hue": 35, "chroma": 0.19},
+    "playful": {"hue": 330, "chroma": 0.18},
+    "natural": {"hue": 135, "chroma": 0.09},
+    "earthy": {"hue": 65, "chroma": 0.08},
+    "fresh": {"hue": 160, "chroma": 0.13},
+    "elegant": {"hue": 300, "chroma": 0.06},
+    "luxury": {"hue": 85, "chroma": 0.10},
+    "professional": {"hue": 250, "chroma": 0.10},
+    "trustworthy": {"hue": 245, "chroma": 0.12},
+    "moody": {"hue": 285, "chroma": 0.09, "dark": True},
+    "dark": {"dark": True},
+    "night": {"hue": 270, "dark": True},
+    "midnight": {"hue": 265, "dark": True},
+}
+
+# Aesthetic keyword -> chroma scale and background tint strength
+AESTHETIC_PRESETS = {
+    "minimalist": {"chroma_scale": 0.75, "bg_tint": 0.2},
+    "modern": {"chroma_scale": 1.0, "bg_tint": 0.3},
+    "maximalist": {"chroma_scale": 1.35, "bg_tint": 0.7},
+    "brutalist": {"chroma_scale": 1.2, "bg_tint": 0.0},
+    "organic": {"chroma_scale": 0.85, "bg_tint": 0.5},
+    "industrial": {"chroma_scale": 0.8, "bg_tint": 0.1},
+    "retro": {"chroma_scale": 1.1, "bg_tint": 0.6},
+    "luxury": {"chroma_scale": 0.7, "bg_tint": 0.3},
+    "playful": {"chroma_scale": 1.25, "bg_tint": 0.5},
+}
+
+# Archetype -> (chroma multiplier, primary hue shift, secondary hue offset, bg tint multiplier)
+ARCHETYPES = {
+    "classic": (1.0, 0, 30, 1.0),
+    "bold": (1.45, 0, 180, 1.3),
+    "subtle": (0.55, 0, -25, 0.6),
+    "creative": (1.15, 40, 150, 1.2),
+}
+
+ARCHETYPE_DESCRIPTIONS = {
+    "classic": "Balanced {hue} accents on quiet neutrals; the safe choice for this mood",
+    "bold": "Saturated {hue} with a complementary pop for high-energy interfaces",
+    "subtle": "Muted, low-chroma {hue} tones for a calm, sophisticated feel",
+    "creative": "An unexpected {hue} and {secondary} split-complementary pairing",
+}
+
+# Upper hue bound (degrees) -> evocative name
+HUE_NAMES = [
+    (20, "Rose"), (45, "Terracotta"), (70, "Amber"), (100, "Ochre"),
+    (130, "Olive"), (160, "Sage"), (190, "Jade"), (215, "Teal"),
+    (245, "Harbor"), (275, "Indigo"), (305, "Violet"), (335, "Plum"),
+    (360, "Rose"),
+]
+
+# Role lightness (OKLCH L) per theme
+LIGHTNESS = {
+    False: {
+        "bg_primary": 0.985, "bg_secondary": 0.96, "bg_tertiary": 0.925,
+        "text_primary": 0.22, "text_secondary": 0.42, "text_tertiary": 0.60,
+        "accent_primary": 0.52, "accent_secondary": 0.62,
+        "border_default": 0.88, "border_focus": 0.52,
+        "success": 0.52, "error": 0.55,
+    },
+    True: {
+        "bg_primary": 0.17, "bg_secondary": 0.21, "bg_tertiary": 0.25,
+        "text_primary": 0.95, "text_secondary": 0.78, "text_tertiary": 0.60,
+        "accent_primary": 0.74, "accent_secondary": 0.80,
+        "border_default": 0.33, "border_focus": 0.74,
+        "success": 0.74, "error": 0.68,
+    },
+}
+
+SUCCESS_HUE = 150
+ERROR_HUE = 27
+SEMANTIC_CHROMA = 0.15
+DEFAULT_HUE = 250
+DEFAULT_CHROMA = 0.12
+
+
+@dataclass
+class PaletteStyle:
+    """Resolved style parameters for palette derivation."""
+    hue: float = DEFAULT_HUE
+    chroma: float = DEFAULT_CHROMA
+    dark: bool = False
+    bg_tint: float = 0.3
+    accent_hex: Optional[str] = None  # exact reference accent to keep
+    background_hex: Optional[str] = None  # exact reference background to keep
+
+
+def _circular_mean(hues: List[float]) -> float:
+    x = sum(math.cos(math.radians(h)) for h in hues)
+    y = sum(math.sin(math.radians(h)) for h in hues)
+    return math.degrees(math.atan2(y, x)) % 360
+
+
+def _hue_name(hue: float) -> str:
+    for bound, name in HUE_NAMES:
+        if hue % 360 < bound:
+            return name
+    return HUE_NAMES[-1][1]
+
+
+def resolve_style(
+    mood: str,
+    aesthetic: str = "modern",
+    reference_colors: Optional[List[str]] = None
+) -> PaletteStyle:
+    """
+    Resolve mood, aesthetic and reference colors into style parameters.
+
+    Args:
+        mood: Free-text mood (e.g. "Warm & Cozy")
+        aesthetic: Aesthetic direction (e.g. "minimalist")
+        reference_colors: Optional hex colors supplied by the user
+
+    Returns:
+        PaletteStyle for palette derivation
+    """
+    words = "".join(c if c.isalnum() else " " for c in f"{mood} {aesthetic}".lower()).split()
+
+    hues, chromas, dark = [], [], False
+    for word in words:
+        preset = MOOD_PRESETS.get(word)
+        if not preset:
+            continue
+        if "hue" in preset:
+            hues.append(preset["hue"])
+        if "chroma" in preset:
+            chromas.append(preset["chroma"])
+        dark = dark or preset.get("dark", False)
+
+    chroma_scale, bg_tint = 1.0, AESTHETIC_PRESETS["modern"]["bg_tint"]
+    for word in words:
+        preset = AESTHETIC_PRESETS.get(word)
+        if preset:
+            chroma_scale, bg_tint = preset["chroma_scale"], preset["bg_tint"]
+            break
+
+    style = PaletteStyle(
+        hue=_circular_mean(hues) if hues else DEFAULT_HUE,
+        chroma=(sum(chromas) / len(chromas) if chromas else DEFAULT_CHROMA) * chroma_scale,
+        dark=dark,
+        bg_tint=bg_tint,
+    )
+
+    references = [c for c in (reference_colors or []) if is_hex_color(c)]
+    if references:
+        lch = [(c, hex_to_oklch(c)) for c in references]
+
+        # Most chromatic reference seeds the accent
+        accent_hex, (_, accent_c, accent_h) = max(lch, key=lambda item: item[1][1])
+        if accent_c >= 0.03:
+            style.hue = accent_h
+            style.chroma = accent_c
+            style.accent_hex = normalize_hex(accent_hex)
+
+        # Theme follows the average reference lightness unless the mood forces dark
+        average_l = sum(item[1][0] for item in lch) / len(lch)
+        style.dark = dark or average_l < 0.45
+
+        # A near-neutral reference at the theme's extreme becomes the background
+        extreme = min if style.dark else max
+        bg_hex, (bg_l, bg_c, _) = extreme(lch, key=lambda item: item[1][0])
+        if bg_c < 0.05 and (bg_l < 0.3 if style.dark else bg_l > 0.85):
+            style.background_hex = normalize_hex(bg_hex)
+
+    return style
+
+
+def build_palette(style: PaletteStyle, archetype: str) -> Dict:
+    """
+    Derive a full 12-role palette for one archetype.
+
+    Args:
+        style: Resolved style parameters
+        archetype: One of "classic", "bold", "subtle", "creative"
+
+    Returns:
+        Palette dict with name, description, archetype and colors
+    """
+    chroma_mult, hue_shift, secondary_offset, tint_mult = ARCHETYPES[archetype]
+    lightness = LIGHTNESS[style.dark]
+
+    hue = (style.hue + hue_shift) % 360
+    secondary_hue = (hue + secondary_offset) % 360
+    accent_c = min(style.chroma * chroma_mult, 0.32)
+    neutral_c = min(style.bg_tint * tint_mult * 0.03, 0.04)
+
+    def neutral(role: str, scale: float = 1.0) -> str:
+        return oklch_to_hex((lightness[role], neutral_c * scale, hue))
+
+    colors = {
+        "bg_primary": neutral("bg_primary"),
+        "bg_secondary": neutral("bg_secondary"),
+        "bg_tertiary": neutral("bg_tertiary", 1.2),
+        "text_primary": neutral("text_primary", 0.8),
+        "text_secondary": neutral("text_secondary", 0.7),
+        "text_tertiary": neutral("text_tertiary", 0.5),
+        "accent_primary": oklch_to_hex((lightness["accent_primary"], accent_c, hue)),
+        "accent_secondary": oklch_to_hex((lightness["accent_secondary"], accent_c * 0.85, secondary_hue)),
+        "border_default": neutral("border_default", 1.5),
+        "border_focus": oklch_to_hex((lightness["border_focus"], max(accent_c, 0.1), hue)),
+        "success": oklch_to_hex((lightness["success"], SEMANTIC_CHROMA, SUCCESS_HUE)),
+        "error": oklch_to_hex((lightness["error"], SEMANTIC_CHROMA + 0.03, ERROR_HUE)),
+    }
+
+    # Classic stays closest to the user's references
+    if archetype == "classic":
+        if style.accent_hex:
+            colors["accent_primary"] = style.accent_hex
+        if style.background_hex:
+            colors["bg_primary"] = style.background_hex
+
+    hue_name = _hue_name(hue)
+    secondary_name = _hue_name(secondary_hue)
+    names = {
+        "classic": f"Classic {hue_name}",
+        "bold": f"Vivid {hue_name}",
+        "subtle": f"Muted {hue_name}",
+        "creative": f"{hue_name} & {secondary_name}",
+    }
+    if style.dark:
+        names = {key: f"{name} Night" for key, name in names.items()}
+
+    return {
+        "name": names[archetype],
+        "description": ARCHETYPE_DESCRIPTIONS[archetype].format(
+            hue=hue_name.lower(), secondary=secondary_name.lower()
+        ),
+        "archetype": archetype,
+        "colors": colors,
+    }
+
+
+def generate_local_palettes(
+    mood: str,
+    aesthetic: str = "modern",
+    reference_colors: Optional[List[str]] = None
+) -> List[Dict]:
+    """
+    Generate the four archetype palettes locally.
+
+    Args:
+        mood: Free-text mood (e.g. "Warm & Cozy")
+        aesthetic: Aesthetic direction
+        reference_colors: Optional hex colors supplied by the user
+
+    Returns:
+        List of 4 palette dicts in the same shape as the Gemini output
+    """
+    style = resolve_style(mood, aesthetic, reference_colors)
+    return [build_palette(style, archetype) for archetype in ARCHETYPES]
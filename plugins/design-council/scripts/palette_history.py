@@ -0,0 +1,254 @@
+"""
+Local palette history for reuse.
+
+Handles:
+- Recording Gemini palettes with their mood, aesthetic and project
+- A token table (mood/aesthetic words) that narrows the candidates
+- Ranking the candidates by token overlap plus OKLab centroid distance,
+  as a brute-force scan in Python (there is no vector index)
+
+Local-engine palettes are not reused: --reuse compares against the local
+engine's output for the same input, so they would always match themselves.
+
+Stored in SQLite under the shared cache directory. Point
+DESIGN_COUNCIL_CACHE_DIR at a shared location to pool history across a team.
+"""
+
+import hashlib
+import json
+import math
+import os
+import sqlite3
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from color_space import hex_to_oklab, is_hex_color
+
+
+HISTORY_DB_FILENAME = "palette-history.sqlite3"
+
+# Ranking weights and thresholds
+TOKEN_WEIGHT = 0.6
+COLOR_WEIGHT = 0.4
+COLOR_DISTANCE_SCALE = 0.25  # OKLab distance at which color similarity reaches 0
+DEFAULT_MIN_SCORE = 0.55
+MAX_UNINDEXED_CANDIDATES = 500
+
+STOPWORDS = {"and", "the", "with", "for", "but", "very"}
+
+# Rows written before local palettes stopped being recorded are skipped too
+REUSABLE_SOURCES = "(p.source IS NULL OR p.source != 'local')"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS palettes (
+    id INTEGER PRIMARY KEY,
+    fingerprint TEXT UNIQUE NOT NULL,
+    created_at TEXT NOT NULL,
+    mood TEXT NOT NULL,
+    aesthetic TEXT,
+    project TEXT,
+    source TEXT,
+    name TEXT,
+    palette_json TEXT NOT NULL,
+    centroid_l REAL NOT NULL,
+    centroid_a REAL NOT NULL,
+    centroid_b REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS palette_tokens (
+    token TEXT NOT NULL,
+    palette_id INTEGER NOT NULL REFERENCES palettes(id) ON DELETE CASCADE,
+    PRIMARY KEY (token, palette_id)
+);
+CREATE INDEX IF NOT EXISTS idx_palettes_created ON palettes(created_at);
+"""
+
+
+Vector = Tuple[float, float, float]
+
+
+def tokenize(*texts: Optional[str]) -> List[str]:
+    """Split mood/aesthetic text into normalized index tokens."""
+    words = "".join(
+        c if c.isalnum() else " " for c in " ".join(t or "" for t in texts).lower()
+    ).split()
+    return sorted({w for w in words if len(w) >= 3 and w not in STOPWORDS})
+
+
+def color_centroid(colors: Sequence[str]) -> Optional[Vector]:
+    """
+    Mean OKLab vector of a set of hex colors.
+
+    Args:
+        colors: Hex colors (invalid entries are ignored)
+
+    Returns:
+        (L, a, b) centroid, or None if no valid colors
+    """
+    labs = [hex_to_oklab(c) for c in colors if is_hex_color(c)]
+    if not labs:
+        return None
+    return tuple(sum(channel) / len(labs) for channel in zip(*labs))
+
+
+def _fingerprint(palette: Dict) -> str:
+    colors = json.dumps(palette.get("colors", {}), sort_keys=True).upper()
+    return hashlib.sha256(colors.encode("utf-8")).hexdigest()
+
+
+class PaletteHistory:
+    """
+    SQLite-backed palette history.
+
+    Usage:
+        with PaletteHistory(cache_dir) as history:
+            history.record(palettes, mood="Warm & Cozy", aesthetic="minimalist", project="timer")
+            matches = history.find_similar("Warm", "minimalist")
+    """
+
+    def __init__(self, cache_dir: str):
+        """
+        Open (and create if needed) the history database.
+
+        Args:
+            cache_dir: Directory holding the database file
+        """
+        self.path = os.path.join(cache_dir, HISTORY_DB_FILENAME)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.executescript(SCHEMA)
+
+    def __enter__(self) -> "PaletteHistory":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self.conn.close()
+
+    def record(
+        self,
+        palettes: List[Dict],
+        mood: str,
+        aesthetic: Optional[str] = None,
+        project: Optional[str] = None,
+        source: Optional[str] = None
+    ) -> int:
+        """
+        Record validated palettes. Identical palettes are stored once.
+
+        Args:
+            palettes: Palette dicts with "name" and "colors"
+            mood: Mood used to generate them
+            aesthetic: Aesthetic direction
+            project: Project description
+            source: "gemini" ("local" rows are never returned by find_similar)
+
+        Returns:
+            Number of newly stored palettes
+        """
+        tokens = tokenize(mood, aesthetic)
+        created_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        inserted = 0
+
+        with self.conn:
+            for palette in palettes:
+                centroid = color_centroid(list(palette.get("colors", {}).values()))
+                if centroid is None:
+                    continue
+
+                cursor = self.conn.execute(
+                    "INSERT OR IGNORE INTO palettes (fingerprint, created_at, mood, aesthetic, "
+                    "project, source, name, palette_json, centroid_l, centroid_a, centroid_b) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        _fingerprint(palette), created_at, mood, aesthetic, project, source,
+                        palette.get("name"), json.dumps(palette), *centroid
+                    )
+                )
+                if cursor.rowcount:
+                    inserted += 1
+                    self.conn.executemany(
+                        "INSERT OR IGNORE INTO palette_tokens (token, palette_id) VALUES (?, ?)",
+                        [(token, cursor.lastrowid) for token in tokens]
+                    )
+
+        return inserted
+
+    def _candidates(self, tokens: List[str]) -> List[sqlite3.Row]:
+        if tokens:
+            placeholders = ", ".join("?" for _ in tokens)
+            rows = self.conn.execute(
+                "SELECT p.*, GROUP_CONCAT(t2.token, ' ') AS tokens FROM palettes p "
+                "JOIN palette_tokens t2 ON t2.palette_id = p.id "
+                f"WHERE p.id IN (SELECT palette_id FROM palette_tokens WHERE token IN ({placeholders})) "
+                f"AND {REUSABLE_SOURCES} "
+                "GROUP BY p.id",
+                tokens
+            ).fetchall()
+            if rows:
+                return rows
+
+        # No token overlap: fall back to color similarity over recent history
+        return self.conn.execute(
+            "SELECT p.*, (SELECT GROUP_CONCAT(token, ' ') FROM palette_tokens "
+            "WHERE palette_id = p.id) AS tokens FROM palettes p "
+            f"WHERE {REUSABLE_SOURCES} "
+            "ORDER BY created_at DESC LIMIT ?",
+            (MAX_UNINDEXED_CANDIDATES,)
+        ).fetchall()
+
+    def find_similar(
+        self,
+        mood: str,
+        aesthetic: Optional[str] = None,
+        query_color: Optional[Vector] = None,
+        limit: int = 4,
+        min_score: float = DEFAULT_MIN_SCORE
+    ) -> List[Dict]:
+        """
+        Find the closest stored palettes.
+
+        Args:
+            mood: Requested mood
+            aesthetic: Requested aesthetic
+            query_color: OKLab centroid to match (e.g. of reference colors)
+            limit: Maximum number of matches
+            min_score: Minimum similarity (0..1)
+
+        Returns:
+            List of {"palette", "score", "mood", "aesthetic", "project", "created_at"},
+            best first
+        """
+        query_tokens = set(tokenize(mood, aesthetic))
+        scored = []
+
+        for row in self._candidates(sorted(query_tokens)):
+            row_tokens = set((row["tokens"] or "").split())
+            union = query_tokens | row_tokens
+            token_score = len(query_tokens & row_tokens) / len(union) if union else 0.0
+
+            if query_color is not None:
+                distance = math.dist(query_color, (row["centroid_l"], row["centroid_a"], row["centroid_b"]))
+                color_score = max(0.0, 1.0 - distance / COLOR_DISTANCE_SCALE)
+                score = TOKEN_WEIGHT * token_score + COLOR_WEIGHT * color_score
+            else:
+                score = token_score
+
+            if score >= min_score:
+                scored.append((score, row))
+
+        scored.sort(key=lambda item: -item[0])
+        return [
+            {
+                "palette": json.loads(row["palette_json"]),
+                "score": round(score, 3),
+                "mood": row["mood"],
+                "aesthetic": row["aesthetic"],
+                "project": row["project"],
+                "created_at": row["created_at"],
+            }
+            for score, row in scored[:limit]
+        ]
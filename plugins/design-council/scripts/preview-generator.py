@@ -1,36 +1,60 @@
 #!/usr/bin/env python3
 """
-Generate HTML preview page with 4 palette options as clickable cards.
+Generate HTML preview page with palette options as clickable cards.
 
 Each card shows a mini mockup of the UI with the palette applied.
 User clicks their preferred card to make a selection.
 
+The standard page renders up to the 4 sprint options eagerly. More
+(or --gallery) switches to gallery mode: the palettes ship as JSON, cards
+are appended as the user scrolls, and each card's CSS variables and
+mockup are only set once it comes into view, so a page with hundreds of
+palettes opens instantly.
+
+Palettes with derived scales and states (palette-generator.py --scales,
+or --scales here) also get --<role>-<step>-N and --<role>-<state>-N
+variables and an accent scale strip on each card.
+
+Mockup components come from the fragment registry (data/mockups/):
+project types map to component names, and each component is an HTML
+fragment compiled once and rendered per option. --mockups DIR layers
+extra project types and components on top.
+
 Usage:
     echo '{"palettes": [...], "project": "music player", "type": "palette"}' | python preview-generator.py
 
-Output: HTML content to stdout
+    # Stream straight to a file:
+    echo '{"palettes": [...], "project": "music player"}' | python preview-generator.py --output ./.design-sprint-staging/palette-options.html
+
+    # Derive 50-900 scales and hover/active/disabled states for the preview:
+    echo '{"palettes": [...], "project": "music player"}' | python preview-generator.py --scales --output ./.design-sprint-staging/palette-options.html
+
+    # Browse a large set of palettes (any count):
+    cat many-palettes.json | python preview-generator.py --gallery --output ./.design-sprint-staging/palette-gallery.html
+
+    # Link the shared stylesheet/script from .design-sprint-staging/assets/ (cached across pages):
+    echo '{...}' | python preview-generator.py --assets-dir ./.design-sprint-staging --precompress --output ./.design-sprint-staging/palette-options.html
+
+Output: HTML content to stdout (or --output file)
 """
 
+import argparse
 import html
 import json
 import sys
-from typing import List, Dict
-
-# Project type to mockup component mapping
-MOCKUP_COMPONENTS = {
-    "timer": ["timer-display", "control-buttons", "progress-ring"],
-    "pomodoro": ["timer-display", "control-buttons", "progress-ring", "session-indicator"],
-    "music": ["album-art", "waveform", "player-controls", "playlist-item"],
-    "player": ["album-art", "waveform", "player-controls", "playlist-item"],
-    "dashboard": ["stat-card", "nav-sidebar", "data-table", "chart-placeholder"],
-    "chat": ["message-bubble", "input-field", "avatar", "sidebar-contact"],
-    "shop": ["product-card", "price-tag", "cart-button", "rating-stars"],
-    "ecommerce": ["product-card", "price-tag", "cart-button", "rating-stars"],
-    "form": ["input-field", "dropdown", "checkbox", "submit-button"],
-    "landing": ["hero-section", "feature-card", "cta-button", "testimonial"],
-    "blog": ["article-card", "author-avatar", "tag-pill", "read-more-link"],
-    "default": ["nav-header", "hero-section", "feature-card", "cta-button"]
-}
+from typing import Iterator, List, Dict, Optional
+
+from color_scales import SCALE_STEPS, add_scales
+from mockup_registry import CSS_VAR_ROLES, css_var_name, get_registry
+from preview_templates import (
+    PageAssets, gallery_chunks, indent_css, render_page, script_json, write_chunks,
+    write_page_assets
+)
+
+SPRINT_OPTION_COUNT = 4
+# Gallery mockups are rendered once against this suffix (--bg-primary-g, ...);
+# each card sets the variables on itself when it is mounted.
+GALLERY_OPTION_SUFFIX = "g"
 
 
 def output_error(message: str, exit_code: int = 1) -> None:
@@ -52,206 +76,118 @@ def read_input() -> dict:
 
 def detect_project_type(project: str) -> str:
     """Detect project type from description."""
-    project_lower = project.lower()
-    for key in MOCKUP_COMPONENTS.keys():
-        if key in project_lower:
-            return key
-    return "default"
+    return get_registry().detect_project_type(project)
 
 
 def generate_component_html(component: str, option_num: int) -> str:
     """Generate HTML for a specific mockup component."""
-    components = {
-        "timer-display": f'''
-            <div class="timer-display" style="font-size: 2.5rem; font-weight: 700; color: var(--text-primary-{option_num}); text-align: center; padding: 1rem;">
-                25:00
-            </div>''',
-
-        "control-buttons": f'''
-            <div class="control-buttons" style="display: flex; gap: 0.5rem; justify-content: center;">
-                <button style="background: var(--accent-primary-{option_num}); color: var(--bg-primary-{option_num}); border: none; padding: 0.5rem 1rem; border-radius: 6px; font-weight: 600;">Start</button>
-                <button style="background: var(--bg-tertiary-{option_num}); color: var(--text-secondary-{option_num}); border: 1px solid var(--border-default-{option_num}); padding: 0.5rem 1rem; border-radius: 6px;">Reset</button>
-            </div>''',
-
-        "progress-ring": f'''
-            <div class="progress-ring" style="width: 60px; height: 60px; border-radius: 50%; border: 4px solid var(--bg-tertiary-{option_num}); border-top-color: var(--accent-primary-{option_num}); margin: 0.5rem auto;"></div>''',
-
-        "session-indicator": f'''
-            <div class="session-indicator" style="display: flex; gap: 0.25rem; justify-content: center; margin-top: 0.5rem;">
-                <span style="width: 8px; height: 8px; border-radius: 50%; background: var(--accent-primary-{option_num});"></span>
-                <span style="width: 8px; height: 8px; border-radius: 50%; background: var(--border-default-{option_num});"></span>
-                <span style="width: 8px; height: 8px; border-radius: 50%; background: var(--border-default-{option_num});"></span>
-            </div>''',
-
-        "album-art": f'''
-            <div class="album-art" style="width: 80px; height: 80px; background: linear-gradient(135deg, var(--accent-primary-{option_num}), var(--accent-secondary-{option_num})); border-radius: 8px; margin: 0 auto;"></div>''',
-
-        "waveform": f'''
-            <div class="waveform" style="display: flex; gap: 2px; align-items: center; justify-content: center; height: 30px; margin: 0.5rem 0;">
-                {"".join([f'<div style="width: 3px; height: {12 + (i*5) % 20}px; background: var(--accent-primary-{option_num}); border-radius: 2px;"></div>' for i in range(12)])}
-            </div>''',
-
-        "player-controls": f'''
-            <div class="player-controls" style="display: flex; gap: 1rem; justify-content: center; align-items: center;">
-                <span style="color: var(--text-secondary-{option_num});">&#9198;</span>
-                <span style="width: 32px; height: 32px; background: var(--accent-primary-{option_num}); border-radius: 50%; display: flex; align-items: center; justify-content: center; color: var(--bg-primary-{option_num});">&#9654;</span>
-                <span style="color: var(--text-secondary-{option_num});">&#9197;</span>
-            </div>''',
-
-        "playlist-item": f'''
-            <div class="playlist-item" style="background: var(--bg-tertiary-{option_num}); padding: 0.5rem; border-radius: 6px; display: flex; align-items: center; gap: 0.5rem;">
-                <div style="width: 24px; height: 24px; background: var(--accent-secondary-{option_num}); border-radius: 4px;"></div>
-                <div style="flex: 1;">
-                    <div style="font-size: 0.7rem; color: var(--text-primary-{option_num});">Song Title</div>
-                    <div style="font-size: 0.6rem; color: var(--text-secondary-{option_num});">Artist</div>
-                </div>
-            </div>''',
-
-        "stat-card": f'''
-            <div class="stat-card" style="background: var(--bg-tertiary-{option_num}); padding: 0.75rem; border-radius: 8px; text-align: center;">
-                <div style="font-size: 1.25rem; font-weight: 700; color: var(--accent-primary-{option_num});">2,847</div>
-                <div style="font-size: 0.65rem; color: var(--text-secondary-{option_num});">Total Users</div>
-            </div>''',
-
-        "nav-sidebar": f'''
-            <div class="nav-sidebar" style="background: var(--bg-secondary-{option_num}); padding: 0.5rem; border-radius: 6px;">
-                <div style="padding: 0.25rem 0.5rem; background: var(--accent-primary-{option_num}); color: var(--bg-primary-{option_num}); border-radius: 4px; font-size: 0.65rem; margin-bottom: 0.25rem;">Dashboard</div>
-                <div style="padding: 0.25rem 0.5rem; color: var(--text-secondary-{option_num}); font-size: 0.65rem;">Settings</div>
-            </div>''',
-
-        "data-table": f'''
-            <div class="data-table" style="font-size: 0.6rem; border: 1px solid var(--border-default-{option_num}); border-radius: 6px; overflow: hidden;">
-                <div style="display: flex; background: var(--bg-tertiary-{option_num}); padding: 0.25rem 0.5rem; color: var(--text-secondary-{option_num});">
-                    <span style="flex: 1;">Name</span><span style="flex: 1;">Status</span>
-                </div>
-                <div style="display: flex; padding: 0.25rem 0.5rem; color: var(--text-primary-{option_num});">
-                    <span style="flex: 1;">Item A</span><span style="flex: 1; color: var(--success-{option_num});">Active</span>
-                </div>
-            </div>''',
-
-        "chart-placeholder": f'''
-            <div class="chart" style="height: 40px; display: flex; align-items: flex-end; gap: 4px; padding: 0.5rem;">
-                <div style="flex: 1; height: 60%; background: var(--accent-primary-{option_num}); border-radius: 2px;"></div>
-                <div style="flex: 1; height: 80%; background: var(--accent-primary-{option_num}); border-radius: 2px;"></div>
-                <div style="flex: 1; height: 45%; background: var(--accent-secondary-{option_num}); border-radius: 2px;"></div>
-                <div style="flex: 1; height: 90%; background: var(--accent-primary-{option_num}); border-radius: 2px;"></div>
-            </div>''',
-
-        "nav-header": f'''
-            <div class="nav-header" style="display: flex; justify-content: space-between; align-items: center; padding: 0.5rem; border-bottom: 1px solid var(--border-default-{option_num});">
-                <div style="font-weight: 700; color: var(--text-primary-{option_num}); font-size: 0.8rem;">Logo</div>
-                <div style="display: flex; gap: 0.5rem; font-size: 0.65rem; color: var(--text-secondary-{option_num});">
-                    <span>Home</span><span>About</span>
-                </div>
-            </div>''',
-
-        "hero-section": f'''
-            <div class="hero" style="text-align: center; padding: 1rem;">
-                <div style="font-size: 1rem; font-weight: 700; color: var(--text-primary-{option_num}); margin-bottom: 0.25rem;">Hero Title</div>
-                <div style="font-size: 0.65rem; color: var(--text-secondary-{option_num});">Subtitle text here</div>
-            </div>''',
-
-        "feature-card": f'''
-            <div class="feature-card" style="background: var(--bg-secondary-{option_num}); padding: 0.75rem; border-radius: 8px; border: 1px solid var(--border-default-{option_num});">
-                <div style="width: 24px; height: 24px; background: var(--accent-primary-{option_num}); border-radius: 6px; margin-bottom: 0.5rem;"></div>
-                <div style="font-size: 0.75rem; font-weight: 600; color: var(--text-primary-{option_num});">Feature</div>
-                <div style="font-size: 0.6rem; color: var(--text-secondary-{option_num});">Description</div>
-            </div>''',
-
-        "cta-button": f'''
-            <button style="background: var(--accent-primary-{option_num}); color: var(--bg-primary-{option_num}); border: none; padding: 0.5rem 1.25rem; border-radius: 6px; font-weight: 600; font-size: 0.75rem; margin: 0.5rem auto; display: block;">
-                Get Started
-            </button>''',
-
-        "input-field": f'''
-            <input type="text" placeholder="Enter text..." style="width: 100%; padding: 0.5rem; background: var(--bg-tertiary-{option_num}); border: 1px solid var(--border-default-{option_num}); border-radius: 6px; color: var(--text-primary-{option_num}); font-size: 0.7rem; outline: none;" />''',
-
-        "message-bubble": f'''
-            <div style="background: var(--accent-primary-{option_num}); color: var(--bg-primary-{option_num}); padding: 0.5rem 0.75rem; border-radius: 12px 12px 4px 12px; font-size: 0.7rem; max-width: 80%; margin-left: auto;">
-                Hello there!
-            </div>''',
-
-        "product-card": f'''
-            <div class="product-card" style="background: var(--bg-secondary-{option_num}); border-radius: 8px; overflow: hidden; border: 1px solid var(--border-default-{option_num});">
-                <div style="height: 50px; background: linear-gradient(135deg, var(--accent-secondary-{option_num}), var(--accent-primary-{option_num}));"></div>
-                <div style="padding: 0.5rem;">
-                    <div style="font-size: 0.75rem; font-weight: 600; color: var(--text-primary-{option_num});">Product</div>
-                    <div style="font-size: 0.8rem; font-weight: 700; color: var(--accent-primary-{option_num});">$29.99</div>
-                </div>
-            </div>''',
-
-        "avatar": f'''
-            <div style="width: 32px; height: 32px; border-radius: 50%; background: linear-gradient(135deg, var(--accent-primary-{option_num}), var(--accent-secondary-{option_num}));"></div>''',
-
-        "tag-pill": f'''
-            <span style="background: var(--accent-secondary-{option_num}); color: var(--text-primary-{option_num}); padding: 0.2rem 0.5rem; border-radius: 12px; font-size: 0.6rem;">Tag</span>''',
-
-        "testimonial": f'''
-            <div style="background: var(--bg-secondary-{option_num}); padding: 0.75rem; border-radius: 8px; border-left: 3px solid var(--accent-primary-{option_num});">
-                <div style="font-size: 0.65rem; color: var(--text-secondary-{option_num}); font-style: italic;">"Great product!"</div>
-                <div style="font-size: 0.6rem; color: var(--text-tertiary-{option_num}); margin-top: 0.25rem;">- Customer</div>
-            </div>'''
-    }
-
-    return components.get(component, f'<div style="color: var(--text-secondary-{option_num}); font-size: 0.6rem;">[{component}]</div>')
+    return get_registry().render(component, option_num)
 
 
 def generate_mockup_html(components: List[str], option_num: int) -> str:
     """Generate the mockup HTML for a single option card."""
-    component_html = "\n".join([generate_component_html(c, option_num) for c in components])
-    return f'''
-        <div class="mockup-content" style="display: flex; flex-direction: column; gap: 0.5rem;">
-            {component_html}
-        </div>
-    '''
+    return get_registry().render_mockup(components, option_num)
 
 
-def generate_palette_preview_html(
-    palettes: List[Dict],
-    project: str,
-    output_file: str = "palette-selection.json"
-) -> str:
-    """Generate the full HTML page with 4 palette option cards."""
+PAGE_CSS = indent_css("""
+.mockup-container {
+    padding: 1rem;
+    min-height: 180px;
+}
+
+.palette-info {
+    padding: 1rem;
+    border-top: 1px solid #333;
+}
+
+.palette-info h3 {
+    font-size: 1rem;
+    font-weight: 600;
+    margin-bottom: 0.25rem;
+}
+
+.palette-info p {
+    font-size: 0.8rem;
+    color: #888;
+    margin-bottom: 0.75rem;
+    line-height: 1.4;
+}
+
+.swatches {
+    display: flex;
+    gap: 6px;
+}
+
+.swatch {
+    width: 24px;
+    height: 24px;
+    border-radius: 6px;
+    border: 1px solid rgba(255, 255, 255, 0.1);
+}
 
-    project_type = detect_project_type(project)
-    components = MOCKUP_COMPONENTS.get(project_type, MOCKUP_COMPONENTS["default"])
+.scale {
+    display: flex;
+    margin-top: 8px;
+    border-radius: 4px;
+    overflow: hidden;
+}
 
-    # Generate CSS variables for each palette
-    css_vars = ""
-    for i, palette in enumerate(palettes):
-        option_num = i + 1
+.scale div {
+    flex: 1;
+    height: 10px;
+}
+""")
+
+SWATCH_ROLES = ["bg_primary", "bg_secondary", "text_primary", "accent_primary", "accent_secondary"]
+SCALE_STRIP_ROLE = "accent_primary"
+
+
+def derived_vars(palette: Dict) -> Dict[str, str]:
+    """Scale and state colors by variable role (accent_primary_500, accent_primary_hover)."""
+    derived = {}
+    for group in ("scales", "states"):
+        for role, values in (palette.get(group) or {}).items():
+            for key, value in values.items():
+                derived[f"{role}_{key}"] = value
+    return derived
+
+
+def scale_strip_html(palette: Dict) -> str:
+    """One row of the accent scale, or "" for palettes without scales."""
+    scale = (palette.get("scales") or {}).get(SCALE_STRIP_ROLE)
+    if not scale:
+        return ""
+    cells = "".join(
+        f'<div style="background: {scale[str(step)]};" title="{SCALE_STRIP_ROLE} {step}"></div>'
+        for step in SCALE_STEPS if str(step) in scale
+    )
+    return f'<div class="scale">{cells}</div>'
+
+
+def iter_css_vars(palettes: List[Dict]) -> Iterator[str]:
+    """Yield the :root block with per-option CSS variables."""
+    yield "        :root {\n"
+    for option_num, palette in enumerate(palettes, 1):
         colors = palette["colors"]
-        css_vars += f"""
-        /* Option {option_num}: {palette['name']} */
-        --bg-primary-{option_num}: {colors['bg_primary']};
-        --bg-secondary-{option_num}: {colors['bg_secondary']};
-        --bg-tertiary-{option_num}: {colors['bg_tertiary']};
-        --text-primary-{option_num}: {colors['text_primary']};
-        --text-secondary-{option_num}: {colors['text_secondary']};
-        --text-tertiary-{option_num}: {colors['text_tertiary']};
-        --accent-primary-{option_num}: {colors['accent_primary']};
-        --accent-secondary-{option_num}: {colors['accent_secondary']};
-        --border-default-{option_num}: {colors['border_default']};
-        --border-focus-{option_num}: {colors['border_focus']};
-        --success-{option_num}: {colors['success']};
-        --error-{option_num}: {colors['error']};
-        """
-
-    # Generate option cards
-    option_cards = ""
-    for i, palette in enumerate(palettes):
-        option_num = i + 1
-        mockup_html = generate_mockup_html(components, option_num)
+        name = palette["name"].replace("*/", "").replace("<", "")
+        yield f"            /* Option {option_num}: {name} */\n"
+        for role in CSS_VAR_ROLES:
+            yield f"            {css_var_name(role, option_num)}: {colors[role]};\n"
+        for role, value in derived_vars(palette).items():
+            yield f"            {css_var_name(role, option_num)}: {value};\n"
+    yield "        }\n\n"
+
+
+def iter_palette_cards(palettes: List[Dict], components: List[str]) -> Iterator[str]:
+    """Yield one option card per palette."""
+    for option_num, palette in enumerate(palettes, 1):
         colors = palette["colors"]
-
-        # Generate color swatches
-        swatch_colors = ["bg_primary", "bg_secondary", "text_primary", "accent_primary", "accent_secondary"]
-        swatches = "".join([
+        swatches = "".join(
             f'<div class="swatch" style="background: {colors[c]};" title="{c}"></div>'
-            for c in swatch_colors
-        ])
+            for c in SWATCH_ROLES
+        )
 
-        option_cards += f'''
+        yield f'''
         <div class="option-card" data-option="{option_num}" onclick="selectOption({option_num})"
              style="--card-bg: {colors['bg_primary']}; --card-border: {colors['border_default']};">
             <div class="card-header">
@@ -259,277 +195,203 @@ def generate_palette_preview_html(
                 <div class="check-mark">&#10003;</div>
             </div>
             <div class="mockup-container" style="background: {colors['bg_primary']};">
-                {mockup_html}
+                {generate_mockup_html(components, option_num)}
             </div>
             <div class="palette-info">
                 <h3>{html.escape(palette['name'])}</h3>
                 <p>{html.escape(palette.get('description', ''))}</p>
                 <div class="swatches">{swatches}</div>
+                {scale_strip_html(palette)}
             </div>
         </div>
         '''
 
-    return f'''<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Choose Your Palette - {html.escape(project)}</title>
-    <style>
-        :root {{
-            {css_vars}
-        }}
-
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }}
-
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-            background: #0f0f0f;
-            color: #ffffff;
-            min-height: 100vh;
-            padding: 2rem;
-        }}
-
-        .header {{
-            text-align: center;
-            margin-bottom: 2rem;
-        }}
-
-        .header h1 {{
-            font-size: 1.75rem;
-            font-weight: 600;
-            margin-bottom: 0.5rem;
-        }}
-
-        .header p {{
-            color: #888;
-            font-size: 0.95rem;
-        }}
-
-        .project-badge {{
-            display: inline-block;
-            background: #1a1a2e;
-            color: #6366f1;
-            padding: 0.25rem 0.75rem;
-            border-radius: 12px;
-            font-size: 0.8rem;
-            margin-top: 0.75rem;
-        }}
-
-        .options-grid {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(280px, 1fr));
-            gap: 1.5rem;
-            max-width: 1400px;
-            margin: 0 auto;
-        }}
-
-        .option-card {{
-            background: #1a1a1a;
-            border: 2px solid #333;
-            border-radius: 16px;
-            overflow: hidden;
-            cursor: pointer;
-            transition: all 0.3s ease;
-            position: relative;
-        }}
-
-        .option-card:hover {{
-            border-color: #555;
-            transform: translateY(-4px);
-            box-shadow: 0 12px 40px rgba(0, 0, 0, 0.4);
-        }}
-
-        .option-card.selected {{
-            border-color: #6366f1;
-            box-shadow: 0 0 0 2px rgba(99, 102, 241, 0.3);
-        }}
-
-        .option-card.selected .check-mark {{
-            opacity: 1;
-            transform: scale(1);
-        }}
-
-        .card-header {{
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            padding: 0.75rem 1rem;
-            background: rgba(255, 255, 255, 0.03);
-            border-bottom: 1px solid #333;
-        }}
-
-        .option-number {{
-            font-size: 0.75rem;
-            font-weight: 600;
-            color: #888;
-            text-transform: uppercase;
-            letter-spacing: 0.05em;
-        }}
-
-        .check-mark {{
-            width: 24px;
-            height: 24px;
-            background: #6366f1;
-            border-radius: 50%;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            color: white;
-            font-size: 0.8rem;
-            opacity: 0;
-            transform: scale(0.5);
-            transition: all 0.2s ease;
-        }}
-
-        .mockup-container {{
-            padding: 1rem;
-            min-height: 180px;
-        }}
-
-        .palette-info {{
-            padding: 1rem;
-            border-top: 1px solid #333;
-        }}
-
-        .palette-info h3 {{
-            font-size: 1rem;
-            font-weight: 600;
-            margin-bottom: 0.25rem;
-        }}
-
-        .palette-info p {{
-            font-size: 0.8rem;
-            color: #888;
-            margin-bottom: 0.75rem;
-            line-height: 1.4;
-        }}
-
-        .swatches {{
-            display: flex;
-            gap: 6px;
-        }}
-
-        .swatch {{
-            width: 24px;
-            height: 24px;
-            border-radius: 6px;
-            border: 1px solid rgba(255, 255, 255, 0.1);
-        }}
-
-        .selection-banner {{
-            position: fixed;
-            bottom: 0;
-            left: 0;
-            right: 0;
-            background: #1a1a2e;
-            border-top: 1px solid #333;
-            padding: 1rem 2rem;
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            transform: translateY(100%);
-            transition: transform 0.3s ease;
-        }}
-
-        .selection-banner.visible {{
-            transform: translateY(0);
-        }}
-
-        .selection-banner p {{
-            color: #888;
-        }}
-
-        .selection-banner strong {{
-            color: #6366f1;
-        }}
-
-        .selection-banner code {{
-            background: #0f0f0f;
-            padding: 0.25rem 0.5rem;
-            border-radius: 4px;
-            font-family: monospace;
-            color: #10b981;
-        }}
-
-        .instructions {{
-            text-align: center;
-            margin-top: 2rem;
-            padding: 1rem;
-            background: #1a1a2e;
-            border-radius: 12px;
-            max-width: 600px;
-            margin-left: auto;
-            margin-right: auto;
-        }}
-
-        .instructions p {{
-            color: #888;
-            font-size: 0.9rem;
-        }}
-
-        .instructions strong {{
-            color: #6366f1;
-        }}
-    </style>
-</head>
-<body>
-    <div class="header">
-        <h1>Choose Your Color Palette</h1>
-        <p>Click on the option that best matches your vision</p>
-        <div class="project-badge">{html.escape(project)}</div>
-    </div>
 
-    <div class="options-grid">
-        {option_cards}
+def iter_palette_preview_html(
+    palettes: List[Dict],
+    project: str,
+    assets: Optional[PageAssets] = None
+) -> Iterator[str]:
+    """Render the palette preview page as a stream of HTML chunks."""
+    components = get_registry().components_for(project)
+
+    return render_page(
+        title="Choose Your Palette",
+        heading="Choose Your Color Palette",
+        intro="Click on the option that best matches your vision",
+        project=project,
+        styles=iter_css_vars(palettes),
+        page_css=PAGE_CSS,
+        cards=iter_palette_cards(palettes, components),
+        option_names=[p["name"] for p in palettes],
+        storage_key="paletteSelection",
+        assets=assets,
+    )
+
+
+GALLERY_CARD = """
+<div class="option-card">
+    <div class="card-header">
+        <span class="option-number"></span>
+        <div class="check-mark">&#10003;</div>
     </div>
-
-    <div class="instructions">
-        <p>Click a card to select it, then tell Claude: <strong>"I choose Option [number]"</strong></p>
+    <div class="mockup-container"></div>
+    <div class="palette-info">
+        <h3></h3>
+        <p></p>
+        <div class="swatches"></div>
     </div>
+</div>
+"""
+
+GALLERY_PAGE_SCRIPT = """
+        const mockupHtml = __MOCKUP__;
+        const cssVarRoles = __CSS_VAR_ROLES__;
+        const swatchRoles = __SWATCH_ROLES__;
+
+        function fillCard(card, item, num) {
+            const colors = item.colors;
+            card.style.setProperty('--card-bg', colors.bg_primary);
+            card.style.setProperty('--card-border', colors.border_default);
+            card.querySelector('.option-number').textContent = `Option ${num}`;
+            card.querySelector('.mockup-container').style.background = colors.bg_primary;
+            card.querySelector('.palette-info h3').textContent = item.name;
+            card.querySelector('.palette-info p').textContent = item.description;
+            const swatches = card.querySelector('.swatches');
+            swatchRoles.forEach(role => {
+                const swatch = document.createElement('div');
+                swatch.className = 'swatch';
+                swatch.style.background = colors[role];
+                swatch.title = role;
+                swatches.appendChild(swatch);
+            });
+            if (item.scale) {
+                const strip = document.createElement('div');
+                strip.className = 'scale';
+                item.scale.forEach(color => {
+                    const cell = document.createElement('div');
+                    cell.style.background = color;
+                    strip.appendChild(cell);
+                });
+                card.querySelector('.palette-info').appendChild(strip);
+            }
+        }
+
+        function mountCard(card, item) {
+            cssVarRoles.forEach(role => {
+                card.style.setProperty(`--${role.replace(/_/g, '-')}-__SUFFIX__`, item.colors[role]);
+            });
+            Object.entries(item.derived || {}).forEach(([role, color]) => {
+                card.style.setProperty(`--${role.replace(/_/g, '-')}-__SUFFIX__`, color);
+            });
+            card.querySelector('.mockup-container').innerHTML = mockupHtml;
+        }
+"""
+
+
+def iter_gallery_items(palettes: List[Dict]) -> Iterator[Dict]:
+    """Yield the per-palette data shipped to the gallery page."""
+    for palette in palettes:
+        colors = palette["colors"]
+        item = {
+            "name": palette["name"],
+            "description": palette.get("description", ""),
+            "colors": {role: colors[role] for role in CSS_VAR_ROLES},
+        }
+        derived = derived_vars(palette)
+        if derived:
+            scale = (palette.get("scales") or {}).get(SCALE_STRIP_ROLE, {})
+            item["derived"] = derived
+            item["scale"] = [scale[str(step)] for step in SCALE_STEPS if str(step) in scale]
+        yield item
+
+
+def iter_palette_gallery_html(
+    palettes: List[Dict],
+    project: str,
+    assets: Optional[PageAssets] = None
+) -> Iterator[str]:
+    """Render the lazily mounted gallery page for any number of palettes."""
+    components = get_registry().components_for(project)
+    page_script = (
+        GALLERY_PAGE_SCRIPT
+        .replace("__MOCKUP__", script_json(get_registry().render_mockup(components, GALLERY_OPTION_SUFFIX)))
+        .replace("__CSS_VAR_ROLES__", script_json(CSS_VAR_ROLES))
+        .replace("__SWATCH_ROLES__", script_json(SWATCH_ROLES))
+        .replace("__SUFFIX__", GALLERY_OPTION_SUFFIX)
+    )
+
+    return render_page(
+        title="Choose Your Palette",
+        heading="Choose Your Color Palette",
+        intro=f"{len(palettes)} options; click the one that best matches your vision",
+        project=project,
+        page_css=PAGE_CSS,
+        cards=(),
+        option_names=None,
+        storage_key="paletteSelection",
+        gallery=gallery_chunks(GALLERY_CARD, iter_gallery_items(palettes)),
+        scripts=[page_script],
+        assets=assets,
+    )
 
-    <div class="selection-banner" id="selectionBanner">
-        <p>Selected: <strong id="selectedName">None</strong></p>
-        <p>Tell Claude: <code id="selectionCode">I choose Option X</code></p>
-    </div>
 
-    <script>
-        let selectedOption = null;
-
-        function selectOption(optionNum) {{
-            // Remove previous selection
-            document.querySelectorAll('.option-card').forEach(card => {{
-                card.classList.remove('selected');
-            }});
-
-            // Select new card
-            const card = document.querySelector(`[data-option="${{optionNum}}"]`);
-            card.classList.add('selected');
-            selectedOption = optionNum;
-
-            // Update banner
-            const palettes = {json.dumps([p['name'] for p in palettes])};
-            document.getElementById('selectedName').textContent = palettes[optionNum - 1];
-            document.getElementById('selectionCode').textContent = `I choose Option ${{optionNum}}`;
-            document.getElementById('selectionBanner').classList.add('visible');
-
-            // Save selection to localStorage for reference
-            localStorage.setItem('paletteSelection', JSON.stringify({{
-                option: optionNum,
-                name: palettes[optionNum - 1]
-            }}));
-        }}
-    </script>
-</body>
-</html>'''
+def generate_palette_preview_html(
+    palettes: List[Dict],
+    project: str,
+    output_file: str = "palette-selection.json"
+) -> str:
+    """Generate the full HTML page with 4 palette option cards."""
+    return "".join(iter_palette_preview_html(palettes, project))
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line flags."""
+    parser = argparse.ArgumentParser(description="Generate the palette options preview page.")
+    parser.add_argument(
+        "--mockups",
+        action="append",
+        default=[],
+        metavar="DIR",
+        help="Extra mockup directory (project-types.json, components/*.html); repeatable"
+    )
+    parser.add_argument(
+        "--output",
+        help="Write the page to this file instead of stdout"
+    )
+    parser.add_argument(
+        "--gallery",
+        action="store_true",
+        help=f"Lazily mounted gallery page (automatic above {SPRINT_OPTION_COUNT} palettes)"
+    )
+    parser.add_argument(
+        "--assets-dir",
+        metavar="DIR",
+        help="Link a shared, content-hashed stylesheet/script written to DIR/assets/ "
+             "(DIR is where the HTML is saved) instead of inlining them"
+    )
+    parser.add_argument(
+        "--precompress",
+        action="store_true",
+        help="With --assets-dir, also write .gz (and .br with brotli installed) siblings"
+    )
+    parser.add_argument(
+        "--scales",
+        action="store_true",
+        help="Derive 50-900 scales and hover/active/disabled states for palettes without them"
+    )
+    return parser.parse_args()
 
 
 def main():
     """Main entry point."""
+    args = parse_args()
+
+    try:
+        get_registry(args.mockups)
+    except (OSError, ValueError) as e:
+        output_error(f"Could not load mockups: {str(e)}")
+
     input_data = read_input()
 
     palettes = input_data.get("palettes")
@@ -539,14 +401,39 @@ def main():
     if not palettes:
         output_error("Missing required field: palettes")
 
-    if len(palettes) != 4:
-        output_error(f"Expected 4 palettes, got {len(palettes)}")
-
-    # Generate HTML
-    html = generate_palette_preview_html(palettes, project)
-
-    # Output raw HTML (not JSON wrapped)
-    print(html)
+    for i, palette in enumerate(palettes, 1):
+        if not isinstance(palette, dict) or "name" not in palette:
+            output_error(f"Palette {i} is missing field: name")
+        missing = [role for role in CSS_VAR_ROLES if role not in palette.get("colors", {})]
+        if missing:
+            output_error(f"Palette {i} is missing colors: {', '.join(missing)}")
+
+    if args.scales:
+        try:
+            add_scales([p for p in palettes if not p.get("scales")])
+        except ValueError as e:
+            output_error(f"Could not derive color scales: {str(e)}")
+
+    if args.precompress and not args.assets_dir:
+        output_error("--precompress requires --assets-dir")
+
+    assets = None
+    if args.assets_dir:
+        try:
+            assets = write_page_assets(args.assets_dir, PAGE_CSS, args.precompress)
+        except OSError as e:
+            output_error(f"Could not write assets: {str(e)}")
+
+    if args.gallery or len(palettes) > SPRINT_OPTION_COUNT:
+        pages = iter_palette_gallery_html(palettes, project, assets)
+    else:
+        pages = iter_palette_preview_html(palettes, project, assets)
+
+    # Stream raw HTML (not JSON wrapped) to the output
+    try:
+        write_chunks(pages, args.output)
+    except OSError as e:
+        output_error(f"Could not write preview: {str(e)}")
 
 
 if __name__ == "__main__":
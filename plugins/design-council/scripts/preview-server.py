@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+Local preview server with live updates over Server-Sent Events.
+
+Serves the staging directory (previews, generated code) on localhost and
+watches it for changes. Every HTML page it serves gets a small client
+script that listens on /__live/events:
+- Option pages (palette/typography/combination previews) update in
+  place when their file is rewritten: styles, header and cards are
+  swapped, the scroll position and current selection are kept
+- Generated HTML written by gemini_generate.py --live-html swaps each
+  partial body in place while streaming, then reloads once complete
+- Other pages (gallery pages, generated code, directory listings)
+  reload automatically and restore their scroll position
+
+Combined with --live-preview on palette-generator.py and
+typography-generator.py, options appear one by one while Gemini is
+still streaming.
+
+Content-hashed assets (--assets-dir) are served with long-lived cache
+headers, and their precompressed .br/.gz siblings when the browser
+accepts them.
+
+Usage:
+    python preview-server.py                                   # serves ./.design-sprint-staging
+    python preview-server.py --dir ./.design-sprint-staging --port 8765
+
+Output: JSON with the server URL on stdout, then serves until interrupted
+"""
+
+import argparse
+import html
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import quote
+
+from live_html import STATUS_ID
+from preview_templates import ASSETS_DIR_NAME
+
+
+DEFAULT_DIR = "./.design-sprint-staging"
+DEFAULT_PORT = 8765
+DEFAULT_INTERVAL = 0.25
+HEARTBEAT_SECONDS = 15
+EVENTS_PATH = "/__live/events"
+CLIENT_PATH = "/__live/client.js"
+IGNORED_SUFFIXES = (".tmp", ".swp", "~")
+PRECOMPRESSED = [("br", ".br"), ("gzip", ".gz")]
+
+LIVE_CLIENT = """(() => {
+    const pagePath = decodeURIComponent(location.pathname);
+    const scrollKey = `live-scroll:${pagePath}`;
+    const saved = sessionStorage.getItem(scrollKey);
+    if (saved !== null) {
+        sessionStorage.removeItem(scrollKey);
+        window.scrollTo(0, Number(saved));
+    }
+
+    function reload() {
+        sessionStorage.setItem(scrollKey, String(window.scrollY));
+        location.reload();
+    }
+
+    async function update() {
+        const response = await fetch(location.href, { cache: 'no-store' });
+        const next = new DOMParser().parseFromString(await response.text(), 'text/html');
+        const headSelector = 'style, link[rel="stylesheet"]';
+
+        // Code being generated (live_html.py): swap the partial body in place
+        if (document.getElementById('__STATUS_ID__') && next.getElementById('__STATUS_ID__')) {
+            document.head.querySelectorAll(headSelector).forEach(node => node.remove());
+            next.head.querySelectorAll(headSelector).forEach(node => document.head.appendChild(document.importNode(node, true)));
+            document.body.replaceChildren(...Array.from(next.body.childNodes, node => document.importNode(node, true)));
+            return;
+        }
+
+        const grid = document.querySelector('.options-grid');
+        const nextGrid = next.querySelector('.options-grid');
+        // Gallery pages hold their options in script state; reload those
+        if (!grid || !nextGrid || document.getElementById('galleryData') || next.getElementById('galleryData')) {
+            return reload();
+        }
+
+        document.head.querySelectorAll(headSelector).forEach(node => node.remove());
+        next.head.querySelectorAll(headSelector).forEach(node => document.head.appendChild(document.importNode(node, true)));
+
+        const header = document.querySelector('.header');
+        const nextHeader = next.querySelector('.header');
+        if (header && nextHeader) header.replaceWith(document.importNode(nextHeader, true));
+        grid.replaceChildren(...Array.from(nextGrid.childNodes, node => document.importNode(node, true)));
+
+        // Re-run the page config so selection names match the new options
+        next.querySelectorAll('script:not([src])').forEach(script => {
+            if (script.textContent.includes('window.previewConfig')) new Function(script.textContent)();
+        });
+        if (typeof selectedOption !== 'undefined' && selectedOption) {
+            const card = document.querySelector(`[data-option="${selectedOption}"]`);
+            if (card) card.classList.add('selected');
+        }
+    }
+
+    const source = new EventSource('__EVENTS_PATH__');
+    source.addEventListener('change', event => {
+        const paths = JSON.parse(event.data).paths.map(path => '/' + path);
+        const filePath = pagePath.endsWith('/') ? pagePath + 'index.html' : pagePath;
+        if (paths.includes(filePath)) {
+            update().catch(reload);
+        } else if (pagePath.endsWith('/') && paths.some(path => path.startsWith(pagePath))) {
+            reload();
+        }
+    });
+})();
+""".replace("__EVENTS_PATH__", EVENTS_PATH).replace("__STATUS_ID__", STATUS_ID)
+
+CLIENT_TAG = f'<script src="{CLIENT_PATH}"></script>'.encode("utf-8")
+
+
+def output_error(message: str, exit_code: int = 1) -> None:
+    """Output error message as JSON and exit."""
+    print(json.dumps({"error": True, "message": message}))
+    sys.exit(exit_code)
+
+
+def inject_client(document: bytes) -> bytes:
+    """Add the live client script before </body> (or at the end)."""
+    index = document.rfind(b"</body>")
+    if index < 0:
+        return document + CLIENT_TAG
+    return document[:index] + CLIENT_TAG + b"\n" + document[index:]
+
+
+class ChangeBroadcaster:
+    """
+    Polls a directory tree and fans file changes out to SSE subscribers.
+
+    Polling (mtime + size) keeps this stdlib-only and works the same on
+    every platform; a staging directory holds a handful of files.
+    """
+
+    def __init__(self, root: str, interval: float = DEFAULT_INTERVAL):
+        self.root = root
+        self.interval = interval
+        self.subscribers: List[queue.Queue] = []
+        self.lock = threading.Lock()
+        self.snapshot = self._scan()
+
+    def _scan(self) -> Dict[str, tuple]:
+        state = {}
+        for dirpath, _, filenames in os.walk(self.root):
+            for filename in filenames:
+                if filename.endswith(IGNORED_SUFFIXES):
+                    continue
+                path = os.path.join(dirpath, filename)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue  # removed between listing and stat
+                rel = os.path.relpath(path, self.root).replace(os.sep, "/")
+                state[rel] = (stat.st_mtime_ns, stat.st_size)
+        return state
+
+    def subscribe(self) -> queue.Queue:
+        events: queue.Queue = queue.Queue()
+        with self.lock:
+            self.subscribers.append(events)
+        return events
+
+    def unsubscribe(self, events: queue.Queue) -> None:
+        with self.lock:
+            if events in self.subscribers:
+                self.subscribers.remove(events)
+
+    def run(self) -> None:
+        """Poll forever, broadcasting changed (or removed) paths."""
+        while True:
+            time.sleep(self.interval)
+            current = self._scan()
+            changed = sorted(
+                path for path in current.keys() | self.snapshot.keys()
+                if current.get(path) != self.snapshot.get(path)
+            )
+            self.snapshot = current
+            if changed:
+                with self.lock:
+                    for events in self.subscribers:
+                        events.put(changed)
+
+
+class PreviewHandler(SimpleHTTPRequestHandler):
+    """Static files plus the live-update endpoints."""
+
+    broadcaster: Optional[ChangeBroadcaster] = None
+
+    def log_message(self, format, *args):
+        # Keep stdout clean for the JSON status line
+        pass
+
+    def end_headers(self):
+        if self.path.startswith(f"/{ASSETS_DIR_NAME}/"):
+            # Content-hashed names never change content
+            self.send_header("Cache-Control", "public, max-age=31536000, immutable")
+        else:
+            self.send_header("Cache-Control", "no-cache")
+        super().end_headers()
+
+    def do_GET(self):
+        route = self.path.split("?", 1)[0]
+        if route == EVENTS_PATH:
+            return self.serve_events()
+        if route == CLIENT_PATH:
+            return self.send_bytes(LIVE_CLIENT.encode("utf-8"), "text/javascript; charset=utf-8")
+
+        path = self.translate_path(self.path)
+        if os.path.isdir(path) and route.endswith("/") and not os.path.exists(os.path.join(path, "index.html")):
+            return self.send_bytes(self.directory_listing(path, route), "text/html; charset=utf-8")
+
+        if os.path.isfile(path) and path.endswith((".html", ".htm")):
+            try:
+                with open(path, "rb") as f:
+                    document = f.read()
+            except OSError:
+                return self.send_error(404, "File not found")
+            return self.send_bytes(inject_client(document), "text/html; charset=utf-8")
+
+        if os.path.isfile(path) and self.serve_precompressed(path):
+            return None
+        return super().do_GET()
+
+    def directory_listing(self, path: str, route: str) -> bytes:
+        """Minimal listing page for a directory without an index.html."""
+        entries = []
+        for name in sorted(os.listdir(path)):
+            if name.endswith(IGNORED_SUFFIXES):
+                continue
+            label = name + "/" if os.path.isdir(os.path.join(path, name)) else name
+            entries.append(f'<li><a href="{html.escape(quote(label))}">{html.escape(label)}</a></li>')
+        title = html.escape(route)
+        return (
+            f"<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\"><title>{title}</title></head>\n"
+            f"<body><h1>{title}</h1>\n<ul>\n" + "\n".join(entries) + "\n</ul>\n</body></html>\n"
+        ).encode("utf-8")
+
+    def send_bytes(self, body: bytes, content_type: str) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def serve_precompressed(self, path: str) -> bool:
+        """Serve a .br/.gz sibling when the client accepts it."""
+        accepted = self.headers.get("Accept-Encoding", "")
+        for encoding, suffix in PRECOMPRESSED:
+            if encoding in accepted and os.path.isfile(path + suffix):
+                with open(path + suffix, "rb") as f:
+                    body = f.read()
+                self.send_response(200)
+                self.send_header("Content-Type", self.guess_type(path))
+                self.send_header("Content-Encoding", encoding)
+                self.send_header("Vary", "Accept-Encoding")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                return True
+        return False
+
+    def serve_events(self) -> None:
+        """Stream change events until the client disconnects."""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "keep-alive")
+        self.end_headers()
+
+        events = self.broadcaster.subscribe()
+        try:
+            self.wfile.write(b": connected\n\n")
+            self.wfile.flush()
+            while True:
+                try:
+                    paths = events.get(timeout=HEARTBEAT_SECONDS)
+                    message = f"event: change\ndata: {json.dumps({'paths': paths})}\n\n"
+                except queue.Empty:
+                    message = ": heartbeat\n\n"
+                self.wfile.write(message.encode("utf-8"))
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            self.broadcaster.unsubscribe(events)
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line flags."""
+    parser = argparse.ArgumentParser(description="Serve staging previews with live updates.")
+    parser.add_argument("--dir", default=DEFAULT_DIR, help=f"Directory to serve (default: {DEFAULT_DIR})")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Port (default: {DEFAULT_PORT}; 0 picks a free one)")
+    parser.add_argument("--host", default="127.0.0.1", help="Bind address (default: 127.0.0.1)")
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=DEFAULT_INTERVAL,
+        help=f"Seconds between change scans (default: {DEFAULT_INTERVAL})"
+    )
+    return parser.parse_args()
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+
+    root = os.path.abspath(args.dir)
+    try:
+        os.makedirs(root, exist_ok=True)
+    except OSError as e:
+        output_error(f"Could not create {root}: {str(e)}")
+
+    broadcaster = ChangeBroadcaster(root, args.interval)
+    handler = type("BoundPreviewHandler", (PreviewHandler,), {"broadcaster": broadcaster})
+
+    try:
+        server = ThreadingHTTPServer((args.host, args.port), partial(handler, directory=root))
+    except OSError as e:
+        output_error(f"Could not start server on {args.host}:{args.port}: {str(e)}")
+    server.daemon_threads = True
+
+    threading.Thread(target=broadcaster.run, daemon=True).start()
+
+    host, port = server.server_address[:2]
+    print(json.dumps({"error": False, "url": f"http://{host}:{port}/", "dir": root}), flush=True)
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,578 @@
+"""
+Shared page template and streaming writer for preview pages.
+
+Handles:
+- The page skeleton, base stylesheet and selection script shared by
+  preview-generator.py and typography-preview-generator.py
+- Rendering pages as a stream of chunks (no whole-page string building)
+- Writing chunks to a file or stdout through a buffered writer
+- Optionally externalizing the stylesheets and runtime script as
+  content-hashed assets (with .gz/.br siblings); the base stylesheet and
+  runtime are shared by every page
+
+Page-specific styles and cards are passed in as iterables, so a page is
+produced in one pass with flat memory regardless of the option count.
+
+Gallery mode (any number of options) ships the options as one JSON blob
+plus a single card <template>; the browser appends cards a page at a
+time as the user scrolls and mounts each card's mockup (CSS variables,
+fonts) only when an IntersectionObserver sees it.
+"""
+
+import gzip
+import hashlib
+import html
+import json
+import os
+import sys
+import textwrap
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional
+
+try:
+    import brotli  # optional: .br siblings for --precompress
+except ImportError:
+    brotli = None
+
+
+BUFFER_SIZE = 64 * 1024
+STYLE_INDENT = " " * 8
+GALLERY_PAGE_SIZE = 48
+DEFAULT_CHOICE_HINT = "I choose Option [number]"
+DEFAULT_CHOICE = "I choose Option {num}"
+ASSETS_DIR_NAME = "assets"
+
+BASE_CSS = """
+* {
+    margin: 0;
+    padding: 0;
+    box-sizing: border-box;
+}
+
+body {
+    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
+    background: #0f0f0f;
+    color: #ffffff;
+    min-height: 100vh;
+    padding: 2rem;
+}
+
+.header {
+    text-align: center;
+    margin-bottom: 2rem;
+}
+
+.header h1 {
+    font-size: 1.75rem;
+    font-weight: 600;
+    margin-bottom: 0.5rem;
+}
+
+.header p {
+    color: #888;
+    font-size: 0.95rem;
+}
+
+.project-badge {
+    display: inline-block;
+    background: #1a1a2e;
+    color: #6366f1;
+    padding: 0.25rem 0.75rem;
+    border-radius: 12px;
+    font-size: 0.8rem;
+    margin-top: 0.75rem;
+}
+
+.options-grid {
+    display: grid;
+    grid-template-columns: repeat(auto-fit, minmax(var(--card-min-width, 280px), 1fr));
+    gap: 1.5rem;
+    max-width: 1400px;
+    margin: 0 auto;
+}
+
+.option-card {
+    background: #1a1a1a;
+    border: 2px solid #333;
+    border-radius: 16px;
+    overflow: hidden;
+    cursor: pointer;
+    transition: all 0.3s ease;
+    position: relative;
+}
+
+.gallery-sentinel {
+    height: 1px;
+}
+
+.options-grid.gallery .option-card {
+    content-visibility: auto;
+    contain-intrinsic-size: auto 360px;
+}
+
+.option-card:hover {
+    border-color: #555;
+    transform: translateY(-4px);
+    box-shadow: 0 12px 40px rgba(0, 0, 0, 0.4);
+}
+
+.option-card.selected {
+    border-color: #6366f1;
+    box-shadow: 0 0 0 2px rgba(99, 102, 241, 0.3);
+}
+
+.option-card.selected .check-mark {
+    opacity: 1;
+    transform: scale(1);
+}
+
+.card-header {
+    display: flex;
+    justify-content: space-between;
+    align-items: center;
+    padding: 0.75rem 1rem;
+    background: rgba(255, 255, 255, 0.03);
+    border-bottom: 1px solid #333;
+}
+
+.option-number {
+    font-size: 0.75rem;
+    font-weight: 600;
+    color: #888;
+    text-transform: uppercase;
+    letter-spacing: 0.05em;
+}
+
+.check-mark {
+    width: 24px;
+    height: 24px;
+    background: #6366f1;
+    border-radius: 50%;
+    display: flex;
+    align-items: center;
+    justify-content: center;
+    color: white;
+    font-size: 0.8rem;
+    opacity: 0;
+    transform: scale(0.5);
+    transition: all 0.2s ease;
+}
+
+.selection-banner {
+    position: fixed;
+    bottom: 0;
+    left: 0;
+    right: 0;
+    background: #1a1a2e;
+    border-top: 1px solid #333;
+    padding: 1rem 2rem;
+    display: flex;
+    justify-content: space-between;
+    align-items: center;
+    transform: translateY(100%);
+    transition: transform 0.3s ease;
+}
+
+.selection-banner.visible {
+    transform: translateY(0);
+}
+
+.selection-banner p {
+    color: #888;
+}
+
+.selection-banner strong {
+    color: #6366f1;
+}
+
+.selection-banner code {
+    background: #0f0f0f;
+    padding: 0.25rem 0.5rem;
+    border-radius: 4px;
+    font-family: monospace;
+    color: #10b981;
+}
+
+.instructions {
+    text-align: center;
+    margin-top: 2rem;
+    padding: 1rem;
+    background: #1a1a2e;
+    border-radius: 12px;
+    max-width: 600px;
+    margin-left: auto;
+    margin-right: auto;
+}
+
+.instructions p {
+    color: #888;
+    font-size: 0.9rem;
+}
+
+.instructions strong {
+    color: #6366f1;
+}
+"""
+
+# Shared page runtime. Page-specific values come from the inline
+# previewConfig object, so this script is identical on every page and can
+# be externalized as a cached asset.
+RUNTIME_SCRIPT = """
+        let selectedOption = null;
+        const galleryElement = document.getElementById('galleryData');
+        const galleryData = galleryElement ? JSON.parse(galleryElement.textContent) : [];
+        // previewConfig is re-read on every selection: preview-server.py swaps it on live updates
+        const optionName = optionNum => previewConfig.optionNames
+            ? previewConfig.optionNames[optionNum - 1]
+            : galleryData[optionNum - 1].name;
+
+        function selectOption(optionNum) {
+            // Remove previous selection
+            document.querySelectorAll('.option-card.selected').forEach(card => {
+                card.classList.remove('selected');
+            });
+
+            // Select new card
+            const card = document.querySelector(`[data-option="${optionNum}"]`);
+            card.classList.add('selected');
+            selectedOption = optionNum;
+            const name = optionName(optionNum);
+
+            // Update banner
+            document.getElementById('selectedName').textContent = name;
+            document.getElementById('selectionCode').textContent = previewConfig.choice
+                .replace('{num}', optionNum)
+                .replace('{name}', () => name);
+            document.getElementById('selectionBanner').classList.add('visible');
+
+            // Save selection to localStorage for reference
+            localStorage.setItem(previewConfig.storageKey, JSON.stringify({
+                option: optionNum,
+                name: name
+            }));
+        }
+
+        // Gallery mode: the page defines fillCard(card, item, num) (cheap: labels)
+        // and mountCard(card, item, num) (expensive: mockup, variables, fonts).
+        if (galleryElement) {
+            const cardTemplate = document.getElementById('cardTemplate');
+            const grid = document.querySelector('.options-grid');
+            let renderedCount = 0;
+
+            const mountObserver = new IntersectionObserver(entries => {
+                entries.forEach(entry => {
+                    if (!entry.isIntersecting) return;
+                    const card = entry.target;
+                    const num = Number(card.dataset.option);
+                    mountCard(card, galleryData[num - 1], num);
+                    card.classList.add('mounted');
+                    mountObserver.unobserve(card);
+                });
+            }, { rootMargin: '400px 0px' });
+
+            const pageObserver = new IntersectionObserver(entries => {
+                if (entries[0].isIntersecting) appendPage();
+            }, { rootMargin: '800px 0px' });
+
+            const appendPage = () => {
+                const fragment = document.createDocumentFragment();
+                const end = Math.min(renderedCount + previewConfig.pageSize, galleryData.length);
+                for (; renderedCount < end; renderedCount++) {
+                    const num = renderedCount + 1;
+                    const card = cardTemplate.content.firstElementChild.cloneNode(true);
+                    card.dataset.option = num;
+                    card.addEventListener('click', () => selectOption(num));
+                    fillCard(card, galleryData[num - 1], num);
+                    fragment.appendChild(card);
+                    mountObserver.observe(card);
+                }
+                grid.appendChild(fragment);
+                if (renderedCount >= galleryData.length) pageObserver.disconnect();
+            };
+
+            appendPage();
+            pageObserver.observe(document.getElementById('gallerySentinel'));
+        }
+"""
+
+
+@dataclass
+class PageAssets:
+    """Page-relative URLs of externalized stylesheets and the runtime script."""
+    stylesheet: str  # base stylesheet, identical on every page
+    script: str
+    page_stylesheet: Optional[str] = None  # this page's static styles
+
+
+def indent_css(css: str) -> str:
+    """Indent a stylesheet for embedding in the page <style> block."""
+    return textwrap.indent(css.strip("\n"), STYLE_INDENT)
+
+
+_BASE_CSS_INDENTED = indent_css(BASE_CSS)
+
+
+def script_json(value) -> str:
+    """JSON that is safe to embed inside a <script> element."""
+    return json.dumps(value).replace("</", "<\\/")
+
+
+def page_config(
+    option_names: Optional[List[str]],
+    storage_key: str,
+    choice: str = DEFAULT_CHOICE
+) -> str:
+    """
+    Inline previewConfig assignment read by the runtime script.
+
+    Args:
+        option_names: Names for the banner; taken from galleryData when None
+        storage_key: localStorage key for the selection
+        choice: Phrase to tell Claude; {num} and {name} are filled in
+    """
+    config = {
+        "optionNames": option_names,
+        "storageKey": storage_key,
+        "choice": choice,
+        "pageSize": GALLERY_PAGE_SIZE,
+    }
+    return f"\n        window.previewConfig = {script_json(config)};\n"
+
+
+def gallery_chunks(card_template: str, items: Iterable[Dict]) -> Iterator[str]:
+    """
+    Yield the gallery markup that follows the (empty) options grid.
+
+    Args:
+        card_template: HTML of one card shell, filled in by the page's fillCard()
+        items: Per-option data passed to fillCard()/mountCard(); needs "name"
+
+    Yields:
+        HTML chunks: card <template>, JSON data blob, scroll sentinel
+    """
+    yield f'    <template id="cardTemplate">{card_template.strip()}</template>\n'
+    yield '    <script type="application/json" id="galleryData">['
+    for i, item in enumerate(items):
+        yield ("," if i else "") + script_json(item)
+    yield "]</script>\n"
+    yield '    <div class="gallery-sentinel" id="gallerySentinel"></div>\n'
+
+
+def write_asset(output_dir: str, name: str, content: str, precompress: bool = False) -> str:
+    """
+    Write a content-addressed asset to output_dir/assets/.
+
+    The filename carries a hash of the content (preview-3f2a9c1b0d4e.css),
+    so an unchanged asset is written once and stays a cache hit across
+    pages and sprints.
+
+    Args:
+        output_dir: Directory the HTML pages are saved in
+        name: Base filename, e.g. "preview.css"
+        content: Asset text
+        precompress: Also write .gz (and .br when brotli is installed) siblings
+
+    Returns:
+        URL of the asset relative to output_dir
+
+    Raises:
+        OSError: If the asset cannot be written
+    """
+    data = content.encode("utf-8")
+    stem, ext = os.path.splitext(name)
+    filename = f"{stem}-{hashlib.sha256(data).hexdigest()[:12]}{ext}"
+    target_dir = os.path.join(output_dir, ASSETS_DIR_NAME)
+    os.makedirs(target_dir, exist_ok=True)
+
+    variants = [("", lambda: data)]
+    if precompress:
+        variants.append((".gz", lambda: gzip.compress(data, compresslevel=9, mtime=0)))
+        if brotli is not None:
+            variants.append((".br", lambda: brotli.compress(data, quality=11)))
+
+    for suffix, encode in variants:
+        path = os.path.join(target_dir, filename + suffix)
+        if os.path.exists(path):
+            continue
+        # Write-then-rename so a concurrently opened page never sees a partial file
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(encode())
+        os.replace(temp_path, path)
+
+    return f"{ASSETS_DIR_NAME}/{filename}"
+
+
+def write_page_assets(output_dir: str, page_css: str = "", precompress: bool = False) -> PageAssets:
+    """
+    Externalize the base stylesheet, the page stylesheet and the runtime script.
+
+    The base stylesheet and runtime are the same file on every page; only
+    the small page stylesheet differs between page kinds.
+
+    Args:
+        output_dir: Directory the HTML page is saved in
+        page_css: Static page stylesheet (as passed to render_page)
+        precompress: Also write .gz/.br siblings
+
+    Raises:
+        OSError: If an asset cannot be written
+    """
+    page_css = textwrap.dedent(page_css).strip("\n")
+    return PageAssets(
+        stylesheet=write_asset(output_dir, "preview.css", BASE_CSS.lstrip("\n"), precompress),
+        script=write_asset(output_dir, "preview.js", textwrap.dedent(RUNTIME_SCRIPT).lstrip("\n"), precompress),
+        page_stylesheet=write_asset(output_dir, "page.css", page_css + "\n", precompress) if page_css else None,
+    )
+
+
+def render_page(
+    *,
+    title: str,
+    heading: str,
+    intro: str,
+    project: str,
+    cards: Iterable[str],
+    option_names: Optional[List[str]],
+    storage_key: str,
+    styles: Iterable[str] = (),
+    page_css: str = "",
+    head: str = "",
+    gallery: Iterable[str] = (),
+    scripts: Iterable[str] = (),
+    choice_hint: str = DEFAULT_CHOICE_HINT,
+    choice: str = DEFAULT_CHOICE,
+    assets: Optional[PageAssets] = None
+) -> Iterator[str]:
+    """
+    Render a preview page as a stream of chunks.
+
+    Args:
+        title: Page title (the project name is appended)
+        heading: Header title
+        intro: Header subtitle
+        project: Project name for the badge
+        cards: Option card HTML chunks, in order (empty in gallery mode)
+        option_names: Option names for the selection banner (None in gallery mode)
+        storage_key: localStorage key for the selection
+        styles: Data-dependent CSS chunks (always inline)
+        page_css: Static page stylesheet, indented (inline unless externalized)
+        head: Extra <head> markup (font links, @font-face)
+        gallery: Gallery chunks from gallery_chunks(); enables gallery mode
+        scripts: Page script chunks (fillCard/mountCard), run before the runtime
+        choice_hint: Selection phrase shown in the instructions
+        choice: Selected phrase template (see page_config)
+        assets: Externalized stylesheets/script from write_page_assets();
+            page_css and the runtime are inlined when None
+
+    Yields:
+        HTML chunks
+    """
+    project_escaped = html.escape(project)
+    gallery = iter(gallery)
+    first_gallery_chunk = next(gallery, None)
+    grid_class = "options-grid gallery" if first_gallery_chunk is not None else "options-grid"
+
+    yield f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{html.escape(title)} - {project_escaped}</title>
+"""
+    if assets:
+        yield f'    <link rel="stylesheet" href="{html.escape(assets.stylesheet)}">\n'
+        if assets.page_stylesheet:
+            yield f'    <link rel="stylesheet" href="{html.escape(assets.page_stylesheet)}">\n'
+    if head:
+        yield f"    {head}\n"
+
+    styles = iter(styles)
+    first_style = next(styles, None)
+    if not assets:
+        yield "    <style>\n"
+        yield _BASE_CSS_INDENTED
+        yield "\n\n"
+        if page_css:
+            yield page_css
+            yield "\n\n"
+    elif first_style is not None:
+        yield "    <style>\n"
+    if first_style is not None:
+        yield first_style
+        yield from styles
+    if not assets or first_style is not None:
+        yield "\n    </style>\n"
+
+    yield f"""</head>
+<body>
+    <div class="header">
+        <h1>{html.escape(heading)}</h1>
+        <p>{html.escape(intro)}</p>
+        <div class="project-badge">{project_escaped}</div>
+    </div>
+
+    <div class="{grid_class}">
+"""
+    yield from cards
+    yield """
+    </div>
+"""
+    if first_gallery_chunk is not None:
+        yield first_gallery_chunk
+        yield from gallery
+
+    yield f"""
+    <div class="instructions">
+        <p>Click a card to select it, then tell Claude: <strong>"{html.escape(choice_hint)}"</strong></p>
+    </div>
+
+    <div class="selection-banner" id="selectionBanner">
+        <p>Selected: <strong id="selectedName">None</strong></p>
+        <p>Tell Claude: <code id="selectionCode">{html.escape(choice_hint)}</code></p>
+    </div>
+
+    <script>"""
+    yield page_config(option_names, storage_key, choice)
+    yield from scripts
+    if assets:
+        yield f"""    </script>
+    <script src="{html.escape(assets.script)}"></script>
+</body>
+</html>"""
+    else:
+        yield f"""{RUNTIME_SCRIPT}    </script>
+</body>
+</html>"""
+
+
+def write_chunks(chunks: Iterable[str], output: Optional[str] = None) -> None:
+    """
+    Write chunks through a buffered writer, ending with a newline.
+
+    A file is rendered to a temporary sibling and renamed into place, so
+    an error mid-render never leaves a truncated page for a browser (or
+    preview-server.py) to pick up.
+
+    Args:
+        chunks: HTML chunks
+        output: File path; stdout when None
+
+    Raises:
+        OSError: If the output file cannot be written
+    """
+    if output:
+        temp_path = f"{output}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8", buffering=BUFFER_SIZE) as f:
+                f.writelines(chunks)
+                f.write("\n")
+            os.replace(temp_path, output)
+        finally:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+        return
+
+    sys.stdout.writelines(chunks)
+    sys.stdout.write("\n")
+    sys.stdout.flush()
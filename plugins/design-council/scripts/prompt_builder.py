@@ -4,6 +4,9 @@ Design spec to prompt conversion.
 Handles:
 - Building initial generation prompts
 - Building iteration prompts with feedback
+- Shared-prefix prompts for multi-framework fan-out
+- Design token blocks from the selected palette and typography, or a
+  reference to a compiled token stylesheet (design_tokens.py)
 - Template management
 """
 
@@ -18,12 +21,12 @@ INITIAL_PROMPT_TEMPLATE = """You are an expert frontend developer. Generate prod
 ## Design Specification
 {design_spec}
 
-{context_section}
+{tokens_section}{context_section}
 {feedback_section}
 ## Requirements
 1. Generate complete, working code - no placeholders or TODOs
 2. Use distinctive typography (avoid Inter, Roboto, Arial, system fonts)
-3. Create a cohesive color palette with CSS variables
+3. {palette_requirement}
 4. Include appropriate animations and transitions
 5. Ensure accessibility (aria-labels, semantic HTML, keyboard navigation)
 6. Make it responsive for mobile and desktop
@@ -61,11 +64,147 @@ IMPORTANT: Only make the changes listed above. The rest of the code is correct a
 Regenerate with these fixes applied:"""
 
 
+# Framework-independent part first and byte-identical across frameworks, so
+# Gemini's implicit prefix cache can serve every fan-out request after the first
+FANOUT_PREFIX_TEMPLATE = """You are an expert frontend developer. Generate production-ready code based on the following design specification. The target framework is named at the end; the same design is being built for several frameworks, so follow the design tokens exactly.
+
+## Design Specification
+{design_spec}
+
+{tokens_section}{context_section}{feedback_section}## Requirements
+1. Generate complete, working code - no placeholders or TODOs
+2. Use distinctive typography (avoid Inter, Roboto, Arial, system fonts)
+3. {palette_requirement}
+4. Include appropriate animations and transitions
+5. Ensure accessibility (aria-labels, semantic HTML, keyboard navigation)
+6. Make it responsive for mobile and desktop
+7. Follow modern best practices for the framework
+
+## Output Format
+Return the code in clearly labeled sections, one fenced code block per file with
+the file name on the fence line (```jsx Dashboard.jsx):
+- Main component(s)
+- Styles (if separate)
+- Any utility functions
+- Import statements needed
+"""
+
+PALETTE_REQUIREMENT = "Create a cohesive color palette with CSS variables"
+TOKEN_REQUIREMENT = "Use the design token custom properties for every color and font"
+
+FANOUT_SUFFIX_TEMPLATE = """
+## Framework
+{framework}
+
+Generate the code now:"""
+
+
+def build_tokens_section(design_tokens: Optional[str] = None, token_reference: Optional[str] = None) -> str:
+    """
+    The "Design Tokens" prompt section.
+
+    Args:
+        design_tokens: Token block whose names and values must be used
+        token_reference: Names of tokens defined by a stylesheet added
+            after generation (takes precedence; values stay out of the prompt)
+
+    Returns:
+        Section text, or "" when there are no tokens
+    """
+    if token_reference:
+        return f"## Design Tokens\n{token_reference}\n\n"
+    if design_tokens:
+        return f"""## Design Tokens (use these exact names and values)
+```css
+{design_tokens}
+```
+
+"""
+    return ""
+
+
+def design_token_block(spec: dict) -> Optional[str]:
+    """
+    CSS custom properties for the selected palette and typography.
+
+    Args:
+        spec: Design spec input; uses "design_tokens" (ready-made block)
+            or "palette" ({"colors": {...}}) and "typography" (pairing
+            with display/body/mono)
+
+    Returns:
+        A :root { ... } block, or None when the spec has neither
+    """
+    if isinstance(spec.get("design_tokens"), str) and spec["design_tokens"].strip():
+        return spec["design_tokens"].strip()
+
+    lines = []
+    palette = spec.get("palette") or {}
+    colors = palette.get("colors", palette) if isinstance(palette, dict) else {}
+    for role, value in colors.items():
+        if isinstance(value, str) and value.startswith("#"):
+            lines.append(f"  --color-{role.replace('_', '-')}: {value};")
+
+    typography = spec.get("typography") or {}
+    fallbacks = {"display": "serif", "body": "sans-serif", "mono": "monospace"}
+    for role, fallback in fallbacks.items():
+        font = typography.get(role) if isinstance(typography, dict) else None
+        if isinstance(font, dict) and font.get("family"):
+            generic = font.get("style") if font.get("style") in ("serif", "sans-serif", "monospace") else fallback
+            lines.append(f"  --font-{role}: \"{font['family']}\", {generic};")
+
+    if not lines:
+        return None
+    block = ":root {\n" + "\n".join(lines) + "\n}"
+    if isinstance(typography, dict) and typography.get("google_fonts_url"):
+        block += f"\n/* Fonts: {typography['google_fonts_url']} */"
+    return block
+
+
+def build_fanout_prefix(
+    design_spec: str,
+    design_tokens: Optional[str] = None,
+    context: Optional[str] = None,
+    feedback: Optional[str] = None,
+    token_reference: Optional[str] = None
+) -> str:
+    """
+    Build the framework-independent prompt prefix shared by a fan-out.
+
+    Args:
+        design_spec: The design specification text
+        design_tokens: Design token block every framework must use
+        context: Optional existing codebase context
+        feedback: Optional feedback from previous attempts
+        token_reference: Compiled token names (see build_tokens_section)
+
+    Returns:
+        Prompt prefix (finish with build_fanout_prompt)
+    """
+    tokens_section = build_tokens_section(design_tokens, token_reference)
+    context_section = f"## Existing Context\n{context}\n\n" if context else ""
+    feedback_section = f"## Feedback to Address (from previous iteration)\n{feedback}\n\n" if feedback else ""
+
+    return FANOUT_PREFIX_TEMPLATE.format(
+        design_spec=design_spec,
+        tokens_section=tokens_section,
+        context_section=context_section,
+        feedback_section=feedback_section,
+        palette_requirement=TOKEN_REQUIREMENT if tokens_section else PALETTE_REQUIREMENT
+    )
+
+
+def build_fanout_prompt(prefix: str, framework: str) -> str:
+    """Append the framework to a shared fan-out prefix."""
+    return prefix + FANOUT_SUFFIX_TEMPLATE.format(framework=framework)
+
+
 def build_initial_prompt(
     design_spec: str,
     framework: str = "react",
     context: Optional[str] = None,
-    feedback: Optional[str] = None
+    feedback: Optional[str] = None,
+    token_reference: Optional[str] = None
 ) -> str:
     """
     Build the initial code generation prompt.
@@ -75,6 +214,8 @@ def build_initial_prompt(
         framework: Target framework (react, vue, svelte, html, nextjs)
         context: Optional existing codebase context
         feedback: Optional feedback from previous attempts
+        token_reference: Compiled token names; the palette values then
+            stay out of the prompt and the output
 
     Returns:
         Formatted prompt string
@@ -95,11 +236,15 @@ def build_initial_prompt(
 
 """
 
+    tokens_section = build_tokens_section(token_reference=token_reference)
+
     return INITIAL_PROMPT_TEMPLATE.format(
         framework=framework,
         design_spec=design_spec,
+        tokens_section=tokens_section,
         context_section=context_section,
-        feedback_section=feedback_section
+        feedback_section=feedback_section,
+        palette_requirement=TOKEN_REQUIREMENT if tokens_section else PALETTE_REQUIREMENT
     )
 
 
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Static quality gate for a generated round, run before the model review.
+
+Scores the generated code against the rules the generation prompt states
+(no placeholders, distinctive fonts, CSS variables for colors,
+accessibility, responsiveness, motion) with local tokenizers, in
+milliseconds. A round that clearly fails (score below the threshold, or
+any critical issue) gets verdict "iterate" and a ready-made iteration
+prompt, so no opus-reviewer round is spent on it. Anything else gets
+verdict "review" and goes to the reviewer as usual.
+
+Usage:
+    python quality-gate.py --round ./.design-sprint-staging/round-1
+
+    # Or the raw generated response:
+    echo '{"code": "...", "framework": "react"}' | python quality-gate.py
+
+Output: JSON with score, verdict, per-rule scores and issues to stdout
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Dict, Optional, Tuple
+
+from code_scan import scan_files, split_response
+from prompt_builder import build_iteration_prompt
+from static_review import STATIC_FAIL_THRESHOLD, review
+
+
+MAX_FILE_BYTES = 2 * 1024 * 1024
+
+
+def output_error(message: str, exit_code: int = 1) -> None:
+    """Output error message as JSON and exit."""
+    print(json.dumps({"error": True, "message": message}))
+    sys.exit(exit_code)
+
+
+def read_input() -> dict:
+    """Read and parse JSON input from stdin."""
+    try:
+        input_data = sys.stdin.read()
+        if not input_data.strip():
+            output_error("No input provided. Expected JSON with code, or --round DIR.")
+        return json.loads(input_data)
+    except json.JSONDecodeError as e:
+        output_error(f"Invalid JSON input: {str(e)}")
+
+
+def read_round(round_dir: str) -> Tuple[Dict[str, str], Optional[dict]]:
+    """
+    Read a round's code/ files and spec.json.
+
+    Args:
+        round_dir: Staging round directory (round-N/)
+
+    Returns:
+        Tuple of (relative file name -> content, spec or None)
+    """
+    code_dir = os.path.join(round_dir, "code")
+    if not os.path.isdir(code_dir):
+        output_error(f"No code directory: {code_dir}")
+
+    files = {}
+    for dirpath, _, filenames in os.walk(code_dir):
+        for filename in sorted(filenames):
+            path = os.path.join(dirpath, filename)
+            if os.path.getsize(path) > MAX_FILE_BYTES:
+                continue
+            try:
+                with open(path, encoding="utf-8") as f:
+                    files[os.path.relpath(path, code_dir).replace(os.sep, "/")] = f.read()
+            except (OSError, UnicodeDecodeError):
+                continue  # binary assets
+
+    spec = None
+    spec_path = os.path.join(round_dir, "spec.json")
+    if os.path.exists(spec_path):
+        try:
+            with open(spec_path, encoding="utf-8") as f:
+                spec = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            spec = None
+    return files, spec
+
+
+def spec_framework(spec: Optional[dict]) -> str:
+    """Framework named in a spec, defaulting to react."""
+    spec = spec or {}
+    return spec.get("framework") or spec.get("format") or spec.get("output_format") or "react"
+
+
+def spec_text(spec: dict) -> str:
+    """Design specification text for the iteration prompt."""
+    return spec.get("design_spec") or spec.get("description") or json.dumps(spec, indent=2)
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line flags."""
+    parser = argparse.ArgumentParser(description="Statically score generated code before the model review.")
+    parser.add_argument(
+        "--round",
+        metavar="DIR",
+        help="Staging round directory with code/ (and spec.json); otherwise JSON on stdin"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=STATIC_FAIL_THRESHOLD,
+        help=f"Score below which the round skips review and iterates (default: {STATIC_FAIL_THRESHOLD})"
+    )
+    return parser.parse_args()
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+    started = time.perf_counter()
+
+    if args.round:
+        files, spec = read_round(args.round)
+    else:
+        input_data = read_input()
+        has_spec = input_data.get("design_spec") or input_data.get("description")
+        spec = {**input_data, "code": None, "files": None} if has_spec else None
+        if isinstance(input_data.get("files"), dict):
+            files = input_data["files"]
+        elif input_data.get("code"):
+            files = split_response(input_data["code"], input_data.get("framework", "react"))
+        else:
+            output_error("Missing required field: code (or files)")
+
+    if not files:
+        output_error("No code files to check")
+
+    static = review(scan_files(files), args.threshold)
+
+    result = {
+        "error": False,
+        "source": "static",
+        **static.to_dict(),
+    }
+
+    if static.verdict == "iterate" and spec:
+        result["iteration_prompt"] = build_iteration_prompt(
+            design_spec=spec_text(spec),
+            framework=spec_framework(spec),
+            score=static.score,
+            critical_fixes=[i.as_fix() for i in static.issues("critical")],
+            major_fixes=[i.as_fix() for i in static.issues("major")],
+            preserve_list=static.preserve_list()
+        )
+
+    result["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
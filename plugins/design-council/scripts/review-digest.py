@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Compact digest of a generated round for the reviewer.
+
+Instead of reading every file under round-N/code/ (often 35KB+ per
+round), the reviewer reads this digest first and opens only the line
+ranges it needs. The digest holds:
+- Files with SHA-256, size and whether they changed since the previous round
+- Component / section outline with line ranges
+- CSS custom properties and the fonts used or loaded
+- ARIA and semantic element inventory, headings
+- Media queries (breakpoints, reduced motion, color scheme)
+- The static gate's score and issue counts
+
+Usage:
+    python review-digest.py --round ./.design-sprint-staging/round-2 > ./.design-sprint-staging/round-2/digest.json
+
+Output: digest JSON to stdout
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from collections import Counter
+from typing import Dict, List, Optional
+
+from code_scan import Element, SourceIndex, scan_files
+from static_review import first_family, review
+
+
+DIGEST_FILENAME = "digest.json"
+MAX_FILE_BYTES = 2 * 1024 * 1024
+MAX_OUTLINE_ENTRIES = 120
+MAX_CUSTOM_PROPERTIES = 150
+MAX_HEADINGS = 40
+MAX_LABEL_CHARS = 60
+
+OUTLINE_TAGS = {
+    "header", "nav", "main", "section", "article", "aside", "footer", "form",
+    "dialog", "h1", "h2", "h3", "template",
+}
+LANDMARK_TAGS = ["header", "nav", "main", "section", "article", "aside", "footer", "form", "dialog"]
+INTERACTIVE_TAGS = ["button", "a", "input", "select", "textarea", "details", "summary"]
+HEADING = re.compile(r"h([1-6])$")
+COMPONENT_DEF = re.compile(
+    r"^[ \t]*(?:export\s+(?:default\s+)?)?(?:function\s+([A-Z]\w*)|(?:const|let)\s+([A-Z]\w*)\s*=)",
+    re.MULTILINE
+)
+HOOK_CALL = re.compile(r"\b(use[A-Z]\w*)\s*\(")
+SECTION_COMMENT = re.compile(r"^[\s=*#-]*([^\n]{3,60}?)[\s=*#-]*$")
+ROUND_DIR = re.compile(r"^(.*round-)(\d+)$")
+
+
+def output_error(message: str, exit_code: int = 1) -> None:
+    """Output error message as JSON and exit."""
+    print(json.dumps({"error": True, "message": message}))
+    sys.exit(exit_code)
+
+
+def read_code(code_dir: str) -> Dict[str, bytes]:
+    """Raw bytes of every file under code/, by relative path."""
+    files = {}
+    for dirpath, _, filenames in os.walk(code_dir):
+        for filename in sorted(filenames):
+            path = os.path.join(dirpath, filename)
+            if os.path.getsize(path) > MAX_FILE_BYTES:
+                continue
+            with open(path, "rb") as f:
+                files[os.path.relpath(path, code_dir).replace(os.sep, "/")] = f.read()
+    return files
+
+
+def previous_hashes(round_dir: str) -> Optional[Dict[str, str]]:
+    """File hashes from the previous round's digest, if there is one."""
+    match = ROUND_DIR.match(os.path.normpath(round_dir))
+    if not match or int(match.group(2)) <= 1:
+        return None
+    path = os.path.join(f"{match.group(1)}{int(match.group(2)) - 1}", DIGEST_FILENAME)
+    try:
+        with open(path, encoding="utf-8") as f:
+            return {entry["path"]: entry["sha256"] for entry in json.load(f).get("files", [])}
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def short(text: str) -> str:
+    """Collapse whitespace and cut to a label."""
+    text = " ".join(text.split())
+    return text if len(text) <= MAX_LABEL_CHARS else text[:MAX_LABEL_CHARS - 1] + "…"
+
+
+def where(file: str, line: int, end_line: int = 0) -> str:
+    """file:line or file:start-end."""
+    return f"{file}:{line}-{end_line}" if end_line > line else f"{file}:{line}"
+
+
+def element_label(element: Element) -> str:
+    """tag#id.class (classes capped at two)."""
+    label = element.tag
+    if element.attrs.get("id"):
+        label += f"#{element.attrs['id']}"
+    classes = (element.attrs.get("class") or "").split()
+    if classes and not classes[0].startswith("{"):
+        label += "".join(f".{c}" for c in classes[:2])
+    return label
+
+
+def markup_outline(index: SourceIndex) -> List[dict]:
+    """Landmarks, headings, id'd elements and components, in document order."""
+    outline = []
+    for element in index.elements:
+        if element.tag in OUTLINE_TAGS or element.attrs.get("id") or element.tag[:1].isupper():
+            entry = {
+                "element": element_label(element),
+                "at": where(element.file, element.line, element.end_line),
+                "depth": element.depth,
+            }
+            name = element.attrs.get("aria-label") or (element.text if HEADING.match(element.tag) else "")
+            if name:
+                entry["label"] = short(name)
+            outline.append(entry)
+    return outline[:MAX_OUTLINE_ENTRIES]
+
+
+def component_outline(name: str, text: str, index: SourceIndex) -> List[dict]:
+    """Component definitions in a JS/JSX file, with line ranges and what they use."""
+    starts = [m for m in COMPONENT_DEF.finditer(text)]
+    total_lines = text.count("\n") + 1
+    components = []
+    for i, match in enumerate(starts):
+        first = text.count("\n", 0, match.start()) + 1
+        last = text.count("\n", 0, starts[i + 1].start()) if i + 1 < len(starts) else total_lines
+        body = text[match.start():starts[i + 1].start() if i + 1 < len(starts) else len(text)]
+        in_range = [e for e in index.elements if e.file == name and first <= e.line <= last]
+        components.append({
+            "component": match.group(1) or match.group(2),
+            "at": where(name, first, last),
+            "renders": next((e.tag for e in in_range if e.tag[:1].islower()), None),
+            "uses": sorted({e.tag for e in in_range if e.tag[:1].isupper()}),
+            "hooks": sorted(set(HOOK_CALL.findall(body))),
+        })
+    return components
+
+
+def css_sections(name: str, index: SourceIndex) -> List[dict]:
+    """Short comment headers in a stylesheet (/* === Header === */)."""
+    sections = []
+    for comment in index.comments:
+        if comment.file != name or "\n" in comment.text:
+            continue
+        match = SECTION_COMMENT.match(comment.text)
+        if match and match.group(1).strip() != os.path.basename(name):
+            sections.append({"section": match.group(1).strip(), "at": where(comment.file, comment.line)})
+    return sections
+
+
+def build_digest(files: Dict[str, bytes], previous: Optional[Dict[str, str]]) -> dict:
+    """
+    Build the digest for one round.
+
+    Args:
+        files: Relative path -> raw file content
+        previous: Previous round's path -> sha256, if known
+
+    Returns:
+        Digest dictionary
+    """
+    texts = {}
+    file_entries = []
+    for path, raw in files.items():
+        sha = hashlib.sha256(raw).hexdigest()
+        entry = {"path": path, "sha256": sha, "bytes": len(raw)}
+        try:
+            texts[path] = raw.decode("utf-8")
+            entry["lines"] = texts[path].count("\n") + 1
+        except UnicodeDecodeError:
+            entry["binary"] = True
+        if previous is not None:
+            entry["changed"] = previous.get(path) != sha
+        file_entries.append(entry)
+
+    index = scan_files(texts)
+
+    outline = {"markup": markup_outline(index)}
+    components = [c for path, text in texts.items() if path.endswith((".jsx", ".tsx", ".js", ".ts"))
+                  for c in component_outline(path, text, index)]
+    if components:
+        outline["components"] = components
+    sections = [s for path in texts if path.endswith((".css", ".scss", ".less")) for s in css_sections(path, index)]
+    if sections:
+        outline["css_sections"] = sections
+
+    custom_properties = []
+    seen = set()
+    for d in index.declarations:
+        if d.property.startswith("--") and (d.property, d.selector) not in seen:
+            seen.add((d.property, d.selector))
+            custom_properties.append({
+                "name": d.property, "value": short(d.value), "scope": d.selector, "at": where(d.file, d.line)
+            })
+
+    fonts_used = Counter(
+        first_family(d.value) for d in index.declarations
+        if d.property == "font-family" and d.value.strip() and not d.value.startswith("var(")
+    )
+    fonts_loaded = sorted({
+        family.replace("+", " ")
+        for element in index.tags("link")
+        for family in re.findall(r"family=([^&:\"')]+)", element.attrs.get("href") or "")
+    } | {
+        first_family(d.value) for d in index.declarations
+        if d.property == "font-family" and d.selector.startswith("@font-face")
+    })
+
+    headings = [
+        {"level": int(HEADING.match(e.tag).group(1)), "text": short(e.text), "at": where(e.file, e.line)}
+        for e in index.elements if HEADING.match(e.tag)
+    ][:MAX_HEADINGS]
+    aria = Counter(k for e in index.elements for k in e.attrs if k.startswith("aria-"))
+    roles = Counter(e.attrs["role"] for e in index.elements if e.attrs.get("role"))
+    images = index.tags("img")
+
+    media = {}
+    for rule in index.at_rules:
+        if rule.name in ("media", "container", "supports"):
+            key = f"@{rule.name} {short(rule.prelude)}"
+            media.setdefault(key, []).append(where(rule.file, rule.line))
+
+    static = review(index)
+    return {
+        "files": file_entries,
+        "source_bytes": sum(len(raw) for raw in files.values()),
+        "outline": outline,
+        "custom_properties": custom_properties[:MAX_CUSTOM_PROPERTIES],
+        "fonts": {"used": dict(fonts_used.most_common()), "loaded": fonts_loaded},
+        "semantics": {
+            "landmarks": {tag: len(index.tags(tag)) for tag in LANDMARK_TAGS if index.tags(tag)},
+            "headings": headings,
+            "interactive": {tag: len(index.tags(tag)) for tag in INTERACTIVE_TAGS if index.tags(tag)},
+            "aria_attributes": dict(aria.most_common()),
+            "roles": dict(roles.most_common()),
+            "images": {"total": len(images), "with_alt": sum(1 for e in images if "alt" in e.attrs)},
+        },
+        "media_queries": [{"query": query, "at": places} for query, places in media.items()],
+        "static_review": {
+            "score": static.score,
+            "verdict": static.verdict,
+            "issues": {s: len(static.issues(s)) for s in ("critical", "major", "minor")},
+        },
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line flags."""
+    parser = argparse.ArgumentParser(description="Build a compact review digest for a generated round.")
+    parser.add_argument(
+        "--round",
+        metavar="DIR",
+        required=True,
+        help="Staging round directory containing code/"
+    )
+    return parser.parse_args()
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+
+    code_dir = os.path.join(args.round, "code")
+    if not os.path.isdir(code_dir):
+        output_error(f"No code directory: {code_dir}")
+
+    try:
+        files = read_code(code_dir)
+    except OSError as e:
+        output_error(f"Could not read code: {str(e)}")
+    if not files:
+        output_error(f"No files in {code_dir}")
+
+    digest = build_digest(files, previous_hashes(args.round))
+    print(json.dumps({"error": False, **digest}, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Snapshot, compare and restore design sprint rounds.
+
+Every round-N/ under the staging directory is stored once in a
+content-addressed blob store (.store/), with a manifest per round. Files
+that did not change between rounds share one blob, diffs are manifest
+comparisons, and any earlier round can be checked out instantly.
+
+Usage:
+    # After a round is generated and reviewed
+    python round-store.py snapshot round-2
+
+    # What changed between rounds
+    python round-store.py diff round-1 round-2
+
+    # Roll back: start round 4 from round 2's files
+    python round-store.py checkout round-2 --to ./.design-sprint-staging/round-4
+
+    python round-store.py list
+    python round-store.py gc
+
+Output: JSON to stdout
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from artifact_store import LINK_MODES, ArtifactStore, StoreError
+
+
+DEFAULT_STAGING_DIR = "./.design-sprint-staging"
+
+
+def output_error(message: str, exit_code: int = 1) -> None:
+    """Output error message as JSON and exit."""
+    print(json.dumps({"error": True, "message": message}))
+    sys.exit(exit_code)
+
+
+def round_name(value: str) -> str:
+    """Accept "round-2", "2" or a path ending in round-2."""
+    value = os.path.basename(os.path.normpath(value))
+    return f"round-{value}" if value.isdigit() else value
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line flags."""
+    parser = argparse.ArgumentParser(description="Content-addressed snapshots of design sprint rounds.")
+    parser.add_argument(
+        "--staging",
+        default=DEFAULT_STAGING_DIR,
+        help=f"Staging directory holding round-N/ (default: {DEFAULT_STAGING_DIR})"
+    )
+    parser.add_argument(
+        "--link",
+        choices=LINK_MODES,
+        default="auto",
+        help="How files are placed from the store (default: auto = reflink, else hardlink, else copy)"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    snapshot = commands.add_parser("snapshot", help="Store a round and write its manifest")
+    snapshot.add_argument("round", help="Round to store (round-N or N)")
+
+    diff = commands.add_parser("diff", help="Compare two snapshotted rounds")
+    diff.add_argument("old", help="Earlier round")
+    diff.add_argument("new", help="Later round")
+
+    checkout = commands.add_parser("checkout", help="Materialize a snapshotted round")
+    checkout.add_argument("round", help="Round to check out")
+    checkout.add_argument("--to", metavar="DIR", help="Destination (default: the round's own directory)")
+    checkout.add_argument("--clean", action="store_true", help="Remove files the manifest does not list")
+
+    commands.add_parser("list", help="Snapshotted rounds with file counts")
+    commands.add_parser("gc", help="Delete blobs no manifest references")
+    return parser.parse_args()
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+    if not os.path.isdir(args.staging):
+        output_error(f"No staging directory: {args.staging}")
+
+    store = ArtifactStore(args.staging, link=args.link)
+    try:
+        if args.command == "snapshot":
+            result = store.snapshot(round_name(args.round)).to_dict()
+        elif args.command == "diff":
+            result = store.diff(round_name(args.old), round_name(args.new))
+        elif args.command == "checkout":
+            name = round_name(args.round)
+            target = args.to or store.round_dir(name)
+            result = {**store.checkout(name, target, clean=args.clean).to_dict(), "to": target}
+        elif args.command == "list":
+            rounds = []
+            for name in store.rounds():
+                manifest = store.load_manifest(name)
+                entry = {
+                    "round": name,
+                    "created": manifest.get("created"),
+                    "files": len(manifest["files"]),
+                    "bytes": sum(f["bytes"] for f in manifest["files"].values()),
+                }
+                if manifest.get("checked_out_from"):
+                    entry["checked_out_from"] = manifest["checked_out_from"]
+                rounds.append(entry)
+            result = {"rounds": rounds}
+        else:
+            result = store.gc()
+    except StoreError as e:
+        output_error(str(e))
+    except OSError as e:
+        output_error(f"Store operation failed: {str(e)}")
+
+    print(json.dumps({"error": False, **result}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
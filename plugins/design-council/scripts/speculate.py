@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Speculatively generate the next round while the user reviews the plan.
+
+As soon as the adaptation-advisor's plan is ready, start generating round
+N+1 with it in the background. Most plans are approved unchanged: claiming
+with the same input then returns the finished (or nearly finished) result.
+An edited plan cancels and discards the speculation. Discarded tokens are
+charged against a per-sprint cap; past it, nothing new is started.
+
+Usage:
+    # Plan ready: start speculating (returns immediately)
+    python speculate.py start --input /tmp/gemini-input-round-3.json
+
+    # User answered: claim with the final input
+    python speculate.py claim --input /tmp/gemini-input-round-3.json --output /tmp/gemini-output.json
+
+    python speculate.py status
+    python speculate.py cancel
+
+Output: JSON to stdout (claim writes the generator's output to --output,
+never to stdout, so generated code stays out of the caller's context)
+"""
+
+import argparse
+import json
+import shlex
+import sys
+
+from speculation import (
+    DEFAULT_MAX_WASTED_TOKENS,
+    DEFAULT_WAIT_SECONDS,
+    Speculator,
+    run_job
+)
+
+
+DEFAULT_STAGING_DIR = "./.design-sprint-staging"
+
+
+def output_error(message: str, exit_code: int = 1) -> None:
+    """Output error message as JSON and exit."""
+    print(json.dumps({"error": True, "message": message}))
+    sys.exit(exit_code)
+
+
+def read_input(path: str) -> dict:
+    """Generator input from --input or stdin."""
+    try:
+        if path:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        input_data = sys.stdin.read()
+        if not input_data.strip():
+            output_error("No input provided. Expected gemini-generate.py input JSON (or --input FILE).")
+        return json.loads(input_data)
+    except (OSError, json.JSONDecodeError) as e:
+        output_error(f"Invalid input: {str(e)}")
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line flags."""
+    parser = argparse.ArgumentParser(description="Speculative next-round generation with a cost cap.")
+    parser.add_argument(
+        "--staging",
+        default=DEFAULT_STAGING_DIR,
+        help=f"Staging directory (default: {DEFAULT_STAGING_DIR})"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    for name, help_text in (("start", "Start generating the recommended plan"),
+                            ("claim", "Take the result for the approved plan")):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument("--input", metavar="FILE", help="gemini-generate.py input JSON (default: stdin)")
+        command.add_argument(
+            "--generator-args",
+            default="",
+            metavar="ARGS",
+            help='Extra gemini-generate.py flags, e.g. "--optimize-css" (must match between start and claim)'
+        )
+    commands.choices["start"].add_argument(
+        "--max-wasted-tokens",
+        type=int,
+        default=DEFAULT_MAX_WASTED_TOKENS,
+        help=f"Cap on discarded speculative tokens per sprint (default: {DEFAULT_MAX_WASTED_TOKENS})"
+    )
+    commands.choices["claim"].add_argument(
+        "--output",
+        metavar="FILE",
+        required=True,
+        help="Where to write the generator output on a hit"
+    )
+    commands.choices["claim"].add_argument(
+        "--wait",
+        type=float,
+        default=DEFAULT_WAIT_SECONDS,
+        help=f"Seconds to wait for a matching run still in progress (default: {DEFAULT_WAIT_SECONDS})"
+    )
+    commands.add_parser("status", help="Speculative runs and the ledger")
+    commands.add_parser("cancel", help="Discard every speculative run")
+    run = commands.add_parser("_run")  # background worker
+    run.add_argument("job_dir")
+    return parser.parse_args()
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+
+    if args.command == "_run":
+        sys.exit(run_job(args.job_dir))
+
+    speculator = Speculator(args.staging, getattr(args, "max_wasted_tokens", DEFAULT_MAX_WASTED_TOKENS))
+    try:
+        if args.command == "start":
+            result = speculator.start(read_input(args.input), shlex.split(args.generator_args))
+        elif args.command == "claim":
+            result = speculator.claim(read_input(args.input), shlex.split(args.generator_args), args.wait)
+            output = result.pop("output", None)
+            if output is not None:
+                with open(args.output, "w", encoding="utf-8") as f:
+                    json.dump(output, f, indent=2)
+                result["output_path"] = args.output
+        elif args.command == "status":
+            result = {"jobs": speculator.jobs(), "ledger": speculator.ledger().to_dict()}
+        else:
+            result = speculator.cancel()
+    except OSError as e:
+        output_error(f"Speculation failed: {str(e)}")
+
+    print(json.dumps({"error": False, **result}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,344 @@
+"""
+Speculative generation of the next round while the user decides.
+
+Handles:
+- Starting gemini-generate.py in the background on the recommended plan,
+  keyed by a hash of its exact input
+- Claiming: an unchanged plan gets the (possibly still running) result;
+  any other plan cancels and discards the speculation
+- A per-sprint cost cap on speculative tokens that are thrown away
+- A ledger of hits, misses and wasted tokens
+
+Layout under <staging>/.speculative/:
+    ledger.json
+    <key>/job.json      # pid, estimate, started
+    <key>/input.json    # gemini-generate.py stdin
+    <key>/output.json   # gemini-generate.py stdout
+    <key>/done.json     # exit code, written when the run ends
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, asdict
+from typing import List, Optional
+
+from api_client import MODEL_MAX_OUTPUT_TOKENS
+from prompt_builder import build_initial_prompt
+from token_budget import OutputHistory, estimate_tokens, plan_output_tokens
+from validators import get_cache_dir
+
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+SPECULATIVE_DIR_NAME = ".speculative"
+LEDGER_FILENAME = "ledger.json"
+GENERATOR_SCRIPT = "gemini-generate.py"
+# Generator flags that take a path; the generator runs in SCRIPTS_DIR
+GENERATOR_PATH_FLAGS = ("--live-html", "--tokens", "--out-dir")
+RUNNER_SCRIPT = "speculate.py"
+# Tokens of discarded speculation allowed per sprint
+DEFAULT_MAX_WASTED_TOKENS = 80000
+DEFAULT_WAIT_SECONDS = 900
+POLL_SECONDS = 0.5
+DEFAULT_OUTPUT_TOKENS = 32768
+
+
+@dataclass
+class Ledger:
+    """Speculative spend for one staging directory."""
+    runs: int = 0
+    hits: int = 0
+    misses: int = 0
+    spent_tokens: int = 0  # all speculative tokens, hits included
+    wasted_tokens: int = 0  # tokens of runs that were discarded
+
+    def to_dict(self) -> dict:
+        """Convert to a JSON-serializable dictionary."""
+        return asdict(self)
+
+
+def resolve_generator_args(args: List[str]) -> List[str]:
+    """Make path-valued generator flags absolute (against the caller's cwd)."""
+    resolved = []
+    expects_path = False
+    for arg in args:
+        flag, sep, value = arg.partition("=")
+        if expects_path:
+            arg = os.path.abspath(arg)
+        elif sep and flag in GENERATOR_PATH_FLAGS:
+            arg = f"{flag}={os.path.abspath(value)}"
+        expects_path = not sep and arg in GENERATOR_PATH_FLAGS
+        resolved.append(arg)
+    return resolved
+
+
+def plan_key(input_data: dict, args: List[str]) -> str:
+    """Hash of the exact generator input and flags."""
+    canonical = json.dumps({"input": input_data, "args": args}, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+def estimate_run_tokens(input_data: dict) -> int:
+    """
+    Expected prompt + output tokens of one generation.
+
+    Uses the largest recent output for this framework/template when there
+    is history, else the planned output budget (a deliberate overestimate).
+    """
+    framework = input_data.get("framework", "react")
+    template = input_data.get("template") or input_data.get("name") or "custom"
+    prompt = build_initial_prompt(
+        design_spec=input_data.get("design_spec") or input_data.get("description", ""),
+        framework=framework,
+        context=input_data.get("context"),
+        feedback=input_data.get("feedback")
+    )
+    samples = OutputHistory(get_cache_dir()).samples(framework, template)
+    if samples:
+        output_tokens = max(samples[-5:])
+    else:
+        output_tokens, _ = plan_output_tokens(samples, DEFAULT_OUTPUT_TOKENS, MODEL_MAX_OUTPUT_TOKENS)
+    return estimate_tokens(prompt) + output_tokens
+
+
+def process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    # A finished child of ours may linger as a zombie until reaped
+    try:
+        reaped, _ = os.waitpid(pid, os.WNOHANG)
+        return reaped == 0
+    except (ChildProcessError, AttributeError, OSError):
+        return True
+
+
+def read_json(path: str) -> Optional[dict]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_json(path: str, data: dict) -> None:
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    os.replace(temp_path, path)
+
+
+def usage_tokens(output: Optional[dict]) -> Optional[int]:
+    """Actual prompt + output tokens reported by a finished generation."""
+    usage = (output or {}).get("usage") or {}
+    total = (usage.get("promptTokenCount") or 0) + (usage.get("candidatesTokenCount") or 0)
+    return total or None
+
+
+def run_job(job_dir: str) -> int:
+    """
+    Body of the background process: run the generator, then write done.json.
+
+    Args:
+        job_dir: Speculative run directory
+
+    Returns:
+        Generator exit code
+    """
+    job = read_json(os.path.join(job_dir, "job.json")) or {}
+    command = [sys.executable, os.path.join(SCRIPTS_DIR, GENERATOR_SCRIPT), *job.get("args", [])]
+    with open(os.path.join(job_dir, "input.json"), "rb") as stdin, \
+            open(os.path.join(job_dir, "output.json.part"), "wb") as stdout, \
+            open(os.path.join(job_dir, "stderr.log"), "wb") as stderr:
+        returncode = subprocess.call(command, stdin=stdin, stdout=stdout, stderr=stderr, cwd=SCRIPTS_DIR)
+    os.replace(os.path.join(job_dir, "output.json.part"), os.path.join(job_dir, "output.json"))
+    write_json(os.path.join(job_dir, "done.json"), {
+        "returncode": returncode,
+        "finished": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    })
+    return returncode
+
+
+class Speculator:
+    """Speculative runs and their ledger for one staging directory."""
+
+    def __init__(self, staging_dir: str, max_wasted_tokens: int = DEFAULT_MAX_WASTED_TOKENS):
+        # Absolute: the background runner and generator run in SCRIPTS_DIR
+        self.root = os.path.join(os.path.abspath(staging_dir), SPECULATIVE_DIR_NAME)
+        self.max_wasted_tokens = max_wasted_tokens
+
+    def job_dir(self, key: str) -> str:
+        return os.path.join(self.root, key)
+
+    def ledger(self) -> Ledger:
+        data = read_json(os.path.join(self.root, LEDGER_FILENAME)) or {}
+        return Ledger(**{k: v for k, v in data.items() if k in Ledger.__dataclass_fields__})
+
+    def save_ledger(self, ledger: Ledger) -> None:
+        os.makedirs(self.root, exist_ok=True)
+        write_json(os.path.join(self.root, LEDGER_FILENAME), ledger.to_dict())
+
+    def jobs(self) -> List[dict]:
+        """Every pending speculative run, with its state."""
+        if not os.path.isdir(self.root):
+            return []
+        jobs = []
+        for key in sorted(os.listdir(self.root)):
+            job = read_json(os.path.join(self.job_dir(key), "job.json"))
+            if job is None:
+                continue
+            done = read_json(os.path.join(self.job_dir(key), "done.json"))
+            if done is not None:
+                job["state"] = "finished" if done.get("returncode") == 0 else "failed"
+            else:
+                job["state"] = "running" if process_alive(job["pid"]) else "died"
+            jobs.append(job)
+        return jobs
+
+    def start(self, input_data: dict, args: List[str]) -> dict:
+        """
+        Start a speculative run unless the cost cap forbids it.
+
+        Args:
+            input_data: gemini-generate.py input for the recommended plan
+            args: Extra gemini-generate.py flags
+
+        Returns:
+            Dictionary with started, key and the estimate (or the reason
+            it did not start)
+        """
+        args = resolve_generator_args(args)
+        key = plan_key(input_data, args)
+        estimate = estimate_run_tokens(input_data)
+        ledger = self.ledger()
+        existing = [j for j in self.jobs() if j["key"] == key]
+        if existing:
+            return {"started": False, "key": key, "reason": "already speculating on this plan",
+                    "state": existing[0]["state"]}
+
+        in_flight = sum(j["estimate_tokens"] for j in self.jobs() if j["state"] == "running")
+        at_risk = ledger.wasted_tokens + in_flight + estimate
+        if at_risk > self.max_wasted_tokens:
+            return {
+                "started": False,
+                "key": key,
+                "reason": f"cost cap: {ledger.wasted_tokens} wasted + {in_flight} in flight + "
+                          f"{estimate} estimated > {self.max_wasted_tokens} tokens",
+                "ledger": ledger.to_dict(),
+            }
+
+        job_dir = self.job_dir(key)
+        os.makedirs(job_dir, exist_ok=True)
+        write_json(os.path.join(job_dir, "input.json"), input_data)
+        job = {
+            "key": key,
+            "args": args,
+            "estimate_tokens": estimate,
+            "started": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "pid": 0,
+        }
+        write_json(os.path.join(job_dir, "job.json"), job)
+        process = subprocess.Popen(
+            [sys.executable, os.path.join(SCRIPTS_DIR, RUNNER_SCRIPT), "_run", job_dir],
+            stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            cwd=SCRIPTS_DIR, start_new_session=True
+        )
+        job["pid"] = process.pid
+        write_json(os.path.join(job_dir, "job.json"), job)
+
+        ledger.runs += 1
+        self.save_ledger(ledger)
+        return {"started": True, "key": key, "estimate_tokens": estimate, "ledger": ledger.to_dict()}
+
+    def discard(self, job: dict, ledger: Ledger) -> None:
+        """
+        Stop a run if needed, charge its tokens as waste, delete it.
+
+        A finished run is charged what it reported using (0 when it failed
+        before calling the API); only a run stopped midway is charged its
+        estimate.
+        """
+        if job["state"] == "running" and job["pid"] > 0:
+            try:
+                if hasattr(os, "killpg"):
+                    os.killpg(job["pid"], signal.SIGTERM)
+                else:
+                    os.kill(job["pid"], signal.SIGTERM)
+            except (ProcessLookupError, PermissionError):
+                pass
+        job_dir = self.job_dir(job["key"])
+        tokens = usage_tokens(read_json(os.path.join(job_dir, "output.json")))
+        if tokens is None:
+            finished = os.path.exists(os.path.join(job_dir, "done.json"))
+            tokens = 0 if finished else job["estimate_tokens"]
+        ledger.spent_tokens += tokens
+        ledger.wasted_tokens += tokens
+        shutil.rmtree(job_dir, ignore_errors=True)
+
+    def cancel(self) -> dict:
+        """Discard every speculative run."""
+        ledger = self.ledger()
+        jobs = self.jobs()
+        for job in jobs:
+            self.discard(job, ledger)
+        self.save_ledger(ledger)
+        return {"cancelled": len(jobs), "ledger": ledger.to_dict()}
+
+    def claim(self, input_data: dict, args: List[str], wait_seconds: float = DEFAULT_WAIT_SECONDS) -> dict:
+        """
+        Take the speculative result for the approved plan.
+
+        Waits for a matching run that is still going. Every other run is
+        cancelled and charged as waste.
+
+        Args:
+            input_data: gemini-generate.py input for the approved plan
+            args: Extra gemini-generate.py flags
+            wait_seconds: How long to wait for a matching run to finish
+
+        Returns:
+            Dictionary with hit, and the generator output on a hit
+        """
+        key = plan_key(input_data, resolve_generator_args(args))
+        ledger = self.ledger()
+        jobs = self.jobs()
+        match = next((j for j in jobs if j["key"] == key), None)
+        for job in jobs:
+            if job is not match:
+                self.discard(job, ledger)
+
+        if match is None:
+            ledger.misses += 1
+            self.save_ledger(ledger)
+            return {"hit": False, "key": key, "reason": "plan changed", "ledger": ledger.to_dict()}
+
+        started = time.monotonic()
+        done_path = os.path.join(self.job_dir(key), "done.json")
+        while not os.path.exists(done_path) and process_alive(match["pid"]):
+            if time.monotonic() - started > wait_seconds:
+                break
+            time.sleep(POLL_SECONDS)
+        waited_ms = round((time.monotonic() - started) * 1000, 1)
+
+        output = read_json(os.path.join(self.job_dir(key), "output.json"))
+        if not os.path.exists(done_path) or output is None or output.get("error"):
+            match["state"] = "running" if process_alive(match["pid"]) else "failed"
+            self.discard(match, ledger)
+            ledger.misses += 1
+            self.save_ledger(ledger)
+            reason = (output or {}).get("message") or ("timed out" if match["state"] == "running" else "run failed")
+            return {"hit": False, "key": key, "reason": reason, "ledger": ledger.to_dict()}
+
+        ledger.hits += 1
+        ledger.spent_tokens += usage_tokens(output) or match["estimate_tokens"]
+        shutil.rmtree(self.job_dir(key), ignore_errors=True)
+        self.save_ledger(ledger)
+        return {"hit": True, "key": key, "waited_ms": waited_ms, "output": output, "ledger": ledger.to_dict()}
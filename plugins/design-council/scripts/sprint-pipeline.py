@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Run design sprint scripts as an incremental, resumable pipeline.
+
+Reads a pipeline definition (see sprint_pipeline.py) from stdin or
+--pipeline, runs stages whose inputs changed (independent ones
+concurrently) and skips the rest. State lives in
+<staging>/.pipeline/, so after a crash or a restarted sprint the same
+command (or --resume) continues from the last completed stage.
+
+Usage:
+    python sprint-pipeline.py --pipeline sprint.json --staging ./.design-sprint-staging
+
+    # Pick up the last pipeline run in this staging directory
+    python sprint-pipeline.py --resume
+
+    # What would run
+    python sprint-pipeline.py --resume --dry-run
+
+    # Rerun a stage even if its inputs are unchanged
+    python sprint-pipeline.py --resume --force palette
+
+Output: JSON with per-stage status (ran/skipped/failed/blocked) to stdout
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from sprint_pipeline import (
+    DEFAULT_JOBS,
+    STATE_DIR_NAME,
+    Pipeline,
+    PipelineError,
+    load_pipeline
+)
+
+
+DEFAULT_STAGING_DIR = "./.design-sprint-staging"
+PIPELINE_FILENAME = "pipeline.json"
+
+
+def output_error(message: str, exit_code: int = 1) -> None:
+    """Output error message as JSON and exit."""
+    print(json.dumps({"error": True, "message": message}))
+    sys.exit(exit_code)
+
+
+def read_definition(args: argparse.Namespace) -> dict:
+    """Pipeline definition from --pipeline, --resume or stdin."""
+    saved = os.path.join(args.staging, STATE_DIR_NAME, PIPELINE_FILENAME)
+    path = args.pipeline or (saved if args.resume else None)
+    try:
+        if path:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        input_data = sys.stdin.read()
+        if not input_data.strip():
+            output_error("No input provided. Expected a pipeline JSON, --pipeline FILE or --resume.")
+        return json.loads(input_data)
+    except FileNotFoundError:
+        output_error(f"No pipeline to resume in {args.staging}" if args.resume and not args.pipeline
+                     else f"Pipeline not found: {path}")
+    except (OSError, json.JSONDecodeError) as e:
+        output_error(f"Invalid pipeline: {str(e)}")
+
+
+def save_definition(staging: str, definition: dict) -> None:
+    """Keep the definition so --resume can rerun it."""
+    directory = os.path.join(staging, STATE_DIR_NAME)
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, PIPELINE_FILENAME), "w", encoding="utf-8") as f:
+        json.dump(definition, f, indent=2)
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line flags."""
+    parser = argparse.ArgumentParser(description="Incremental, resumable runner for design sprint scripts.")
+    parser.add_argument("--pipeline", metavar="FILE", help="Pipeline definition (default: stdin)")
+    parser.add_argument(
+        "--staging",
+        default=DEFAULT_STAGING_DIR,
+        help=f"Staging directory for outputs and state (default: {DEFAULT_STAGING_DIR})"
+    )
+    parser.add_argument("--resume", action="store_true", help="Rerun the last pipeline used in this staging directory")
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=DEFAULT_JOBS,
+        help=f"Stages to run at once (default: {DEFAULT_JOBS})"
+    )
+    parser.add_argument(
+        "--force",
+        action="append",
+        default=[],
+        metavar="STAGE",
+        help="Rerun this stage even if unchanged (repeatable; dependents rerun when its output changes)"
+    )
+    parser.add_argument("--dry-run", action="store_true", help="Report what would run without running it")
+    return parser.parse_args()
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+    started = time.perf_counter()
+
+    definition = read_definition(args)
+    try:
+        stages = load_pipeline(definition)
+    except PipelineError as e:
+        output_error(str(e))
+
+    unknown = set(args.force) - {s.name for s in stages}
+    if unknown:
+        output_error(f"Unknown stages for --force: {', '.join(sorted(unknown))}")
+
+    try:
+        os.makedirs(args.staging, exist_ok=True)
+        if not args.dry_run:
+            save_definition(args.staging, definition)
+        results = Pipeline(stages, args.staging, jobs=args.jobs).run(set(args.force), dry_run=args.dry_run)
+    except OSError as e:
+        output_error(f"Pipeline failed: {str(e)}")
+
+    counts = {}
+    for result in results:
+        counts[result.status] = counts.get(result.status, 0) + 1
+    failed = any(r.status in ("failed", "blocked") for r in results)
+    print(json.dumps({
+        "error": failed,
+        "stages": [r.to_dict() for r in results],
+        "counts": counts,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1)
+    }, indent=2))
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,393 @@
+"""
+Incremental DAG executor for design sprint scripts.
+
+Handles:
+- Pipeline definitions: stages that run a script with JSON on stdin and
+  save its stdout under the staging directory
+- Dependencies from "@stage" references in a stage's input (and "after")
+- Hash keys over script, arguments, input and upstream outputs, so a stage
+  whose key and outputs are unchanged is skipped
+- Running independent stages concurrently
+- Resuming: state is saved after every stage, so a restarted sprint picks
+  up from the last completed node
+
+Stage definition:
+    {
+        "name": "palette-preview",
+        "script": "preview-generator.py",
+        "args": ["--assets-dir", "{staging}"],
+        "input": {"palettes": "@palette.palettes", "project": "music player"},
+        "output": "palette-options.html",
+        "files": ["assets"],
+        "after": [],
+        "timeout": 300
+    }
+
+"@name" is the named stage's JSON output, "@name.key.sub" a part of it.
+"{staging}" in args expands to the staging directory.
+"""
+
+import hashlib
+import json
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set
+
+from artifact_store import file_sha256
+
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+STATE_DIR_NAME = ".pipeline"
+STATE_FILENAME = "state.json"
+DEFAULT_JOBS = 4
+REFERENCE = re.compile(r"^@([\w-]+)((?:\.[\w-]+)*)$")
+STAGE_NAME = re.compile(r"^[\w-]+$")
+
+
+class PipelineError(Exception):
+    """Invalid pipeline definition (unknown stage, cycle, bad field)."""
+
+
+@dataclass
+class Stage:
+    """One script invocation in the pipeline."""
+    name: str
+    script: str
+    output: str
+    args: List[str] = field(default_factory=list)
+    input: Any = None
+    files: List[str] = field(default_factory=list)
+    after: List[str] = field(default_factory=list)
+    timeout: Optional[float] = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Stage":
+        """Build a stage from its JSON definition."""
+        for key in ("name", "script", "output"):
+            if not isinstance(data.get(key), str) or not data[key]:
+                raise PipelineError(f"Stage is missing {key}: {json.dumps(data)[:80]}")
+        if not STAGE_NAME.match(data["name"]):
+            raise PipelineError(f"Stage names are letters, digits, - and _: {data['name']}")
+        return cls(
+            name=data["name"],
+            script=data["script"],
+            output=data["output"],
+            args=[str(a) for a in data.get("args", [])],
+            input=data.get("input"),
+            files=list(data.get("files", [])),
+            after=list(data.get("after", [])),
+            timeout=data.get("timeout"),
+        )
+
+    def references(self) -> Set[str]:
+        """Stages this one depends on."""
+        found: Set[str] = set(self.after)
+
+        def walk(value: Any) -> None:
+            if isinstance(value, str):
+                match = REFERENCE.match(value)
+                if match:
+                    found.add(match.group(1))
+            elif isinstance(value, dict):
+                for item in value.values():
+                    walk(item)
+            elif isinstance(value, list):
+                for item in value:
+                    walk(item)
+
+        walk(self.input)
+        return found
+
+
+@dataclass
+class StageResult:
+    """Outcome of one stage in a run."""
+    name: str
+    status: str  # "ran", "skipped", "failed", "blocked", "pending" (dry run)
+    elapsed_ms: float = 0.0
+    message: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        """Convert to a JSON-serializable dictionary."""
+        result = {"name": self.name, "status": self.status, "elapsed_ms": round(self.elapsed_ms, 1)}
+        if self.message:
+            result["message"] = self.message
+        return result
+
+
+def load_pipeline(definition: dict) -> List[Stage]:
+    """
+    Validate a pipeline definition.
+
+    Args:
+        definition: {"stages": [...]}
+
+    Returns:
+        Stages in definition order
+
+    Raises:
+        PipelineError: On unknown references, duplicate names or cycles
+    """
+    stages = [Stage.from_dict(s) for s in definition.get("stages", [])]
+    if not stages:
+        raise PipelineError("Pipeline has no stages")
+    names = [s.name for s in stages]
+    duplicates = {n for n in names if names.count(n) > 1}
+    if duplicates:
+        raise PipelineError(f"Duplicate stage names: {', '.join(sorted(duplicates))}")
+    for stage in stages:
+        unknown = stage.references() - set(names)
+        if unknown:
+            raise PipelineError(f"{stage.name} depends on unknown stages: {', '.join(sorted(unknown))}")
+
+    # Depth-first cycle check
+    by_name = {s.name: s for s in stages}
+    done: Set[str] = set()
+
+    def visit(name: str, path: List[str]) -> None:
+        if name in path:
+            raise PipelineError(f"Cycle: {' -> '.join(path[path.index(name):] + [name])}")
+        if name in done:
+            return
+        for dep in sorted(by_name[name].references()):
+            visit(dep, path + [name])
+        done.add(name)
+
+    for name in names:
+        visit(name, [])
+    return stages
+
+
+class Pipeline:
+    """Runs stages against one staging directory, skipping unchanged ones."""
+
+    def __init__(self, stages: List[Stage], staging_dir: str, jobs: int = DEFAULT_JOBS):
+        self.stages = {s.name: s for s in stages}
+        self.order = [s.name for s in stages]
+        self.staging_dir = os.path.abspath(staging_dir)
+        self.jobs = max(1, jobs)
+        self.state_path = os.path.join(self.staging_dir, STATE_DIR_NAME, STATE_FILENAME)
+        self.state = self._load_state()
+        self._lock = threading.Lock()
+
+    # --- State -----------------------------------------------------------
+
+    def _load_state(self) -> dict:
+        try:
+            with open(self.state_path, encoding="utf-8") as f:
+                state = json.load(f)
+            return state if isinstance(state.get("stages"), dict) else {"stages": {}}
+        except (OSError, ValueError):
+            return {"stages": {}}
+
+    def _save_state(self) -> None:
+        os.makedirs(os.path.dirname(self.state_path), exist_ok=True)
+        temp_path = f"{self.state_path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(temp_path, self.state_path)
+
+    def _record(self, stage: Stage, key: str, elapsed_ms: float) -> None:
+        with self._lock:
+            self.state["stages"][stage.name] = {
+                "key": key,
+                "outputs": self.output_hashes(stage),
+                "finished": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                "elapsed_ms": round(elapsed_ms, 1),
+            }
+            self._save_state()
+
+    # --- Hashing ---------------------------------------------------------
+
+    def path(self, relative: str) -> str:
+        return os.path.join(self.staging_dir, relative)
+
+    def output_hashes(self, stage: Stage) -> Dict[str, str]:
+        """Hashes of a stage's output and extra files (directories walked)."""
+        hashes = {}
+        for relative in [stage.output] + stage.files:
+            path = self.path(relative)
+            if os.path.isdir(path):
+                for dirpath, _, filenames in os.walk(path):
+                    for filename in sorted(filenames):
+                        full = os.path.join(dirpath, filename)
+                        hashes[os.path.relpath(full, self.staging_dir).replace(os.sep, "/")] = file_sha256(full)
+            elif os.path.isfile(path):
+                hashes[relative] = file_sha256(path)
+        return hashes
+
+    def outputs_intact(self, stage: Stage) -> bool:
+        """Whether the recorded outputs are still on disk, unchanged."""
+        recorded = self.state["stages"].get(stage.name, {}).get("outputs")
+        if not recorded or stage.output not in recorded:
+            return False
+        try:
+            return all(file_sha256(self.path(p)) == sha for p, sha in recorded.items())
+        except OSError:
+            return False
+
+    def read_output(self, name: str) -> Any:
+        """JSON output of a completed stage."""
+        with open(self.path(self.stages[name].output), encoding="utf-8") as f:
+            return json.load(f)
+
+    def resolve(self, value: Any, cache: Dict[str, Any]) -> Any:
+        """Replace "@stage.key" references with upstream output."""
+        if isinstance(value, str):
+            match = REFERENCE.match(value)
+            if not match:
+                return value
+            name = match.group(1)
+            if name not in cache:
+                cache[name] = self.read_output(name)
+            resolved = cache[name]
+            for key in filter(None, match.group(2).split(".")):
+                if isinstance(resolved, list) and key.isdigit():
+                    resolved = resolved[int(key)]
+                elif isinstance(resolved, dict) and key in resolved:
+                    resolved = resolved[key]
+                else:
+                    raise PipelineError(f"{value}: no {key!r} in {name} output")
+            return resolved
+        if isinstance(value, dict):
+            return {k: self.resolve(v, cache) for k, v in value.items()}
+        if isinstance(value, list):
+            return [self.resolve(v, cache) for v in value]
+        return value
+
+    def prepare(self, stage: Stage) -> tuple:
+        """
+        Command, stdin and hash key for a stage whose dependencies are done.
+
+        The key covers the script's content, the expanded arguments, the
+        resolved stdin and the recorded outputs of every dependency.
+        """
+        script_path = os.path.join(SCRIPTS_DIR, stage.script)
+        if not os.path.isfile(script_path):
+            raise PipelineError(f"{stage.name}: no script {stage.script}")
+        args = [a.replace("{staging}", self.staging_dir) for a in stage.args]
+        stdin = b"" if stage.input is None else json.dumps(self.resolve(stage.input, {}), sort_keys=True).encode("utf-8")
+        upstream = {
+            name: self.state["stages"].get(name, {}).get("outputs", {})
+            for name in sorted(stage.references())
+        }
+        key = hashlib.sha256(json.dumps({
+            "script": stage.script,
+            "script_sha256": file_sha256(script_path),
+            "args": args,
+            "stdin_sha256": hashlib.sha256(stdin).hexdigest(),
+            "upstream": upstream,
+        }, sort_keys=True).encode("utf-8")).hexdigest()
+        return [sys.executable, script_path, *args], stdin, key
+
+    def is_fresh(self, stage: Stage, key: str) -> bool:
+        return self.state["stages"].get(stage.name, {}).get("key") == key and self.outputs_intact(stage)
+
+    # --- Running ---------------------------------------------------------
+
+    def execute(self, stage: Stage, command: List[str], stdin: bytes, key: str) -> StageResult:
+        """Run one stage and record it on success."""
+        started = time.perf_counter()
+        try:
+            completed = subprocess.run(
+                command, input=stdin, capture_output=True, cwd=SCRIPTS_DIR, timeout=stage.timeout
+            )
+        except subprocess.TimeoutExpired:
+            return StageResult(stage.name, "failed", (time.perf_counter() - started) * 1000,
+                               f"timed out after {stage.timeout}s")
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        message = None
+        try:
+            payload = json.loads(completed.stdout)
+            if isinstance(payload, dict) and payload.get("error") is True:
+                message = payload.get("message") or "script reported an error"
+        except ValueError:
+            pass  # HTML and other non-JSON output
+        if completed.returncode != 0 and not message:
+            stderr = completed.stderr.decode("utf-8", "replace").strip().splitlines()
+            message = f"exit {completed.returncode}" + (f": {stderr[-1]}" if stderr else "")
+        if message:
+            return StageResult(stage.name, "failed", elapsed_ms, message)
+
+        output = self.path(stage.output)
+        os.makedirs(os.path.dirname(output), exist_ok=True)
+        temp_path = f"{output}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(completed.stdout)
+        os.replace(temp_path, output)
+        self._record(stage, key, elapsed_ms)
+        return StageResult(stage.name, "ran", elapsed_ms)
+
+    def run(self, force: Optional[Set[str]] = None, dry_run: bool = False) -> List[StageResult]:
+        """
+        Run every stage whose key changed, dependencies first.
+
+        Args:
+            force: Stage names to rerun regardless of their key
+            dry_run: Report what would run without running anything
+
+        Returns:
+            One StageResult per stage, in definition order
+        """
+        force = force or set()
+        results: Dict[str, StageResult] = {}
+        deps = {name: self.stages[name].references() for name in self.order}
+        settled_ok: Set[str] = set()  # ran or skipped
+        running: Dict[Any, str] = {}
+
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            while len(results) < len(self.order):
+                progressed = False
+                for name in self.order:
+                    if name in results or name in running.values():
+                        continue
+                    stage = self.stages[name]
+                    failed_deps = [d for d in deps[name] if d in results and d not in settled_ok]
+                    if failed_deps:
+                        results[name] = StageResult(name, "blocked", message=f"{', '.join(sorted(failed_deps))} did not finish")
+                        progressed = True
+                        continue
+                    if not deps[name] <= settled_ok:
+                        continue
+                    if dry_run and any(results[d].status == "pending" for d in deps[name]):
+                        results[name] = StageResult(name, "pending", message="after an upstream stage reruns")
+                        settled_ok.add(name)
+                        progressed = True
+                        continue
+                    try:
+                        command, stdin, key = self.prepare(stage)
+                    except (PipelineError, OSError, ValueError) as e:
+                        results[name] = StageResult(name, "failed", message=str(e))
+                        progressed = True
+                        continue
+                    if name not in force and self.is_fresh(stage, key):
+                        results[name] = StageResult(name, "skipped")
+                        settled_ok.add(name)
+                    elif dry_run:
+                        results[name] = StageResult(name, "pending")
+                        settled_ok.add(name)
+                    else:
+                        running[pool.submit(self.execute, stage, command, stdin, key)] = name
+                    progressed = True
+
+                if running:
+                    finished, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        name = running.pop(future)
+                        try:
+                            results[name] = future.result()
+                        except OSError as e:
+                            results[name] = StageResult(name, "failed", message=str(e))
+                        if results[name].status == "ran":
+                            settled_ok.add(name)
+                elif not progressed:
+                    break  # unreachable with a validated (acyclic) pipeline
+
+        return [results.get(name, StageResult(name, "blocked")) for name in self.order]
@@ -0,0 +1,423 @@
+"""
+Static review of generated code against the generation prompt's rules.
+
+Handles:
+- Scoring the INITIAL_PROMPT_TEMPLATE requirements locally: no
+  placeholders, distinctive fonts, CSS variables for colors,
+  accessibility, responsiveness, motion
+- Review-style issues (severity, file, line, fix) for the iteration prompt
+- A gate verdict: rounds that clearly fail go straight to iteration,
+  everything else still gets the full model review
+
+The gate never passes a round on its own: visual fidelity and design
+quality still need the reviewer.
+"""
+
+import re
+from dataclasses import dataclass, field, asdict
+from typing import Callable, Dict, List, Optional
+
+from code_scan import SourceIndex
+
+
+# Below this (out of 10), or with any critical issue, skip the model review.
+# Only unambiguous findings (TODO markers, elided code, lorem ipsum) are
+# critical; everything else counts through the score alone.
+STATIC_FAIL_THRESHOLD = 5.0
+
+MAX_ISSUES_PER_RULE = 5
+
+# Fonts the generation prompt rules out (system and overused families)
+BANNED_FONTS = {
+    "inter", "roboto", "arial", "helvetica", "helvetica neue", "system-ui",
+    "-apple-system", "blinkmacsystemfont", "segoe ui", "ui-sans-serif", "ui-serif",
+    "sans-serif", "serif",
+}
+FONT_KEYWORDS = {"inherit", "initial", "unset", "revert", "monospace", "ui-monospace"}
+
+PLACEHOLDER_COMMENT = re.compile(
+    r"\b(?:TODO|FIXME|XXX|TBD)\b|^\s*\.{3}|\.{3}\s*(?:rest|more|other|remaining|existing)\b",
+    re.IGNORECASE
+)
+# "Implement this later" reads like a stub, but so does an ordinary
+# explanatory comment ("Add the listener here so..."): minor only
+DEFERRED_COMMENT = re.compile(r"\b(?:implement|add)\b.*\b(?:here|later)\b", re.IGNORECASE)
+DEFERRED_COMMENT_SCORE = 0.75
+LOREM = re.compile(r"\blorem ipsum\b", re.IGNORECASE)
+COLOR_LITERAL = re.compile(
+    r"#[0-9a-fA-F]{3,8}\b|\b(?:rgba?|hsla?|oklch|oklab|lab|lch|hwb)\(", re.IGNORECASE
+)
+COLOR_PROPERTY = re.compile(r"color|background|border|outline|fill|stroke|shadow")
+TAILWIND_COLOR = re.compile(r"\[#[0-9a-fA-F]{3,8}\]")
+TAILWIND_BREAKPOINT = re.compile(r"(?:^|\s)(?:sm|md|lg|xl|2xl):")
+FONT_SHORTHAND_FAMILY = re.compile(r"\d[\w.%]*(?:\s*/\s*[\w.%]+)?\s+([^\d\s].*)$")
+GOOGLE_FAMILY = re.compile(r"family=([^&:\"')]+)")
+FLUID_VALUE = re.compile(r"\b(?:clamp|min|max)\(|auto-fit|auto-fill|\d(?:vw|vh|dvh|svh|cqi)\b")
+
+NON_INTERACTIVE = {"div", "span", "li", "p", "img", "section", "article", "td", "tr"}
+LANDMARKS = {"main", "nav", "header", "footer", "section", "article", "aside"}
+LABELED_INPUT_EXEMPT = {"hidden", "submit", "button", "reset", "image"}
+
+
+@dataclass
+class Issue:
+    """A review-style finding."""
+    severity: str  # "critical", "major" or "minor"
+    rule: str
+    description: str
+    file: str = ""
+    line: int = 0
+    fix: str = ""
+
+    def as_fix(self) -> str:
+        """One line for the iteration prompt."""
+        where = f"{self.file}:{self.line} " if self.file else ""
+        return f"{where}{self.description}. {self.fix}".strip()
+
+
+@dataclass
+class RuleResult:
+    """Score for one prompt requirement (None when it does not apply)."""
+    rule: str
+    label: str
+    weight: float
+    score: Optional[float]
+    summary: str
+    issues: List[Issue] = field(default_factory=list)
+
+
+@dataclass
+class StaticReview:
+    """Outcome of the static gate for one round."""
+    score: float
+    verdict: str  # "iterate" (clear failure) or "review" (needs the model review)
+    rules: List[RuleResult]
+    files_reviewed: List[str]
+    files_skipped: List[str] = field(default_factory=list)
+
+    def issues(self, severity: str) -> List[Issue]:
+        """Issues of one severity, in rule order."""
+        return [i for r in self.rules for i in r.issues if i.severity == severity]
+
+    def preserve_list(self) -> List[str]:
+        """Requirements already met, so the iteration keeps them."""
+        return [f"{r.label}: {r.summary}" for r in self.rules if r.score is not None and r.score >= 1.0]
+
+    def to_dict(self) -> dict:
+        """Convert to a JSON-serializable dictionary (review.json-like)."""
+        return {
+            "score": self.score,
+            "verdict": self.verdict,
+            "scores": {
+                r.rule: {
+                    "score": None if r.score is None else round(r.score * 10, 1),
+                    "weight": r.weight,
+                    "summary": r.summary,
+                }
+                for r in self.rules
+            },
+            "issues": {
+                severity: [asdict(i) for i in self.issues(severity)]
+                for severity in ("critical", "major", "minor")
+            },
+            "preserve": self.preserve_list(),
+            "files_reviewed": self.files_reviewed,
+            "files_skipped": self.files_skipped,
+        }
+
+
+def first_family(value: str) -> str:
+    """First family of a font-family value, unquoted and lowercased."""
+    return value.split(",")[0].strip().strip("'\"").lower()
+
+
+def resolve_var(value: str, variables: Dict[str, str]) -> str:
+    """Resolve a leading var(--x[, fallback]) one level deep."""
+    match = re.match(r"var\(\s*(--[\w-]+)\s*(?:,\s*(.+))?\)", value.strip())
+    if not match:
+        return value
+    return variables.get(match.group(1)) or match.group(2) or value
+
+
+def check_placeholders(index: SourceIndex) -> RuleResult:
+    """Rule 1: complete code, no TODOs, elided sections or lorem ipsum."""
+    issues = [
+        Issue("critical", "placeholders", f"Placeholder comment \"{c.text[:60]}\"", c.file, c.line,
+              "Replace it with the complete implementation")
+        for c in index.comments if PLACEHOLDER_COMMENT.search(c.text)
+    ]
+    issues += [
+        Issue("critical", "placeholders", "Lorem ipsum placeholder copy", s.file, s.line,
+              "Write real copy for this project")
+        for s in index.texts + index.strings if LOREM.search(s.text)
+    ]
+    issues += [
+        Issue("minor", "placeholders", f"Comment may mark unfinished code: \"{c.text[:60]}\"", c.file, c.line,
+              "If this is a stub, write the implementation")
+        for c in index.comments
+        if DEFERRED_COMMENT.search(c.text) and not PLACEHOLDER_COMMENT.search(c.text)
+    ]
+    critical = sum(1 for i in issues if i.severity == "critical")
+    if critical:
+        score, summary = 0.0, f"{critical} placeholders"
+    elif issues:
+        score, summary = DEFERRED_COMMENT_SCORE, f"{len(issues)} comments that may mark stubs"
+    else:
+        score, summary = 1.0, "complete, no TODOs or filler copy"
+    return RuleResult("placeholders", "No placeholders", 2.0, score, summary, issues)
+
+
+def check_fonts(index: SourceIndex) -> RuleResult:
+    """Rule 2: no Inter/Roboto/Arial/system fonts as the primary family."""
+    variables = {d.property: d.value for d in index.declarations if d.property.startswith("--")}
+    families: List[tuple] = []  # (family, declaration)
+    for d in index.declarations:
+        if d.property == "font-family":
+            value = d.value
+        elif d.property == "font":
+            shorthand = FONT_SHORTHAND_FAMILY.search(d.value)
+            if not shorthand:
+                continue
+            value = shorthand.group(1)
+        else:
+            continue
+        family = first_family(resolve_var(value, variables))
+        if family and family not in FONT_KEYWORDS and not family.startswith("var("):
+            families.append((family, d))
+
+    issues = [
+        Issue("major", "fonts", f"Generic font \"{family}\" in {d.selector or d.property}", d.file, d.line,
+              "Use the specified distinctive typeface, keeping generic families as fallbacks only")
+        for family, d in families if family in BANNED_FONTS
+    ]
+    loaded = [
+        (match.group(1).replace("+", " ").strip().lower(), element)
+        for element in index.tags("link")
+        for match in GOOGLE_FAMILY.finditer(element.attrs.get("href") or "")
+    ]
+    issues += [
+        Issue("major", "fonts", f"Loads generic font \"{family}\"", element.file, element.line,
+              "Load the specified typefaces instead")
+        for family, element in loaded if family in BANNED_FONTS
+    ]
+
+    if not families:
+        return RuleResult(
+            "fonts", "Distinctive typography", 2.0, 0.0, "no font-family declared (system fonts)",
+            [Issue("major", "fonts", "No font-family declared; the page renders in system fonts",
+                   fix="Import the specified typefaces and set them via font-family")]
+        )
+    good = sorted({family for family, _ in families if family not in BANNED_FONTS})
+    score = sum(1 for family, _ in families if family not in BANNED_FONTS) / len(families)
+    if any(family in BANNED_FONTS for family, _ in loaded):
+        score = min(score, 0.5)
+    return RuleResult(
+        "fonts", "Distinctive typography", 2.0, score,
+        f"fonts: {', '.join(good)}" if good else "only generic fonts", issues
+    )
+
+
+def check_color_variables(index: SourceIndex) -> RuleResult:
+    """Rule 3: colors defined as CSS variables and used through var()."""
+    defined = [d for d in index.declarations if d.property.startswith("--") and COLOR_LITERAL.search(d.value)]
+    uses = [
+        d for d in index.declarations
+        if not d.property.startswith("--") and COLOR_PROPERTY.search(d.property)
+    ]
+    hardcoded = [d for d in uses if COLOR_LITERAL.search(d.value) and "var(" not in d.value]
+    hardcoded_classes = [
+        e for e in index.elements if TAILWIND_COLOR.search(e.attrs.get("class") or "")
+    ]
+    via_var = [d for d in uses if "var(" in d.value]
+
+    total = len(hardcoded) + len(hardcoded_classes) + len(via_var)
+    if not total and not defined:
+        return RuleResult("color_variables", "CSS variables for colors", 1.5, None, "no color styles found")
+
+    issues = [
+        Issue("major", "color_variables",
+              f"Hardcoded color {COLOR_LITERAL.search(d.value).group()} in {d.selector or 'styles'} {{ {d.property} }}",
+              d.file, d.line, "Define it as a custom property in :root and use var(--...)")
+        for d in hardcoded
+    ] + [
+        Issue("major", "color_variables", "Arbitrary Tailwind color class", e.file, e.line,
+              "Use a theme color backed by a CSS variable")
+        for e in hardcoded_classes
+    ]
+    if not defined:
+        issues.insert(0, Issue("major", "color_variables", "No color custom properties defined",
+                               fix="Define the palette as CSS variables in :root"))
+        score = 0.0
+    else:
+        score = len(via_var) / total if total else 1.0
+    return RuleResult(
+        "color_variables", "CSS variables for colors", 1.5, score,
+        f"{len(defined)} color variables, {len(via_var)}/{total} color declarations use them", issues
+    )
+
+
+def check_accessibility(index: SourceIndex) -> RuleResult:
+    """Rule 5: lang, alt text, accessible names, labels, keyboard access, landmarks, focus."""
+    checks: List[tuple] = []  # (passed, total, issues)
+
+    html_roots = index.tags("html")
+    if html_roots:
+        missing = [e for e in html_roots if not e.attrs.get("lang")]
+        checks.append((len(html_roots) - len(missing), len(html_roots), [
+            Issue("major", "accessibility", "<html> has no lang attribute", e.file, e.line, 'Add lang="en" (or the page language)')
+            for e in missing
+        ]))
+
+    images = index.tags("img")
+    if images:
+        missing = [e for e in images if "alt" not in e.attrs]
+        checks.append((len(images) - len(missing), len(images), [
+            Issue("major", "accessibility", "<img> without alt text", e.file, e.line, 'Add alt (alt="" if decorative)')
+            for e in missing
+        ]))
+
+    controls = index.tags("button", "a")
+    if controls:
+        unnamed = [
+            e for e in controls
+            if not e.text.strip() and not any(e.attrs.get(k) for k in ("aria-label", "aria-labelledby", "title"))
+        ]
+        checks.append((len(controls) - len(unnamed), len(controls), [
+            Issue("major", "accessibility",
+                  f"<{e.tag}> has no accessible name", e.file, e.line, "Add visible text or aria-label")
+            for e in unnamed
+        ]))
+
+    label_targets = {e.attrs.get("for") for e in index.tags("label") if e.attrs.get("for")}
+    fields = [
+        e for e in index.tags("input", "select", "textarea")
+        if (e.attrs.get("type") or "").lower() not in LABELED_INPUT_EXEMPT
+    ]
+    if fields:
+        unlabeled = [
+            e for e in fields
+            if not e.in_label and e.attrs.get("id") not in label_targets
+            and not any(e.attrs.get(k) for k in ("aria-label", "aria-labelledby"))
+        ]
+        checks.append((len(fields) - len(unlabeled), len(fields), [
+            Issue("major", "accessibility", f"<{e.tag}> has no label", e.file, e.line,
+                  "Wrap it in <label>, point a <label for> at its id, or add aria-label")
+            for e in unlabeled
+        ]))
+
+    clickable = [e for e in index.elements if e.tag in NON_INTERACTIVE and "onclick" in e.attrs]
+    if clickable:
+        inaccessible = [e for e in clickable if not (e.attrs.get("role") and "tabindex" in e.attrs)]
+        checks.append((len(clickable) - len(inaccessible), len(clickable), [
+            Issue("major", "accessibility", f"Clickable <{e.tag}> is not keyboard accessible", e.file, e.line,
+                  "Use a <button>, or add role, tabIndex and a key handler")
+            for e in inaccessible
+        ]))
+
+    markup = [e for e in index.elements if e.tag[:1].islower()]
+    if len(markup) >= 10:
+        has_landmarks = any(e.tag in LANDMARKS for e in markup)
+        checks.append((int(has_landmarks), 1, [] if has_landmarks else [
+            Issue("major", "accessibility", "No semantic landmarks (main, nav, header, section...)",
+                  fix="Replace generic wrappers with semantic elements")
+        ]))
+
+    if index.declarations:
+        has_focus = any(":focus" in s.text for s in index.selectors)
+        checks.append((int(has_focus), 1, [] if has_focus else [
+            Issue("minor", "accessibility", "No :focus / :focus-visible styles",
+                  fix="Add visible focus styles for keyboard navigation")
+        ]))
+
+    if not checks:
+        return RuleResult("accessibility", "Accessibility", 2.5, None, "no markup found")
+    score = sum(passed / total for passed, total, _ in checks) / len(checks)
+    issues = [i for _, _, found in checks for i in found]
+    return RuleResult(
+        "accessibility", "Accessibility", 2.5, score,
+        f"{sum(1 for p, t, _ in checks if p == t)}/{len(checks)} checks pass", issues
+    )
+
+
+def check_responsive(index: SourceIndex) -> RuleResult:
+    """Rule 6: viewport meta plus breakpoints or fluid sizing."""
+    parts: List[float] = []
+    issues: List[Issue] = []
+
+    if index.tags("html", "head"):
+        viewport = any((e.attrs.get("name") or "").lower() == "viewport" for e in index.tags("meta"))
+        parts.append(1.0 if viewport else 0.0)
+        if not viewport:
+            issues.append(Issue("major", "responsive", "No viewport meta tag",
+                                fix='Add <meta name="viewport" content="width=device-width, initial-scale=1">'))
+
+    breakpoints = [a for a in index.at_rules if a.name in ("media", "container") and "width" in a.prelude]
+    tailwind = any(TAILWIND_BREAKPOINT.search(e.attrs.get("class") or "") for e in index.elements)
+    fluid = any(FLUID_VALUE.search(d.value) for d in index.declarations)
+    if breakpoints or tailwind:
+        parts.append(1.0)
+    elif fluid:
+        parts.append(0.5)
+        issues.append(Issue("minor", "responsive", "Fluid sizing but no breakpoints",
+                            fix="Add @media rules for the mobile and desktop layouts"))
+    else:
+        parts.append(0.0)
+        issues.append(Issue("major", "responsive", "No media queries or fluid sizing",
+                            fix="Add @media breakpoints (or clamp()-based sizing) for mobile and desktop"))
+
+    summary = f"{len(breakpoints)} breakpoints" + (", fluid sizing" if fluid else "")
+    return RuleResult("responsive", "Responsive layout", 1.5, sum(parts) / len(parts), summary, issues)
+
+
+def check_motion(index: SourceIndex) -> RuleResult:
+    """Rule 4: transitions/animations, honoring prefers-reduced-motion."""
+    animated = any(
+        d.property.startswith(("transition", "animation")) for d in index.declarations
+    ) or any(a.name == "keyframes" for a in index.at_rules)
+    if not animated:
+        return RuleResult("motion", "Animations and transitions", 0.5, 0.0, "no transitions or animations", [
+            Issue("minor", "motion", "No transitions or animations",
+                  fix="Add purposeful transitions for hover, focus and state changes")
+        ])
+    reduced = any("prefers-reduced-motion" in a.prelude for a in index.at_rules)
+    if not reduced:
+        return RuleResult("motion", "Animations and transitions", 0.5, 0.5, "animated, no reduced-motion handling", [
+            Issue("minor", "motion", "Animations ignore prefers-reduced-motion",
+                  fix="Wrap or disable them in @media (prefers-reduced-motion: reduce)")
+        ])
+    return RuleResult("motion", "Animations and transitions", 0.5, 1.0, "animated, respects reduced motion")
+
+
+RULES: List[Callable[[SourceIndex], RuleResult]] = [
+    check_placeholders,
+    check_fonts,
+    check_color_variables,
+    check_accessibility,
+    check_responsive,
+    check_motion,
+]
+
+
+def review(index: SourceIndex, threshold: float = STATIC_FAIL_THRESHOLD) -> StaticReview:
+    """
+    Score scanned code against the prompt rules.
+
+    Args:
+        index: Scanned files (code_scan.scan_files)
+        threshold: Score below which the round clearly fails
+
+    Returns:
+        StaticReview with a 0-10 score and verdict "iterate" (clear failure,
+        skip the model review) or "review"
+    """
+    results = [rule(index) for rule in RULES]
+    for result in results:
+        del result.issues[MAX_ISSUES_PER_RULE:]
+
+    scored = [r for r in results if r.score is not None]
+    weight = sum(r.weight for r in scored)
+    score = round(10 * sum(r.weight * r.score for r in scored) / weight, 1) if weight else 0.0
+
+    has_critical = any(i.severity == "critical" for r in results for i in r.issues)
+    verdict = "iterate" if has_critical or score < threshold or not index.files else "review"
+    return StaticReview(score, verdict, results, index.files, index.skipped)
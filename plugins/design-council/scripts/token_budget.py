@@ -0,0 +1,206 @@
+"""
+Token budget planning for Gemini requests.
+
+Handles:
+- Local prompt token estimates
+- Trimming oversized context before prompt construction
+- Output budgets learned from a per-framework/template size history
+"""
+
+import json
+import math
+import os
+from typing import List, Optional, Tuple
+from dataclasses import dataclass, asdict
+
+
+# Rough Gemini tokenizer ratio for mixed prose and code
+CHARS_PER_TOKEN = 4
+
+DEFAULT_MAX_CONTEXT_TOKENS = 6000
+
+# Output budget tuning
+MIN_OUTPUT_TOKENS = 2048
+MIN_HISTORY_SAMPLES = 3
+HISTORY_PERCENTILE = 0.9
+OUTPUT_BUDGET_MARGIN = 1.25
+BUDGET_GRANULARITY = 1024
+
+HISTORY_FILENAME = "output-history.json"
+MAX_HISTORY_SAMPLES = 20
+
+
+@dataclass
+class TokenBudget:
+    """Planned token budget for a single generation request."""
+    prompt_tokens: int
+    max_output_tokens: int
+    output_budget_source: str  # "history" or "default"
+    history_samples: int = 0
+    context_trimmed: bool = False
+    context_tokens_removed: int = 0
+
+    def to_dict(self) -> dict:
+        """Convert to a JSON-serializable dictionary."""
+        return asdict(self)
+
+
+def estimate_tokens(text: Optional[str]) -> int:
+    """
+    Estimate token count locally.
+
+    Args:
+        text: Text to estimate
+
+    Returns:
+        Approximate number of tokens
+    """
+    if not text:
+        return 0
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def trim_context(context: Optional[str], max_tokens: int) -> Tuple[Optional[str], int]:
+    """
+    Trim context to fit a token budget.
+
+    Blank-line runs and trailing whitespace are collapsed first. If the
+    context is still too large, the head and tail are kept (imports and
+    theme definitions usually live at the edges) and the middle is elided
+    on line boundaries.
+
+    Args:
+        context: Existing codebase context (may be None)
+        max_tokens: Token budget for the context section
+
+    Returns:
+        Tuple of (trimmed_context, tokens_removed)
+    """
+    original_tokens = estimate_tokens(context)
+    if original_tokens <= max_tokens:
+        return context, 0
+
+    lines = [line.rstrip() for line in context.splitlines()]
+    compact = []
+    for line in lines:
+        if line or (compact and compact[-1]):
+            compact.append(line)
+    text = "\n".join(compact).strip()
+
+    if estimate_tokens(text) > max_tokens:
+        max_chars = max_tokens * CHARS_PER_TOKEN
+        head_chars = max_chars * 2 // 3
+        tail_chars = max_chars - head_chars
+
+        head = text[:head_chars]
+        head = head[:head.rfind("\n")] if "\n" in head else head
+        tail = text[-tail_chars:]
+        tail = tail[tail.find("\n") + 1:] if "\n" in tail else tail
+
+        omitted = text.count("\n") - head.count("\n") - tail.count("\n") - 1
+        text = f"{head}\n[... {max(omitted, 1)} lines of context omitted ...]\n{tail}"
+
+    return text, max(original_tokens - estimate_tokens(text), 0)
+
+
+def plan_output_tokens(
+    samples: List[int],
+    default: int,
+    ceiling: int
+) -> Tuple[int, str]:
+    """
+    Choose maxOutputTokens from previous output sizes.
+
+    Uses the 90th percentile of recorded outputs plus a safety margin,
+    rounded up. Jobs that previously needed continuations get a budget
+    large enough to finish in one call; small jobs stop reserving the
+    full default.
+
+    Args:
+        samples: Previous output token counts for this framework/template
+        default: Budget to use when history is too short
+        ceiling: Model's maximum output tokens
+
+    Returns:
+        Tuple of (max_output_tokens, source) where source is "history" or "default"
+    """
+    if len(samples) < MIN_HISTORY_SAMPLES:
+        return min(default, ceiling), "default"
+
+    ordered = sorted(samples)
+    index = max(math.ceil(HISTORY_PERCENTILE * len(ordered)) - 1, 0)
+    target = ordered[index] * OUTPUT_BUDGET_MARGIN
+    budget = math.ceil(target / BUDGET_GRANULARITY) * BUDGET_GRANULARITY
+
+    return max(MIN_OUTPUT_TOKENS, min(budget, ceiling)), "history"
+
+
+class OutputHistory:
+    """
+    Persistent record of output sizes keyed by framework and template.
+
+    Usage:
+        history = OutputHistory(cache_dir)
+        samples = history.samples("react", "dashboard")
+        history.record("react", "dashboard", 14210)
+    """
+
+    def __init__(self, cache_dir: str):
+        """
+        Initialize the history store.
+
+        Args:
+            cache_dir: Directory holding the history file
+        """
+        self.path = os.path.join(cache_dir, HISTORY_FILENAME)
+
+    @staticmethod
+    def _key(framework: str, template: str) -> str:
+        return f"{framework.lower().strip()}:{template.lower().strip()}"
+
+    def _load(self) -> dict:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def samples(self, framework: str, template: str) -> List[int]:
+        """
+        Get recorded output token counts.
+
+        Args:
+            framework: Target framework
+            template: Template or job name
+
+        Returns:
+            List of output token counts, oldest first
+        """
+        values = self._load().get(self._key(framework, template), [])
+        return [v for v in values if isinstance(v, int) and v > 0]
+
+    def record(self, framework: str, template: str, output_tokens: int) -> None:
+        """
+        Record the output size of a completed generation.
+
+        Args:
+            framework: Target framework
+            template: Template or job name
+            output_tokens: Total output tokens across continuations
+        """
+        if output_tokens <= 0:
+            return
+
+        data = self._load()
+        key = self._key(framework, template)
+        data[key] = (data.get(key, []) + [output_tokens])[-MAX_HISTORY_SAMPLES:]
+
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            # History is an optimization; never fail a generation over it
+            pass
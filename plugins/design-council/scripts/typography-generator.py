@@ -5,16 +5,31 @@ Generate 4 typography pairing variations using Gemini API.
 Takes mood, aesthetic, project description and generates font pairings.
 Outputs JSON with 4 typography options for user selection.
 
+Every family and weight is checked against the bundled Google Fonts
+catalog; misspelled families and unavailable weights are corrected
+before the preview is built. If the API key is missing or Gemini fails,
+falls back to the local pairing engine. Use --local to skip the API.
+
 Usage:
     echo '{"mood": "Warm & Cozy", "aesthetic": "minimalist", "project": "pomodoro timer"}' | python typography-generator.py
+
+    # Local pairing engine only (no API call):
+    echo '{"mood": "Warm & Cozy"}' | python typography-generator.py --local
+
+    # Stream Gemini's answer and render the preview as each pairing arrives:
+    echo '{"mood": "Warm & Cozy"}' | python typography-generator.py --live-preview ./.design-sprint-staging/typography-options.html
 """
 
+import argparse
 import json
 import sys
 from typing import Optional
 
 from api_client import GeminiClient, APIConfig
 from validators import validate_api_key, get_api_key
+from font_catalog import FontCatalog
+from typography_engine import generate_local_typography
+from live_preview import LivePreview
 
 
 def output_error(message: str, exit_code: int = 1) -> None:
@@ -158,62 +173,167 @@ def validate_typography(typography_data: dict) -> Optional[str]:
 
         for key in ["display", "body"]:
             font = option[key]
-            if "family" not in font:
+            if not isinstance(font, dict) or "family" not in font:
                 return f"Typography option {i+1} {key} missing 'family'"
+            if not isinstance(font.get("weights", []), list):
+                return f"Typography option {i+1} {key} 'weights' must be a list"
 
     return None
 
 
-def main():
-    """Main entry point."""
-    input_data = read_input()
+def correct_typography(typography: list, catalog: FontCatalog) -> tuple[list, dict]:
+    """
+    Check every family and weight against the offline catalog.
+
+    Returns:
+        Tuple of (corrected options, report)
+    """
+    corrected, reports = [], []
+    for option in typography:
+        option, corrections = catalog.correct_option(option)
+        corrected.append(option)
+        reports.append({"name": option.get("name"), "corrections": corrections})
+
+    return corrected, {
+        "catalog_families": len(catalog),
+        "snapshot_date": catalog.snapshot_date,
+        "corrected": sum(1 for c in reports for item in c["corrections"] if item["to"] is not None),
+        "unknown": sorted({
+            item["from"] for c in reports for item in c["corrections"] if item["to"] is None
+        }),
+        "options": reports
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line flags."""
+    parser = argparse.ArgumentParser(description="Generate 4 typography pairing options.")
+    parser.add_argument(
+        "--local",
+        action="store_true",
+        help="Use the local pairing engine only (no API call)"
+    )
+    parser.add_argument(
+        "--live-preview",
+        metavar="HTML",
+        help="Stream the Gemini response and rewrite this preview page as each pairing arrives"
+    )
+    return parser.parse_args()
 
-    mood = input_data.get("mood")
-    aesthetic = input_data.get("aesthetic", "modern")
-    project = input_data.get("project", "web application")
 
-    if not mood:
-        output_error("Missing required field: mood")
+def generate_gemini_typography(
+    mood: str,
+    aesthetic: str,
+    project: str,
+    live: Optional[LivePreview] = None
+) -> tuple[Optional[list], Optional[str]]:
+    """
+    Generate typography pairings with Gemini.
+
+    Args:
+        live: Stream the response and render each pairing as it completes
 
-    # Validate API key
+    Returns:
+        Tuple of (typography, error_message); typography is None on failure
+    """
     is_valid, error = validate_api_key()
     if not is_valid:
-        output_error(error)
+        return None, error
 
     api_key = get_api_key()
 
-    # Build prompt
     prompt = build_typography_prompt(mood=mood, aesthetic=aesthetic, project=project)
 
-    # Call Gemini API
     config = APIConfig(
         temperature=0.8,
         max_output_tokens=4096,
         timeout=60
     )
     client = GeminiClient(api_key, config)
-    response = client.generate(prompt)
+    if live is not None:
+        response = client.generate_stream(prompt, live.feed)
+    else:
+        response = client.generate(prompt)
 
     if not response.success:
-        output_error(f"Gemini API error: {response.error_message}")
+        return None, f"Gemini API error: {response.error_message}"
 
-    # Extract and validate typography
     typography_data = extract_typography(response.data)
 
     validation_error = validate_typography(typography_data)
     if validation_error:
-        output_error(f"Invalid typography response: {validation_error}")
+        return None, f"Invalid typography response: {validation_error}"
+
+    return typography_data["typography"], None
 
-    # Output result
-    output_result({
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+
+    input_data = read_input()
+
+    mood = input_data.get("mood")
+    aesthetic = input_data.get("aesthetic", "modern")
+    project = input_data.get("project", "web application")
+
+    if not mood:
+        output_error("Missing required field: mood")
+
+    try:
+        catalog = FontCatalog.load()
+    except (OSError, ValueError) as e:
+        catalog = None
+        catalog_error = f"Font catalog unavailable: {str(e)}"
+
+    live = None
+    if args.live_preview:
+        # Partial options are catalog-corrected too, so the live page loads real fonts
+        prepare = (lambda options: correct_typography(options, catalog)[0]) if catalog else None
+        live = LivePreview(
+            "typography-preview-generator.py", "typography", args.live_preview, project, prepare
+        )
+
+    # Generate with Gemini unless local-only
+    typography, source = None, "gemini"
+    fallback_reason = "Local engine requested (--local)"
+    if not args.local:
+        typography, fallback_reason = generate_gemini_typography(mood, aesthetic, project, live)
+
+    # Fall back to the local pairing engine
+    if typography is None:
+        if catalog is None:
+            output_error(f"{fallback_reason}. {catalog_error}")
+        typography = generate_local_typography(mood, aesthetic, catalog)
+        source = "local"
+
+    # Correct families and weights against the offline catalog
+    if catalog is not None:
+        typography, fonts_report = correct_typography(typography, catalog)
+    else:
+        fonts_report = {"error": catalog_error}
+
+    if live is not None:
+        live.prepare = None  # already corrected
+        live.update(typography)
+
+    result = {
         "error": False,
-        "typography": typography_data["typography"],
+        "typography": typography,
+        "source": source,
+        "fonts": fonts_report,
         "input": {
             "mood": mood,
             "aesthetic": aesthetic,
             "project": project
         }
-    })
+    }
+    if source == "local":
+        result["fallback_reason"] = fallback_reason
+    if live is not None:
+        result["live_preview"] = live.report()
+
+    output_result(result)
 
 
 if __name__ == "__main__":
@@ -1,20 +1,70 @@
 #!/usr/bin/env python3
 """
-Generate HTML preview page with 4 typography options as clickable cards.
+Generate HTML preview page with typography options as clickable cards.
 
 Each card shows font samples with the typography applied.
 User clicks their preferred card to make a selection.
 
+More than the 4 sprint options (or --gallery) renders a
+gallery page: cards are appended as the user scrolls, and each card
+only sets its font variables and requests its own fonts once it comes
+into view.
+
+All fonts are requested in one deduplicated, preconnected css2 stylesheet.
+Pass --subset-text to fetch only the glyphs that appear in the preview.
+
+With --bundle-fonts, families found in the local font directory are
+subset to the preview glyphs and embedded (inline data URIs, or files
+beside the HTML with --fonts-out), so the page renders fully offline.
+Families not found locally still load from Google Fonts.
+
 Usage:
     echo '{"typography": [...], "project": "music player"}' | python typography-preview-generator.py
 
-Output: HTML content to stdout
+    # Fetch only the glyphs used on the page:
+    echo '{"typography": [...], "project": "music player"}' | python typography-preview-generator.py --subset-text
+
+    # Self-hosted subset fonts from ~/.cache/design-council/fonts (offline):
+    echo '{"typography": [...], "project": "music player"}' | python typography-preview-generator.py --bundle-fonts
+
+    # Browse many pairings (any count), fonts fetched per visible card:
+    cat many-pairings.json | python typography-preview-generator.py --gallery --output ./.design-sprint-staging/typography-gallery.html
+
+    # Write font files beside the HTML instead of inlining them:
+    echo '{...}' | python typography-preview-generator.py --bundle-fonts --fonts-out ./.design-sprint-staging > ./.design-sprint-staging/typography-options.html
+
+    # Link the shared stylesheet/script from .design-sprint-staging/assets/:
+    echo '{...}' | python typography-preview-generator.py --assets-dir ./.design-sprint-staging --output ./.design-sprint-staging/typography-options.html
+
+Output: HTML content to stdout (or --output file)
 """
 
+import argparse
 import html
 import json
+import os
 import sys
-from typing import List, Dict
+from typing import Iterator, List, Dict, Optional
+
+from font_catalog import build_css2_url, collect_fonts, css2_link_tags, get_catalog
+from font_bundle import FONT_DIR_NAME, SUBSET_CACHE_DIR_NAME, bundle_fonts
+from validators import get_cache_dir
+from preview_templates import (
+    PageAssets, gallery_chunks, indent_css, render_page, write_chunks, write_page_assets
+)
+
+
+SPRINT_OPTION_COUNT = 4
+FONT_ROLES = ["display", "body", "mono"]
+
+# Sample strings rendered in the option fonts (also used for --subset-text)
+SAMPLE_SUBHEADING = "Beautiful typography makes all the difference"
+SAMPLE_BODY = (
+    "This is body text that demonstrates how your content will look. "
+    "Good typography creates hierarchy and guides the reader's eye."
+)
+SAMPLE_UI = ["Primary Action", "Text Link", "Caption text"]
+SAMPLE_CODE = 'const code = "example";'
 
 
 def output_error(message: str, exit_code: int = 1) -> None:
@@ -34,43 +84,192 @@ def read_input() -> dict:
         output_error(f"Invalid JSON input: {str(e)}")
 
 
-def generate_font_import(typography: List[Dict]) -> str:
-    """Generate Google Fonts import links."""
-    imports = []
+def collect_preview_text(typography: List[Dict], project: str) -> str:
+    """All characters rendered in the option fonts, for the text= subset."""
+    parts = [project.title(), SAMPLE_SUBHEADING, SAMPLE_BODY, SAMPLE_CODE, *SAMPLE_UI]
     for option in typography:
-        if "google_fonts_url" in option:
-            imports.append(f'<link rel="stylesheet" href="{option["google_fonts_url"]}">')
-        else:
-            # Build URL from font families
-            families = []
-            for key in ["display", "body", "mono"]:
-                if key in option and "family" in option[key]:
-                    family = option[key]["family"].replace(" ", "+")
-                    weights = option[key].get("weights", [400, 500, 600, 700])
-                    weights_str = ";".join(str(w) for w in weights)
-                    families.append(f"family={family}:wght@{weights_str}")
-
-            if families:
-                url = f'https://fonts.googleapis.com/css2?{"&".join(families)}&display=swap'
-                imports.append(f'<link rel="stylesheet" href="{url}">')
-
-    return "\n    ".join(imports)
-
-
-def generate_typography_preview_html(typography: List[Dict], project: str) -> str:
-    """Generate the full HTML page with 4 typography option cards."""
-
-    font_imports = generate_font_import(typography)
-
-    # Generate option cards
-    option_cards = ""
-    for i, option in enumerate(typography):
-        option_num = i + 1
+        parts.extend(
+            option[key]["family"] for key in FONT_ROLES
+            if isinstance(option.get(key), dict) and option[key].get("family")
+        )
+    return "".join(sorted({c for c in "".join(parts) if not c.isspace()} | {" "}))
+
+
+def generate_font_import(
+    typography: List[Dict],
+    subset_text: Optional[str] = None,
+    fonts: Optional[List[tuple]] = None
+) -> str:
+    """
+    Generate one consolidated Google Fonts stylesheet link with preconnect hints.
+
+    Args:
+        typography: Typography options
+        subset_text: Only request these glyphs (css2 text= parameter)
+        fonts: (family, weights) pairs to request; defaults to all option fonts
+
+    Returns:
+        HTML link tags for the document head
+    """
+    if fonts is None:
+        fonts = collect_fonts(typography)
+    return css2_link_tags(fonts, text=subset_text)
+
+
+def generate_font_bundle(
+    typography: List[Dict],
+    project: str,
+    font_dir: str,
+    output_dir: Optional[str] = None
+) -> tuple[str, List[tuple], Dict]:
+    """
+    Embed locally available fonts, subset to the preview glyphs.
+
+    Returns:
+        Tuple of (<style> block, fonts still to load remotely, report)
+    """
+    variable_ranges = {}
+    catalog = get_catalog()
+    if catalog is not None:
+        for family, _ in collect_fonts(typography):
+            entry = catalog.lookup(family)
+            if entry and entry.variable:
+                variable_ranges[family] = (entry.weights[0], entry.weights[-1])
+
+    css, missing, report = bundle_fonts(
+        collect_fonts(typography),
+        font_dir,
+        text=collect_preview_text(typography, project),
+        output_dir=output_dir,
+        cache_dir=os.path.join(get_cache_dir(), FONT_DIR_NAME, SUBSET_CACHE_DIR_NAME),
+        variable_ranges=variable_ranges,
+    )
+    style = f"<style>\n{css}\n    </style>" if css else ""
+    return style, missing, report
+
+
+PAGE_CSS = indent_css("""
+.options-grid {
+    --card-min-width: 320px;
+}
+
+.typography-preview {
+    padding: 1.5rem;
+    background: #fafafa;
+    color: #1a1a1a;
+}
+
+.sample-heading {
+    font-size: 1.5rem;
+    font-weight: 700;
+    margin-bottom: 0.5rem;
+    color: #1a1a1a;
+}
+
+.sample-subheading {
+    font-size: 1rem;
+    font-weight: 500;
+    margin-bottom: 1rem;
+    color: #444;
+}
+
+.sample-body {
+    font-size: 0.9rem;
+    line-height: 1.6;
+    color: #555;
+    margin-bottom: 1rem;
+}
+
+.sample-ui {
+    display: flex;
+    align-items: center;
+    gap: 1rem;
+    margin-bottom: 1rem;
+    flex-wrap: wrap;
+}
+
+.sample-button {
+    background: #6366f1;
+    color: white;
+    border: none;
+    padding: 0.5rem 1rem;
+    border-radius: 6px;
+    font-size: 0.85rem;
+    font-weight: 500;
+    cursor: pointer;
+}
+
+.sample-link {
+    color: #6366f1;
+    text-decoration: underline;
+    font-size: 0.85rem;
+}
+
+.sample-caption {
+    color: #888;
+    font-size: 0.75rem;
+}
+
+.sample-mono {
+    background: #f0f0f0;
+    padding: 0.5rem 0.75rem;
+    border-radius: 6px;
+    font-size: 0.8rem;
+    color: #e11d48;
+}
+
+.typography-info {
+    padding: 1rem;
+    border-top: 1px solid #333;
+}
+
+.typography-info h3 {
+    font-size: 1rem;
+    font-weight: 600;
+    margin-bottom: 0.25rem;
+}
+
+.typography-info .description {
+    font-size: 0.8rem;
+    color: #888;
+    margin-bottom: 0.75rem;
+    line-height: 1.4;
+}
+
+.font-stack {
+    display: flex;
+    flex-direction: column;
+    gap: 0.5rem;
+}
+
+.font-item {
+    display: flex;
+    justify-content: space-between;
+    align-items: center;
+}
+
+.font-label {
+    font-size: 0.7rem;
+    color: #666;
+    text-transform: uppercase;
+    letter-spacing: 0.05em;
+}
+
+.font-name {
+    font-size: 0.85rem;
+    color: #fff;
+}
+""")
+
+
+def iter_typography_cards(typography: List[Dict], project: str) -> Iterator[str]:
+    """Yield one option card per typography option."""
+    for option_num, option in enumerate(typography, 1):
         display_font = option["display"]["family"]
         body_font = option["body"]["family"]
-        mono_font = option.get("mono", {}).get("family", "monospace")
+        mono_font = (option.get("mono") or {}).get("family") or "monospace"
 
-        option_cards += f'''
+        yield f'''
         <div class="option-card" data-option="{option_num}" onclick="selectOption({option_num})">
             <div class="card-header">
                 <span class="option-number">Option {option_num}</span>
@@ -83,22 +282,21 @@ def generate_typography_preview_html(typography: List[Dict], project: str) -> st
                 </div>
 
                 <div class="sample-subheading" style="font-family: '{display_font}', serif;">
-                    Beautiful typography makes all the difference
+                    {SAMPLE_SUBHEADING}
                 </div>
 
                 <div class="sample-body" style="font-family: '{body_font}', sans-serif;">
-                    This is body text that demonstrates how your content will look.
-                    Good typography creates hierarchy and guides the reader's eye.
+                    {SAMPLE_BODY}
                 </div>
 
                 <div class="sample-ui" style="font-family: '{body_font}', sans-serif;">
-                    <button class="sample-button">Primary Action</button>
-                    <span class="sample-link">Text Link</span>
-                    <span class="sample-caption">Caption text</span>
+                    <button class="sample-button">{SAMPLE_UI[0]}</button>
+                    <span class="sample-link">{SAMPLE_UI[1]}</span>
+                    <span class="sample-caption">{SAMPLE_UI[2]}</span>
                 </div>
 
                 <div class="sample-mono" style="font-family: '{mono_font}', monospace;">
-                    const code = "example";
+                    {html.escape(SAMPLE_CODE, quote=False)}
                 </div>
             </div>
 
@@ -123,331 +321,276 @@ def generate_typography_preview_html(typography: List[Dict], project: str) -> st
         </div>
         '''
 
-    return f'''<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Choose Your Typography - {html.escape(project)}</title>
-    {font_imports}
-    <style>
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }}
-
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-            background: #0f0f0f;
-            color: #ffffff;
-            min-height: 100vh;
-            padding: 2rem;
-        }}
-
-        .header {{
-            text-align: center;
-            margin-bottom: 2rem;
-        }}
-
-        .header h1 {{
-            font-size: 1.75rem;
-            font-weight: 600;
-            margin-bottom: 0.5rem;
-        }}
-
-        .header p {{
-            color: #888;
-            font-size: 0.95rem;
-        }}
-
-        .project-badge {{
-            display: inline-block;
-            background: #1a1a2e;
-            color: #6366f1;
-            padding: 0.25rem 0.75rem;
-            border-radius: 12px;
-            font-size: 0.8rem;
-            margin-top: 0.75rem;
-        }}
-
-        .options-grid {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(320px, 1fr));
-            gap: 1.5rem;
-            max-width: 1400px;
-            margin: 0 auto;
-        }}
-
-        .option-card {{
-            background: #1a1a1a;
-            border: 2px solid #333;
-            border-radius: 16px;
-            overflow: hidden;
-            cursor: pointer;
-            transition: all 0.3s ease;
-        }}
-
-        .option-card:hover {{
-            border-color: #555;
-            transform: translateY(-4px);
-            box-shadow: 0 12px 40px rgba(0, 0, 0, 0.4);
-        }}
-
-        .option-card.selected {{
-            border-color: #6366f1;
-            box-shadow: 0 0 0 2px rgba(99, 102, 241, 0.3);
-        }}
-
-        .option-card.selected .check-mark {{
-            opacity: 1;
-            transform: scale(1);
-        }}
-
-        .card-header {{
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            padding: 0.75rem 1rem;
-            background: rgba(255, 255, 255, 0.03);
-            border-bottom: 1px solid #333;
-        }}
-
-        .option-number {{
-            font-size: 0.75rem;
-            font-weight: 600;
-            color: #888;
-            text-transform: uppercase;
-            letter-spacing: 0.05em;
-        }}
-
-        .check-mark {{
-            width: 24px;
-            height: 24px;
-            background: #6366f1;
-            border-radius: 50%;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            color: white;
-            font-size: 0.8rem;
-            opacity: 0;
-            transform: scale(0.5);
-            transition: all 0.2s ease;
-        }}
-
-        .typography-preview {{
-            padding: 1.5rem;
-            background: #fafafa;
-            color: #1a1a1a;
-        }}
-
-        .sample-heading {{
-            font-size: 1.5rem;
-            font-weight: 700;
-            margin-bottom: 0.5rem;
-            color: #1a1a1a;
-        }}
-
-        .sample-subheading {{
-            font-size: 1rem;
-            font-weight: 500;
-            margin-bottom: 1rem;
-            color: #444;
-        }}
-
-        .sample-body {{
-            font-size: 0.9rem;
-            line-height: 1.6;
-            color: #555;
-            margin-bottom: 1rem;
-        }}
-
-        .sample-ui {{
-            display: flex;
-            align-items: center;
-            gap: 1rem;
-            margin-bottom: 1rem;
-            flex-wrap: wrap;
-        }}
-
-        .sample-button {{
-            background: #6366f1;
-            color: white;
-            border: none;
-            padding: 0.5rem 1rem;
-            border-radius: 6px;
-            font-size: 0.85rem;
-            font-weight: 500;
-            cursor: pointer;
-        }}
-
-        .sample-link {{
-            color: #6366f1;
-            text-decoration: underline;
-            font-size: 0.85rem;
-        }}
-
-        .sample-caption {{
-            color: #888;
-            font-size: 0.75rem;
-        }}
-
-        .sample-mono {{
-            background: #f0f0f0;
-            padding: 0.5rem 0.75rem;
-            border-radius: 6px;
-            font-size: 0.8rem;
-            color: #e11d48;
-        }}
-
-        .typography-info {{
-            padding: 1rem;
-            border-top: 1px solid #333;
-        }}
-
-        .typography-info h3 {{
-            font-size: 1rem;
-            font-weight: 600;
-            margin-bottom: 0.25rem;
-        }}
-
-        .typography-info .description {{
-            font-size: 0.8rem;
-            color: #888;
-            margin-bottom: 0.75rem;
-            line-height: 1.4;
-        }}
-
-        .font-stack {{
-            display: flex;
-            flex-direction: column;
-            gap: 0.5rem;
-        }}
-
-        .font-item {{
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-        }}
-
-        .font-label {{
-            font-size: 0.7rem;
-            color: #666;
-            text-transform: uppercase;
-            letter-spacing: 0.05em;
-        }}
-
-        .font-name {{
-            font-size: 0.85rem;
-            color: #fff;
-        }}
-
-        .selection-banner {{
-            position: fixed;
-            bottom: 0;
-            left: 0;
-            right: 0;
-            background: #1a1a2e;
-            border-top: 1px solid #333;
-            padding: 1rem 2rem;
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            transform: translateY(100%);
-            transition: transform 0.3s ease;
-        }}
-
-        .selection-banner.visible {{
-            transform: translateY(0);
-        }}
-
-        .selection-banner p {{
-            color: #888;
-        }}
-
-        .selection-banner strong {{
-            color: #6366f1;
-        }}
-
-        .selection-banner code {{
-            background: #0f0f0f;
-            padding: 0.25rem 0.5rem;
-            border-radius: 4px;
-            font-family: monospace;
-            color: #10b981;
-        }}
-
-        .instructions {{
-            text-align: center;
-            margin-top: 2rem;
-            padding: 1rem;
-            background: #1a1a2e;
-            border-radius: 12px;
-            max-width: 600px;
-            margin-left: auto;
-            margin-right: auto;
-        }}
-
-        .instructions p {{
-            color: #888;
-            font-size: 0.9rem;
-        }}
-
-        .instructions strong {{
-            color: #6366f1;
-        }}
-    </style>
-</head>
-<body>
-    <div class="header">
-        <h1>Choose Your Typography</h1>
-        <p>Click on the font pairing that best matches your vision</p>
-        <div class="project-badge">{html.escape(project)}</div>
-    </div>
 
-    <div class="options-grid">
-        {option_cards}
+GALLERY_CSS = indent_css("""
+.options-grid.gallery .sample-heading,
+.options-grid.gallery .sample-subheading,
+.options-grid.gallery .font-name.display {
+    font-family: var(--display-font, serif), serif;
+}
+
+.options-grid.gallery .sample-body,
+.options-grid.gallery .sample-ui,
+.options-grid.gallery .font-name.body {
+    font-family: var(--body-font, sans-serif), sans-serif;
+}
+
+.options-grid.gallery .sample-mono,
+.options-grid.gallery .font-name.mono {
+    font-family: var(--mono-font, monospace), monospace;
+}
+""")
+
+GALLERY_PAGE_CSS = PAGE_CSS + "\n\n" + GALLERY_CSS
+
+GALLERY_CARD = """
+<div class="option-card">
+    <div class="card-header">
+        <span class="option-number"></span>
+        <div class="check-mark">&#10003;</div>
     </div>
-
-    <div class="instructions">
-        <p>Click a card to select it, then tell Claude: <strong>"I choose Option [number]"</strong></p>
+    <div class="typography-preview">
+        <div class="sample-heading">__PROJECT__</div>
+        <div class="sample-subheading">__SUBHEADING__</div>
+        <div class="sample-body">__BODY__</div>
+        <div class="sample-ui">
+            <button class="sample-button">__UI_0__</button>
+            <span class="sample-link">__UI_1__</span>
+            <span class="sample-caption">__UI_2__</span>
+        </div>
+        <div class="sample-mono">__CODE__</div>
     </div>
-
-    <div class="selection-banner" id="selectionBanner">
-        <p>Selected: <strong id="selectedName">None</strong></p>
-        <p>Tell Claude: <code id="selectionCode">I choose Option X</code></p>
+    <div class="typography-info">
+        <h3></h3>
+        <p class="description"></p>
+        <div class="font-stack">
+            <div class="font-item"><span class="font-label">Display</span><span class="font-name display"></span></div>
+            <div class="font-item"><span class="font-label">Body</span><span class="font-name body"></span></div>
+            <div class="font-item"><span class="font-label">Mono</span><span class="font-name mono"></span></div>
+        </div>
     </div>
+</div>
+"""
 
-    <script>
-        let selectedOption = null;
-
-        function selectOption(optionNum) {{
-            document.querySelectorAll('.option-card').forEach(card => {{
-                card.classList.remove('selected');
-            }});
-
-            const card = document.querySelector(`[data-option="${{optionNum}}"]`);
-            card.classList.add('selected');
-            selectedOption = optionNum;
+GALLERY_PAGE_SCRIPT = """
+        const fontRoles = ['display', 'body', 'mono'];
+        const loadedFontUrls = new Set();
+
+        function fillCard(card, item, num) {
+            card.querySelector('.option-number').textContent = `Option ${num}`;
+            card.querySelector('.typography-info h3').textContent = item.name;
+            card.querySelector('.typography-info .description').textContent = item.description;
+            fontRoles.forEach(role => {
+                card.querySelector(`.font-name.${role}`).textContent = item[role];
+            });
+        }
+
+        function mountCard(card, item) {
+            if (item.fonts_url && !loadedFontUrls.has(item.fonts_url)) {
+                const link = document.createElement('link');
+                link.rel = 'stylesheet';
+                link.href = item.fonts_url;
+                document.head.appendChild(link);
+                loadedFontUrls.add(item.fonts_url);
+            }
+            fontRoles.forEach(role => {
+                card.style.setProperty(`--${role}-font`, `'${item[role].replace(/['\\\\]/g, '')}'`);
+            });
+        }
+"""
 
-            const typography = {json.dumps([t['name'] for t in typography])};
-            document.getElementById('selectedName').textContent = typography[optionNum - 1];
-            document.getElementById('selectionCode').textContent = `I choose Option ${{optionNum}}`;
-            document.getElementById('selectionBanner').classList.add('visible');
 
-            localStorage.setItem('typographySelection', JSON.stringify({{
-                option: optionNum,
-                name: typography[optionNum - 1]
-            }}));
-        }}
-    </script>
-</body>
-</html>'''
+def prepare_fonts(
+    typography: List[Dict],
+    project: str,
+    font_dir: Optional[str] = None,
+    fonts_out: Optional[str] = None
+) -> tuple[str, Optional[List[tuple]], str]:
+    """
+    Bundle local fonts (if requested) and collect the preview glyphs.
+
+    Returns:
+        Tuple of (@font-face <style> block, fonts to load remotely or None
+        for all, preview text)
+    """
+    preview_text = collect_preview_text(typography, project)
+
+    font_faces, remote_fonts = "", None
+    if font_dir:
+        font_faces, remote_fonts, report = generate_font_bundle(
+            typography, project, font_dir, fonts_out
+        )
+        print(json.dumps({"font_bundle": report}), file=sys.stderr)
+
+    return font_faces, remote_fonts, preview_text
+
+
+def iter_gallery_items(
+    typography: List[Dict],
+    remote_fonts: Optional[List[tuple]],
+    subset_text: Optional[str]
+) -> Iterator[Dict]:
+    """Yield the per-option data shipped to the gallery page."""
+    remote_families = None if remote_fonts is None else {family for family, _ in remote_fonts}
+    for option in typography:
+        fonts = [
+            (family, weights) for family, weights in collect_fonts([option])
+            if remote_families is None or family in remote_families
+        ]
+        yield {
+            "name": option["name"],
+            "description": option.get("description", ""),
+            "display": option["display"]["family"],
+            "body": option["body"]["family"],
+            "mono": (option.get("mono") or {}).get("family") or "monospace",
+            "fonts_url": build_css2_url(fonts, text=subset_text) if fonts else None,
+        }
+
+
+def iter_typography_gallery_html(
+    typography: List[Dict],
+    project: str,
+    subset_text: bool = False,
+    font_dir: Optional[str] = None,
+    fonts_out: Optional[str] = None,
+    assets: Optional[PageAssets] = None
+) -> Iterator[str]:
+    """Render the lazily mounted gallery page for any number of options."""
+    font_faces, remote_fonts, preview_text = prepare_fonts(typography, project, font_dir, fonts_out)
+
+    card = GALLERY_CARD
+    for placeholder, text in [
+        ("__PROJECT__", project.title()), ("__SUBHEADING__", SAMPLE_SUBHEADING),
+        ("__BODY__", SAMPLE_BODY), ("__CODE__", SAMPLE_CODE),
+        ("__UI_0__", SAMPLE_UI[0]), ("__UI_1__", SAMPLE_UI[1]), ("__UI_2__", SAMPLE_UI[2]),
+    ]:
+        card = card.replace(placeholder, html.escape(text, quote=False))
+
+    head = "\n    ".join(filter(None, [
+        font_faces,
+        '<link rel="preconnect" href="https://fonts.googleapis.com">',
+        '<link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>',
+    ]))
+
+    return render_page(
+        title="Choose Your Typography",
+        heading="Choose Your Typography",
+        intro=f"{len(typography)} font pairings; click the one that best matches your vision",
+        project=project,
+        head=head,
+        page_css=GALLERY_PAGE_CSS,
+        cards=(),
+        option_names=None,
+        storage_key="typographySelection",
+        gallery=gallery_chunks(
+            card, iter_gallery_items(typography, remote_fonts, preview_text if subset_text else None)
+        ),
+        scripts=[GALLERY_PAGE_SCRIPT],
+        assets=assets,
+    )
+
+
+def iter_typography_preview_html(
+    typography: List[Dict],
+    project: str,
+    subset_text: bool = False,
+    font_dir: Optional[str] = None,
+    fonts_out: Optional[str] = None,
+    assets: Optional[PageAssets] = None
+) -> Iterator[str]:
+    """
+    Render the typography preview page as a stream of HTML chunks.
+
+    Args:
+        typography: Typography options
+        project: Project name
+        subset_text: Request only the preview glyphs from Google Fonts
+        font_dir: Bundle fonts found in this directory (None loads all remotely)
+        fonts_out: Write bundled fonts to fonts_out/fonts/ instead of inlining
+        assets: Externalized stylesheet/script (inline when None)
+    """
+    font_faces, remote_fonts, preview_text = prepare_fonts(typography, project, font_dir, fonts_out)
+
+    font_imports = "\n    ".join(filter(None, [
+        font_faces,
+        generate_font_import(typography, preview_text if subset_text else None, remote_fonts),
+    ]))
+
+    return render_page(
+        title="Choose Your Typography",
+        heading="Choose Your Typography",
+        intro="Click on the font pairing that best matches your vision",
+        project=project,
+        head=font_imports,
+        page_css=PAGE_CSS,
+        cards=iter_typography_cards(typography, project),
+        option_names=[t["name"] for t in typography],
+        storage_key="typographySelection",
+        assets=assets,
+    )
+
+
+def generate_typography_preview_html(
+    typography: List[Dict],
+    project: str,
+    subset_text: bool = False,
+    font_dir: Optional[str] = None,
+    fonts_out: Optional[str] = None
+) -> str:
+    """Generate the full HTML page with 4 typography option cards."""
+    return "".join(iter_typography_preview_html(
+        typography, project, subset_text, font_dir, fonts_out
+    ))
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line flags."""
+    parser = argparse.ArgumentParser(description="Generate the typography options preview page.")
+    parser.add_argument(
+        "--subset-text",
+        action="store_true",
+        help="Request only the glyphs used in the preview (css2 text= parameter)"
+    )
+    parser.add_argument(
+        "--bundle-fonts",
+        action="store_true",
+        help="Embed subset fonts from the local font directory for offline previews"
+    )
+    parser.add_argument(
+        "--font-dir",
+        help="Local font directory (default: <cache dir>/fonts)"
+    )
+    parser.add_argument(
+        "--output",
+        help="Write the page to this file instead of stdout"
+    )
+    parser.add_argument(
+        "--fonts-out",
+        help="Write bundled fonts to DIR/fonts/ (DIR is where the HTML is saved) instead of inlining"
+    )
+    parser.add_argument(
+        "--gallery",
+        action="store_true",
+        help=f"Lazily mounted gallery page (automatic above {SPRINT_OPTION_COUNT} options)"
+    )
+    parser.add_argument(
+        "--assets-dir",
+        metavar="DIR",
+        help="Link a shared, content-hashed stylesheet/script written to DIR/assets/ "
+             "(DIR is where the HTML is saved) instead of inlining them"
+    )
+    parser.add_argument(
+        "--precompress",
+        action="store_true",
+        help="With --assets-dir, also write .gz (and .br with brotli installed) siblings"
+    )
+    return parser.parse_args()
 
 
 def main():
     """Main entry point."""
+    args = parse_args()
+
     input_data = read_input()
 
     typography = input_data.get("typography")
@@ -456,11 +599,49 @@ def main():
     if not typography:
         output_error("Missing required field: typography")
 
-    if len(typography) != 4:
-        output_error(f"Expected 4 typography options, got {len(typography)}")
+    for i, option in enumerate(typography, 1):
+        for key in ("name", "display", "body"):
+            if key not in option:
+                output_error(f"Typography option {i} is missing field: {key}")
+        for key in ("display", "body"):
+            if not isinstance(option[key], dict) or not option[key].get("family"):
+                output_error(f"Typography option {i} has no {key} family")
+        if option.get("mono") is not None and not isinstance(option["mono"], dict):
+            output_error(f"Typography option {i} has an invalid mono font (expected an object or null)")
+
+    if args.gallery or len(typography) > SPRINT_OPTION_COUNT:
+        render, page_css = iter_typography_gallery_html, GALLERY_PAGE_CSS
+    else:
+        render, page_css = iter_typography_preview_html, PAGE_CSS
+
+    if args.precompress and not args.assets_dir:
+        output_error("--precompress requires --assets-dir")
+
+    assets = None
+    if args.assets_dir:
+        try:
+            assets = write_page_assets(args.assets_dir, page_css, args.precompress)
+        except OSError as e:
+            output_error(f"Could not write assets: {str(e)}")
+
+    font_dir = None
+    if args.bundle_fonts:
+        font_dir = args.font_dir or os.path.join(get_cache_dir(), FONT_DIR_NAME)
 
-    html = generate_typography_preview_html(typography, project)
-    print(html)
+    try:
+        write_chunks(
+            render(
+                typography,
+                project,
+                subset_text=args.subset_text,
+                font_dir=font_dir,
+                fonts_out=args.fonts_out,
+                assets=assets
+            ),
+            args.output
+        )
+    except OSError as e:
+        output_error(f"Could not write preview: {str(e)}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,218 @@
+"""
+Local typography pairing by category contrast.
+
+Handles:
+- Mood/aesthetic keyword tags for a curated set of catalog families
+- The four option approaches: classic, distinctive, modern, creative
+- Pairing a display and body font from contrasting categories
+- Snapping weights to what each family actually ships
+
+Runs without an API call, so it serves as an offline fallback for
+typography-generator.py in the same way palette_engine.py does for palettes.
+"""
+
+from typing import Dict, List, Optional, Set
+
+from font_catalog import FontCatalog, FontFamily, build_css2_url
+
+
+# Curated candidates -> mood/aesthetic tags. Order is the tie-break preference.
+DISPLAY_CANDIDATES = {
+    "Fraunces": {"warm", "cozy", "organic", "playful", "retro", "editorial"},
+    "Playfair Display": {"elegant", "luxury", "editorial", "classic"},
+    "DM Serif Display": {"elegant", "warm", "editorial", "minimalist"},
+    "Cormorant Garamond": {"elegant", "luxury", "serene", "calm"},
+    "Instrument Serif": {"minimalist", "modern", "elegant", "calm"},
+    "Young Serif": {"warm", "retro", "cozy", "earthy"},
+    "Bodoni Moda": {"luxury", "bold", "elegant", "maximalist"},
+    "Newsreader": {"professional", "trustworthy", "editorial", "calm"},
+    "Space Grotesk": {"modern", "industrial", "professional", "cool"},
+    "Outfit": {"modern", "minimalist", "fresh", "clean"},
+    "Sora": {"modern", "cool", "professional", "fresh"},
+    "Plus Jakarta Sans": {"modern", "professional", "trustworthy", "fresh"},
+    "Bricolage Grotesque": {"playful", "bold", "organic", "warm"},
+    "Syne": {"bold", "creative", "maximalist", "vibrant"},
+    "Unbounded": {"bold", "energetic", "vibrant", "maximalist"},
+    "Big Shoulders Display": {"industrial", "bold", "brutalist", "energetic"},
+    "Bebas Neue": {"bold", "brutalist", "energetic", "industrial"},
+    "Righteous": {"retro", "playful", "energetic"},
+    "Baloo 2": {"cozy", "warm", "playful", "fresh"},
+    "Abril Fatface": {"editorial", "bold", "luxury", "retro"},
+    "Poiret One": {"elegant", "minimalist", "retro", "luxury"},
+    "Comfortaa": {"playful", "fresh", "calm"},
+    "Caveat": {"cozy", "playful", "warm", "organic"},
+    "Dancing Script": {"elegant", "warm", "romantic"},
+    "Kalam": {"cozy", "playful", "natural"},
+    "Space Mono": {"brutalist", "industrial", "retro", "technical"},
+    "JetBrains Mono": {"technical", "modern", "professional", "dark"},
+    "DM Mono": {"minimalist", "technical", "calm"},
+}
+
+BODY_CANDIDATES = {
+    "DM Sans": {"modern", "minimalist", "fresh", "clean"},
+    "Nunito Sans": {"warm", "cozy", "playful", "calm"},
+    "Source Sans 3": {"professional", "trustworthy", "calm"},
+    "Work Sans": {"modern", "industrial", "professional"},
+    "Manrope": {"modern", "cool", "minimalist", "professional"},
+    "Public Sans": {"trustworthy", "professional", "brutalist"},
+    "Figtree": {"fresh", "playful", "modern", "warm"},
+    "Karla": {"organic", "retro", "warm", "earthy"},
+    "Rubik": {"playful", "bold", "energetic"},
+    "Hanken Grotesk": {"minimalist", "elegant", "modern"},
+    "Lora": {"warm", "cozy", "editorial", "organic"},
+    "Source Serif 4": {"professional", "editorial", "trustworthy", "calm"},
+    "Crimson Pro": {"elegant", "luxury", "editorial"},
+    "Literata": {"calm", "serene", "editorial", "natural"},
+    "Newsreader": {"editorial", "elegant", "professional"},
+    "Spectral": {"elegant", "luxury", "minimalist"},
+    "EB Garamond": {"classic", "luxury", "elegant"},
+}
+
+MONO_CANDIDATES = {
+    "JetBrains Mono": {"modern", "technical", "professional", "dark"},
+    "IBM Plex Mono": {"professional", "industrial", "trustworthy"},
+    "Fira Code": {"technical", "cool", "modern"},
+    "DM Mono": {"minimalist", "calm", "fresh"},
+    "Space Mono": {"retro", "brutalist", "bold"},
+    "Source Code Pro": {"calm", "classic", "editorial"},
+}
+
+# Approach -> (display categories, body category, name template, description)
+APPROACHES = {
+    "classic": (
+        ["serif"], "sans-serif", "Classic {display}",
+        "{display} serif headings over clean {body} text; the safe, broadly appealing choice"
+    ),
+    "distinctive": (
+        ["display"], "serif", "Characterful {display}",
+        "Expressive {display} headings grounded by a readable {body} serif"
+    ),
+    "modern": (
+        ["sans-serif"], "sans-serif", "Modern {display}",
+        "Contemporary {display} headings with a neutral {body} UI face"
+    ),
+    "creative": (
+        ["handwriting", "monospace", "display"], "serif", "Unexpected {display}",
+        "{display} headings against {body}: an unexpected pairing that still reads well"
+    ),
+}
+
+DISPLAY_WEIGHTS = [500, 600, 700]
+BODY_WEIGHTS = [400, 500, 600]
+MONO_WEIGHTS = [400, 500]
+
+
+def mood_tags(mood: str, aesthetic: str = "modern") -> Set[str]:
+    """Split mood and aesthetic text into lowercase keyword tags."""
+    text = f"{mood} {aesthetic}".lower()
+    return set("".join(c if c.isalnum() else " " for c in text).split())
+
+
+def _font_entry(font: FontFamily, weights: List[int], include_style: bool = True) -> Dict:
+    entry = {
+        "family": font.name,
+        "weights": sorted({font.snap_weight(w) for w in weights}),
+    }
+    if include_style:
+        entry["style"] = font.category
+    return entry
+
+
+def _rank(
+    catalog: FontCatalog,
+    candidates: Dict[str, Set[str]],
+    categories: List[str],
+    tags: Set[str],
+    exclude: Set[str]
+) -> List[FontFamily]:
+    """Candidates in the given categories, best mood match first."""
+    ranked = []
+    for order, (name, font_tags) in enumerate(candidates.items()):
+        font = catalog.lookup(name)
+        if font is None or font.category not in categories or font.name in exclude:
+            continue
+        # Earlier categories are preferred, but a mood match outweighs that
+        score = len(font_tags & tags) - 0.5 * categories.index(font.category)
+        ranked.append((-score, order, font))
+    ranked.sort(key=lambda item: item[:2])
+    return [item[2] for item in ranked]
+
+
+def build_pairing(
+    catalog: FontCatalog,
+    approach: str,
+    tags: Set[str],
+    used: Optional[Set[str]] = None
+) -> Optional[Dict]:
+    """
+    Build one typography option for an approach.
+
+    Args:
+        catalog: Loaded font catalog
+        approach: One of "classic", "distinctive", "modern", "creative"
+        tags: Mood/aesthetic tags
+        used: Display/body families already used by other options (updated in place)
+
+    Returns:
+        Typography option dict in the Gemini output shape, or None if the
+        catalog has no candidates for the approach
+    """
+    used = used if used is not None else set()
+    display_categories, body_category, name_template, description = APPROACHES[approach]
+
+    displays = _rank(catalog, DISPLAY_CANDIDATES, display_categories, tags, used)
+    if not displays:
+        return None
+    display = displays[0]
+
+    bodies = _rank(catalog, BODY_CANDIDATES, [body_category], tags, used | {display.name})
+    if not bodies:
+        return None
+    body = bodies[0]
+
+    monos = _rank(catalog, MONO_CANDIDATES, ["monospace"], tags, {display.name})
+    used.update({display.name, body.name})
+
+    option = {
+        "name": name_template.format(display=display.name),
+        "description": description.format(display=display.name, body=body.name),
+        "approach": approach,
+        "display": _font_entry(display, DISPLAY_WEIGHTS),
+        "body": _font_entry(body, BODY_WEIGHTS),
+    }
+    if monos:
+        option["mono"] = _font_entry(monos[0], MONO_WEIGHTS, include_style=False)
+
+    option["google_fonts_url"] = build_css2_url([
+        (option[role]["family"], option[role]["weights"])
+        for role in ("display", "body", "mono") if role in option
+    ])
+    return option
+
+
+def generate_local_typography(
+    mood: str,
+    aesthetic: str = "modern",
+    catalog: Optional[FontCatalog] = None
+) -> List[Dict]:
+    """
+    Generate the four approach pairings locally.
+
+    Args:
+        mood: Free-text mood (e.g. "Warm & Cozy")
+        aesthetic: Aesthetic direction
+        catalog: Font catalog (loads the bundled snapshot if omitted)
+
+    Returns:
+        List of typography option dicts in the same shape as the Gemini output
+    """
+    catalog = catalog or FontCatalog.load()
+    tags = mood_tags(mood, aesthetic)
+    used: Set[str] = set()
+
+    options = []
+    for approach in APPROACHES:
+        option = build_pairing(catalog, approach, tags, used)
+        if option:
+            options.append(option)
+    return options
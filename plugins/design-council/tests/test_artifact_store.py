@@ -0,0 +1,71 @@
+"""
+Unit tests for artifact_store.py.
+
+Run from the plugin directory:
+    python -m unittest discover tests
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+
+from artifact_store import ArtifactStore, file_sha256  # noqa: E402
+
+
+def write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def read(path):
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+class CheckoutTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.staging = self.tmp.name
+        self.store = ArtifactStore(self.staging, link="auto")
+        self.app = os.path.join(self.staging, "round-2", "code", "App.jsx")
+        write(self.app, "round2\n")
+        self.store.snapshot("round-2")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_rollback_edit_leaves_source_round_alone(self):
+        # Regression: the rollback checkout hardlinked round-4 to round-2's blobs
+        target = os.path.join(self.staging, "round-4")
+        report = self.store.checkout("round-2", target)
+        self.assertNotIn("hardlink", report.linked)
+
+        write(os.path.join(target, "code", "App.jsx"), "round4 edit\n")
+
+        self.assertEqual(read(self.app), "round2\n")
+        sha = self.store.load_manifest("round-2")["files"]["code/App.jsx"]["sha256"]
+        self.assertEqual(file_sha256(self.store.blob_path(sha)), sha)
+        self.store.snapshot("round-2")
+        self.store.snapshot("round-4")
+        self.assertEqual(len(self.store.diff("round-2", "round-4")["changed"]), 1)
+
+    def test_checkout_replaces_hardlinked_match(self):
+        restored = self.store.checkout("round-2", os.path.join(self.staging, "round-2"))
+        self.assertEqual(restored.files, 1)
+        sha = file_sha256(self.app)
+        self.assertFalse(os.path.samefile(self.app, self.store.blob_path(sha)))
+
+    def test_checkout_outside_staging_is_editable(self):
+        with tempfile.TemporaryDirectory() as out:
+            self.store.checkout("round-2", out)
+            copy = os.path.join(out, "code", "App.jsx")
+            write(copy, "changed\n")
+            self.assertEqual(read(self.app), "round2\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+"""
+Unit tests for completeness.py.
+
+Run from the plugin directory:
+    python -m unittest discover tests
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+
+from completeness import check_completeness  # noqa: E402
+
+
+class UnfencedResponseTests(unittest.TestCase):
+    def test_prose_is_complete(self):
+        # Regression: prose was scanned as JS and the apostrophe read as an
+        # open string, triggering needless continuations
+        result = check_completeness("Here's the plan: use a grid.")
+        self.assertTrue(result.complete)
+        self.assertIsNone(result.open)
+
+    def test_prose_with_open_paren_is_complete(self):
+        self.assertTrue(check_completeness("Sure, I can't add that (yet").complete)
+
+    def test_empty_is_complete(self):
+        self.assertTrue(check_completeness("").complete)
+
+    def test_cut_off_script_is_incomplete(self):
+        result = check_completeness('import React from "react";\nfunction App() {\n  return (')
+        self.assertFalse(result.complete)
+        self.assertEqual(result.open.brackets, "{(")
+
+    def test_cut_off_markup_is_incomplete(self):
+        result = check_completeness("<main>\n  <section>\n    <p>Hello")
+        self.assertFalse(result.complete)
+        self.assertEqual(result.open.tags, ["main", "section"])
+
+    def test_cut_off_css_is_incomplete(self):
+        self.assertFalse(check_completeness(".card {\n  color: red;").complete)
+
+
+class FencedResponseTests(unittest.TestCase):
+    def test_open_fence_is_incomplete(self):
+        result = check_completeness("```jsx\nexport default function App() {\n")
+        self.assertFalse(result.complete)
+        self.assertTrue(result.unclosed_fence)
+
+    def test_closed_blocks_are_complete(self):
+        text = "Here's the component:\n\n```jsx\nconst a = { b: 'c' };\n```\n"
+        self.assertTrue(check_completeness(text).complete)
+
+
+if __name__ == "__main__":
+    unittest.main()
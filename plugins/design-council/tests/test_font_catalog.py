@@ -0,0 +1,34 @@
+"""
+Unit tests for font_catalog.py.
+
+Run from the plugin directory:
+    python -m unittest discover tests
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+
+from font_catalog import build_css2_url, collect_fonts  # noqa: E402
+
+
+class CollectFontsTests(unittest.TestCase):
+    def test_default_weights_are_snapped_to_the_catalog(self):
+        # Regression: Abril Fatface (400 only) was requested at 400-700,
+        # which fails the merged css2 URL for every option on the page
+        fonts = dict(collect_fonts([
+            {"display": {"family": "Abril Fatface"}, "body": {"family": "Inter"}, "mono": None},
+        ]))
+        self.assertEqual(fonts["Abril Fatface"], [400])
+        self.assertEqual(fonts["Inter"], [400, 500, 600, 700])
+        self.assertIn("family=Abril+Fatface&", build_css2_url(list(fonts.items())))
+
+    def test_unknown_family_keeps_its_weights(self):
+        fonts = collect_fonts([{"display": {"family": "Not A Real Font", "weights": [300, 700]}}])
+        self.assertEqual(fonts, [("Not A Real Font", [300, 700])])
+
+
+if __name__ == "__main__":
+    unittest.main()
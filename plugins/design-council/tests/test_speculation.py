@@ -0,0 +1,72 @@
+"""
+Unit tests for speculation.py and the speculate.py CLI.
+
+Run from the plugin directory:
+    python -m unittest discover tests
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts")
+sys.path.insert(0, SCRIPTS_DIR)
+
+from speculation import Speculator, plan_key, resolve_generator_args  # noqa: E402
+
+
+class PathTests(unittest.TestCase):
+    def test_staging_dir_is_absolute(self):
+        self.assertTrue(os.path.isabs(Speculator("./stg").root))
+
+    def test_path_flags_are_resolved(self):
+        args = resolve_generator_args(["--optimize-css", "--tokens", "t.json", "--out-dir=out"])
+        self.assertEqual(args[:2], ["--optimize-css", "--tokens"])
+        self.assertEqual(args[2], os.path.abspath("t.json"))
+        self.assertEqual(args[3], "--out-dir=" + os.path.abspath("out"))
+
+    def test_key_matches_between_relative_and_absolute_args(self):
+        data = {"design_spec": "A card", "framework": "html"}
+        self.assertEqual(
+            plan_key(data, resolve_generator_args(["--tokens", "t.json"])),
+            plan_key(data, resolve_generator_args(["--tokens", os.path.abspath("t.json")]))
+        )
+
+
+class CliTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.env = {k: v for k, v in os.environ.items() if k != "GEMINI_API_KEY"}
+        self.env["DESIGN_COUNCIL_CACHE_DIR"] = os.path.join(self.tmp.name, "cache")
+        with open(os.path.join(self.tmp.name, "input.json"), "w", encoding="utf-8") as f:
+            json.dump({"design_spec": "A pricing card", "framework": "html"}, f)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def speculate(self, *args):
+        result = subprocess.run(
+            [sys.executable, os.path.join(SCRIPTS_DIR, "speculate.py"), "--staging", "./stg", *args],
+            cwd=self.tmp.name, env=self.env, capture_output=True, text=True, timeout=60
+        )
+        return json.loads(result.stdout)
+
+    def test_start_and_claim_from_another_cwd(self):
+        # Regression: a relative --staging resolved against scripts/, so the
+        # run died at once and was charged its full estimate as waste
+        started = self.speculate("start", "--input", "input.json")
+        self.assertTrue(started["started"])
+        self.assertTrue(os.path.isdir(os.path.join(self.tmp.name, "stg", ".speculative", started["key"])))
+
+        claimed = self.speculate("claim", "--input", "input.json", "--output", "out.json", "--wait", "30")
+        self.assertFalse(claimed["hit"])
+        # The generator ran and reported its own error (no API key here)
+        self.assertIn("GEMINI_API_KEY", claimed["reason"])
+        self.assertEqual(claimed["ledger"]["wasted_tokens"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
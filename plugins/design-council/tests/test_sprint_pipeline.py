@@ -0,0 +1,84 @@
+"""
+Unit tests for sprint_pipeline.py.
+
+Run from the plugin directory:
+    python -m unittest discover tests
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+
+import sprint_pipeline  # noqa: E402
+from sprint_pipeline import Pipeline, load_pipeline  # noqa: E402
+
+
+# Echoes its stdin under "value"; reports an error while FAIL_MARKER exists
+STAGE_SCRIPT = """
+import json, os, sys
+data = json.load(sys.stdin)
+if os.path.exists(os.path.join(os.path.dirname(os.path.abspath(__file__)), "fail")):
+    print(json.dumps({"error": True, "message": "asked to fail"}))
+    sys.exit(1)
+print(json.dumps({"error": False, "value": data}))
+"""
+
+DEFINITION = {
+    "stages": [
+        {"name": "palette", "script": "stage.py", "input": {"mood": "calm"}, "output": "palette.json"},
+        {"name": "preview", "script": "stage.py", "input": {"palette": "@palette.value"}, "output": "preview.json"},
+    ]
+}
+
+
+class PipelineTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.scripts = os.path.join(self.tmp.name, "scripts")
+        self.staging = os.path.join(self.tmp.name, "staging")
+        os.makedirs(self.scripts)
+        with open(os.path.join(self.scripts, "stage.py"), "w", encoding="utf-8") as f:
+            f.write(STAGE_SCRIPT)
+        patcher = mock.patch.object(sprint_pipeline, "SCRIPTS_DIR", self.scripts)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def run_pipeline(self, definition=DEFINITION):
+        # A fresh Pipeline each time, so state is always reloaded from disk
+        results = Pipeline(load_pipeline(definition), self.staging, jobs=2).run()
+        return {r.name: r.status for r in results}
+
+    def test_unchanged_stages_are_skipped(self):
+        self.assertEqual(self.run_pipeline(), {"palette": "ran", "preview": "ran"})
+        self.assertEqual(self.run_pipeline(), {"palette": "skipped", "preview": "skipped"})
+
+    def test_deleted_output_reruns_only_that_stage(self):
+        self.run_pipeline()
+        os.unlink(os.path.join(self.staging, "palette.json"))
+        # Same output content again, so the downstream key is unchanged
+        self.assertEqual(self.run_pipeline(), {"palette": "ran", "preview": "skipped"})
+
+    def test_changed_upstream_output_reruns_downstream(self):
+        self.run_pipeline()
+        changed = {"stages": [dict(DEFINITION["stages"][0], input={"mood": "bold"}), DEFINITION["stages"][1]]}
+        self.assertEqual(self.run_pipeline(changed), {"palette": "ran", "preview": "ran"})
+
+    def test_resume_after_failure(self):
+        marker = os.path.join(self.scripts, "fail")
+        self.run_pipeline({"stages": DEFINITION["stages"][:1]})
+        open(marker, "w").close()
+        self.assertEqual(self.run_pipeline(), {"palette": "skipped", "preview": "failed"})
+
+        os.unlink(marker)
+        self.assertEqual(self.run_pipeline(), {"palette": "skipped", "preview": "ran"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+"""
+Unit tests for static_review.py.
+
+Run from the plugin directory:
+    python -m unittest discover tests
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+
+from code_scan import scan_files  # noqa: E402
+from static_review import review  # noqa: E402
+
+
+STYLES = """
+:root { --bg: #101418; --fg: #f5efe6; --accent: #e07a5f; }
+body { font-family: "Fraunces", serif; background: var(--bg); color: var(--fg); font-size: clamp(1rem, 2vw, 1.25rem); }
+.header { transition: padding 0.2s ease; padding: 2rem; }
+a:focus-visible { outline: 2px solid var(--accent); }
+@media (max-width: 600px) { .header { padding: 1rem; } }
+@media (prefers-reduced-motion: reduce) { .header { transition: none; } }
+"""
+
+
+def component(comment: str) -> str:
+    return f"""import "./styles.css";
+
+export default function Header() {{
+  // {comment}
+  return (
+    <header className="header">
+      <nav aria-label="Main"><a href="/">Home</a></nav>
+    </header>
+  );
+}}
+"""
+
+
+def run(comment: str):
+    return review(scan_files({"App.jsx": component(comment), "styles.css": STYLES}))
+
+
+class PlaceholderTests(unittest.TestCase):
+    def test_explanatory_comment_does_not_force_iterate(self):
+        # Regression: "add ... here" counted as a critical placeholder
+        result = run("Add the scroll listener here so the header shrinks")
+        self.assertEqual(result.verdict, "review")
+        self.assertEqual(result.issues("critical"), [])
+        self.assertEqual(len(result.issues("minor")), 1)
+
+    def test_todo_is_critical(self):
+        result = run("TODO: wire up the menu")
+        self.assertEqual(result.verdict, "iterate")
+        self.assertEqual(len(result.issues("critical")), 1)
+
+    def test_elision_is_critical(self):
+        self.assertEqual(run("... rest of the navigation").verdict, "iterate")
+
+    def test_plain_comment_is_clean(self):
+        result = run("Shrinks once the page scrolls")
+        self.assertEqual(result.verdict, "review")
+        self.assertEqual([i for r in result.rules for i in r.issues if i.rule == "placeholders"], [])
+
+
+if __name__ == "__main__":
+    unittest.main()